@@ -0,0 +1,434 @@
+from __future__ import annotations
+
+import base64
+import bisect
+import fcntl
+import json
+import logging
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from threading import RLock
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from backend.utils.yaml_utils import load_yaml
+
+logger = logging.getLogger("uvicorn.error")
+
+# Compact once the log holds this many records and at least twice the live entries.
+_COMPACT_MIN_RECORDS = 1000
+
+# Row fields with a per-value, requested_at-ordered index for filtered listing.
+_FILTER_FIELDS = ("type", "status", "application", "requestor")
+
+
+class AccessRequestsImpl:
+    """Access request store backed by an append-only JSON-lines log.
+
+    Every create/update appends one {"op": "put", "key", "item"} line to
+    accessrequests.jsonl under an fcntl lock, so several uvicorn workers can
+    share the file. The log is replayed into in-memory indexes:
+
+    - by key (requested_at:requestor:type)
+    - by (type, application, role, "userid"|"group", principal) for duplicate checks
+    - by requested_at, overall and per type/status/application/requestor value,
+      for ordered, filtered and paginated listing
+
+    Before answering, the store stats the log and reads only the bytes appended
+    since the last sync (a full replay only happens after another worker
+    compacted the file). Superseded records are dropped by periodic compaction.
+    An existing accessrequests.yaml is imported once on first use.
+    """
+
+    _instance: "AccessRequestsImpl | None" = None
+    _instance_lock = RLock()
+
+    def __init__(self, store_dir: Path | None = None) -> None:
+        base = store_dir or (Path.home() / "workspace" / "kselfserv" / "temp")
+        self._log_path = base / "accessrequests.jsonl"
+        self._lock_path = base / "accessrequests.lock"
+        self._legacy_path = base / "accessrequests.yaml"
+        self._lock = RLock()
+        self._reset()
+
+    @classmethod
+    def get_instance(cls) -> "AccessRequestsImpl":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    # ------------------------------------------------------------------
+    # Indexes
+    # ------------------------------------------------------------------
+
+    def _reset(self) -> None:
+        self._items: Dict[str, Dict[str, Any]] = {}
+        self._dup_index: Dict[Tuple[Any, ...], set[str]] = {}
+        self._by_time: List[Tuple[str, str]] = []
+        self._by_field: Dict[Tuple[str, str], List[Tuple[str, str]]] = {}
+        self._log_ino: int | None = None
+        self._log_offset = 0
+        self._log_records = 0
+
+    @staticmethod
+    def _sanitize(v: Dict[Any, Any]) -> Dict[str, Any]:
+        row: Dict[str, Any] = {}
+        for kk, vv in v.items():
+            if not isinstance(kk, str) or vv is None:
+                continue
+
+            # Preserve nested payload object as a dict. Older entries may have payload
+            # stored as a string representation; attempt to parse it as YAML.
+            if kk == "payload":
+                if isinstance(vv, str):
+                    try:
+                        vv = load_yaml(vv)
+                    except Exception:
+                        vv = None
+                if isinstance(vv, dict):
+                    row[kk] = {str(pkk): str(pvv) for pkk, pvv in vv.items() if isinstance(pkk, str)}
+                else:
+                    row[kk] = {}
+                continue
+
+            # All other fields should be strings.
+            row[kk] = str(vv)
+        return row
+
+    @staticmethod
+    def _dup_keys(row: Dict[str, Any]) -> List[Tuple[Any, ...]]:
+        """Index keys (type, application, role, kind, principal); role None matches any role."""
+        payload = row.get("payload")
+        if not isinstance(payload, dict):
+            return []
+        rtype = str(row.get("type") or "")
+        app = payload.get("application") or ""
+        out: List[Tuple[Any, ...]] = []
+        for kind in ("userid", "group"):
+            principal = payload.get(kind)
+            if principal:
+                out.append((rtype, app, payload.get("role") or "", kind, principal))
+                out.append((rtype, app, None, kind, principal))
+        return out
+
+    @staticmethod
+    def _field_values(row: Dict[str, Any]) -> List[Tuple[str, str]]:
+        payload = row.get("payload") if isinstance(row.get("payload"), dict) else {}
+        return [
+            ("type", str(row.get("type") or "")),
+            ("status", str(row.get("status") or "pending")),
+            ("application", str(payload.get("application") or "")),
+            ("requestor", str(row.get("requestor") or "")),
+        ]
+
+    @staticmethod
+    def _sorted_remove(entries: List[Tuple[str, str]], entry: Tuple[str, str]) -> None:
+        idx = bisect.bisect_left(entries, entry)
+        if idx < len(entries) and entries[idx] == entry:
+            entries.pop(idx)
+
+    def _apply(self, key: str, row: Dict[str, Any]) -> None:
+        old = self._items.get(key)
+        if old is not None:
+            for dk in self._dup_keys(old):
+                keys = self._dup_index.get(dk)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        self._dup_index.pop(dk, None)
+            entry = (str(old.get("requested_at") or ""), key)
+            self._sorted_remove(self._by_time, entry)
+            for fv in self._field_values(old):
+                entries = self._by_field.get(fv)
+                if entries is not None:
+                    self._sorted_remove(entries, entry)
+                    if not entries:
+                        self._by_field.pop(fv, None)
+
+        self._items[key] = row
+        for dk in self._dup_keys(row):
+            self._dup_index.setdefault(dk, set()).add(key)
+        entry = (str(row.get("requested_at") or ""), key)
+        bisect.insort(self._by_time, entry)
+        for fv in self._field_values(row):
+            bisect.insort(self._by_field.setdefault(fv, []), entry)
+
+    def _apply_lines(self, data: bytes) -> None:
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            self._log_records += 1
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                logger.warning("Skipping malformed access request record in %s", str(self._log_path))
+                continue
+            if not isinstance(rec, dict) or rec.get("op") != "put":
+                continue
+            key, item = rec.get("key"), rec.get("item")
+            if isinstance(key, str) and isinstance(item, dict):
+                self._apply(key, self._sanitize(item))
+
+    # ------------------------------------------------------------------
+    # Log file handling
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool) -> Iterator[None]:
+        self._lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._lock_path, "a") as lf:
+            fcntl.flock(lf.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lf.fileno(), fcntl.LOCK_UN)
+
+    def _sync(self) -> None:
+        """Bring the indexes up to date with the log (caller holds a file lock)."""
+        try:
+            st = os.stat(self._log_path)
+        except FileNotFoundError:
+            if self._log_ino is not None:
+                self._reset()
+            return
+
+        if st.st_ino != self._log_ino or st.st_size < self._log_offset:
+            self._reset()
+            self._log_ino = st.st_ino
+        if st.st_size == self._log_offset:
+            return
+
+        with open(self._log_path, "rb") as f:
+            f.seek(self._log_offset)
+            data = f.read(st.st_size - self._log_offset)
+        # Only consume complete lines; a torn tail is picked up on the next sync.
+        end = data.rfind(b"\n") + 1
+        self._apply_lines(data[:end])
+        self._log_offset += end
+
+    @staticmethod
+    def _record(key: str, row: Dict[str, Any]) -> bytes:
+        return (json.dumps({"op": "put", "key": key, "item": row}, separators=(",", ":")) + "\n").encode("utf-8")
+
+    def _import_legacy(self) -> None:
+        """Import accessrequests.yaml into a fresh log (caller holds the exclusive lock)."""
+        if self._log_path.exists() or not self._legacy_path.is_file():
+            return
+        loaded = load_yaml(self._legacy_path.read_text())
+        if not isinstance(loaded, dict):
+            return
+        rows = {str(k): self._sanitize(v) for k, v in loaded.items() if isinstance(k, str) and isinstance(v, dict)}
+        self._write_compacted(rows)
+        logger.info("Imported %d access requests from %s", len(rows), str(self._legacy_path))
+
+    def _write_compacted(self, rows: Dict[str, Dict[str, Any]]) -> None:
+        self._log_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".accessrequests.", suffix=".tmp", dir=str(self._log_path.parent))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for key, row in rows.items():
+                    f.write(self._record(key, row))
+            os.replace(tmp, self._log_path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _maybe_compact(self) -> None:
+        if self._log_records < max(_COMPACT_MIN_RECORDS, 2 * len(self._items)):
+            return
+        ordered = {key: self._items[key] for _, key in self._by_time}
+        self._write_compacted(ordered)
+        self._reset()
+        self._sync()
+
+    def _refresh(self) -> None:
+        with self._lock:
+            try:
+                with self._file_lock(exclusive=False):
+                    self._sync()
+                if self._log_ino is None and self._legacy_path.is_file():
+                    with self._file_lock(exclusive=True):
+                        self._import_legacy()
+                        self._sync()
+            except Exception as e:
+                logger.error("Failed to load access requests from %s: %s", str(self._log_path), str(e), exc_info=True)
+
+    def _append(self, rows: Dict[str, Dict[str, Any]]) -> None:
+        with self._lock:
+            try:
+                with self._file_lock(exclusive=True):
+                    self._import_legacy()
+                    self._sync()
+                    data = b"".join(self._record(k, r) for k, r in rows.items())
+                    fd = os.open(self._log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                    try:
+                        os.write(fd, data)
+                    finally:
+                        os.close(fd)
+                    self._sync()
+                    self._maybe_compact()
+            except Exception as e:
+                logger.error("Failed to persist access requests to %s: %s", str(self._log_path), str(e), exc_info=True)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def request_access(self, item: Any) -> None:
+        key = f"{item.requested_at}:{item.requestor}:{item.type}"
+        self._append({key: self._sanitize(item.model_dump())})
+
+    def get_all_access_requests(self) -> Dict[str, Dict[str, object]]:
+        self._refresh()
+        with self._lock:
+            return dict(self._items)
+
+    def list_access_requests(self) -> List[Dict[str, object]]:
+        """Return all access requests, newest requested_at first."""
+        return self.query_access_requests()[0]
+
+    @staticmethod
+    def _encode_cursor(entry: Tuple[str, str]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(list(entry)).encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[str, str]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            requested_at, key = json.loads(raw)
+            return str(requested_at), str(key)
+        except Exception:
+            raise ValueError("Invalid cursor")
+
+    def query_access_requests(
+        self,
+        *,
+        filters: Optional[Dict[str, str]] = None,
+        requested_from: Optional[str] = None,
+        requested_to: Optional[str] = None,
+        descending: bool = True,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, object]], Optional[str]]:
+        """Return one page of access requests ordered by requested_at.
+
+        The scan starts from the smallest per-value index among the equality
+        filters, bisected to the date range and cursor position, so the cost of
+        a page does not grow with the size of the history.
+
+        Args:
+            filters: Equality filters on type, status ("pending" when unset),
+                application and requestor
+            requested_from: Inclusive lower bound on requested_at (ISO-8601 prefix)
+            requested_to: Inclusive upper bound on requested_at (ISO-8601 prefix)
+            descending: Newest first when True
+            cursor: Opaque cursor returned with the previous page
+            limit: Page size; None returns all matching requests
+
+        Returns:
+            (page of requests, cursor for the next page or None)
+
+        Raises:
+            ValueError: If the cursor or a filter field is invalid
+        """
+        wanted = {k: str(v) for k, v in (filters or {}).items() if v is not None and str(v) != ""}
+        unknown = set(wanted) - set(_FILTER_FIELDS)
+        if unknown:
+            raise ValueError(f"Unsupported filter: {', '.join(sorted(unknown))}")
+        after = self._decode_cursor(cursor) if cursor else None
+
+        self._refresh()
+        with self._lock:
+            candidates = [self._by_field.get(fv, []) for fv in wanted.items()]
+            entries = min(candidates, key=len) if candidates else self._by_time
+
+            lo = bisect.bisect_left(entries, (requested_from, "")) if requested_from else 0
+            hi = bisect.bisect_right(entries, (requested_to + "\uffff", "")) if requested_to else len(entries)
+            if after is not None:
+                if descending:
+                    hi = min(hi, bisect.bisect_left(entries, after))
+                else:
+                    lo = max(lo, bisect.bisect_right(entries, after))
+
+            indexes = range(hi - 1, lo - 1, -1) if descending else range(lo, hi)
+            page: List[Dict[str, object]] = []
+            last: Optional[Tuple[str, str]] = None
+            for i in indexes:
+                entry = entries[i]
+                row = self._items[entry[1]]
+                if wanted and any(dict(self._field_values(row)).get(f) != v for f, v in wanted.items()):
+                    continue
+                if limit is not None and len(page) >= limit:
+                    return page, self._encode_cursor(last)
+                page.append(row)
+                last = entry
+            return page, None
+
+    def check_duplicate_app_access_request(
+        self, application: str, role: str, userid: str, group: str
+    ) -> bool:
+        """Check if a duplicate app access request already exists.
+
+        Args:
+            application: Application name
+            role: Requested role
+            userid: User ID (empty if group request)
+            group: Group name (empty if user request)
+
+        Returns:
+            True if duplicate exists, False otherwise
+        """
+        self._refresh()
+        base = ("app_access", application, role)
+        with self._lock:
+            if userid and self._dup_index.get(base + ("userid", userid)):
+                return True
+            if group and self._dup_index.get(base + ("group", group)):
+                return True
+        return False
+
+    def mark_app_access_granted(
+        self, grants: List[Tuple[str, str, str, str]], granted_by: str, granted_at: str
+    ) -> int:
+        """Mark the most recent matching app access request for each grant as granted.
+
+        All updates are appended to the log in one write.
+
+        Args:
+            grants: (app, role, userid, group) tuples; exactly one of userid/group is set
+            granted_by: User granting the roles
+            granted_at: ISO timestamp of the grant
+
+        Returns:
+            Number of access requests updated
+        """
+        self._refresh()
+        updates: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for app, role, userid, group in grants:
+                app = str(app or "").strip()
+                kind, principal = ("userid", userid) if userid else ("group", group)
+                # Any role may be granted against a request, so match on app + principal.
+                candidates = self._dup_index.get(("app_access", app, None, kind, principal))
+                if not candidates:
+                    continue
+                key = max(candidates, key=lambda k: str(self._items[k].get("requested_at") or ""))
+                row = dict(updates.get(key) or self._items[key])
+                payload = dict(row.get("payload") or {})
+                payload["application"] = app
+                payload["role"] = str(role or "").strip()
+                payload.pop("group" if userid else "userid", None)
+                payload[kind] = principal
+                row["payload"] = payload
+                row["status"] = "granted"
+                row["granted_by"] = str(granted_by or "").strip() or "unknown"
+                row["granted_at"] = granted_at
+                updates[key] = row
+        if updates:
+            self._append(updates)
+        return len(updates)
@@ -1,31 +1,32 @@
 from __future__ import annotations
 
 from pathlib import Path
-from threading import RLock
-from time import monotonic
-from typing import Any
+from typing import TYPE_CHECKING, Any
 import logging
 
-import casbin
-from casbin.persist.adapters import FileAdapter
 from fastapi import HTTPException, status
 
-logger = logging.getLogger("uvicorn.error")
+from backend.utils.request_timing import timed
 
+if TYPE_CHECKING:
+    import casbin
 
-_ENFORCER_LOCK = RLock()
-_POLICY_RELOAD_INTERVAL_SECONDS = 30 * 60
-_LAST_POLICY_LOAD_AT = 0.0
+logger = logging.getLogger("uvicorn.error")
 
 
 def build_enforcer(*, model_path: Path, policy_path: Path) -> casbin.Enforcer:
+    """Build a fully loaded enforcer.
+
+    The returned enforcer is never reloaded in place; policy changes are picked
+    up by building a new one and swapping it in (see backend.auth.rbac.reload_enforcer).
+    casbin is imported here so that importing the app does not pay for it.
+    """
+    import casbin
+    from casbin.persist.adapters import FileAdapter
+
     adapter = FileAdapter(str(policy_path))
     e = casbin.Enforcer(str(model_path), adapter)
-    with _ENFORCER_LOCK:
-        e.load_policy()
-
-    global _LAST_POLICY_LOAD_AT
-    _LAST_POLICY_LOAD_AT = monotonic()
+    e.load_policy()
     return e
 
 
@@ -58,12 +59,7 @@ def enforce_rbac(
     groups = usercontext.get("groups", [])
     app_roles = usercontext.get("app_roles", {})
 
-    with _ENFORCER_LOCK:
-        global _LAST_POLICY_LOAD_AT
-        now = monotonic()
-        if now - _LAST_POLICY_LOAD_AT >= _POLICY_RELOAD_INTERVAL_SECONDS:
-            enforcer.load_policy()
-            _LAST_POLICY_LOAD_AT = now
+    with timed("rbac"):
         allowed = enforcer.enforce(usercontext, obj, act, app_ctx)
 
     if not allowed:
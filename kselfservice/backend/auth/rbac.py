@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 from pathlib import Path
 from typing import Any, Callable, Dict
 
@@ -7,13 +8,66 @@ from fastapi import Depends, Request
 
 from backend.auth.casbin_service import build_enforcer, enforce_rbac
 from backend.auth.role_mgmt_impl import RoleMgmtImpl
+from backend.utils.batch import batch_cached
+from backend.utils.generation import stat_token
+from backend.utils.request_timing import timed
 
 _API_PREFIX = "/api/v1"
 _BASE_DIR = Path(__file__).resolve().parent
-_ENFORCER = build_enforcer(
-    model_path=_BASE_DIR / "casbin_model.conf",
-    policy_path=_BASE_DIR / "casbin_policy.csv",
-)
+MODEL_PATH = _BASE_DIR / "casbin_model.conf"
+POLICY_PATH = _BASE_DIR / "casbin_policy.csv"
+# Built by init_enforcer() in the app lifespan (or on first use), not at import
+_POLICY_TOKEN = None
+_ENFORCER = None
+_reload_lock = threading.Lock()
+
+
+def _rebuild_enforcer() -> None:
+    global _ENFORCER, _POLICY_TOKEN
+    token = stat_token(MODEL_PATH, POLICY_PATH)
+    _ENFORCER = build_enforcer(model_path=MODEL_PATH, policy_path=POLICY_PATH)
+    _POLICY_TOKEN = token
+
+
+def reload_enforcer() -> None:
+    """Build a new enforcer from the policy files and swap it in.
+
+    Called by the RBAC watcher (backend.auth.rbac_watcher) when the policy
+    files change, in this worker or any other. Requests that already hold the
+    previous enforcer finish against it; the rebinding of the module global
+    is atomic.
+    """
+    with _reload_lock:
+        _rebuild_enforcer()
+
+
+def init_enforcer() -> None:
+    """Build the enforcer if it has not been built yet (called at startup)."""
+    with _reload_lock:
+        if _ENFORCER is None:
+            _rebuild_enforcer()
+
+
+def _enforcer():
+    """Return the current enforcer.
+
+    Never rebuilt on the request path: policy edits are picked up by the RBAC
+    watcher, which swaps in a new enforcer built on its own thread.
+    """
+    if _ENFORCER is None:
+        init_enforcer()
+    return _ENFORCER
+
+
+def policy_version() -> Any:
+    """Return the stat signature of the policy files the current enforcer was built from."""
+    _enforcer()
+    return _POLICY_TOKEN
+
+
+def role_store_version() -> Any:
+    """Return the generation of the role stores in memory (see RoleMgmtImpl.store_version)."""
+    return RoleMgmtImpl.get_instance().store_version()
 
 
 def _normalize_obj(path: str) -> str:
@@ -23,7 +77,7 @@ def _normalize_obj(path: str) -> str:
 
 
 def enforce_request(usercontext: dict[str, Any], obj: str, act: str, app: dict[str, Any] | None = None) -> None:
-    enforce_rbac(enforcer=_ENFORCER, usercontext=usercontext, obj=_normalize_obj(obj), act=act, app=app)
+    enforce_rbac(enforcer=_enforcer(), usercontext=usercontext, obj=_normalize_obj(obj), act=act, app=app)
 
 
 def check_permission(usercontext: dict[str, Any], obj: str, act: str, app: dict[str, Any] | None = None) -> bool:
@@ -39,7 +93,8 @@ def check_permission(usercontext: dict[str, Any], obj: str, act: str, app: dict[
         True if user has permission, False otherwise
     """
     app_ctx = app or {"id": ""}
-    return _ENFORCER.enforce(usercontext, _normalize_obj(obj), act, app_ctx)
+    with timed("rbac"):
+        return _enforcer().enforce(usercontext, _normalize_obj(obj), act, app_ctx)
 
 
 def calculate_resource_permissions(
@@ -132,6 +187,12 @@ def wrap_response_with_permissions(
 
 
 def get_user_context(user_id: str) -> dict[str, Any]:
+    # Resolved once per POST /batch; each sub-request still enforces its own route
+    return batch_cached(("user_context", user_id), lambda: _load_user_context(user_id))
+
+
+def _load_user_context(user_id: str) -> dict[str, Any]:
+    # Role changes made by other workers are reloaded by the RBAC watcher
     rolemgmtimpl = RoleMgmtImpl.get_instance()
     groups = rolemgmtimpl.get_user_groups(user_id)
     roles = rolemgmtimpl.get_user_roles(user_id, groups)
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import copy
 import os
+import tempfile
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
 from threading import RLock
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List
 
 import yaml
 
 from backend.config.settings import is_demo_mode
+from backend.utils.generation import GenerationFile, StatToken, interprocess_lock
+from backend.utils.yaml_utils import load_yaml
+
+
+_STORE_KEYS = ("group_app_roles", "user_app_roles", "group_global_roles", "user_global_roles", "user_groups")
 
 
 class RoleMgmtImpl:
@@ -21,6 +29,10 @@ class RoleMgmtImpl:
         self._legacy_store_path = self._rbac_dir / "role_assignments.yaml"
         self._store_paths: Dict[str, Path] = {}
         self._demo_users_path = self._rbac_dir / "demo_users.yaml"
+        self._generation = GenerationFile(Path.home() / "workspace" / "kselfserv" / "temp" / "role_stores.generation")
+        self._writers_lock_path = self._generation.path.with_suffix(".lock")
+        # Generation token of the stores currently in memory
+        self._seen_generation: StatToken | None = None
         self._refresh_paths()
         self._data: Dict[str, Any] = {
             "group_app_roles": {},
@@ -29,6 +41,15 @@ class RoleMgmtImpl:
             "user_global_roles": {},
             "user_groups": {},
         }
+        # Stores modified since the last flush; only these are rewritten.
+        self._dirty: set[str] = set()
+        self._batch_depth = 0
+        self._mutation_seq = 0
+        # Reverse indexes derived from _data:
+        #   app -> role -> {"users": {...}, "groups": {...}} (dicts used as ordered sets)
+        #   group -> {user, ...} from user_groups
+        self._app_index: Dict[str, Dict[str, Dict[str, Dict[str, None]]]] = {}
+        self._group_members: Dict[str, Dict[str, None]] = {}
         # Always load from files - never create dummy data
         self._load()
 
@@ -39,6 +60,17 @@ class RoleMgmtImpl:
                 cls._instance = cls()
             return cls._instance
 
+    @property
+    def rbac_dir(self) -> Path:
+        with self._lock:
+            return self._rbac_dir
+
+    @property
+    def generation_path(self) -> Path:
+        """File bumped by every worker's role write (watched by the RBAC watcher)."""
+        with self._lock:
+            return self._generation.path
+
     def update_roles(self, *, force: bool = False) -> None:
         if force:
             self._refresh_paths()
@@ -54,6 +86,9 @@ class RoleMgmtImpl:
             workspace = Path.home() / "workspace"
 
         rbac_dir = workspace / "kselfserv" / "cloned-repositories" / "control" / "rbac"
+        # Cross-worker coordination files stay out of the control repo clone
+        state_name = "role_stores_demo" if demo_mode else "role_stores"
+        state_dir = workspace / "kselfserv" / "temp"
         if demo_mode:
             rbac_dir = rbac_dir / "demo_mode"
 
@@ -69,53 +104,253 @@ class RoleMgmtImpl:
                 "user_groups": self._rbac_dir / "user_groups.yaml",
             }
             self._demo_users_path = self._rbac_dir / "demo_users.yaml"
+            self._generation = GenerationFile(state_dir / f"{state_name}.generation")
+            self._writers_lock_path = state_dir / f"{state_name}.lock"
+
+    def _read_stores(self, store_paths: Dict[str, Path], legacy_path: Path) -> tuple[Dict[str, Any], bool]:
+        """Read the store files from disk without touching in-memory state.
+
+        Returns:
+            (stores keyed by store name, True if they came from the legacy file)
+        """
+        loaded: Dict[str, Any] = {}
+        for key in _STORE_KEYS:
+            p = store_paths.get(key)
+            if not p or not p.exists() or not p.is_file():
+                continue
+            raw = load_yaml(p.read_text())
+            if isinstance(raw, dict):
+                loaded[key] = raw
+
+        if loaded:
+            return loaded, False
+
+        if not legacy_path.exists() or not legacy_path.is_file():
+            return {}, False
+        raw = load_yaml(legacy_path.read_text())
+        if not isinstance(raw, dict):
+            return {}, False
+        return {key: raw[key] for key in _STORE_KEYS if isinstance(raw.get(key), dict)}, True
+
+    def _load(self, *, skip_if_mutated: bool = False) -> bool:
+        """Load the stores and indexes off-lock, then swap them in atomically.
+
+        Args:
+            skip_if_mutated: Discard the result if an in-process mutation happened
+                while reading (the in-memory state is then newer than what was read).
+
+        Returns:
+            True if the loaded state was swapped in
+        """
+        with self._lock:
+            seq = self._mutation_seq
+            store_paths = dict(self._store_paths)
+            legacy_path = self._legacy_store_path
+            generation = self._generation
+
+        # Taken before reading: a bump racing with the read only causes one extra reload
+        token = generation.token()
+
+        try:
+            loaded, from_legacy = self._read_stores(store_paths, legacy_path)
+        except Exception:
+            # Best effort: keep in-memory defaults
+            loaded, from_legacy = {}, False
+
+        # Stores not on disk keep their in-memory value; copy them (as batch()
+        # does for rollback) so the indexes below are built from private dicts
+        # that in-place mutations cannot change while they are walked.
+        with self._lock:
+            data = {key: copy.deepcopy(value) for key, value in self._data.items() if key not in loaded}
+        data.update(loaded)
+        app_index, group_members = self._build_indexes(data)
 
-    def _load(self) -> None:
         with self._lock:
-            try:
-                keys = ["group_app_roles", "user_app_roles", "group_global_roles", "user_global_roles", "user_groups"]
-                loaded_any = False
-                for key in keys:
-                    p = self._store_paths.get(key)
-                    if not p or not p.exists() or not p.is_file():
-                        continue
-                    raw = yaml.safe_load(p.read_text())
-                    if isinstance(raw, dict):
-                        self._data[key] = raw
-                        loaded_any = True
+            if skip_if_mutated and (self._mutation_seq != seq or self._batch_depth > 0):
+                return False
+            self._data = data
+            self._app_index = app_index
+            self._group_members = group_members
+            self._dirty.clear()
+            self._seen_generation = token
+            if from_legacy:
+                self._dirty.update(_STORE_KEYS)
+                try:
+                    self._flush()
+                except Exception:
+                    pass
+        return True
+
+    def reload_from_disk(self) -> bool:
+        """Re-read the role stores after an external change (used by the file watcher)."""
+        self._refresh_paths()
+        return self._load(skip_if_mutated=True)
 
-                if loaded_any:
-                    return
+    def refresh_if_changed(self) -> bool:
+        """Reload if another worker changed the stores since they were loaded.
 
-                if not self._legacy_store_path.exists() or not self._legacy_store_path.is_file():
-                    return
-                raw = yaml.safe_load(self._legacy_store_path.read_text())
-                if not isinstance(raw, dict):
-                    return
+        Costs one stat of the generation file. Called by the RBAC watcher
+        (backend.auth.rbac_watcher) when that file changes, so a grant made in
+        one worker reaches every other without a request paying for the reload.
 
-                for key in keys:
-                    val = raw.get(key)
-                    if isinstance(val, dict):
-                        self._data[key] = val
+        Returns:
+            True if the stores were reloaded
+        """
+        with self._lock:
+            generation, seen = self._generation, self._seen_generation
+        if generation.token() == seen:
+            return False
+        return self._load(skip_if_mutated=True)
 
-                self._flush()
-            except Exception:
-                # Best effort: keep in-memory defaults
+    def store_version(self) -> StatToken | None:
+        """Return the generation token of the stores in memory.
+
+        Changes with every flush in this worker and every reload of another
+        worker's change, so it can key caches of role-derived responses.
+        """
+        with self._lock:
+            return self._seen_generation
+
+    def _reload_if_stale(self) -> None:
+        """Reload before a read-modify-write (caller holds the writers' lock)."""
+        if self._generation.token() != self._seen_generation:
+            self._load()
+
+    @contextmanager
+    def _mutation(self) -> Iterator[None]:
+        """Lock for one add_*/del_* call: in-process lock plus the cross-worker writers' lock.
+
+        The stores are brought up to date first, so the write cannot drop
+        another worker's change. Inside a batch, the batch already holds both.
+        """
+        with self._lock:
+            if self._batch_depth > 0:
+                yield
                 return
+            with interprocess_lock(self._writers_lock_path):
+                self._reload_if_stale()
+                yield
 
     def _flush(self) -> None:
+        """Persist the dirty stores, unless a batch is open (it flushes on exit)."""
         with self._lock:
+            if self._batch_depth > 0 or not self._dirty:
+                return
             self._rbac_dir.mkdir(parents=True, exist_ok=True)
-            for key, path in self._store_paths.items():
+            for key in [k for k in _STORE_KEYS if k in self._dirty]:
+                path = self._store_paths.get(key)
+                if not path:
+                    continue
                 data = self._data.get(key)
                 if not isinstance(data, dict):
                     data = {}
-                path.write_text(yaml.safe_dump(data, sort_keys=False))
-
+                self._atomic_write(path, yaml.safe_dump(data, sort_keys=False))
+                self._dirty.discard(key)
+            # Tell the other workers to reload
+            self._seen_generation = self._generation.bump()
+
+    @staticmethod
+    def _atomic_write(path: Path, text: str) -> None:
+        fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(text)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _commit(self, key: str) -> None:
+        self._mutation_seq += 1
+        self._dirty.add(key)
+        self._flush()
+
+    @contextmanager
+    def batch(self) -> Iterator["RoleMgmtImpl"]:
+        """Apply several mutations as one transaction with a single flush.
+
+        All add_*/del_* calls made inside the block only update memory. On normal
+        exit the changed stores are written once; if the block raises, the
+        in-memory state is rolled back and nothing is written.
+        """
+        with self._lock:
+            outermost = self._batch_depth == 0
+            with interprocess_lock(self._writers_lock_path) if outermost else nullcontext():
+                if outermost:
+                    self._reload_if_stale()
+                snapshot = copy.deepcopy(self._data) if outermost else None
+                dirty_before = set(self._dirty)
+                self._batch_depth += 1
+                try:
+                    yield self
+                except BaseException:
+                    if outermost:
+                        self._data = snapshot
+                        self._dirty = dirty_before
+                        self._mutation_seq += 1
+                        self._app_index, self._group_members = self._build_indexes(self._data)
+                    raise
+                finally:
+                    self._batch_depth -= 1
+                self._flush()
 
     def _norm(self, s: str | None) -> str:
         return str(s or "").strip()
 
+    def _index_roles(self, app_index: Dict[str, Any], kind: str, principal: str, app: str, roles: Any) -> None:
+        if not principal or not app or not isinstance(roles, list):
+            return
+        for r in roles:
+            rr = self._norm(r)
+            if not rr:
+                continue
+            entry = app_index.setdefault(app, {}).setdefault(rr, {"users": {}, "groups": {}})
+            entry[kind][principal] = None
+
+    def _build_indexes(self, data: Dict[str, Any]) -> tuple[Dict[str, Any], Dict[str, Dict[str, None]]]:
+        app_index: Dict[str, Any] = {}
+        for kind, key in (("users", "user_app_roles"), ("groups", "group_app_roles")):
+            pmap = data.get(key)
+            if not isinstance(pmap, dict):
+                continue
+            for principal, apps_map in pmap.items():
+                if not isinstance(apps_map, dict):
+                    continue
+                for app, roles in apps_map.items():
+                    self._index_roles(app_index, kind, self._norm(str(principal)), self._norm(str(app)), roles)
+
+        group_members: Dict[str, Dict[str, None]] = {}
+        ug = data.get("user_groups")
+        if isinstance(ug, dict):
+            for user_id, groups in ug.items():
+                uid = self._norm(str(user_id))
+                if not uid or not isinstance(groups, list):
+                    continue
+                for g in groups:
+                    gg = self._norm(g)
+                    if gg:
+                        group_members.setdefault(gg, {})[uid] = None
+        return app_index, group_members
+
+    def _reindex_app_roles(self, kind: str, principal: str, app: str) -> None:
+        """Refresh the app index entries of one (user|group, app) pair after a mutation."""
+        roles_by_role = self._app_index.get(app) or {}
+        for role in list(roles_by_role):
+            entry = roles_by_role[role]
+            entry[kind].pop(principal, None)
+            if not entry["users"] and not entry["groups"]:
+                roles_by_role.pop(role, None)
+        if not roles_by_role:
+            self._app_index.pop(app, None)
+
+        key = "user_app_roles" if kind == "users" else "group_app_roles"
+        apps_map = (self._data.get(key) or {}).get(principal)
+        if isinstance(apps_map, dict):
+            self._index_roles(self._app_index, kind, principal, app, apps_map.get(app))
+
     def get_grp2apps2roles(self) -> dict:
         with self._lock:
             return dict(self._data.get("group_app_roles") or {})
@@ -131,13 +366,14 @@ class RoleMgmtImpl:
         if not user or not app or not role:
             raise ValueError("user, app, and role are required")
 
-        with self._lock:
+        with self._mutation():
             umap = self._data.setdefault("user_app_roles", {})
             amap = umap.setdefault(user, {})
             roles = amap.setdefault(app, [])
             if role not in roles:
                 roles.append(role)
-            self._flush()
+                self._reindex_app_roles("users", user, app)
+                self._commit("user_app_roles")
 
     def del_user2apps2roles(self, grantor: str | None, user: str, app: str, role: str) -> None:
         user = self._norm(user)
@@ -146,17 +382,20 @@ class RoleMgmtImpl:
         if not user or not app or not role:
             raise ValueError("user, app, and role are required")
 
-        with self._lock:
+        with self._mutation():
             umap = self._data.get("user_app_roles") or {}
             amap = (umap.get(user) or {})
             roles = (amap.get(app) or [])
-            if role in roles:
+            changed = role in roles
+            if changed:
                 roles.remove(role)
             if not roles and app in amap:
                 amap.pop(app, None)
             if not amap and user in umap:
                 umap.pop(user, None)
-            self._flush()
+            if changed:
+                self._reindex_app_roles("users", user, app)
+                self._commit("user_app_roles")
 
     def add_grp2apps2roles(self, grantor: str | None, group: str, app: str, role: str) -> None:
         group = self._norm(group)
@@ -165,13 +404,14 @@ class RoleMgmtImpl:
         if not group or not app or not role:
             raise ValueError("group, app, and role are required")
 
-        with self._lock:
+        with self._mutation():
             gmap = self._data.setdefault("group_app_roles", {})
             amap = gmap.setdefault(group, {})
             roles = amap.setdefault(app, [])
             if role not in roles:
                 roles.append(role)
-            self._flush()
+                self._reindex_app_roles("groups", group, app)
+                self._commit("group_app_roles")
 
     def del_grp2apps2roles(self, grantor: str | None, group: str, app: str, role: str) -> None:
         group = self._norm(group)
@@ -180,17 +420,20 @@ class RoleMgmtImpl:
         if not group or not app or not role:
             raise ValueError("group, app, and role are required")
 
-        with self._lock:
+        with self._mutation():
             gmap = self._data.get("group_app_roles") or {}
             amap = (gmap.get(group) or {})
             roles = (amap.get(app) or [])
-            if role in roles:
+            changed = role in roles
+            if changed:
                 roles.remove(role)
             if not roles and app in amap:
                 amap.pop(app, None)
             if not amap and group in gmap:
                 gmap.pop(group, None)
-            self._flush()
+            if changed:
+                self._reindex_app_roles("groups", group, app)
+                self._commit("group_app_roles")
 
     def get_grps2globalroles(self) -> dict:
         with self._lock:
@@ -202,12 +445,12 @@ class RoleMgmtImpl:
         if not group or not role:
             raise ValueError("group and role are required")
 
-        with self._lock:
+        with self._mutation():
             gmap = self._data.setdefault("group_global_roles", {})
             roles = gmap.setdefault(group, [])
             if role not in roles:
                 roles.append(role)
-            self._flush()
+                self._commit("group_global_roles")
 
     def del_grps2globalroles(self, grantor: str | None, group: str, role: str) -> None:
         group = self._norm(group)
@@ -215,14 +458,16 @@ class RoleMgmtImpl:
         if not group or not role:
             raise ValueError("group and role are required")
 
-        with self._lock:
+        with self._mutation():
             gmap = self._data.get("group_global_roles") or {}
             roles = (gmap.get(group) or [])
-            if role in roles:
+            changed = role in roles
+            if changed:
                 roles.remove(role)
             if not roles and group in gmap:
                 gmap.pop(group, None)
-            self._flush()
+            if changed:
+                self._commit("group_global_roles")
 
     def get_users2globalroles(self) -> dict:
         with self._lock:
@@ -234,12 +479,12 @@ class RoleMgmtImpl:
         if not user or not role:
             raise ValueError("user and role are required")
 
-        with self._lock:
+        with self._mutation():
             umap = self._data.setdefault("user_global_roles", {})
             roles = umap.setdefault(user, [])
             if role not in roles:
                 roles.append(role)
-            self._flush()
+                self._commit("user_global_roles")
 
     def del_users2globalroles(self, grantor: str | None, user: str, role: str) -> None:
         user = self._norm(user)
@@ -247,14 +492,16 @@ class RoleMgmtImpl:
         if not user or not role:
             raise ValueError("user and role are required")
 
-        with self._lock:
+        with self._mutation():
             umap = self._data.get("user_global_roles") or {}
             roles = (umap.get(user) or [])
-            if role in roles:
+            changed = role in roles
+            if changed:
                 roles.remove(role)
             if not roles and user in umap:
                 umap.pop(user, None)
-            self._flush()
+            if changed:
+                self._commit("user_global_roles")
 
     def get_user_groups(self, user_id: str) -> List[str]:
         user_id = self._norm(user_id)
@@ -326,45 +573,99 @@ class RoleMgmtImpl:
                             app_roles[str(app)].append(rr)
         return app_roles
 
+    def _clean_roles(self, roles: Any) -> List[str]:
+        if not isinstance(roles, list):
+            return []
+        return [self._norm(r) for r in roles if self._norm(r)]
+
+    def get_users_role_details(self, user_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Resolve direct, group-inherited and combined roles for many users.
+
+        Answered under a single lock acquisition by direct lookups into the
+        stores, without copying the full role maps.
+
+        Args:
+            user_ids: User ids to resolve; blanks and duplicates are ignored
+
+        Returns:
+            Role details keyed by user id, in input order
+        """
+        out: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            user_global_map = self._data.get("user_global_roles") or {}
+            group_global_map = self._data.get("group_global_roles") or {}
+            user_app_map = self._data.get("user_app_roles") or {}
+            group_app_map = self._data.get("group_app_roles") or {}
+
+            for user_id in user_ids or []:
+                user_id = self._norm(user_id)
+                if not user_id or user_id in out:
+                    continue
+                groups = self.get_user_groups(user_id)
+
+                group_global_roles: Dict[str, List[str]] = {}
+                group_app_roles: Dict[str, Dict[str, List[str]]] = {}
+                for g in groups:
+                    roles = group_global_map.get(g)
+                    if isinstance(roles, list):
+                        group_global_roles[g] = self._clean_roles(roles)
+                    amap = group_app_map.get(g)
+                    if isinstance(amap, dict):
+                        next_amap = {str(app): self._clean_roles(roles) for app, roles in amap.items() if isinstance(roles, list)}
+                        if next_amap:
+                            group_app_roles[g] = next_amap
+
+                uamap = user_app_map.get(user_id)
+                user_app_roles: Dict[str, List[str]] = {}
+                if isinstance(uamap, dict):
+                    user_app_roles = {str(app): self._clean_roles(roles) for app, roles in uamap.items() if isinstance(roles, list)}
+
+                out[user_id] = {
+                    "userid": user_id,
+                    "groups": groups,
+                    "user_global_roles": self._clean_roles(user_global_map.get(user_id)),
+                    "group_global_roles": group_global_roles,
+                    "user_app_roles": user_app_roles,
+                    "group_app_roles": group_app_roles,
+                    "combined_global_roles": self.get_user_roles(user_id, groups),
+                    "combined_app_roles": self.get_app_roles(groups, user_id),
+                }
+        return out
+
+    def get_group_members(self, group: str) -> List[str]:
+        """Return the user ids whose user_groups entry lists the group."""
+        group = self._norm(group)
+        with self._lock:
+            return list(self._group_members.get(group) or {})
+
+    def get_app_role_holders(self, app: str, role: str) -> Dict[str, List[str]]:
+        """Return {"users": [...], "groups": [...]} holding a role on an app."""
+        with self._lock:
+            entry = (self._app_index.get(self._norm(app)) or {}).get(self._norm(role)) or {}
+            return {
+                "users": list(entry.get("users") or {}),
+                "groups": list(entry.get("groups") or {}),
+            }
+
     def get_app_managedby(self, app: str) -> List[str]:
         app = self._norm(app)
         if not app:
             return []
+        return self.get_managedby_for_apps([app]).get(app, [])
 
-        users: List[str] = []
-        groups: List[str] = []
+    def get_managedby_for_apps(self, apps: Iterable[str]) -> Dict[str, List[str]]:
+        """Return the users and groups holding the manager role, keyed by app.
 
+        Users come first, then groups, without duplicates.
+        """
+        out: Dict[str, List[str]] = {}
         with self._lock:
-            umap = self._data.get("user_app_roles") or {}
-            if isinstance(umap, dict):
-                for user_id, apps_map in umap.items():
-                    if not isinstance(apps_map, dict):
-                        continue
-                    roles = apps_map.get(app)
-                    if not isinstance(roles, list):
-                        continue
-                    if "manager" in [self._norm(r) for r in roles]:
-                        uid = self._norm(str(user_id))
-                        if uid:
-                            users.append(uid)
-
-            gmap = self._data.get("group_app_roles") or {}
-            if isinstance(gmap, dict):
-                for group, apps_map in gmap.items():
-                    if not isinstance(apps_map, dict):
-                        continue
-                    roles = apps_map.get(app)
-                    if not isinstance(roles, list):
-                        continue
-                    if "manager" in [self._norm(r) for r in roles]:
-                        gg = self._norm(str(group))
-                        if gg:
-                            groups.append(gg)
-
-        seen = set()
-        out: List[str] = []
-        for v in (users + groups):
-            if v not in seen:
-                seen.add(v)
-                out.append(v)
+            for app in apps or []:
+                app = self._norm(app)
+                if not app:
+                    continue
+                entry = (self._app_index.get(app) or {}).get("manager") or {}
+                merged = dict(entry.get("users") or {})
+                merged.update(entry.get("groups") or {})
+                out[app] = list(merged)
         return out
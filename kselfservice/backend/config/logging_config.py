@@ -6,13 +6,20 @@ This module provides centralized logging configuration with:
 - Different log levels per environment
 - Request ID tracking
 - Performance logging
+- Non-blocking output: records are queued and formatted/written by a listener thread
 """
 
+import atexit
+import copy
 import logging
 import logging.handlers
+import queue
 import sys
+import threading
+import time
+import zlib
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 import json
 from datetime import datetime
 import os
@@ -63,6 +70,9 @@ class JSONFormatter(logging.Formatter):
         if hasattr(record, "method"):
             log_data["method"] = record.method
 
+        if hasattr(record, "io"):
+            log_data["io"] = record.io
+
         return json.dumps(log_data)
 
 
@@ -115,22 +125,159 @@ class ColoredConsoleFormatter(logging.Formatter):
         return formatted
 
 
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks the calling (request) thread.
+
+    When the queue is full, records below WARNING are dropped; WARNING and
+    above evict the oldest queued record instead. The number of dropped
+    records is reported with a warning once the queue has room again.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        """Initialize handler.
+
+        Args:
+            max_size: Maximum number of queued records
+        """
+        super().__init__(queue.Queue(maxsize=max(1, int(max_size))))
+        self.dropped = 0
+        self._unreported = 0
+        self._drop_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge args into the message; formatting is left to the listener's handlers.
+
+        Unlike the base class, exc_info is kept (the queue is in-process) so
+        formatters such as JSONFormatter still see the exception.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno >= logging.WARNING:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+                try:
+                    self.queue.put_nowait(record)
+                except queue.Full:
+                    self._count_drop()
+                    return
+            self._count_drop()
+            return
+        self._report_drops()
+
+    def _count_drop(self) -> None:
+        with self._drop_lock:
+            self.dropped += 1
+            self._unreported += 1
+
+    def _report_drops(self) -> None:
+        if not self._unreported:
+            return
+        with self._drop_lock:
+            count, self._unreported = self._unreported, 0
+        if not count:
+            return
+        notice = logging.LogRecord(
+            __name__, logging.WARNING, __file__, 0,
+            f"Log queue full: dropped {count} log record(s)", None, None,
+        )
+        try:
+            self.queue.put_nowait(notice)
+        except queue.Full:
+            with self._drop_lock:
+                self._unreported += count
+
+
+class SuccessSamplingFilter(logging.Filter):
+    """Sample successful request logs once request volume is high.
+
+    Only records carrying a ``sample_key`` extra are sampled. That is the
+    request id, which RequestLoggingMiddleware sets on the completion line
+    of successful requests only; its start line is logged at DEBUG and never
+    sampled, so each request is counted and decided exactly once. Sampling
+    applies only while more than ``qps_threshold`` such records are logged
+    per second; errors are never sampled.
+    """
+
+    def __init__(self, rate: float = 1.0, qps_threshold: float = 50.0):
+        """Initialize filter.
+
+        Args:
+            rate: Fraction of successful requests to keep under load (0-1)
+            qps_threshold: Sampleable records per second above which sampling applies
+        """
+        super().__init__()
+        self.rate = min(1.0, max(0.0, float(rate)))
+        self.qps_threshold = max(0.0, float(qps_threshold))
+        self._window = 0
+        self._window_count = 0
+        self._window_lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, "sample_key", None)
+        if key is None or self.rate >= 1.0:
+            return True
+        window = int(time.monotonic())
+        with self._window_lock:
+            if window != self._window:
+                self._window, self._window_count = window, 0
+            self._window_count += 1
+            count = self._window_count
+        if count <= self.qps_threshold:
+            return True
+        return (zlib.crc32(str(key).encode("utf-8")) % 10000) < self.rate * 10000
+
+
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[BoundedQueueHandler] = None
+_QUEUED_LOGGERS = ("", "uvicorn", "uvicorn.error", "uvicorn.access")
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)).strip())
+    except ValueError:
+        return default
+
+
 def setup_logging(
     log_level: str = None,
     log_file: str = None,
     json_logs: bool = None,
     max_bytes: int = 5242880,  # 5MB default
     backup_count: int = 0,  # 0 = don't keep old files
+    queue_size: int = None,
+    success_sample_rate: float = None,
+    sample_qps_threshold: float = None,
 ) -> None:
     """Setup application logging configuration.
 
+    Loggers only enqueue records (BoundedQueueHandler); a QueueListener thread
+    formats them and writes to the console/file handlers, so stdout or disk
+    backpressure does not stall requests. Call shutdown_logging() to flush.
+
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Path to log file (None for console only)
         json_logs: Use JSON formatting (default: True in production, False in dev)
         max_bytes: Maximum bytes per log file before rotation (default: 5MB)
         backup_count: Number of backup files to keep (default: 0 - no backups, file gets truncated)
+        queue_size: Maximum queued records before dropping (default: LOG_QUEUE_SIZE or 10000)
+        success_sample_rate: Fraction of successful request logs kept under load
+            (default: LOG_SUCCESS_SAMPLE_RATE or 1.0, i.e. no sampling)
+        sample_qps_threshold: Successful request log lines per second above which
+            sampling applies (default: LOG_SAMPLE_QPS_THRESHOLD or 50)
     """
+    global _queue_listener, _queue_handler
+
     # Get configuration from environment or use defaults
     env = os.getenv("ENVIRONMENT", "development").lower()
 
@@ -143,6 +290,18 @@ def setup_logging(
     if log_file is None:
         log_file = os.getenv("LOG_FILE")
 
+    if queue_size is None:
+        queue_size = int(_env_number("LOG_QUEUE_SIZE", 10000))
+
+    if success_sample_rate is None:
+        success_sample_rate = _env_number("LOG_SUCCESS_SAMPLE_RATE", 1.0)
+
+    if sample_qps_threshold is None:
+        sample_qps_threshold = _env_number("LOG_SAMPLE_QPS_THRESHOLD", 50)
+
+    # Re-initialization: drain and stop the previous listener first
+    shutdown_logging()
+
     # Convert log level string to logging constant
     numeric_level = getattr(logging, log_level.upper(), logging.INFO)
 
@@ -170,7 +329,7 @@ def setup_logging(
         )
 
     console_handler.setFormatter(console_formatter)
-    root_logger.addHandler(console_handler)
+    output_handlers = [console_handler]
 
     # File handler with rotation (if log file specified)
     if log_file:
@@ -194,7 +353,16 @@ def setup_logging(
                 datefmt="%Y-%m-%d %H:%M:%S",
             )
         file_handler.setFormatter(file_formatter)
-        root_logger.addHandler(file_handler)
+        output_handlers.append(file_handler)
+
+    # Loggers only enqueue; the listener thread formats and writes
+    _queue_handler = BoundedQueueHandler(max_size=queue_size)
+    _queue_handler.addFilter(SuccessSamplingFilter(success_sample_rate, sample_qps_threshold))
+    _queue_listener = logging.handlers.QueueListener(
+        _queue_handler.queue, *output_handlers, respect_handler_level=True
+    )
+    _queue_listener.start()
+    root_logger.addHandler(_queue_handler)
 
     # Configure third-party loggers
     _configure_third_party_loggers()
@@ -203,9 +371,7 @@ def setup_logging(
     for logger_name in ["uvicorn", "uvicorn.error", "uvicorn.access"]:
         uvicorn_logger = logging.getLogger(logger_name)
         uvicorn_logger.handlers.clear()
-        uvicorn_logger.addHandler(console_handler)
-        if log_file:
-            uvicorn_logger.addHandler(file_handler)
+        uvicorn_logger.addHandler(_queue_handler)
         uvicorn_logger.propagate = False
 
     # Log startup information
@@ -216,6 +382,37 @@ def setup_logging(
     )
 
 
+def shutdown_logging() -> None:
+    """Flush queued log records and stop the listener thread.
+
+    Loggers are switched to write through the output handlers directly, so
+    records logged after shutdown (e.g. by Uvicorn) are still written. Safe
+    to call more than once.
+    """
+    global _queue_listener
+    listener, _queue_listener = _queue_listener, None
+    if listener is None:
+        return
+    try:
+        listener.stop()
+    except Exception:
+        pass
+    for handler in listener.handlers:
+        try:
+            handler.flush()
+        except Exception:
+            pass
+    for name in _QUEUED_LOGGERS:
+        target = logging.getLogger(name)
+        if _queue_handler in target.handlers:
+            target.removeHandler(_queue_handler)
+            for handler in listener.handlers:
+                target.addHandler(handler)
+
+
+atexit.register(shutdown_logging)
+
+
 def _configure_third_party_loggers() -> None:
     """Configure logging levels for third-party libraries."""
     # Reduce noise from third-party libraries
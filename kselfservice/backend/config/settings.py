@@ -11,6 +11,152 @@ def is_readonly() -> bool:
     return readonly_value in ("true", "1", "yes", "on")
 
 
+def get_rbac_watch_interval() -> float:
+    """Seconds between RBAC store/policy stat polls (RBAC_WATCH_INTERVAL); 0 disables the watcher."""
+    try:
+        return max(0.0, float(os.getenv("RBAC_WATCH_INTERVAL", "2").strip()))
+    except ValueError:
+        return 2.0
+
+
+def get_profile_ring_size() -> int:
+    """Number of recent request profiles kept in memory (PROFILE_RING_SIZE)."""
+    try:
+        return max(1, int(os.getenv("PROFILE_RING_SIZE", "20").strip()))
+    except ValueError:
+        return 20
+
+
+def get_profile_sample_interval_ms() -> float:
+    """Milliseconds between stack samples of a profiled request (PROFILE_SAMPLE_INTERVAL_MS)."""
+    try:
+        return max(0.5, float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "2").strip()))
+    except ValueError:
+        return 2.0
+
+
+def get_trace_sample_ratio() -> float:
+    """Fraction of traces recorded to the trace file (TRACE_SAMPLE_RATIO); 0 disables tracing."""
+    try:
+        return min(1.0, max(0.0, float(os.getenv("TRACE_SAMPLE_RATIO", "0").strip())))
+    except ValueError:
+        return 0.0
+
+
+def get_trace_file() -> str:
+    """Span output file (TRACE_FILE), one OTLP/JSON line per trace."""
+    default = Path(__file__).resolve().parents[2] / "logs" / "traces.jsonl"
+    return os.getenv("TRACE_FILE", "").strip() or str(default)
+
+
+def get_trace_max_bytes() -> int:
+    """Trace file size before rotation (TRACE_MAX_BYTES)."""
+    try:
+        return max(0, int(os.getenv("TRACE_MAX_BYTES", "10485760").strip()))
+    except ValueError:
+        return 10485760
+
+
+def get_trace_backup_count() -> int:
+    """Rotated trace files kept (TRACE_BACKUP_COUNT)."""
+    try:
+        return max(0, int(os.getenv("TRACE_BACKUP_COUNT", "3").strip()))
+    except ValueError:
+        return 3
+
+
+_BULKHEAD_DEFAULT_LIMITS = {"read": 32, "write": 8, "git": 2, "external": 4}
+
+
+def get_bulkhead_limit(group: str) -> int:
+    """Concurrent requests allowed in a route group (BULKHEAD_<GROUP>_LIMIT, e.g. BULKHEAD_GIT_LIMIT)."""
+    default = _BULKHEAD_DEFAULT_LIMITS.get(group, 8)
+    try:
+        return max(1, int(os.getenv(f"BULKHEAD_{group.upper()}_LIMIT", str(default)).strip()))
+    except ValueError:
+        return default
+
+
+def get_bulkhead_queue_timeout() -> float:
+    """Seconds a request waits for a free slot in its route group before rejection (BULKHEAD_QUEUE_TIMEOUT)."""
+    try:
+        return max(0.0, float(os.getenv("BULKHEAD_QUEUE_TIMEOUT", "0.5").strip()))
+    except ValueError:
+        return 0.5
+
+
+def get_bulkhead_retry_after() -> int:
+    """Retry-After seconds sent with bulkhead rejections (BULKHEAD_RETRY_AFTER)."""
+    try:
+        return max(1, int(os.getenv("BULKHEAD_RETRY_AFTER", "2").strip()))
+    except ValueError:
+        return 2
+
+
+def get_response_gzip_min_bytes() -> int:
+    """Smallest FastJSONResponse body, in bytes, that is gzipped for clients accepting it (RESPONSE_GZIP_MIN_BYTES)."""
+    try:
+        return max(0, int(os.getenv("RESPONSE_GZIP_MIN_BYTES", "2048").strip()))
+    except ValueError:
+        return 2048
+
+
+def get_change_journal_size() -> int:
+    """Number of workspace changes kept for GET /changes (CHANGE_JOURNAL_SIZE)."""
+    try:
+        return max(1, int(os.getenv("CHANGE_JOURNAL_SIZE", "1000").strip()))
+    except ValueError:
+        return 1000
+
+
+def get_event_stream_queue_size() -> int:
+    """Events buffered per /changes/stream subscriber before it is dropped (EVENT_STREAM_QUEUE_SIZE)."""
+    try:
+        return max(1, int(os.getenv("EVENT_STREAM_QUEUE_SIZE", "100").strip()))
+    except ValueError:
+        return 100
+
+
+def get_event_stream_keepalive() -> float:
+    """Seconds between keep-alive comments on idle event streams (EVENT_STREAM_KEEPALIVE)."""
+    try:
+        return max(1.0, float(os.getenv("EVENT_STREAM_KEEPALIVE", "15").strip()))
+    except ValueError:
+        return 15.0
+
+
+def get_event_stream_watch_interval() -> float:
+    """Seconds between change journal stat polls for event streams (EVENT_STREAM_WATCH_INTERVAL)."""
+    try:
+        return max(0.1, float(os.getenv("EVENT_STREAM_WATCH_INTERVAL", "1").strip()))
+    except ValueError:
+        return 1.0
+
+
+def get_batch_max_requests() -> int:
+    """Most sub-requests accepted in one POST /batch (BATCH_MAX_REQUESTS)."""
+    try:
+        return max(1, int(os.getenv("BATCH_MAX_REQUESTS", "100").strip()))
+    except ValueError:
+        return 100
+
+
+def get_batch_concurrency() -> int:
+    """Sub-requests of one POST /batch run at the same time (BATCH_CONCURRENCY)."""
+    try:
+        return max(1, int(os.getenv("BATCH_CONCURRENCY", "8").strip()))
+    except ValueError:
+        return 8
+
+
+def get_promotion_concurrency() -> int:
+    """Namespaces copied at the same time by one app promotion (PROMOTION_CONCURRENCY)."""
+    try:
+        return max(1, int(os.getenv("PROMOTION_CONCURRENCY", "8").strip()))
+    except ValueError:
+        return 8
+
+
 def _config_path() -> Path:
     return Path.home() / ".kselfserve" / "kselfserveconfig.yaml"
 
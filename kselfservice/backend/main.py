@@ -7,7 +7,7 @@ including routers, middleware, exception handlers, and static file serving.
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from fastapi.responses import RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
@@ -24,12 +24,17 @@ try:
 except Exception:
     pass
 
-# Configure logging before any other imports
-from backend.config.logging_config import setup_logging, get_logger
-setup_logging()
+# Logging is configured in the lifespan; until then records go to the stdlib defaults
+from backend.config.logging_config import setup_logging, shutdown_logging, get_logger
 
 logger = get_logger(__name__)
 
+from backend.utils.metrics import CONTENT_TYPE_LATEST, render_latest
+
+# Span sampling and the trace file exporter (no-op unless TRACE_SAMPLE_RATIO > 0)
+from backend.utils.tracing import setup_tracing, shutdown_tracing
+setup_tracing()
+
 from backend.config.settings import ensure_demo_mode_env_from_config
 
 from backend.routers import (
@@ -39,6 +44,8 @@ from backend.routers import (
     apps,
     namespaces,
     pull_requests,
+    changes,
+    batch,
 
     access_request_api,
 
@@ -58,14 +65,29 @@ from backend.routers import (
     ns_limitrange,
     ns_rolebindings,
     ns_egressfirewall,
+    ns_details,
 
     # User-related router
     users,
+
+    # Diagnostics
+    debug,
 )
 from backend.middleware.readonly import ReadOnlyMiddleware
 from backend.middleware.logging import RequestLoggingMiddleware
+from backend.middleware.metrics import MetricsMiddleware
+from backend.middleware.profiling import ProfilingMiddleware
+from backend.utils.profiler import anchor_endpoints
+from backend.middleware.tracing import TracingMiddleware
+from backend.middleware.bulkhead import BulkheadMiddleware
+from backend.middleware.etag import ETagMiddleware
+from backend.utils.frontend_bundle import DIST_DIRNAME, PrecompressedStaticFiles, load_manifest
 from backend.exceptions import register_exception_handlers
-from backend.auth.rbac import enforce_request, get_current_user_context
+from backend.auth.rbac import enforce_request, get_current_user_context, init_enforcer
+from backend.auth.rbac_watcher import start_rbac_watcher, stop_rbac_watcher
+from backend.auth.role_mgmt_impl import RoleMgmtImpl
+from backend.utils.workspace_events import start_event_watcher, stop_event_watcher
+from backend.utils.workspace_generation import bump_generation
 
 # Constants
 API_PREFIX = "/api/v1"
@@ -96,7 +118,9 @@ async def lifespan(app: FastAPI):
     This replaces the deprecated @app.on_event("startup") and
     @app.on_event("shutdown") decorators.
     """
-    # Startup
+    # Startup: the log queue listener thread starts here rather than at import time
+    setup_logging()
+
     logger.info("=" * 80)
     logger.info(f"🚀 {API_TITLE} v{API_VERSION}")
     logger.info(f"📝 API Documentation: http://localhost:8888/api/docs")
@@ -123,11 +147,32 @@ async def lifespan(app: FastAPI):
         raise RuntimeError(
             "Invalid environment configuration: WORKSPACE must be set when using env-based repo configuration."
         )
+
+    # Load the Casbin policy and role stores here rather than at import time
+    init_enforcer()
+    RoleMgmtImpl.get_instance()
+
+    # Repositories may have been re-cloned while the server was down: invalidate every
+    # ETag and make delta-syncing clients resync
+    try:
+        bump_generation(op="refresh")
+    except OSError as exc:
+        logger.warning(f"Could not bump the workspace generation: {exc}")
+
+    # Hot-reload RBAC role stores and Casbin policy when their files change
+    start_rbac_watcher()
+    # Feed /changes/stream subscribers from the change journal written by all workers
+    start_event_watcher()
     yield
     # Shutdown
+    stop_event_watcher()
+    stop_rbac_watcher()
     logger.info("=" * 80)
     logger.info(f"👋 Shutting down {API_TITLE}")
     logger.info("=" * 80)
+    # Flush queued spans and log records before the process exits
+    shutdown_tracing()
+    shutdown_logging()
 
 
 # Initialize FastAPI app
@@ -157,13 +202,34 @@ def redirect_openapi():
     return RedirectResponse(url="/api/openapi.json")
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Expose in-process metrics in the Prometheus text format.
+
+    Async so the threadpool gauges are read on the event loop.
+    """
+    return Response(content=render_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 # ============================================
 # Middleware Configuration
 # ============================================
 
+# Per-route-group concurrency limits (innermost, so rejections are logged, traced and counted)
+app.add_middleware(BulkheadMiddleware)
+
+# Conditional GETs (outside the bulkhead, so 304s take no slot) and generation bumps after writes
+app.add_middleware(ETagMiddleware)
+
+# On-demand profiling for platform admins (inside request logging, to reuse its request id)
+app.add_middleware(ProfilingMiddleware)
+
 # Request logging middleware (should be first to capture all requests)
 app.add_middleware(RequestLoggingMiddleware)
 
+# Tracing middleware (outside request logging, so the request id is known when the span ends)
+app.add_middleware(TracingMiddleware)
+
 # CORS middleware (configure based on your needs)
 app.add_middleware(
     CORSMiddleware,
@@ -176,6 +242,9 @@ app.add_middleware(
 # Read-only middleware
 app.add_middleware(ReadOnlyMiddleware)
 
+# Metrics middleware (outermost, so every response including read-only rejections is counted)
+app.add_middleware(MetricsMiddleware)
+
 
 # ============================================
 # Exception Handlers
@@ -192,6 +261,8 @@ app.include_router(system.router, prefix=API_PREFIX, tags=["System"])
 app.include_router(users.router, prefix=API_PREFIX, tags=["Users"])
 app.include_router(clusters.router, prefix=API_PREFIX, tags=["Clusters"])
 app.include_router(pull_requests.router, prefix=API_PREFIX, tags=["Pull Requests"])
+app.include_router(changes.router, prefix=API_PREFIX, tags=["Changes"])
+app.include_router(batch.router, prefix=API_PREFIX, tags=["Batch"])
 
 # Access request routers
 app.include_router(access_request_api.router, prefix=API_PREFIX, tags=["Access Requests"])
@@ -210,6 +281,9 @@ app.include_router(app_l4_ingress.router, prefix=API_PREFIX, tags=["Applications
 app.include_router(app_egress_ip.router, prefix=API_PREFIX, tags=["Applications"])
 app.include_router(allocate_l4_ingress.router, prefix=API_PREFIX, tags=["Applications"])
 
+# Diagnostics routers
+app.include_router(debug.router, prefix=API_PREFIX, tags=["Debug"])
+
 # Namespace routers
 app.include_router(namespaces.router, prefix=API_PREFIX, tags=["Namespaces"])
 app.include_router(ns_argocd.router, prefix=API_PREFIX, tags=["Namespaces"])
@@ -219,6 +293,10 @@ app.include_router(ns_resourcequota.router, prefix=API_PREFIX, tags=["Namespaces
 app.include_router(ns_limitrange.router, prefix=API_PREFIX, tags=["Namespaces"])
 app.include_router(ns_rolebindings.router, prefix=API_PREFIX, tags=["Namespaces"])
 app.include_router(ns_egressfirewall.router, prefix=API_PREFIX, tags=["Namespaces"])
+app.include_router(ns_details.router, prefix=API_PREFIX, tags=["Namespaces"])
+
+# Profiled requests (X-Profile) sample the call of their own endpoint only
+anchor_endpoints(app)
 
 
 
@@ -228,15 +306,26 @@ app.include_router(ns_egressfirewall.router, prefix=API_PREFIX, tags=["Namespace
 
 _BACKEND_DIR = Path(__file__).resolve().parent
 _FRONTEND_DIR = _BACKEND_DIR.parent / "frontend"
+_INDEX_HTML = _FRONTEND_DIR / "index.html"
+
+# Prebuilt bundle (python -m backend.utils.frontend_bundle): hashed, precompressed, immutable
+if load_manifest(_FRONTEND_DIR) is not None:
+    _DIST_DIR = _FRONTEND_DIR / DIST_DIRNAME
+    _INDEX_HTML = _DIST_DIR / "index.html"
+    app.mount(f"/static/{DIST_DIRNAME}", PrecompressedStaticFiles(directory=str(_DIST_DIR)), name="static-dist")
+    logger.info(f"Serving prebuilt frontend bundle from {_DIST_DIR}")
 
 # Mount static files
 app.mount("/static", StaticFiles(directory=str(_FRONTEND_DIR)), name="static")
 
+# index.html names the current bundle hashes, so browsers must revalidate it
+_INDEX_HEADERS = {"Cache-Control": "no-cache"}
+
 
 @app.get("/", include_in_schema=False)
 def serve_ui():
     """Serve the main UI page."""
-    return FileResponse(str(_FRONTEND_DIR / "index.html"))
+    return FileResponse(str(_INDEX_HTML), headers=_INDEX_HEADERS)
 
 
 @app.get("/{full_path:path}", include_in_schema=False)
@@ -255,6 +344,6 @@ def serve_ui_routes(full_path: str):
         raise HTTPException(status_code=404, detail="Static file not found")
 
     # Serve the main HTML for client-side routing
-    return FileResponse(str(_FRONTEND_DIR / "index.html"))
+    return FileResponse(str(_INDEX_HTML), headers=_INDEX_HEADERS)
 
 
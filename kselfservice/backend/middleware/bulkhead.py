@@ -0,0 +1,192 @@
+"""Bulkhead middleware: per-route-group concurrency limits.
+
+Every endpoint is a sync function on AnyIO's shared worker thread pool, so a
+burst of slow git or GitHub-bound requests could take every thread and stall
+cheap reads. API requests are therefore classified into route groups, each
+with its own concurrency limit:
+
+- git: endpoints that run git (commit/push, ensure/merge/discard PR, save config,
+  requests changes)
+- external: reads that call the GitHub API (pull request status / list)
+- write: other modifying requests
+- read: other GET/HEAD requests
+
+The change event stream is exempt: it is a long-lived async response that
+holds no worker thread. So is POST /batch, which only waits on its
+sub-requests; each of those takes a slot of its own group.
+
+A request that finds its group full waits up to BULKHEAD_QUEUE_TIMEOUT for a
+slot and is otherwise rejected with 503 and a Retry-After header. On the
+first request the shared thread pool is grown to the sum of the group limits,
+so each group effectively has its own threads and one group filling up leaves
+the others untouched. Occupancy is exported as bulkhead_* gauges on /metrics.
+"""
+
+import asyncio
+import re
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from backend.config.logging_config import get_logger
+from backend.config.settings import get_bulkhead_limit, get_bulkhead_queue_timeout, get_bulkhead_retry_after
+from backend.utils.metrics import (
+    BULKHEAD_IN_FLIGHT,
+    BULKHEAD_LIMIT,
+    BULKHEAD_REJECTED,
+    BULKHEAD_SATURATION,
+    BULKHEAD_WAITING,
+)
+
+logger = get_logger(__name__)
+
+GROUPS = ("read", "write", "git", "external")
+
+_API_PREFIX = "/api/v1"
+_SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# (methods, path pattern relative to the API prefix, group or None for unlimited); first match wins
+ROUTE_GROUP_RULES: Tuple[Tuple[Tuple[str, ...], "re.Pattern[str]", Optional[str]], ...] = (
+    (("GET",), re.compile(r"^/changes/stream$"), None),
+    (("POST",), re.compile(r"^/batch$"), None),
+    (("POST",), re.compile(r"^/apps/[^/]+/pull_request/(commit_push|ensure|merge|discard_edits)$"), "git"),
+    (("POST",), re.compile(r"^/config$"), "git"),
+    (("GET",), re.compile(r"^/requests/changes$"), "git"),
+    (("GET",), re.compile(r"^/apps/[^/]+/(pull_request/status|pull_requests)$"), "external"),
+)
+
+# Threads kept free of any group (dependencies, unclassified routes)
+_THREADPOOL_HEADROOM = 8
+
+
+def route_group(method: str, path: str) -> Optional[str]:
+    """Return the bulkhead group of an API request, or None for unlimited paths."""
+    if not path.startswith(_API_PREFIX + "/"):
+        return None
+    relative = path[len(_API_PREFIX):]
+    for methods, pattern, group in ROUTE_GROUP_RULES:
+        if method in methods and pattern.match(relative):
+            return group
+    return "read" if method in _SAFE_METHODS else "write"
+
+
+class Bulkhead:
+    """Concurrency limit for one route group.
+
+    Only used from the event loop thread, so plain counters suffice. Waiters
+    are served first come, first served: a released slot is handed to the
+    oldest waiter rather than returned to the pool.
+    """
+
+    def __init__(self, group: str, limit: int) -> None:
+        self.group = group
+        self.limit = limit
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        BULKHEAD_LIMIT.set(limit, group)
+        self._publish()
+
+    def _publish(self) -> None:
+        BULKHEAD_IN_FLIGHT.set(self.in_flight, self.group)
+        BULKHEAD_WAITING.set(len(self._waiters), self.group)
+        BULKHEAD_SATURATION.set(self.in_flight / self.limit, self.group)
+
+    async def acquire(self, timeout: float) -> bool:
+        """Take a slot, waiting up to ``timeout`` seconds; return False if none freed up."""
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self._publish()
+            return True
+        if timeout <= 0:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._publish()
+        try:
+            await asyncio.wait([waiter], timeout=timeout)
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the client went away
+                self.release()
+            raise
+        finally:
+            if not waiter.done():
+                waiter.cancel()
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+            self._publish()
+        return not waiter.cancelled()
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Hand the slot over; in_flight stays the same
+                waiter.set_result(True)
+                self._publish()
+                return
+        self.in_flight -= 1
+        self._publish()
+
+
+def _threadpool_limiter():
+    from anyio.to_thread import current_default_thread_limiter
+
+    return current_default_thread_limiter()
+
+
+class BulkheadMiddleware:
+    """Middleware admitting API requests through their route group's bulkhead."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.bulkheads: Dict[str, Bulkhead] = {g: Bulkhead(g, get_bulkhead_limit(g)) for g in GROUPS}
+        self.queue_timeout = get_bulkhead_queue_timeout()
+        self.retry_after = get_bulkhead_retry_after()
+        self._sized_limiter = None
+
+    def _size_threadpool(self) -> None:
+        # The default limiter belongs to the running event loop; size it once per loop
+        limiter = _threadpool_limiter()
+        if limiter is self._sized_limiter:
+            return
+        wanted = sum(b.limit for b in self.bulkheads.values()) + _THREADPOOL_HEADROOM
+        if limiter.total_tokens < wanted:
+            limiter.total_tokens = wanted
+        self._sized_limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        group = route_group(scope["method"], scope["path"])
+        if group is None:
+            await self.app(scope, receive, send)
+            return
+
+        self._size_threadpool()
+
+        bulkhead = self.bulkheads[group]
+        if not await bulkhead.acquire(self.queue_timeout):
+            BULKHEAD_REJECTED.inc(group)
+            logger.warning(
+                f"Bulkhead '{group}' full ({bulkhead.limit} in flight): rejecting {scope['method']} {scope['path']}"
+            )
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": f"Server is busy with {group} requests. Please retry shortly."},
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            bulkhead.release()
@@ -0,0 +1,274 @@
+"""Conditional GET middleware: strong ETags from workspace generations.
+
+The UI re-fetches apps, namespaces, clusters and namespace resources on every
+navigation. For those GET endpoints this middleware derives a strong ETag
+from the workspace generation of the resource's scope
+(backend.utils.workspace_generation), the caller's identity and roles, the
+role store and Casbin policy versions and the request URL. When the request's If-None-Match
+matches, it answers 304 before routing, so neither RBAC nor the service
+layer runs. Otherwise the ETag is added to the 200 response.
+
+Writes are classified by path as well: after a write (any status but 4xx)
+the counters of the namespace, app or env it touched are bumped, and writes
+that may affect anything (workspace config, enforcement settings, clusters,
+namespace copies) bump the global epoch. Each bump is also recorded in the
+change journal behind GET /changes (see ``write_change``).
+"""
+
+import hashlib
+import json
+import re
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.auth.rbac import get_user_context, policy_version, role_store_version
+from backend.config.logging_config import get_logger
+from backend.dependencies import get_current_user
+from backend.utils.workspace_generation import bump_generation, workspace_generations
+
+logger = get_logger(__name__)
+
+_API_PREFIX = "/api/v1"
+_SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+_APP = r"(?P<app>[^/]+)"
+_NS = r"(?P<ns>[^/]+)"
+
+# Sent with every ETag: browsers keep the body but revalidate before reuse
+CACHE_CONTROL = "private, no-cache"
+
+# GET endpoints with ETags: (pattern relative to the API prefix, route template)
+ETAG_ROUTE_RULES: Tuple[Tuple["re.Pattern[str]", str], ...] = (
+    (re.compile(r"^/clusters$"), "/clusters"),
+    (re.compile(r"^/apps$"), "/apps"),
+    (re.compile(rf"^/apps/{_APP}/namespaces$"), "/apps/{appname}/namespaces"),
+    (re.compile(rf"^/apps/{_APP}/(?P<rest>argocd|l4_ingress|egress_ips)$"), "/apps/{appname}/{rest}"),
+    (
+        re.compile(
+            rf"^/apps/{_APP}/namespaces/{_NS}/(?P<rest>nsargocd|namespace_info/basic|namespace_info/egress|egress_ip"
+            r"|resources/resourcequota|resources/limitrange|rolebinding_requests|egressfirewall|details)$"
+        ),
+        "/apps/{appname}/namespaces/{namespace}/{rest}",
+    ),
+)
+
+# Writes: (pattern relative to the API prefix, scope bumped); first match wins.
+# None bumps nothing, "all" bumps the epoch; unmatched writes bump the epoch.
+WRITE_SCOPE_RULES: Tuple[Tuple["re.Pattern[str]", Optional[str]], ...] = (
+    # Git and GitHub only; the workspace clone is untouched
+    (re.compile(rf"^/apps/{_APP}/pull_request/(ensure|merge|commit_push)$"), None),
+    # GET sub-requests only; each is classified on its own
+    (re.compile(r"^/batch$"), None),
+    # Role and access changes show up through the role store version in the ETag
+    # (it also covers other users' grants, e.g. the managedby lists of GET /apps)
+    (re.compile(r"^/(role-management|app_access|global_access|current-user)(/.*)?$"), None),
+    (re.compile(rf"^/apps/{_APP}/namespaces/{_NS}/copy$"), "all"),
+    (re.compile(rf"^/apps/{_APP}/namespaces/promote$"), "all"),
+    # May allocate egress IPs in the app-wide per-cluster files, keyed by app and
+    # egress_nameid: namespaces sharing the egress_nameid show them too
+    (re.compile(rf"^/apps/{_APP}/namespaces/{_NS}/namespace_info/(egress|basic)$"), "app"),
+    (re.compile(rf"^/apps/{_APP}/namespaces/{_NS}/.+$"), "namespace"),
+    (re.compile(rf"^/apps/{_APP}(/.*)?$"), "app"),
+    (re.compile(r"^/apps$"), "env"),
+)
+
+
+# Writes with their own journal kind: (pattern, journal kind, {method: op}); other methods update
+_ITEM_OPS: Tuple[Tuple["re.Pattern[str]", str, Dict[str, str]], ...] = (
+    (re.compile(r"^/apps$"), "app", {"POST": "create"}),
+    (re.compile(rf"^/apps/{_APP}$"), "app", {"DELETE": "delete"}),
+    (re.compile(rf"^/apps/{_APP}/namespaces(/bulk)?$"), "namespace", {"POST": "create", "DELETE": "delete"}),
+    (re.compile(rf"^/apps/{_APP}/(l4_ingress(/allocate|/release)?|egress_ips)$"), "allocation", {}),
+)
+
+# Pull request writes only change GitHub: journalled for GET /changes and the event
+# stream, but the workspace counters (ETags) are left alone
+_PULL_REQUEST_WRITE = re.compile(rf"^/apps/{_APP}/pull_request/(ensure|merge|commit_push)$")
+
+
+def _query_env(scope: Scope) -> str:
+    values = parse_qs((scope.get("query_string") or b"").decode("latin-1")).get("env") or [""]
+    return values[0].strip()
+
+
+def etag_scope(path: str, query_env: str) -> Optional[Tuple[Tuple[Optional[str], ...], str]]:
+    """Return ((env, app, namespace), route template) for a GET with ETags, else None."""
+    if not path.startswith(_API_PREFIX + "/"):
+        return None
+    relative = path[len(_API_PREFIX):]
+    for pattern, template in ETAG_ROUTE_RULES:
+        match = pattern.match(relative)
+        if match is None:
+            continue
+        if not query_env and template != "/clusters":
+            return None  # the endpoint answers 400
+        groups = match.groupdict()
+        scope = (query_env or None, groups.get("app"), groups.get("ns"))
+        return scope, _API_PREFIX + template.replace("{rest}", groups.get("rest") or "")
+    return None
+
+
+def write_scope(path: str, query_env: str) -> Optional[Tuple[Optional[str], ...]]:
+    """Return the (env, app, namespace) scope a write touches; () means everything, None nothing."""
+    if not path.startswith(_API_PREFIX + "/"):
+        return None
+    relative = path[len(_API_PREFIX):]
+    for pattern, level in WRITE_SCOPE_RULES:
+        match = pattern.match(relative)
+        if match is None:
+            continue
+        if level is None:
+            return None
+        if level == "all" or not query_env:
+            return ()
+        groups = match.groupdict()
+        if level == "namespace":
+            return (query_env, groups["app"], groups["ns"])
+        if level == "app":
+            return (query_env, groups["app"])
+        return (query_env,)
+    return ()
+
+
+def write_change(method: str, path: str, query_env: str) -> Optional[Tuple[Tuple[Optional[str], ...], str, str]]:
+    """Return (scope, journal kind, journal op) for a write, or None when it records nothing.
+
+    Creating or deleting apps and namespaces is journalled as such under the
+    parent scope (the item name is in the request body or query, not the path);
+    IP allocation writes are "allocation" updates and pull request writes
+    "pull_request" updates of the app. Saving the workspace config re-clones
+    the repositories and is a refresh. Every other write is an update of the
+    scope it touched.
+    """
+    if path.startswith(_API_PREFIX + "/"):
+        match = _PULL_REQUEST_WRITE.match(path[len(_API_PREFIX):])
+        if match is not None:
+            return ((query_env, match.group("app")), "pull_request", "update") if query_env else None
+    scope = write_scope(path, query_env)
+    if scope is None:
+        return None
+    relative = path[len(_API_PREFIX):]
+    if not scope:
+        return scope, "workspace", "refresh" if relative == "/config" else "update"
+    for pattern, kind, ops in _ITEM_OPS:
+        if pattern.match(relative):
+            return scope, kind, ops.get(method, "update")
+    return scope, ("env", "app", "namespace")[len(scope) - 1], "update"
+
+
+def compute_etag(scope: Scope, resource_scope: Tuple[Optional[str], ...]) -> str:
+    """Strong ETag of a GET: generation, caller, roles, role store, policy and URL (blocking)."""
+    user_id = get_current_user(Request(scope))
+    payload = json.dumps(
+        [
+            workspace_generations().version(*resource_scope),
+            user_id,
+            get_user_context(user_id),
+            role_store_version(),
+            policy_version(),
+            scope.get("path") or "",
+            (scope.get("query_string") or b"").decode("latin-1"),
+        ],
+        sort_keys=True,
+        default=str,
+    )
+    return '"' + hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24] + '"'
+
+
+def _gzip_variant(etag: str) -> str:
+    # FastJSONResponse may gzip the body; that representation gets its own tag
+    return etag[:-1] + '-gzip"'
+
+
+def _matching_tag(etag: str, if_none_match: str) -> Optional[str]:
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    for candidate in (etag, _gzip_variant(etag)):
+        if candidate in tags:
+            return candidate
+    return None
+
+
+class ETagMiddleware:
+    """Middleware answering conditional GETs and bumping generations after writes."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        if method in ("GET", "HEAD"):
+            target = etag_scope(scope["path"], _query_env(scope))
+            if target is None:
+                await self.app(scope, receive, send)
+                return
+            await self._conditional_get(scope, receive, send, *target)
+            return
+        if method in _SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        change = write_change(method, scope["path"], _query_env(scope))
+        if change is None:
+            await self.app(scope, receive, send)
+            return
+        bump_scope, kind, op = change
+        bump_counters = kind != "pull_request"
+
+        started = False
+
+        async def bump() -> None:
+            try:
+                await anyio.to_thread.run_sync(
+                    lambda: bump_generation(*bump_scope, kind=kind, op=op, bump_counters=bump_counters)
+                )
+            except OSError as exc:
+                logger.error(f"Failed to bump workspace generation for {scope['path']}: {exc}")
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+                # Bump before the client sees the response, so its next GET misses.
+                # Client errors are rejected before anything is written.
+                if not 400 <= message["status"] < 500:
+                    await bump()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            if not started:
+                # Unhandled error (answered 500 further out): part of the write may have landed
+                await bump()
+            raise
+
+    async def _conditional_get(
+        self, scope: Scope, receive: Receive, send: Send, resource_scope: Tuple[Optional[str], ...], template: str
+    ) -> None:
+        etag = await anyio.to_thread.run_sync(compute_etag, scope, resource_scope)
+        matched = _matching_tag(etag, Headers(scope=scope).get("if-none-match", ""))
+        if matched is not None:
+            # Answered before routing: label metrics and spans with the route template
+            scope["route_template"] = template
+            response = Response(status_code=304, headers={"ETag": matched, "Cache-Control": CACHE_CONTROL})
+            await response(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                headers["ETag"] = _gzip_variant(etag) if headers.get("content-encoding") == "gzip" else etag
+                if "cache-control" not in headers:
+                    headers["Cache-Control"] = CACHE_CONTROL
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -5,86 +5,95 @@ This middleware adds:
 - Request/response logging
 - Performance metrics
 - Error tracking
+- Server-Timing header and per-request I/O breakdown (backend.utils.request_timing)
+
+It is a plain ASGI middleware rather than a BaseHTTPMiddleware subclass, so
+responses (including streaming ones) pass straight through without an extra
+task and body-stream wrapper per request.
 """
 
 import time
 import uuid
-from typing import Callable
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from backend.config.logging_config import get_logger
+from backend.utils.request_timing import reset_request_timing, start_request_timing
 
 logger = get_logger(__name__)
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """Middleware for logging all HTTP requests and responses."""
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request and log details.
 
         Args:
-            request: Incoming HTTP request
-            call_next: Next middleware/route handler
-
-        Returns:
-            HTTP response
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # Generate unique request ID
         request_id = str(uuid.uuid4())
 
         # Add request ID to request state for use in route handlers
-        request.state.request_id = request_id
+        scope.setdefault("state", {})["request_id"] = request_id
 
         # Start timing
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         # Extract request details
-        method = request.method
-        path = request.url.path
-        client_host = request.client.host if request.client else "unknown"
-
-        # Log request start
-        logger.info(
+        method = scope["method"]
+        path = scope["path"]
+        client = scope.get("client")
+        client_host = client[0] if client else "unknown"
+        user_agent = None
+        for name, value in scope.get("headers") or []:
+            if name == b"user-agent":
+                user_agent = value.decode("latin-1")
+                break
+
+        # Log request start. At DEBUG so that under sampling a request is
+        # kept or dropped as a whole, by its completion line alone.
+        logger.debug(
             f"Request started: {method} {path}",
             extra={
                 "request_id": request_id,
                 "method": method,
                 "path": path,
                 "client_host": client_host,
-                "user_agent": request.headers.get("user-agent"),
+                "user_agent": user_agent,
             },
         )
 
-        # Process request
-        try:
-            response = await call_next(request)
+        status_code = 500
 
-            # Calculate duration
-            duration_ms = (time.time() - start_time) * 1000
+        # Accumulate yaml/fs/rbac/git/github time for this request
+        timing, timing_token = start_request_timing()
 
-            # Add request ID to response headers
-            response.headers["X-Request-ID"] = request_id
-
-            # Log successful response
-            logger.info(
-                f"Request completed: {method} {path} - {response.status_code} in {duration_ms:.2f}ms",
-                extra={
-                    "request_id": request_id,
-                    "method": method,
-                    "path": path,
-                    "status_code": response.status_code,
-                    "duration_ms": duration_ms,
-                    "client_host": client_host,
-                },
-            )
-
-            return response
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                # Add request ID to response headers
+                headers["X-Request-ID"] = request_id
+                headers["Server-Timing"] = timing.server_timing()
+            await send(message)
 
+        # Process request
+        try:
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
             # Calculate duration
-            duration_ms = (time.time() - start_time) * 1000
+            duration_ms = (time.perf_counter() - start_time) * 1000
 
             # Log error
             logger.error(
@@ -95,9 +104,32 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                     "path": path,
                     "duration_ms": duration_ms,
                     "client_host": client_host,
+                    "io": timing.summary(),
                 },
                 exc_info=True,
             )
 
             # Re-raise to let FastAPI handle the error
             raise
+        finally:
+            reset_request_timing(timing_token)
+
+        # Calculate duration
+        duration_ms = (time.perf_counter() - start_time) * 1000
+
+        # Log successful response
+        extra = {
+            "request_id": request_id,
+            "method": method,
+            "path": path,
+            "status_code": status_code,
+            "duration_ms": duration_ms,
+            "client_host": client_host,
+            "io": timing.summary(),
+        }
+        if status_code < 400:
+            extra["sample_key"] = request_id
+        logger.info(
+            f"Request completed: {method} {path} - {status_code} in {duration_ms:.2f}ms",
+            extra=extra,
+        )
@@ -0,0 +1,69 @@
+"""Request metrics middleware.
+
+Records per-route-template latency histograms, status code counters and
+in-flight gauges into the in-process registry (backend.utils.metrics).
+"""
+
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.utils.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS, HTTP_REQUESTS_IN_FLIGHT
+
+
+def route_template(scope: Scope) -> str:
+    """Return the matched route's path template (bounded label cardinality).
+
+    Depending on the FastAPI version, the route on the scope may carry its
+    path without the include_router prefix, so the static prefix is recovered
+    from the request path when the template does not match it as a whole.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None)
+    regex = getattr(route, "path_regex", None)
+    path = scope.get("path") or ""
+    if template and regex is not None:
+        if regex.match(path):
+            return str(template)
+        for i, ch in enumerate(path):
+            if ch == "/" and i and regex.match(path[i:]):
+                return path[:i] + str(template)
+        return str(template)
+    if scope.get("route_template"):
+        # Answered before routing (e.g. a 304 from ETagMiddleware)
+        return str(scope["route_template"])
+    if scope.get("root_path"):
+        # Mounted apps (e.g. /static) without a route object on the scope
+        return f"{scope['root_path']}/{{path}}"
+    return "<unmatched>"
+
+
+class MetricsMiddleware:
+    """Middleware recording request count, latency and concurrency."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route on the shared scope.
+            route = route_template(scope)
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - started, method, route)
+            HTTP_REQUESTS.inc(method, route, str(status_code))
+            HTTP_REQUESTS_IN_FLIGHT.dec(method)
@@ -0,0 +1,68 @@
+"""On-demand request profiling middleware.
+
+A request is profiled when it carries an ``X-Profile: 1`` header or a
+``_profile=1`` query parameter and the caller may PROFILE ``/debug/profile``
+under the Casbin policy (platform_admin). Other callers' flags are ignored.
+Profiles are kept in a ring buffer (backend.utils.profiler) and served by
+the /debug/profiles endpoints; the response carries ``X-Profile-Id``.
+"""
+
+import uuid
+from urllib.parse import parse_qsl
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.auth.rbac import check_permission, get_current_user_context
+from backend.config.logging_config import get_logger
+from backend.utils.profiler import RequestProfile
+
+logger = get_logger(__name__)
+
+PROFILE_OBJ = "/debug/profile"
+PROFILE_ACT = "PROFILE"
+
+_TRUTHY = ("1", "true", "yes", "on")
+
+
+def profile_requested(scope: Scope) -> bool:
+    """Return True if the request asks to be profiled."""
+    for name, value in scope.get("headers") or []:
+        if name == b"x-profile":
+            return value.decode("latin-1").strip().lower() in _TRUTHY
+    query = (scope.get("query_string") or b"").decode("latin-1")
+    if "_profile" not in query:
+        return False
+    return any(k == "_profile" and v.strip().lower() in _TRUTHY for k, v in parse_qsl(query))
+
+
+def _may_profile(scope: Scope) -> bool:
+    try:
+        user_context = get_current_user_context(Request(scope))
+        return check_permission(user_context, PROFILE_OBJ, PROFILE_ACT)
+    except Exception as e:
+        logger.warning(f"Profiling permission check failed: {str(e)}")
+        return False
+
+
+class ProfilingMiddleware:
+    """Middleware that samples the handler of admin-flagged requests."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not profile_requested(scope) or not _may_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = (scope.get("state") or {}).get("request_id") or str(uuid.uuid4())
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile-Id"] = request_id
+            await send(message)
+
+        with RequestProfile(scope, request_id):
+            await self.app(scope, receive, send_wrapper)
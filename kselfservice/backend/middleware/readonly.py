@@ -1,33 +1,32 @@
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 from backend.config.settings import is_readonly
 
 
-class ReadOnlyMiddleware(BaseHTTPMiddleware):
+_MODIFYING_METHODS = ("POST", "PUT", "DELETE", "PATCH")
+_BATCH_PATH = "/api/v1/batch"
+
+
+class ReadOnlyMiddleware:
     """Middleware to block modification requests when in read-only mode."""
 
-    async def dispatch(self, request: Request, call_next):
-        # Check if readonly mode is enabled
-        if is_readonly():
-            # Block POST, PUT, DELETE, PATCH requests
-            if request.method in ("POST", "PUT", "DELETE", "PATCH"):
-                # Allow specific endpoints even in readonly mode
-                # These are read-only operations that happen to use POST for technical reasons
-                allowed_readonly_paths = [
-                    "/api/v1/apps/",  # Will check more specifically below
-                ]
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-                # Allow YAML preview/generation endpoints (they don't modify data)
-                # These POST endpoints just generate YAML previews for viewing purposes
-                if "_yaml" in request.url.path:
-                    # Allow any endpoint that generates YAML (egressfirewall_yaml, rolebinding_yaml, etc.)
-                    pass
-                else:
-                    # Block all other POST/PUT/DELETE/PATCH requests
-                    raise HTTPException(
-                        status_code=403,
-                        detail="Application is in read-only mode. Modifications are not allowed."
-                    )
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Check if readonly mode is enabled
+        if scope["type"] == "http" and scope["method"] in _MODIFYING_METHODS and is_readonly():
+            # Allow YAML preview/generation endpoints (they don't modify data)
+            # These POST endpoints just generate YAML previews for viewing purposes
+            # (egressfirewall_yaml, rolebinding_yaml, etc.)
+            # POST /batch only runs GET sub-requests
+            if "_yaml" not in scope["path"] and scope["path"] != _BATCH_PATH:
+                # Block all other POST/PUT/DELETE/PATCH requests
+                response = JSONResponse(
+                    status_code=403,
+                    content={"detail": "Application is in read-only mode. Modifications are not allowed."},
+                )
+                await response(scope, receive, send)
+                return
 
-        response = await call_next(request)
-        return response
+        await self.app(scope, receive, send)
@@ -0,0 +1,60 @@
+"""Request tracing middleware.
+
+Opens the server span of each HTTP request (backend.utils.tracing); spans
+from routers, services, repositories, git and GitHub nest under it. The
+span is named after the route template once routing has matched, and
+recorded requests carry an ``X-Trace-Id`` response header so a slow request
+can be looked up in the trace file.
+"""
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.middleware.metrics import route_template
+from backend.utils.tracing import KIND_SERVER, STATUS_ERROR, parse_traceparent, span, tracing_enabled
+
+
+class TracingMiddleware:
+    """Middleware wrapping each request in a server span."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not tracing_enabled():
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        parent = None
+        for name, value in scope.get("headers") or []:
+            if name == b"traceparent":
+                parent = parse_traceparent(value.decode("latin-1"))
+                break
+
+        attributes = {"http.request.method": method, "url.path": scope.get("path") or ""}
+        with span(method, KIND_SERVER, attributes, parent=parent) as server_span:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    server_span.set_attribute("http.response.status_code", status_code)
+                    if status_code >= 500:
+                        server_span.set_status(STATUS_ERROR)
+                    if server_span.recording:
+                        MutableHeaders(scope=message)["X-Trace-Id"] = server_span.trace_id
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                # The router stores the matched route and endpoint on the shared scope.
+                route = route_template(scope)
+                server_span.set_name(f"{method} {route}")
+                server_span.set_attribute("http.route", route)
+                endpoint = scope.get("endpoint")
+                if endpoint is not None:
+                    server_span.set_attribute("code.function", getattr(endpoint, "__name__", str(endpoint)))
+                request_id = (scope.get("state") or {}).get("request_id")
+                if request_id:
+                    server_span.set_attribute("request.id", request_id)
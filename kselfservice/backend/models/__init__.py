@@ -33,6 +33,7 @@ from backend.models.cluster import (
 
 from backend.models.namespace import (
     NamespaceCreate,
+    NamespaceBulkCreate,
     NamespaceInfoUpdate,
     NamespaceInfoEgressUpdate,
     NsArgoCdDetails,
@@ -57,10 +58,14 @@ from backend.models.namespace import (
     NamespaceRoleBindingsUpdate,
     NamespaceResourcesYamlRequest,
     NamespaceCopyRequest,
+    NamespacePromoteRequest,
     NamespaceResponse,
     NamespaceCreateResponse,
+    NamespaceBulkCreateResponse,
     NamespaceDeleteResponse,
     NamespaceCopyResponse,
+    PromotedNamespace,
+    NamespacePromoteResponse,
 )
 
 from backend.models.config import (
@@ -73,6 +78,12 @@ from backend.models.common import (
     L4IngressAllocation,
     L4IngressResponse,
     PullRequestStatus,
+    WorkspaceChange,
+    WorkspaceChanges,
+    BatchSubRequest,
+    BatchRequest,
+    BatchSubResponse,
+    BatchResponse,
 )
 
 __all__ = [
@@ -94,6 +105,7 @@ __all__ = [
     'ClusterCreateResponse',
     # Namespace models
     'NamespaceCreate',
+    'NamespaceBulkCreate',
     'NamespaceInfoUpdate',
     'NamespaceInfoEgressUpdate',
     'NsArgoCdDetails',
@@ -118,10 +130,14 @@ __all__ = [
     'NamespaceRoleBindingsUpdate',
     'NamespaceResourcesYamlRequest',
     'NamespaceCopyRequest',
+    'NamespacePromoteRequest',
     'NamespaceResponse',
     'NamespaceCreateResponse',
+    'NamespaceBulkCreateResponse',
     'NamespaceDeleteResponse',
     'NamespaceCopyResponse',
+    'PromotedNamespace',
+    'NamespacePromoteResponse',
     # Config models
     'KSelfServeConfig',
     # Common models
@@ -130,4 +146,10 @@ __all__ = [
     'L4IngressAllocation',
     'L4IngressResponse',
     'PullRequestStatus',
+    'WorkspaceChange',
+    'WorkspaceChanges',
+    'BatchSubRequest',
+    'BatchRequest',
+    'BatchSubResponse',
+    'BatchResponse',
 ]
@@ -1,7 +1,7 @@
 """Common/shared Pydantic models used across multiple domains."""
 
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 
 class L4IngressRequestedUpdate(BaseModel):
@@ -46,3 +46,43 @@ class PullRequestStatus(BaseModel):
     approved_by: List[str] = []
     missing_approvers: List[str] = []
     merge_allowed: bool = False
+
+
+class WorkspaceChange(BaseModel):
+    """One write recorded in the workspace change journal."""
+    generation: int
+    kind: Literal["workspace", "env", "app", "namespace", "allocation", "pull_request"]
+    env: Optional[str] = None
+    app: Optional[str] = None
+    namespace: Optional[str] = None
+    op: Literal["create", "update", "delete", "refresh"]
+
+
+class WorkspaceChanges(BaseModel):
+    """Response model for the changes of an environment since a generation."""
+    generation: int
+    resync: bool = False
+    changes: List[WorkspaceChange] = []
+
+
+class BatchSubRequest(BaseModel):
+    """One GET of a batch, relative to the API prefix (e.g. /apps/app1/pull_request/status)."""
+    path: str
+    params: Dict[str, Any] = {}
+
+
+class BatchRequest(BaseModel):
+    """Request model for running several GETs in one call."""
+    requests: List[BatchSubRequest]
+
+
+class BatchSubResponse(BaseModel):
+    """Outcome of one GET of a batch."""
+    path: str
+    status: int
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    """Response model for a batch: one entry per sub-request, in request order."""
+    responses: List[BatchSubResponse] = []
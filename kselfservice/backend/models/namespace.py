@@ -1,7 +1,7 @@
 """Namespace-related Pydantic models."""
 
 from pydantic import BaseModel, ConfigDict, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 class NamespaceCreate(BaseModel):
@@ -11,6 +11,11 @@ class NamespaceCreate(BaseModel):
     egress_nameid: Optional[str] = None
 
 
+class NamespaceBulkCreate(BaseModel):
+    """Request model for creating several namespaces at once."""
+    namespaces: List[NamespaceCreate]
+
+
 class NamespaceInfoUpdate(BaseModel):
     """Model for updating namespace info."""
     clusters: Optional[List[str]] = None
@@ -167,6 +172,13 @@ class NamespaceCopyRequest(BaseModel):
     to_namespace: str
 
 
+class NamespacePromoteRequest(BaseModel):
+    """Request model for promoting an application's namespaces to another environment."""
+    to_env: str
+    namespaces: Optional[List[str]] = None
+    cluster_map: Optional[Dict[str, str]] = None
+
+
 # ============================================
 # Response Models
 # ============================================
@@ -195,6 +207,13 @@ class NamespaceCreateResponse(BaseModel):
     status: str = ""
 
 
+class NamespaceBulkCreateResponse(BaseModel):
+    """Response model for bulk namespace creation."""
+    appname: str
+    env: str
+    namespaces: List[NamespaceCreateResponse]
+
+
 class NamespaceDeleteResponse(BaseModel):
     """Response model for namespace deletion."""
     appname: str
@@ -212,3 +231,18 @@ class NamespaceCopyResponse(BaseModel):
     to_env: str
     to_namespace: str
     copied: bool
+
+
+class PromotedNamespace(BaseModel):
+    """A promoted namespace and its clusters in the target environment."""
+    namespace: str
+    clusters: List[str] = []
+
+
+class NamespacePromoteResponse(BaseModel):
+    """Response model for namespace promotion."""
+    appname: str
+    from_env: str
+    to_env: str
+    namespaces: List[PromotedNamespace]
+    summary: str
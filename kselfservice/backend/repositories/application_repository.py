@@ -7,12 +7,16 @@ import logging
 import yaml
 
 from backend.dependencies import get_requests_root
+from backend.utils.request_timing import timed_methods
+from backend.utils.tracing import traced_methods
 from backend.utils.yaml_utils import read_yaml_dict, write_yaml_dict
 from backend.exceptions.custom import NotFoundError, AlreadyExistsError, NotInitializedError, AppError
 
 logger = logging.getLogger("uvicorn.error")
 
 
+@traced_methods
+@timed_methods("fs")
 class ApplicationRepository:
     """Repository for application data operations."""
 
@@ -5,11 +5,15 @@ from typing import Dict, Any, List, Optional
 import logging
 
 from backend.dependencies import get_control_clusters_root, require_control_clusters_root
+from backend.utils.request_timing import timed_methods
+from backend.utils.tracing import traced_methods
 from backend.utils.yaml_utils import load_clusters_from_file
 
 logger = logging.getLogger("uvicorn.error")
 
 
+@traced_methods
+@timed_methods("fs")
 class ClusterRepository:
     """Repository for cluster data operations."""
 
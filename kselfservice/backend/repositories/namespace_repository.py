@@ -5,12 +5,16 @@ from typing import Dict, Any, Optional
 import logging
 
 from backend.dependencies import get_requests_root
+from backend.utils.request_timing import timed_methods
+from backend.utils.tracing import traced_methods
 from backend.utils.yaml_utils import read_yaml_dict, write_yaml_dict
 from backend.exceptions.custom import NotFoundError, AlreadyExistsError
 
 logger = logging.getLogger("uvicorn.error")
 
 
+@traced_methods
+@timed_methods("fs")
 class NamespaceRepository:
     """Repository for namespace data operations."""
 
@@ -1 +1 @@
-from . import apps, system, clusters, namespaces, ns_resourcequota, ns_limitrange, app_l4_ingress, allocate_l4_ingress, pull_requests, app_egress_ip, ns_rolebindings, app_argocd, ns_argocd, ns_egressfirewall, ns_basicInfo, ns_egress_ip, role_mgmt_api, users
+from . import apps, system, clusters, namespaces, ns_resourcequota, ns_limitrange, app_l4_ingress, allocate_l4_ingress, pull_requests, app_egress_ip, ns_rolebindings, app_argocd, ns_argocd, ns_egressfirewall, ns_basicInfo, ns_egress_ip, role_mgmt_api, users, debug, changes, ns_details, batch
@@ -1,14 +1,12 @@
 from datetime import datetime
 import logging
-from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from typing import Dict, List
-
-import yaml
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from typing import List, Literal, Optional
 
 from backend.dependencies import get_current_user
 from backend.auth.rbac import require_rbac
+from backend.auth.access_requests_impl import AccessRequestsImpl
 from backend.auth.role_mgmt_impl import RoleMgmtImpl
 from backend.models.access_request import AccessRequest, AppAccessRequest, GlobalAccessRequest
 
@@ -18,119 +16,49 @@ router = APIRouter(tags=["access_request"])
 logger = logging.getLogger("uvicorn.error")
 
 
-class AccessRequestsImpl:
-    _instance = None
-
-    def __init__(self):
-        self._store_path = (Path.home() / "workspace" / "kselfserv" / "temp" / "accessrequests.yaml")
-
-    def _read_from_disk(self) -> Dict[str, Dict[str, object]]:
-        try:
-            if not self._store_path.exists() or not self._store_path.is_file():
-                return {}
-            loaded = yaml.safe_load(self._store_path.read_text())
-            if not isinstance(loaded, dict):
-                return {}
-            sanitized: Dict[str, Dict[str, object]] = {}
-            for k, v in loaded.items():
-                if not isinstance(k, str) or not isinstance(v, dict):
-                    continue
-
-                row: Dict[str, object] = {}
-                for kk, vv in v.items():
-                    if not isinstance(kk, str):
-                        continue
-
-                    # Preserve nested payload object as a dict. Older entries may have payload
-                    # stored as a string representation; attempt to parse it as YAML.
-                    if kk == "payload":
-                        if isinstance(vv, dict):
-                            row[kk] = {str(pkk): str(pvv) for pkk, pvv in vv.items() if isinstance(pkk, str)}
-                        elif isinstance(vv, str):
-                            try:
-                                parsed = yaml.safe_load(vv)
-                                if isinstance(parsed, dict):
-                                    row[kk] = {str(pkk): str(pvv) for pkk, pvv in parsed.items() if isinstance(pkk, str)}
-                                else:
-                                    row[kk] = {}
-                            except Exception:
-                                row[kk] = {}
-                        else:
-                            row[kk] = {}
-                        continue
-
-                    # All other fields should be strings.
-                    row[kk] = str(vv)
-
-                sanitized[str(k)] = row
-            return sanitized
-        except Exception as e:
-            logger.error("Failed to load access requests from %s: %s", str(self._store_path), str(e), exc_info=True)
-            return {}
-
-    def _write_to_disk(self, items: Dict[str, Dict[str, object]]) -> None:
-        try:
-            self._store_path.parent.mkdir(parents=True, exist_ok=True)
-            self._store_path.write_text(yaml.safe_dump(items or {}, sort_keys=False))
-        except Exception as e:
-            logger.error("Failed to persist access requests to %s: %s", str(self._store_path), str(e), exc_info=True)
-
-    @classmethod
-    def get_instance(cls) -> "AccessRequestsImpl":
-        if cls._instance is None:
-            cls._instance = cls()
-        return cls._instance
-
-    def request_access(self, item: "AccessRequest") -> None:
-        key = f"{item.requested_at}:{item.requestor}:{item.type}"
-        items = self._read_from_disk()
-        items[key] = item.model_dump()
-        self._write_to_disk(items)
-
-    def get_all_access_requests(self) -> Dict[str, Dict[str, object]]:
-        return dict(self._read_from_disk())
-
-    def check_duplicate_app_access_request(
-        self, application: str, role: str, userid: str, group: str
-    ) -> bool:
-        """Check if a duplicate app access request already exists.
-
-        Args:
-            application: Application name
-            role: Requested role
-            userid: User ID (empty if group request)
-            group: Group name (empty if user request)
-
-        Returns:
-            True if duplicate exists, False otherwise
-        """
-        items = self._read_from_disk()
-        for item in items.values():
-            if item.get("type") != "app_access":
-                continue
-            payload = item.get("payload", {})
-            if not isinstance(payload, dict):
-                continue
-            if payload.get("application") != application:
-                continue
-            if payload.get("role") != role:
-                continue
-            if userid and payload.get("userid") == userid:
-                return True
-            if group and payload.get("group") == group:
-                return True
-        return False
-
-
 accessrequestimpl: AccessRequestsImpl = AccessRequestsImpl.get_instance()
 
+_MAX_PAGE_SIZE = 500
+
 @router.get("/access_requests", response_model=List[AccessRequest])
 def list_requests(
     request: Request,
+    response: Response,
+    request_type: Optional[str] = Query(None, alias="type"),
+    status: Optional[str] = None,
+    application: Optional[str] = None,
+    requestor: Optional[str] = None,
+    requested_from: Optional[str] = None,
+    requested_to: Optional[str] = None,
+    order: Literal["asc", "desc"] = "desc",
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=_MAX_PAGE_SIZE),
     _: None = Depends(require_rbac(obj=lambda r: r.url.path, act=lambda r: r.method)),
 ):
-    requests = accessrequestimpl.get_all_access_requests()
-    return sorted(requests.values(), key=lambda r: r.get("requested_at"), reverse=True)
+    """List access requests ordered by requested_at.
+
+    Without a limit all matching requests are returned. With a limit, the
+    cursor for the next page (if any) is returned in the X-Next-Cursor header.
+    """
+    try:
+        items, next_cursor = accessrequestimpl.query_access_requests(
+            filters={
+                "type": request_type,
+                "status": status,
+                "application": application,
+                "requestor": requestor,
+            },
+            requested_from=requested_from,
+            requested_to=requested_to,
+            descending=order == "desc",
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
 
 @router.post("/app_access", response_model=AccessRequest)
 def create_app_access_request(payload: AppAccessRequest, request: Request):
@@ -4,7 +4,6 @@ from pathlib import Path
 import ipaddress
 import logging
 
-import yaml
 
 from pydantic import BaseModel
 
@@ -14,7 +13,7 @@ from backend.dependencies import (
     get_workspace_path,
     require_control_clusters_root,
 )
-from backend.utils.yaml_utils import read_yaml_dict, write_yaml_dict
+from backend.utils.yaml_utils import read_yaml_dict, write_yaml_dict, load_yaml
 
 router = APIRouter(tags=["allocate_l4_ingress"])
 
@@ -89,7 +88,7 @@ def _load_cluster_first_range(*, clusters_root: Path, env: str, clustername: str
         raise HTTPException(status_code=404, detail=f"Clusters file not found: {clusters_path}")
 
     try:
-        raw = yaml.safe_load(clusters_path.read_text())
+        raw = load_yaml(clusters_path.read_text())
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to read clusters yaml: {e}")
 
@@ -1,12 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import Any, Dict, List, Optional
 
-import yaml
 
 from backend.dependencies import require_env, get_workspace_path
 from backend.auth.rbac import require_rbac
 from backend.repositories.namespace_repository import NamespaceRepository
-from backend.utils.yaml_utils import read_yaml_dict, write_yaml_dict
+from backend.utils.yaml_utils import read_yaml_dict, write_yaml_dict, load_yaml
 
 router = APIRouter(tags=["egress_ip"])
 
@@ -75,7 +74,7 @@ def get_egress_ips(
             cluster = ""
 
         try:
-            raw = yaml.safe_load(path.read_text()) or {}
+            raw = load_yaml(path.read_text()) or {}
         except Exception:
             continue
         if not isinstance(raw, dict):
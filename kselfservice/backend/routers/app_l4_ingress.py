@@ -16,7 +16,7 @@ from backend.dependencies import (
 )
 from backend.routers.allocate_l4_ingress import _load_cluster_first_range
 from backend.routers.clusters import get_allocated_clusters_for_app
-from backend.utils.yaml_utils import read_yaml_dict, write_yaml_dict
+from backend.utils.yaml_utils import read_yaml_dict, write_yaml_dict, load_yaml
 from backend.auth.rbac import require_rbac, get_current_user_context, wrap_response_with_permissions
 
 router = APIRouter(tags=["l4_ingress"])
@@ -177,7 +177,7 @@ def get_l4_ingress(
     raw: Dict[str, Any] = {}
     if req_path.exists() and req_path.is_file():
         try:
-            loaded = yaml.safe_load(req_path.read_text()) or {}
+            loaded = load_yaml(req_path.read_text()) or {}
             if isinstance(loaded, dict):
                 raw = loaded
         except Exception as e:
@@ -297,7 +297,7 @@ def put_l4_ingress_requested(
     raw: Dict[str, Any] = {}
     if req_path.exists() and req_path.is_file():
         try:
-            loaded = yaml.safe_load(req_path.read_text()) or {}
+            loaded = load_yaml(req_path.read_text()) or {}
             if isinstance(loaded, dict):
                 raw = loaded
         except Exception as e:
@@ -432,7 +432,7 @@ def release_l4_ingress_ip(
     raw: Dict[str, Any] = {}
     if req_path.exists() and req_path.is_file():
         try:
-            loaded = yaml.safe_load(req_path.read_text()) or {}
+            loaded = load_yaml(req_path.read_text()) or {}
             if isinstance(loaded, dict):
                 raw = loaded
         except Exception as e:
@@ -8,6 +8,7 @@ from backend.models import AppCreate, AppResponse, AppDeleteResponse
 from backend.services.application_service import ApplicationService
 from backend.services.cluster_service import ClusterService
 from backend.auth.rbac import require_rbac, get_current_user_context, add_permissions_to_items
+from backend.utils.responses import FastJSONResponse
 
 router = APIRouter(tags=["apps"])
 
@@ -33,7 +34,7 @@ def get_cluster_service() -> ClusterService:
 # API Endpoints
 # ============================================
 
-@router.get("/apps", response_model=Dict[str, Dict[str, Any]])
+@router.get("/apps", response_model=Dict[str, Dict[str, Any]], response_class=FastJSONResponse)
 def list_apps(
     request: Request,
     env: Optional[str] = None,
@@ -53,12 +54,14 @@ def list_apps(
         Dictionary of applications keyed by app name, each with permissions field
     """
     env = require_env(env)
-    apps = service.get_apps_for_env(env)
+    # The service result is shared with concurrent requests: add permissions to copies
+    apps = {appname: dict(app) for appname, app in service.get_apps_for_env(env).items()}
 
     # Add permissions for each app using helper
     add_permissions_to_items(apps, user_context, "/apps/{item_id}")
 
-    return apps
+    # Already plain dicts: skip response_model validation and encoding
+    return FastJSONResponse(apps)
 
 
 @router.post("/apps", response_model=AppResponse)
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Request
+
+import logging
+
+from backend.config.settings import get_batch_concurrency, get_batch_max_requests
+from backend.exceptions.custom import ValidationError
+from backend.models import BatchRequest, BatchResponse
+from backend.utils.batch import run_batch, subrequest_target
+from backend.utils.responses import FastJSONResponse
+
+router = APIRouter(tags=["batch"])
+
+logger = logging.getLogger("uvicorn.error")
+
+
+@router.post("/batch", response_model=BatchResponse, response_class=FastJSONResponse)
+async def post_batch(payload: BatchRequest, request: Request):
+    """Run several GET requests in one call.
+
+    Each sub-request runs in-process through the whole application with the
+    caller's headers, so RBAC, ETags and the bulkhead apply to it as to a
+    request of its own; a denied sub-request answers 403 without failing the
+    batch. At most BATCH_CONCURRENCY sub-requests run at a time and lookups
+    repeated across them (caller roles, workspace config, coalesced service
+    results) are shared for the duration of the batch.
+
+    Async, so waiting on sub-requests holds no worker thread.
+
+    Args:
+        payload: Sub-requests: GET paths relative to /api/v1 with query params
+
+    Returns:
+        One {path, status, body} per sub-request, in request order
+
+    Raises:
+        ValidationError: If there are too many sub-requests or a path is not
+            a relative API path that can run in a batch
+    """
+    limit = get_batch_max_requests()
+    if len(payload.requests) > limit:
+        raise ValidationError("requests", f"At most {limit} sub-requests per batch, got {len(payload.requests)}")
+    targets = [subrequest_target(sub.path, sub.params) for sub in payload.requests]
+
+    responses = await run_batch(request.app, request.scope, targets, get_batch_concurrency())
+    return FastJSONResponse({"responses": responses})
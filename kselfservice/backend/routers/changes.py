@@ -0,0 +1,114 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from typing import Any, AsyncIterator, Dict, Optional
+import asyncio
+import json
+import logging
+
+import anyio
+
+from backend.config.settings import get_event_stream_keepalive
+from backend.dependencies import get_current_user, require_env
+from backend.models import WorkspaceChanges
+from backend.utils.workspace_events import workspace_event_broker
+from backend.utils.workspace_generation import workspace_generations
+
+router = APIRouter(tags=["changes"])
+
+logger = logging.getLogger("uvicorn.error")
+
+# Browsers reconnect this many milliseconds after a stream ends
+_RETRY_MS = 3000
+
+
+@router.get("/changes", response_model=WorkspaceChanges)
+def get_changes(env: Optional[str] = None, since: Optional[int] = None):
+    """Get the workspace changes in an environment since a generation.
+
+    This endpoint is open to all authenticated users, like GET /apps. Each
+    change names the narrowest scope a write touched (kind plus env, app and
+    namespace); the UI refetches just those scopes instead of every list.
+
+    Args:
+        env: Environment name (dev, qa, prd)
+        since: Generation returned by the previous call; omit on first load
+
+    Returns:
+        The current generation and the changes after ``since``, or
+        ``resync: true`` when the client must refetch everything (first load,
+        ``since`` older than the journal, or a workspace-wide refresh)
+    """
+    env = require_env(env)
+    return workspace_generations().changes_since(since, env)
+
+
+def _sse(event: str, data: Dict[str, Any], event_id: Optional[int] = None) -> str:
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines += [f"event: {event}", "data: " + json.dumps(data, sort_keys=True, separators=(",", ":"))]
+    return "\n".join(lines) + "\n\n"
+
+
+async def _event_stream(env: str, user_id: str, since: Optional[int]) -> AsyncIterator[str]:
+    broker = workspace_event_broker()
+    # Subscribe before reading the journal so nothing falls between replay and live events
+    subscriber = broker.subscribe(env, user_id)
+    try:
+        def replay():
+            result = workspace_generations().changes_since(since, env)
+            return result, ([] if result["resync"] else subscriber.visible(result["changes"]))
+
+        result, missed = await anyio.to_thread.run_sync(replay)
+        yield f"retry: {_RETRY_MS}\n\n"
+        for change in missed:
+            yield _sse("change", change, change["generation"])
+        last = result["generation"]
+        yield _sse("ready", {"generation": last, "resync": result["resync"]}, last)
+
+        keepalive = get_event_stream_keepalive()
+        while True:
+            try:
+                change = await asyncio.wait_for(subscriber.queue.get(), keepalive)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if subscriber.dropped:
+                # Too slow or events were missed: make the client refetch and reconnect
+                yield _sse("resync", {"generation": last})
+                return
+            if change["generation"] <= last:
+                continue
+            last = change["generation"]
+            yield _sse("change", change, last)
+    finally:
+        broker.unsubscribe(subscriber)
+
+
+@router.get("/changes/stream")
+async def stream_changes(request: Request, env: Optional[str] = None, since: Optional[int] = None):
+    """Stream workspace changes in an environment as server-sent events.
+
+    Open to all authenticated users; changes to apps the user may not view
+    are filtered out. Events:
+
+    - ``change``: one change journal entry (app/namespace created, edited or
+      deleted, IP allocations, pull request status, workspace refresh); the
+      event id is its generation
+    - ``ready``: sent once connected, with the current generation and
+      ``resync: true`` when changes since ``since`` (or the Last-Event-ID a
+      reconnecting browser sends) could not be replayed
+    - ``resync``: the client fell behind; refetch everything. The stream
+      ends and the browser reconnects
+
+    Args:
+        env: Environment name (dev, qa, prd)
+        since: Generation to replay changes from (defaults to Last-Event-ID)
+    """
+    env = require_env(env)
+    last_event_id = request.headers.get("last-event-id", "").strip()
+    if last_event_id.isdigit():
+        since = int(last_event_id)
+    return StreamingResponse(
+        _event_stream(env, get_current_user(request), since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
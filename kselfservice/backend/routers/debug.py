@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+from backend.auth.rbac import require_rbac
+from backend.utils.profiler import get_profile_store
+
+router = APIRouter(tags=["debug"])
+
+
+@router.get("/debug/profiles")
+def list_profiles(
+    request: Request,
+    _: None = Depends(require_rbac(obj=lambda r: r.url.path, act=lambda r: r.method)),
+):
+    """List recently captured request profiles (newest first, without stacks)."""
+    return {"profiles": get_profile_store().summaries()}
+
+
+@router.get("/debug/profiles/{request_id}")
+def get_profile(
+    request_id: str,
+    request: Request,
+    format: str = "json",
+    _: None = Depends(require_rbac(obj=lambda r: r.url.path, act=lambda r: r.method)),
+):
+    """Get one request profile.
+
+    With ``format=collapsed`` the collapsed stacks are returned as plain text,
+    ready for flamegraph.pl or speedscope.
+    """
+    profile = get_profile_store().get(request_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"No profile for request {request_id}")
+    if format == "collapsed":
+        return PlainTextResponse(profile["collapsed"])
+    return profile
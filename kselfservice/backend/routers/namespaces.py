@@ -5,17 +5,22 @@ import logging
 
 from backend.models import (
     NamespaceCopyRequest,
+    NamespacePromoteRequest,
     NamespaceCreate,
+    NamespaceBulkCreate,
     NamespaceResponse,
     NamespaceCreateResponse,
+    NamespaceBulkCreateResponse,
     NamespaceDeleteResponse,
     NamespaceCopyResponse,
+    NamespacePromoteResponse,
 )
 from backend.dependencies import require_env, require_initialized_workspace
 from backend.routers import pull_requests
 from backend.services.namespace_service import NamespaceService
 from backend.repositories.namespace_repository import NamespaceRepository
 from backend.auth.rbac import require_rbac, get_current_user_context, calculate_resource_permissions
+from backend.utils.responses import FastJSONResponse
 
 router = APIRouter(tags=["namespaces"])
 
@@ -41,7 +46,7 @@ def get_namespace_repo() -> NamespaceRepository:
 # API Endpoints
 # ============================================
 
-@router.get("/apps/{appname}/namespaces", response_model=Dict[str, Dict[str, Any]])
+@router.get("/apps/{appname}/namespaces", response_model=Dict[str, Dict[str, Any]], response_class=FastJSONResponse)
 def get_namespaces(
     request: Request,
     appname: str,
@@ -72,7 +77,8 @@ def get_namespaces(
     for ns_name, ns_data in namespaces.items():
         ns_data["permissions"] = permissions
 
-    return namespaces
+    # Already plain dicts: skip response_model validation and encoding
+    return FastJSONResponse(namespaces)
 
 
 @router.post("/apps/{appname}/namespaces", response_model=NamespaceCreateResponse)
@@ -108,6 +114,44 @@ def create_namespace(
     return result
 
 
+@router.post("/apps/{appname}/namespaces/bulk", response_model=NamespaceBulkCreateResponse)
+def create_namespaces_bulk(
+    appname: str,
+    payload: NamespaceBulkCreate,
+    env: Optional[str] = None,
+    _: None = Depends(require_rbac(
+        obj=lambda r: f"/apps/{r.path_params.get('appname', '')}/namespaces",
+        act="POST",
+        app_id=lambda r: r.path_params.get("appname", "")
+    )),
+    service: NamespaceService = Depends(get_namespace_service)
+):
+    """Create several namespaces for an application in one request.
+
+    The whole set is validated before anything is written and either all
+    namespaces are created or none; the pull request is ensured once.
+
+    Args:
+        appname: The application name
+        payload: Namespace creation data, one entry per namespace
+        env: The environment (dev/qa/prd)
+
+    Returns:
+        Created namespaces data, in request order
+    """
+    env = require_env(env)
+
+    created = service.create_namespaces(
+        env=env,
+        appname=appname,
+        namespaces=[item.model_dump() for item in payload.namespaces]
+    )
+
+    _try_ensure_pull_request(env, appname)
+
+    return {"appname": appname, "env": env, "namespaces": created}
+
+
 @router.delete("/apps/{appname}/namespaces", response_model=NamespaceDeleteResponse)
 def delete_namespaces(
     appname: str,
@@ -189,6 +233,47 @@ def copy_namespace(
     return result
 
 
+@router.post("/apps/{appname}/namespaces/promote", response_model=NamespacePromoteResponse)
+def promote_namespaces(
+    appname: str,
+    payload: NamespacePromoteRequest,
+    env: Optional[str] = None,
+    _: None = Depends(require_rbac(
+        obj=lambda r: f"/apps/{r.path_params.get('appname', '')}/namespaces",
+        act="POST",
+        app_id=lambda r: r.path_params.get("appname", "")
+    )),
+    service: NamespaceService = Depends(get_namespace_service)
+):
+    """Promote namespaces of an application to another environment (dev -> qa -> prd).
+
+    The namespaces are copied in parallel under the same names, all or none,
+    and the target env's pull request is ensured once.
+
+    Args:
+        appname: The application name
+        payload: Target env, namespaces (all if omitted) and cluster mapping
+        env: The source environment
+
+    Returns:
+        Promoted namespaces with their target clusters and a summary
+    """
+    from_env = require_env(env)
+    to_env = require_env(payload.to_env)
+
+    result = service.promote_namespaces(
+        appname=appname,
+        from_env=from_env,
+        to_env=to_env,
+        namespaces=payload.namespaces,
+        cluster_map=payload.cluster_map
+    )
+
+    _try_ensure_pull_request(to_env, appname)
+
+    return result
+
+
 # ============================================
 # Helper Functions
 # ============================================
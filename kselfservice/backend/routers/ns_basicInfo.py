@@ -2,17 +2,16 @@ from fastapi import APIRouter, HTTPException, Depends
 from typing import Optional
 
 import logging
-from pathlib import Path
 import yaml
 
 from backend.dependencies import require_env
 from backend.routers import pull_requests
 from backend.models import NamespaceInfoBasicUpdate
 from backend.repositories.namespace_repository import NamespaceRepository
-from backend.utils.helpers import parse_bool
-from backend.utils.yaml_utils import read_yaml_dict
 from backend.auth.rbac import require_rbac
+from backend.services.namespace_details_service import NamespaceDetailsService
 from backend.services.ns_egress_ip_service import NsEgressIpService
+from backend.utils.yaml_utils import load_yaml
 
 router = APIRouter(tags=["ns_basic"])
 
@@ -24,6 +23,11 @@ def get_namespace_repository() -> NamespaceRepository:
     return NamespaceRepository()
 
 
+def get_namespace_details_service() -> NamespaceDetailsService:
+    """Dependency injection for NamespaceDetailsService."""
+    return NamespaceDetailsService()
+
+
 ns_egress_ip_service = NsEgressIpService()
 
 
@@ -31,53 +35,6 @@ def get_ns_egress_ip_service() -> NsEgressIpService:
     return ns_egress_ip_service
 
 
-def _nsargocd_summary(
-    *,
-    env: str,
-    appname: str,
-    ns_dir: Path,
-    repo: NamespaceRepository
-) -> dict:
-    """Get ArgoCD summary for a namespace.
-
-    Args:
-        env: Environment name
-        appname: Application name
-        ns_dir: Namespace directory path
-        repo: NamespaceRepository instance
-
-    Returns:
-        Dictionary with ArgoCD information
-    """
-    try:
-        nsargocd_path = ns_dir / "nsargocd.yaml"
-        nsargocd = read_yaml_dict(nsargocd_path)
-
-        need_argo = parse_bool(nsargocd.get("need_argo"))
-        argocd_sync_strategy = str(nsargocd.get("argocd_sync_strategy", "") or "")
-        gitrepourl = str(nsargocd.get("gitrepourl", "") or "")
-
-        argocd_exists = repo.argocd_exists(env, appname)
-        if not argocd_exists:
-            need_argo = False
-
-        status = "Argo used" if need_argo else "Argo not used"
-
-        return {
-            "need_argo": need_argo,
-            "argocd_sync_strategy": argocd_sync_strategy,
-            "gitrepourl": gitrepourl,
-            "status": status,
-        }
-    except Exception:
-        return {
-            "need_argo": False,
-            "argocd_sync_strategy": "",
-            "gitrepourl": "",
-            "status": "Argo not used",
-        }
-
-
 @router.put("/apps/{appname}/namespaces/{namespace}/namespace_info/basic")
 def put_namespace_info_basic(
     appname: str,
@@ -85,6 +42,7 @@ def put_namespace_info_basic(
     payload: NamespaceInfoBasicUpdate,
     env: Optional[str] = None,
     repo: NamespaceRepository = Depends(get_namespace_repository),
+    service: NamespaceDetailsService = Depends(get_namespace_details_service),
     ns_egress_service: NsEgressIpService = Depends(get_ns_egress_ip_service),
     _: None = Depends(require_rbac(
         obj=lambda r: f"/apps/{r.path_params.get('appname', '')}/namespaces",
@@ -102,9 +60,10 @@ def put_namespace_info_basic(
         payload: Namespace info update payload
         env: Environment name
         repo: NamespaceRepository instance (injected)
+        service: NamespaceDetailsService instance (injected)
 
     Returns:
-        Updated namespace basic information
+        Updated namespace basic information, as returned by the GET endpoint
 
     Raises:
         HTTPException: 403 if user lacks permission to modify namespace
@@ -117,7 +76,7 @@ def put_namespace_info_basic(
     try:
         existing = {}
         if ns_info_path.exists() and ns_info_path.is_file():
-            parsed = yaml.safe_load(ns_info_path.read_text()) or {}
+            parsed = load_yaml(ns_info_path.read_text()) or {}
             if isinstance(parsed, dict):
                 existing = parsed
 
@@ -182,18 +141,7 @@ def put_namespace_info_basic(
     except Exception as e:
         logger.error("Failed to ensure PR for %s/%s: %s", str(env), str(appname), str(e))
 
-    clusters = existing.get("clusters")
-    if not isinstance(clusters, list):
-        clusters = []
-    clusters = [str(c) for c in clusters if c is not None and str(c).strip()]
-
-    argo = _nsargocd_summary(env=env, appname=appname, ns_dir=ns_dir, repo=repo)
-    return {
-        "clusters": clusters,
-        "gitrepourl": str(argo.get("gitrepourl", "") or ""),
-        "argocd_sync_strategy": str(argo.get("argocd_sync_strategy", "") or ""),
-        "need_argo": bool(argo.get("need_argo")),
-    }
+    return service.get_basic_info(env, appname, namespace)
 
 
 @router.get("/apps/{appname}/namespaces/{namespace}/namespace_info/basic")
@@ -201,7 +149,7 @@ def get_namespace_info_basic(
     appname: str,
     namespace: str,
     env: Optional[str] = None,
-    repo: NamespaceRepository = Depends(get_namespace_repository),
+    service: NamespaceDetailsService = Depends(get_namespace_details_service),
     _: None = Depends(require_rbac(
         obj=lambda r: f"/apps/{r.path_params.get('appname', '')}/namespaces",
         act="GET",
@@ -216,7 +164,7 @@ def get_namespace_info_basic(
         appname: Application name
         namespace: Namespace name
         env: Environment name
-        repo: NamespaceRepository instance (injected)
+        service: NamespaceDetailsService instance (injected)
 
     Returns:
         Namespace basic information including ArgoCD details
@@ -225,26 +173,4 @@ def get_namespace_info_basic(
         HTTPException: 403 if user lacks permission to view namespace
     """
     env = require_env(env)
-    ns_dir = repo.get_namespace_dir(env, appname, namespace)
-
-    ns_info_path = ns_dir / "namespace_info.yaml"
-    ns_info = {}
-    if ns_info_path.exists() and ns_info_path.is_file():
-        try:
-            parsed = yaml.safe_load(ns_info_path.read_text()) or {}
-            if isinstance(parsed, dict):
-                ns_info = parsed
-        except Exception:
-            ns_info = {}
-
-    clusters = ns_info.get("clusters")
-    if not isinstance(clusters, list):
-        clusters = []
-    clusters = [str(c) for c in clusters if c is not None and str(c).strip()]
-
-    out = {
-        "clusters": clusters,
-        "generate_argo_app": parse_bool(ns_info.get("generate_argo_app")),
-    }
-    out.update(_nsargocd_summary(env=env, appname=appname, ns_dir=ns_dir, repo=repo))
-    return out
+    return service.get_basic_info(env, appname, namespace)
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends
+from typing import Optional
+
+from backend.dependencies import require_env
+from backend.services.namespace_details_service import NamespaceDetailsService
+from backend.auth.rbac import require_rbac
+
+router = APIRouter(tags=["ns_details"])
+
+
+def get_namespace_details_service() -> NamespaceDetailsService:
+    """Dependency injection for NamespaceDetailsService."""
+    return NamespaceDetailsService()
+
+
+@router.get("/apps/{appname}/namespaces/{namespace}/details")
+def get_namespace_details(
+    appname: str,
+    namespace: str,
+    env: Optional[str] = None,
+    fields: Optional[str] = None,
+    service: NamespaceDetailsService = Depends(get_namespace_details_service),
+    _: None = Depends(require_rbac(
+        obj=lambda r: f"/apps/{r.path_params.get('appname', '')}/namespaces",
+        act="GET",
+        app_id=lambda r: r.path_params.get("appname", "")
+    ))
+):
+    """Get all namespace detail sections in one call. Requires viewer or manager role.
+
+    Args:
+        appname: Application name
+        namespace: Namespace name
+        env: Environment name
+        fields: Comma-separated sections to return (default: all), e.g.
+            "basic,egress,resourcequota"
+        service: NamespaceDetailsService instance (injected)
+
+    Returns:
+        {"sections": {name: body}, "errors": {name: {"detail", "type"}}}; a
+        section that fails is reported under errors and the others are still
+        returned
+    """
+    env = require_env(env)
+    sections = [f.strip() for f in (fields or "").split(",") if f.strip()]
+    return service.get_details(env, appname, namespace, sections or None)
@@ -9,6 +9,7 @@ from backend.models import EgressPort, EgressFirewallRule, EgressFirewallUpdate
 from backend.services.namespace_details_service import NamespaceDetailsService
 from backend.utils.enforcement import load_enforcement_settings
 from backend.auth.rbac import require_rbac
+from backend.utils.yaml_utils import load_yaml
 
 router = APIRouter(tags=["egressfirewall"])
 
@@ -30,7 +31,7 @@ def _extract_egress_entries_from_template(path) -> List[Dict[str, Any]]:
         return []
 
     try:
-        raw = yaml.safe_load(path.read_text())
+        raw = load_yaml(path.read_text())
     except Exception:
         return []
 
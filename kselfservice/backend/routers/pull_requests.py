@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
 from pathlib import Path
 import logging
 import os
@@ -8,13 +8,17 @@ import subprocess
 import json
 import shutil
 
-import requests
-import yaml
+
+if TYPE_CHECKING:
+    import requests
 
 from backend.models import PullRequestStatus
 from backend.dependencies import require_env
 from backend.routers.system import _require_workspace_path
 from backend.auth.rbac import require_rbac, get_current_user_context
+from backend.utils.metrics import track_git, track_github
+from backend.utils.tracing import traced
+from backend.utils.yaml_utils import load_yaml
 
 router = APIRouter(tags=["pull_requests"])
 
@@ -55,7 +59,7 @@ def _read_required_approvers(appname: str) -> List[str]:
     if not base.exists() or not base.is_file():
         return []
     try:
-        raw = yaml.safe_load(base.read_text())
+        raw = load_yaml(base.read_text())
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to read approvers.yaml for {appname}: {e}")
 
@@ -113,7 +117,7 @@ def _get_requests_repo_url_from_config() -> str:
     if not cfg_path.exists():
         raise HTTPException(status_code=400, detail="not initialized")
     try:
-        raw_cfg = yaml.safe_load(cfg_path.read_text()) or {}
+        raw_cfg = load_yaml(cfg_path.read_text()) or {}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to read config: {e}")
     if not isinstance(raw_cfg, dict):
@@ -122,12 +126,13 @@ def _get_requests_repo_url_from_config() -> str:
 
 
 def _run_git(repo_dir: Path, args: List[str]) -> subprocess.CompletedProcess:
-    return subprocess.run(
-        ["git", "-C", str(repo_dir), *args],
-        check=True,
-        capture_output=True,
-        text=True,
-    )
+    with track_git(args):
+        return subprocess.run(
+            ["git", "-C", str(repo_dir), *args],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
 
 
 def _git_config_pull_rebase_true(repo_dir: Path) -> None:
@@ -156,6 +161,7 @@ def _git_branch_exists(repo_dir: Path, branch: str) -> bool:
         return False
 
 
+@traced()
 def _copy_app_env_folder(*, env: str, appname: str, src_repo_dir: Path, dst_repo_dir: Path) -> Tuple[Path, Path]:
     src_path = src_repo_dir / "apprequests" / env / appname
     dst_path = dst_repo_dir / "apprequests" / env / appname
@@ -290,10 +296,20 @@ def _ensure_branch_committed_and_pushed(repo_dir: Path, head_branch: str, base_b
     return True
 
 
+def _github_request(method: str, url: str, **kwargs: Any) -> "requests.Response":
+    # Imported on first GitHub call; requests (and urllib3/ssl/certifi) is slow to import
+    import requests
+
+    with track_github(method, url) as call:
+        r = requests.request(method, url, headers=_github_headers(), timeout=30, **kwargs)
+        call.status = str(r.status_code)
+    return r
+
+
 def _find_open_pr(owner: str, repo: str, head_branch: str, base_branch: str) -> Optional[Dict[str, Any]]:
     url = f"https://api.github.com/repos/{owner}/{repo}/pulls"
     params = {"state": "open", "head": f"{owner}:{head_branch}", "base": base_branch}
-    r = requests.get(url, headers=_github_headers(), params=params, timeout=30)
+    r = _github_request("GET", url, params=params)
     if r.status_code != 200:
         raise HTTPException(status_code=500, detail=f"GitHub list PRs failed: {r.status_code} {r.text}")
     items = r.json() if isinstance(r.json(), list) else []
@@ -305,7 +321,7 @@ def _find_open_pr(owner: str, repo: str, head_branch: str, base_branch: str) ->
 def _create_pr(owner: str, repo: str, head_branch: str, base_branch: str, title: str, body: str) -> Dict[str, Any]:
     url = f"https://api.github.com/repos/{owner}/{repo}/pulls"
     payload = {"title": title, "head": head_branch, "base": base_branch, "body": body}
-    r = requests.post(url, headers=_github_headers(), json=payload, timeout=30)
+    r = _github_request("POST", url, json=payload)
     if r.status_code not in (200, 201):
         raise HTTPException(status_code=500, detail=f"GitHub create PR failed: {r.status_code} {r.text}")
     return r.json()
@@ -313,7 +329,7 @@ def _create_pr(owner: str, repo: str, head_branch: str, base_branch: str, title:
 
 def _list_approvals(owner: str, repo: str, pr_number: int) -> Set[str]:
     url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}/reviews"
-    r = requests.get(url, headers=_github_headers(), timeout=30)
+    r = _github_request("GET", url)
     if r.status_code != 200:
         raise HTTPException(status_code=500, detail=f"GitHub list reviews failed: {r.status_code} {r.text}")
 
@@ -336,7 +352,7 @@ def _list_approvals(owner: str, repo: str, pr_number: int) -> Set[str]:
 def _merge_pr(owner: str, repo: str, pr_number: int) -> Dict[str, Any]:
     url = f"https://api.github.com/repos/{owner}/{repo}/pulls/{pr_number}/merge"
     payload = {"merge_method": "merge"}
-    r = requests.put(url, headers=_github_headers(), json=payload, timeout=30)
+    r = _github_request("PUT", url, json=payload)
     if r.status_code not in (200, 201):
         raise HTTPException(status_code=500, detail=f"GitHub merge PR failed: {r.status_code} {r.text}")
     return r.json() if isinstance(r.json(), dict) else {"merged": True}
@@ -2,18 +2,21 @@
 
 from datetime import datetime
 import logging
-from pathlib import Path
 from typing import Any, Callable
 
 from fastapi import APIRouter, HTTPException, Depends, Request, status
 from pydantic import BaseModel
-import yaml
 
+from backend.auth.access_requests_impl import AccessRequestsImpl
 from backend.auth.role_mgmt_impl import RoleMgmtImpl
 from backend.dependencies import get_current_user
 
 
-rolemgmtimpl = RoleMgmtImpl.get_instance()
+def _rolemgmt() -> RoleMgmtImpl:
+    # Resolved per call: the role stores are loaded on first use, not at import
+    return RoleMgmtImpl.get_instance()
+
+_MAX_BATCH_USER_IDS = 1000
 
 
 def execute_role_operation(operation: Callable[[], None], operation_name: str) -> dict[str, Any]:
@@ -52,6 +55,23 @@ def execute_role_operation(operation: Callable[[], None], operation_name: str) -
         )
 
 
+def _mark_access_requests_granted(grantor: str | None, grants: list[tuple[str, str, str, str]]) -> None:
+    """Mark the most recent matching app access request for each grant as granted.
+
+    Args:
+        grantor: User granting the roles
+        grants: (app, role, userid, group) tuples; exactly one of userid/group is set
+    """
+    try:
+        AccessRequestsImpl.get_instance().mark_app_access_granted(
+            grants,
+            granted_by=str(grantor or "").strip() or "unknown",
+            granted_at=datetime.now().astimezone().isoformat(),
+        )
+    except Exception:
+        pass
+
+
 def create_rolemgmt_router(
     *,
     enforce: Callable[[dict[str, Any], str, str, dict[str, Any] | None], None],
@@ -68,6 +88,14 @@ def create_rolemgmt_router(
         group: str | None = None
 
 
+    class BatchRoleAssignmentRequest(BaseModel):
+        assignments: list[RoleAssignmentRequest]
+
+
+    class BatchUserRolesRequest(BaseModel):
+        userids: list[str]
+
+
     class GlobalRoleAssignmentRequest(BaseModel):
         group: str
         role: str
@@ -84,7 +112,7 @@ def create_rolemgmt_router(
     @router.get("/role-management/rbac/refresh")
     def refresh_rbac_roles() -> dict[str, Any]:
         try:
-            rolemgmtimpl.update_roles(force=True)
+            _rolemgmt().update_roles(force=True)
             return {
                 "status": "success",
                 "message": "Role refreshed successfully",
@@ -101,8 +129,8 @@ def create_rolemgmt_router(
 
     @router.get("/role-management/app")
     def list_applicationservice_roles() -> dict[str, Any]:
-        group_rows = rolemgmtimpl.get_grp2apps2roles()
-        user_rows = rolemgmtimpl.get_user2apps2roles()
+        group_rows = _rolemgmt().get_grp2apps2roles()
+        user_rows = _rolemgmt().get_user2apps2roles()
         return {
             "rows": group_rows,
             "group_rows": group_rows,
@@ -123,61 +151,50 @@ def create_rolemgmt_router(
                 detail={"status": "error", "message": "Exactly one of userid or group is required"},
             )
         result = execute_role_operation(
-            (lambda: rolemgmtimpl.add_user2apps2roles(grantor, userid, payload.app, payload.role))
+            (lambda: _rolemgmt().add_user2apps2roles(grantor, userid, payload.app, payload.role))
             if userid
-            else (lambda: rolemgmtimpl.add_grp2apps2roles(grantor, group, payload.app, payload.role)),
+            else (lambda: _rolemgmt().add_grp2apps2roles(grantor, group, payload.app, payload.role)),
             "assigned"
         )
-        try:
-            store_path = (Path.home() / "workspace" / "kselfserv" / "temp" / "accessrequests.yaml")
-            raw = None
-            if store_path.exists() and store_path.is_file():
-                loaded = yaml.safe_load(store_path.read_text())
-                if isinstance(loaded, dict):
-                    raw = loaded
-            if isinstance(raw, dict):
-                matches: list[tuple[str, dict[str, object]]] = []
-                for k, v in raw.items():
-                    if not isinstance(k, str) or not isinstance(v, dict):
-                        continue
-                    if str(v.get("type") or "").strip() != "app_access":
-                        continue
-                    p = v.get("payload")
-                    if not isinstance(p, dict):
-                        continue
-                    if str(p.get("application") or "").strip() != str(payload.app or "").strip():
-                        continue
-                    if userid and str(p.get("userid") or "").strip() != userid:
-                        continue
-                    if group and str(p.get("group") or "").strip() != group:
-                        continue
-                    matches.append((k, v))
-
-                if matches:
-                    def _requested_at(key: str) -> str:
-                        return str(key.split(":", 1)[0] if ":" in key else "")
-
-                    matches.sort(key=lambda kv: _requested_at(kv[0]), reverse=True)
-                    k, v = matches[0]
-                    v = dict(v)
-                    p = dict(v.get("payload") or {})
-                    p["application"] = str(payload.app or "").strip()
-                    p["role"] = str(payload.role or "").strip()
+        _mark_access_requests_granted(grantor, [(payload.app, payload.role, userid, group)])
+
+        return result
+
+
+    @router.post("/role-management/app/assign/batch",
+                 summary="Assign app roles to many users/groups in one transaction",
+                 description="""{
+      "assignments": [
+        {"app": "app1", "role": "viewer", "userid": "asingh"},
+        {"app": "app1", "role": "manager", "group": "app1-admins"}
+      ]
+    }""")
+    def assign_roles_batch(payload: BatchRoleAssignmentRequest,
+                           grantor: str | None = Depends(get_grantor),
+                    user_context: dict[str, Any] = Depends(get_current_user_context)) -> dict[str, Any]:
+        enforce(user_context, "/role-management/app/assign/batch", "POST", {})
+        grants: list[tuple[str, str, str, str]] = []
+        for idx, item in enumerate(payload.assignments):
+            userid = str(item.userid or "").strip()
+            group = str(item.group or "").strip()
+            if bool(userid) == bool(group):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail={"status": "error", "message": f"assignments[{idx}]: Exactly one of userid or group is required"},
+                )
+            grants.append((item.app, item.role, userid, group))
+
+        def _apply() -> None:
+            with _rolemgmt().batch():
+                for app, role, userid, group in grants:
                     if userid:
-                        p["userid"] = userid
-                        p.pop("group", None)
+                        _rolemgmt().add_user2apps2roles(grantor, userid, app, role)
                     else:
-                        p["group"] = group
-                        p.pop("userid", None)
-                    v["payload"] = p
-                    v["status"] = "granted"
-                    v["granted_by"] = str(grantor or "").strip() or "unknown"
-                    v["granted_at"] = datetime.now().astimezone().isoformat()
-                    raw[k] = v
-                    store_path.write_text(yaml.safe_dump(raw, sort_keys=False))
-        except Exception:
-            pass
+                        _rolemgmt().add_grp2apps2roles(grantor, group, app, role)
 
+        result = execute_role_operation(_apply, "assigned")
+        _mark_access_requests_granted(grantor, grants)
+        result["count"] = len(grants)
         return result
 
 
@@ -194,16 +211,16 @@ def create_rolemgmt_router(
                 detail={"status": "error", "message": "Exactly one of userid or group is required"},
             )
         return execute_role_operation(
-            (lambda: rolemgmtimpl.del_user2apps2roles(grantor, userid, payload.app, payload.role))
+            (lambda: _rolemgmt().del_user2apps2roles(grantor, userid, payload.app, payload.role))
             if userid
-            else (lambda: rolemgmtimpl.del_grp2apps2roles(grantor, group, payload.app, payload.role)),
+            else (lambda: _rolemgmt().del_grp2apps2roles(grantor, group, payload.app, payload.role)),
             "unassigned"
         )
 
 
     @router.get("/role-management/groupglobal")
     def list_groupglobal_roles() -> dict[str, Any]:
-        rows = rolemgmtimpl.get_grps2globalroles()
+        rows = _rolemgmt().get_grps2globalroles()
         return {"rows": rows}
 
 
@@ -219,7 +236,7 @@ def create_rolemgmt_router(
                     user_context: dict[str, Any] = Depends(get_current_user_context)) -> dict[str, Any]:
         enforce(user_context, "/role-management/groupglobal/assign", "POST", {})
         return execute_role_operation(
-            lambda: rolemgmtimpl.add_grps2globalroles(grantor, payload.group, payload.role),
+            lambda: _rolemgmt().add_grps2globalroles(grantor, payload.group, payload.role),
             "assigned"
         )
 
@@ -236,7 +253,7 @@ def create_rolemgmt_router(
                     user_context: dict[str, Any] = Depends(get_current_user_context)) -> dict[str, Any]:
         enforce(user_context, "/role-management/groupglobal/unassign", "POST", {})
         return execute_role_operation(
-            lambda: rolemgmtimpl.del_grps2globalroles(grantor, payload.group, payload.role),
+            lambda: _rolemgmt().del_grps2globalroles(grantor, payload.group, payload.role),
             "unassigned"
         )
 
@@ -245,7 +262,7 @@ def create_rolemgmt_router(
                  summary="Get the list of roles that govern user access across the portal",
                  description="""""")
     def list_userglobal_roles() -> dict[str, Any]:
-        rows = rolemgmtimpl.get_users2globalroles()
+        rows = _rolemgmt().get_users2globalroles()
         return {"rows": rows}
 
 
@@ -263,55 +280,34 @@ def create_rolemgmt_router(
                 detail={"status": "error", "message": "userid is required"},
             )
 
-        groups = rolemgmtimpl.get_user_groups(user_id)
-
-        user_global_map = rolemgmtimpl.get_users2globalroles()
-        group_global_map = rolemgmtimpl.get_grps2globalroles()
-        user_app_map = rolemgmtimpl.get_user2apps2roles()
-        group_app_map = rolemgmtimpl.get_grp2apps2roles()
-
-        user_global_roles = user_global_map.get(user_id) if isinstance(user_global_map, dict) else None
-        if not isinstance(user_global_roles, list):
-            user_global_roles = []
-
-        group_global_roles: dict[str, list[str]] = {}
-        if isinstance(group_global_map, dict):
-            for g in groups:
-                roles = group_global_map.get(g)
-                if isinstance(roles, list):
-                    group_global_roles[g] = [str(r).strip() for r in roles if str(r).strip()]
-
-        user_app_roles = user_app_map.get(user_id) if isinstance(user_app_map, dict) else None
-        if not isinstance(user_app_roles, dict):
-            user_app_roles = {}
-
-        group_app_roles: dict[str, dict[str, list[str]]] = {}
-        if isinstance(group_app_map, dict):
-            for g in groups:
-                amap = group_app_map.get(g)
-                if not isinstance(amap, dict):
-                    continue
-                next_amap: dict[str, list[str]] = {}
-                for app, roles in amap.items():
-                    if not isinstance(roles, list):
-                        continue
-                    next_amap[str(app)] = [str(r).strip() for r in roles if str(r).strip()]
-                if next_amap:
-                    group_app_roles[g] = next_amap
-
-        combined_app_roles = rolemgmtimpl.get_app_roles(groups, user_id)
-        combined_global_roles = rolemgmtimpl.get_user_roles(user_id, groups)
+        return _rolemgmt().get_users_role_details([user_id])[user_id]
 
-        return {
-            "userid": user_id,
-            "groups": groups,
-            "user_global_roles": [str(r).strip() for r in user_global_roles if str(r).strip()],
-            "group_global_roles": group_global_roles,
-            "user_app_roles": user_app_roles,
-            "group_app_roles": group_app_roles,
-            "combined_global_roles": combined_global_roles,
-            "combined_app_roles": combined_app_roles,
-        }
+
+    @router.post("/role-management/user/roles/batch",
+                 summary="Resolve roles for many users in one call",
+                 description="""{
+      "userids": ["asingh", "bjones"]
+    }""")
+    def lookup_users_roles_batch(
+        payload: BatchUserRolesRequest,
+        user_context: dict[str, Any] = Depends(get_current_user_context),
+    ) -> dict[str, Any]:
+        enforce(user_context, "/role-management/user/roles/batch", "POST", {})
+
+        user_ids = [str(u or "").strip() for u in payload.userids]
+        user_ids = [u for u in user_ids if u]
+        if not user_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"status": "error", "message": "userids is required"},
+            )
+        if len(user_ids) > _MAX_BATCH_USER_IDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"status": "error", "message": f"At most {_MAX_BATCH_USER_IDS} userids per request"},
+            )
+
+        return {"users": _rolemgmt().get_users_role_details(user_ids)}
 
 
     @router.post("/role-management/userglobal/assign",
@@ -326,7 +322,7 @@ def create_rolemgmt_router(
                     user_context: dict[str, Any] = Depends(get_current_user_context)) -> dict[str, Any]:
         enforce(user_context, "/role-management/userglobal/assign", "POST", {})
         return execute_role_operation(
-            lambda: rolemgmtimpl.add_users2globalroles(grantor, payload.user, payload.role),
+            lambda: _rolemgmt().add_users2globalroles(grantor, payload.user, payload.role),
             "assigned"
         )
 
@@ -343,7 +339,7 @@ def create_rolemgmt_router(
                     user_context: dict[str, Any] = Depends(get_current_user_context)) -> dict[str, Any]:
         enforce(user_context, "/role-management/userglobal/unassign", "POST", {})
         return execute_role_operation(
-            lambda: rolemgmtimpl.del_users2globalroles(grantor, payload.user, payload.role),
+            lambda: _rolemgmt().del_users2globalroles(grantor, payload.user, payload.role),
             "unassigned"
         )
 
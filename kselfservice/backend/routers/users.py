@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Request, HTTPException
 from pathlib import Path
 import os
-import yaml
 
 from backend.config.settings import is_demo_mode
 from backend.auth.role_mgmt_impl import RoleMgmtImpl
 from backend.auth.rbac import get_current_user_context
+from backend.utils.yaml_utils import load_yaml
 
 router = APIRouter(tags=["users"])
 
@@ -49,7 +49,7 @@ def get_demo_users():
     p = workspace / "kselfserv" / "cloned-repositories" / "control" / "rbac" / "demo_mode" / "demo_users.yaml"
     if not p.exists() or not p.is_file():
         return {"rows": []}
-    raw = yaml.safe_load(p.read_text())
+    raw = load_yaml(p.read_text())
     if not isinstance(raw, dict):
         return {"rows": []}
     rows = []
@@ -18,19 +18,26 @@ from backend.exceptions.custom import (
     NotInitializedError,
     AppError,
 )
+from backend.utils.single_flight import single_flight
+from backend.utils.tracing import traced_methods
+from backend.utils.yaml_utils import load_yaml
 
 logger = logging.getLogger("uvicorn.error")
 
 
+@traced_methods
 class ApplicationService:
     """Service for application business logic."""
 
     def __init__(self):
         self.cluster_service = ClusterService()
 
+    @single_flight(scope=lambda env: (env,))
     def get_apps_for_env(self, env: str) -> Dict[str, Dict[str, Any]]:
         """Get all applications for an environment.
 
+        Concurrent calls for the same env share one result (read-only).
+
         Args:
             env: Environment name
 
@@ -52,13 +59,20 @@ class ApplicationService:
             logger.error("Failed to compute clusters_by_app for env=%s: %s", str(env), str(e), exc_info=True)
             clusters_by_app = {}
 
-        apps_out: Dict[str, Dict[str, Any]] = {}
-        for child in env_dir.iterdir():
-            if not child.is_dir():
-                continue
+        app_dirs = [child for child in env_dir.iterdir() if child.is_dir()]
+
+        try:
+            managedby_by_app = RoleMgmtImpl.get_instance().get_managedby_for_apps(
+                [child.name for child in app_dirs]
+            )
+        except Exception as e:
+            logger.error("Failed to compute managedby for env=%s: %s", str(env), str(e), exc_info=True)
+            managedby_by_app = {}
 
+        apps_out: Dict[str, Dict[str, Any]] = {}
+        for child in app_dirs:
             appname = child.name
-            app_data = self._load_app_data(child, appname, clusters_by_app)
+            app_data = self._load_app_data(child, appname, clusters_by_app, managedby_by_app)
             apps_out[appname] = app_data
 
         return apps_out
@@ -67,7 +81,8 @@ class ApplicationService:
         self,
         app_dir: Path,
         appname: str,
-        clusters_by_app: Dict[str, List[str]]
+        clusters_by_app: Dict[str, List[str]],
+        managedby_by_app: Dict[str, List[str]],
     ) -> Dict[str, Any]:
         """Load application data from disk.
 
@@ -75,6 +90,7 @@ class ApplicationService:
             app_dir: Path to application directory
             appname: Application name
             clusters_by_app: Cluster mapping from cluster service
+            managedby_by_app: Manager users/groups keyed by app name
 
         Returns:
             Dictionary with app data
@@ -85,7 +101,7 @@ class ApplicationService:
 
         if appinfo_path.exists() and appinfo_path.is_file():
             try:
-                appinfo = yaml.safe_load(appinfo_path.read_text()) or {}
+                appinfo = load_yaml(appinfo_path.read_text()) or {}
                 if isinstance(appinfo, dict):
                     description = str(appinfo.get("description", "") or "")
             except Exception as e:
@@ -97,11 +113,7 @@ class ApplicationService:
         totalns = self._count_namespaces(app_dir)
         argocd = self._check_argocd_exists(app_dir)
 
-        managedby: List[str] = []
-        try:
-            managedby = RoleMgmtImpl.get_instance().get_app_managedby(appname)
-        except Exception:
-            managedby = []
+        managedby: List[str] = list(managedby_by_app.get(appname, []))
 
         return {
             "appname": appname,
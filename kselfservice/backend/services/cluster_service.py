@@ -13,10 +13,14 @@ from backend.dependencies import (
     get_workspace_path,
     get_requests_root,
 )
+from backend.utils.single_flight import single_flight
+from backend.utils.tracing import traced_methods
+from backend.utils.yaml_utils import read_yaml_dict, read_yaml_list, load_yaml
 
 logger = logging.getLogger("uvicorn.error")
 
 
+@traced_methods
 class ClusterService:
     """Service for cluster business logic."""
 
@@ -250,7 +254,7 @@ class ClusterService:
             if requests_root is not None:
                 env_info_path = requests_root / "env_info.yaml"
                 if env_info_path.exists():
-                    envs = yaml.safe_load(env_info_path.read_text()).get("env_order", [])
+                    envs = load_yaml(env_info_path.read_text()).get("env_order", [])
         except Exception:
             pass
 
@@ -265,11 +269,14 @@ class ClusterService:
 
         return envs
 
+    @single_flight(scope=lambda env, *roots: (env,))
     def get_clusters_for_env(
         self, env: str, clusters_root: Path, requests_root: Optional[Path]
     ) -> List[Dict[str, Any]]:
         """Get all clusters for an environment with derived app associations.
 
+        Concurrent calls for the same env share one result (read-only).
+
         Args:
             env: Environment name
             clusters_root: Path to clusters root
@@ -293,7 +300,7 @@ class ClusterService:
                 if not appinfo_path.exists() or not appinfo_path.is_file():
                     continue
                 try:
-                    appinfo = yaml.safe_load(appinfo_path.read_text()) or {}
+                    appinfo = load_yaml(appinfo_path.read_text()) or {}
                     if isinstance(appinfo, dict):
                         clusters = as_string_list(appinfo.get("clusters"))
                         for c in clusters:
@@ -319,6 +326,79 @@ class ClusterService:
 
         return sorted(rows, key=lambda r: str(r.get("clustername") or "").lower())
 
+    @single_flight()
+    def get_datacenters(self, env: str) -> List[Dict[str, str]]:
+        """Get datacenter choices for an environment, sorted by location.
+
+        Reads control/datacenters/<env>_datacenters.yaml: a list of names or
+        {location|name, description} items, a {datacenters: [...]} dict, or a
+        {location: description} mapping. Concurrent calls share one result (read-only).
+
+        Args:
+            env: Environment name
+
+        Returns:
+            List of {location, description} dictionaries
+        """
+        path = (
+            get_workspace_path()
+            / "kselfserv"
+            / "cloned-repositories"
+            / "control"
+            / "datacenters"
+            / f"{env}_datacenters.yaml"
+        )
+
+        items: List[Dict[str, str]] = []
+
+        raw_list = read_yaml_list(path)
+        if isinstance(raw_list, list) and raw_list:
+            for it in raw_list:
+                if isinstance(it, dict):
+                    loc = str(it.get("location") or it.get("name") or "").strip()
+                    if not loc:
+                        continue
+                    desc = str(it.get("description") or "").strip()
+                    items.append({"location": loc, "description": desc})
+                else:
+                    loc = str(it or "").strip()
+                    if not loc:
+                        continue
+                    items.append({"location": loc, "description": ""})
+        else:
+            raw_dict = read_yaml_dict(path)
+            if isinstance(raw_dict, dict) and raw_dict:
+                if isinstance(raw_dict.get("datacenters"), list):
+                    for it in raw_dict.get("datacenters"):
+                        loc = str(it or "").strip()
+                        if not loc:
+                            continue
+                        items.append({"location": loc, "description": ""})
+                else:
+                    for k, v in raw_dict.items():
+                        loc = str(k or "").strip()
+                        if not loc:
+                            continue
+                        desc = ""
+                        if isinstance(v, dict):
+                            desc = str(v.get("description") or "").strip()
+                        elif v is not None:
+                            desc = str(v).strip()
+                        items.append({"location": loc, "description": desc})
+
+        merged: Dict[str, Dict[str, str]] = {}
+        for it in items:
+            loc = str(it.get("location") or "").strip()
+            if not loc:
+                continue
+            if loc not in merged:
+                merged[loc] = {"location": loc, "description": str(it.get("description") or "").strip()}
+            else:
+                if not merged[loc].get("description") and str(it.get("description") or "").strip():
+                    merged[loc]["description"] = str(it.get("description") or "").strip()
+
+        return sorted(merged.values(), key=lambda d: str(d.get("location") or "").lower())
+
     def ensure_appinfo_exists(
         self, requests_root: Path, env_key: str, appname: str
     ) -> None:
@@ -507,7 +587,7 @@ class ClusterService:
                 if not ns_info_path.exists() or not ns_info_path.is_file():
                     continue
                 try:
-                    ns_info = yaml.safe_load(ns_info_path.read_text()) or {}
+                    ns_info = load_yaml(ns_info_path.read_text()) or {}
                     if not isinstance(ns_info, dict):
                         continue
                     clusters_list = ns_info.get("clusters")
@@ -564,7 +644,7 @@ class ClusterService:
                 ):
                     try:
                         l4_data = (
-                            yaml.safe_load(l4_ingress_request_path.read_text()) or {}
+                            load_yaml(l4_ingress_request_path.read_text()) or {}
                         )
                         if isinstance(l4_data, dict) and cluster_name in l4_data:
                             allocations.append(
@@ -593,7 +673,7 @@ class ClusterService:
                 if allocated_file.exists():
                     try:
                         allocated_data = (
-                            yaml.safe_load(allocated_file.read_text()) or []
+                            load_yaml(allocated_file.read_text()) or []
                         )
                         if allocated_data and len(allocated_data) > 0:
                             allocations.append(
@@ -646,7 +726,7 @@ class ClusterService:
                 if egress_allocated_file.exists():
                     try:
                         egress_data = (
-                            yaml.safe_load(egress_allocated_file.read_text()) or []
+                            load_yaml(egress_allocated_file.read_text()) or []
                         )
                         if egress_data and len(egress_data) > 0:
                             allocations.append(
@@ -744,7 +824,7 @@ class ClusterService:
             return
 
         try:
-            l4_data = yaml.safe_load(l4_ingress_request_path.read_text()) or {}
+            l4_data = load_yaml(l4_ingress_request_path.read_text()) or {}
             if isinstance(l4_data, dict) and cluster_name in l4_data:
                 del l4_data[cluster_name]
                 l4_ingress_request_path.write_text(
@@ -775,7 +855,7 @@ class ClusterService:
             if not ns_info_path.exists() or not ns_info_path.is_file():
                 continue
             try:
-                ns_info = yaml.safe_load(ns_info_path.read_text()) or {}
+                ns_info = load_yaml(ns_info_path.read_text()) or {}
                 if not isinstance(ns_info, dict):
                     continue
                 clusters_list = ns_info.get("clusters")
@@ -20,6 +20,7 @@ from backend.dependencies import (
 )
 from backend.utils.helpers import normalize_yes_no
 from backend.utils.enforcement import EnforcementSettings
+from backend.utils.metrics import track_git
 from backend.config.logging_config import get_logger
 from backend.exceptions.custom import (
     ValidationError,
@@ -27,6 +28,7 @@ from backend.exceptions.custom import (
     NotInitializedError,
     AppError,
 )
+from backend.utils.yaml_utils import load_yaml
 
 logger = get_logger(__name__)
 
@@ -60,7 +62,7 @@ class ConfigService:
             }
 
         try:
-            raw = yaml.safe_load(self.config_path.read_text()) or {}
+            raw = load_yaml(self.config_path.read_text()) or {}
             if not isinstance(raw, dict):
                 raise ValueError("config is not a mapping")
         except Exception as e:
@@ -247,12 +249,13 @@ class ConfigService:
         """
         target_dir.parent.mkdir(parents=True, exist_ok=True)
         try:
-            subprocess.run(
-                ["git", "clone", str(repo_url), str(target_dir)],
-                check=True,
-                capture_output=True,
-                text=True,
-            )
+            with track_git(["clone"]):
+                subprocess.run(
+                    ["git", "clone", str(repo_url), str(target_dir)],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                )
         except subprocess.CalledProcessError as e:
             stderr = (e.stderr or "").strip()
             logger.error("Failed to clone %s into %s: %s", repo_name, target_dir, stderr)
@@ -279,7 +282,7 @@ class ConfigService:
             )
 
         try:
-            env_info = yaml.safe_load(env_info_path.read_text()) or {}
+            env_info = load_yaml(env_info_path.read_text()) or {}
         except Exception as e:
             logger.error("env_info.yaml parsing failed at %s: %s", env_info_path, e, exc_info=True)
             raise ValidationError(
@@ -366,20 +369,21 @@ class ConfigService:
             AppError: If clone fails
         """
         try:
-            subprocess.run(
-                [
-                    "git",
-                    "clone",
-                    "--branch",
-                    branch,
-                    "--single-branch",
-                    repo_url,
-                    str(target_dir),
-                ],
-                check=True,
-                capture_output=True,
-                text=True,
-            )
+            with track_git(["clone"]):
+                subprocess.run(
+                    [
+                        "git",
+                        "clone",
+                        "--branch",
+                        branch,
+                        "--single-branch",
+                        repo_url,
+                        str(target_dir),
+                    ],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                )
         except subprocess.CalledProcessError as e:
             stderr = (e.stderr or "").strip()
             logger.error("Failed to clone rendered branch %s into %s: %s", branch, target_dir, stderr)
@@ -400,24 +404,27 @@ class ConfigService:
         try:
             git_dir = repo_dir / ".git"
             if git_dir.exists() and git_dir.is_dir():
-                subprocess.run(
-                    ["git", "-C", str(repo_dir), "fetch", "--all"],
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
-                subprocess.run(
-                    ["git", "-C", str(repo_dir), "checkout", branch],
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
-                subprocess.run(
-                    ["git", "-C", str(repo_dir), "pull", "--ff-only", "origin", branch],
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
+                with track_git(["fetch"]):
+                    subprocess.run(
+                        ["git", "-C", str(repo_dir), "fetch", "--all"],
+                        check=True,
+                        capture_output=True,
+                        text=True,
+                    )
+                with track_git(["checkout"]):
+                    subprocess.run(
+                        ["git", "-C", str(repo_dir), "checkout", branch],
+                        check=True,
+                        capture_output=True,
+                        text=True,
+                    )
+                with track_git(["pull"]):
+                    subprocess.run(
+                        ["git", "-C", str(repo_dir), "pull", "--ff-only", "origin", branch],
+                        check=True,
+                        capture_output=True,
+                        text=True,
+                    )
         except subprocess.CalledProcessError as e:
             stderr = (e.stderr or "").strip()
             logger.error("Failed to update rendered repo in %s for branch %s: %s", repo_dir, branch, stderr)
@@ -444,7 +451,7 @@ class ConfigService:
             raise NotInitializedError("configuration")
 
         try:
-            raw_cfg = yaml.safe_load(self.config_path.read_text()) or {}
+            raw_cfg = load_yaml(self.config_path.read_text()) or {}
             if not isinstance(raw_cfg, dict):
                 logger.error("Configuration not initialized: config is not a dictionary")
                 raise NotInitializedError("configuration")
@@ -468,7 +475,7 @@ class ConfigService:
                 logger.error("env_info.yaml not found at %s", env_info_path)
                 raise NotInitializedError("env_info.yaml")
 
-            env_info = yaml.safe_load(env_info_path.read_text()) or {}
+            env_info = load_yaml(env_info_path.read_text()) or {}
             if not isinstance(env_info, dict):
                 logger.error("env_info.yaml is not a dictionary")
                 raise ValidationError("env_info.yaml", "invalid env_info.yaml file")
@@ -534,7 +541,7 @@ class ConfigService:
         base: Dict[str, Any] = {}
         if path.exists() and path.is_file():
             try:
-                raw = yaml.safe_load(path.read_text())
+                raw = load_yaml(path.read_text())
                 if isinstance(raw, dict):
                     base = dict(raw)
             except Exception as e:
@@ -593,7 +600,7 @@ class ConfigService:
             raise NotInitializedError("role catalog")
 
         try:
-            raw = yaml.safe_load(path.read_text())
+            raw = load_yaml(path.read_text())
         except Exception as e:
             logger.error("Failed to read role catalog: %s", e, exc_info=True)
             raise AppError(f"Failed to read role catalog: {e}")
@@ -605,7 +612,7 @@ class ConfigService:
             env_path = catalog_dir / env_key / filename
             if env_path.exists() and env_path.is_file():
                 try:
-                    env_raw = yaml.safe_load(env_path.read_text())
+                    env_raw = load_yaml(env_path.read_text())
                 except Exception as e:
                     logger.error("Failed to read env role catalog: %s", e, exc_info=True)
                     raise AppError(f"Failed to read env role catalog: {e}")
@@ -711,12 +718,13 @@ class ConfigService:
         Returns:
             CompletedProcess instance
         """
-        return subprocess.run(
-            ["git", "-C", str(repo_dir), *args],
-            check=True,
-            capture_output=True,
-            text=True,
-        )
+        with track_git(args):
+            return subprocess.run(
+                ["git", "-C", str(repo_dir), *args],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
 
     def _get_changed_files(self, repo_root: Path) -> List[str]:
         """Get list of changed files in repository.
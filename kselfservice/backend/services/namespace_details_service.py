@@ -2,7 +2,7 @@
 
 This service handles rolebindings, resourcequota, limitrange, and egress firewall
 configurations for namespaces. It centralizes the business logic for namespace
-detail page operations.
+detail page operations, including the aggregated details of all sections.
 """
 
 from typing import Dict, Any, List, Optional, Tuple
@@ -18,7 +18,7 @@ from backend.models import (
 )
 from backend.repositories.namespace_repository import NamespaceRepository
 from backend.utils.helpers import is_set, as_trimmed_str
-from backend.utils.yaml_utils import read_yaml_dict, read_yaml_list
+from backend.utils.yaml_utils import read_yaml_dict, load_yaml
 from backend.utils.enforcement import load_enforcement_settings
 from backend.config.logging_config import get_logger
 from backend.exceptions.custom import (
@@ -26,10 +26,27 @@ from backend.exceptions.custom import (
     NotFoundError,
     AppError,
 )
+from backend.utils.tracing import traced_methods
 
 logger = get_logger(__name__)
 
+# Sections of GET /apps/{appname}/namespaces/{namespace}/details. Each has the
+# body of the namespace endpoint it replaces: namespace_info/basic,
+# namespace_info/egress, egress_ip, resources/resourcequota,
+# resources/limitrange, rolebinding_requests, egressfirewall and nsargocd.
+NAMESPACE_DETAIL_SECTIONS = (
+    "basic",
+    "egress",
+    "egress_ip",
+    "resourcequota",
+    "limitrange",
+    "rolebindings",
+    "egressfirewall",
+    "nsargocd",
+)
+
 
+@traced_methods
 class NamespaceDetailsService:
     """Service for namespace details business logic."""
 
@@ -52,13 +69,16 @@ class NamespaceDetailsService:
             Dictionary with bindings list
         """
         ns_dir = self.repo.get_namespace_dir(env, appname, namespace)
+        return self._rolebindings_in(ns_dir)
+
+    def _rolebindings_in(self, ns_dir: Path) -> Dict[str, Any]:
         rolebinding_path = ns_dir / "rolebinding_requests.yaml"
 
         if not rolebinding_path.exists() or not rolebinding_path.is_file():
             return {"bindings": []}
 
         try:
-            parsed = yaml.safe_load(rolebinding_path.read_text())
+            parsed = load_yaml(rolebinding_path.read_text())
         except Exception as e:
             logger.error("Failed to read RoleBinding: %s", e, exc_info=True)
             raise AppError(f"Failed to read RoleBinding: {e}")
@@ -296,9 +316,10 @@ class NamespaceDetailsService:
             Dictionary with requests and quota_limits
         """
         ns_dir = self.repo.get_namespace_dir(env, appname, namespace)
-        resourcequota_path = ns_dir / "resourcequota.yaml"
+        return self._resourcequota_in(ns_dir)
 
-        rq = read_yaml_dict(resourcequota_path)
+    def _resourcequota_in(self, ns_dir: Path) -> Dict[str, Any]:
+        rq = read_yaml_dict(ns_dir / "resourcequota.yaml")
         reqs, quota_limits = self._parse_resourcequota(rq)
 
         return {
@@ -512,9 +533,10 @@ class NamespaceDetailsService:
             Dictionary with limits
         """
         ns_dir = self.repo.get_namespace_dir(env, appname, namespace)
-        limitrange_path = ns_dir / "limitrange.yaml"
+        return self._limitrange_in(ns_dir)
 
-        lr = read_yaml_dict(limitrange_path)
+    def _limitrange_in(self, ns_dir: Path) -> Dict[str, Any]:
+        lr = read_yaml_dict(ns_dir / "limitrange.yaml")
         limits = self._parse_limitrange(lr)
 
         return {
@@ -710,23 +732,23 @@ class NamespaceDetailsService:
         Returns:
             Dictionary with exists flag and rules list
         """
-        enforcement = load_enforcement_settings()
-        egress_firewall_enforced = str(enforcement.enforce_egress_firewall or "yes").strip().lower() != "no"
-
-        if not egress_firewall_enforced:
+        if not self._egress_firewall_enforced():
             return {"exists": False, "rules": []}
 
         ns_dir = self.repo.get_namespace_dir(env, appname, namespace)
-        path = ns_dir / "egress_firewall_requests.yaml"
+        return self._egressfirewall_in(ns_dir)
+
+    @staticmethod
+    def _egress_firewall_enforced() -> bool:
+        enforcement = load_enforcement_settings()
+        return str(enforcement.enforce_egress_firewall or "yes").strip().lower() != "no"
 
-        # Try to extract from full EgressFirewall object structure first
-        egress_entries = self._extract_egress_entries_from_template(path)
+    def _egressfirewall_in(self, ns_dir: Path) -> Dict[str, Any]:
+        path = ns_dir / "egress_firewall_requests.yaml"
 
-        # Fallback to reading as a list (backward compatibility)
-        if not egress_entries:
-            rules = read_yaml_list(path)
-        else:
-            rules = egress_entries
+        # Full EgressFirewall object, shorthand object, or a plain list of
+        # entries/rules (backward compatibility)
+        rules = self._extract_egress_entries_from_template(path)
 
         normalized: List[Dict[str, Any]] = []
         for r in rules:
@@ -1033,7 +1055,7 @@ class NamespaceDetailsService:
             return []
 
         try:
-            raw = yaml.safe_load(path.read_text())
+            raw = load_yaml(path.read_text())
         except Exception:
             return []
 
@@ -1071,20 +1093,9 @@ class NamespaceDetailsService:
             Dictionary with egress information
         """
         ns_dir = self.repo.get_namespace_dir(env, appname, namespace)
-        ns_info_path = ns_dir / "namespace_info.yaml"
-
-        enforcement = load_enforcement_settings()
-        egress_firewall_enforced = str(enforcement.enforce_egress_firewall or "yes").strip().lower() != "no"
-
-        ns_info = {}
-        if ns_info_path.exists() and ns_info_path.is_file():
-            try:
-                parsed = yaml.safe_load(ns_info_path.read_text()) or {}
-                if isinstance(parsed, dict):
-                    ns_info = parsed
-            except Exception:
-                ns_info = {}
+        return self._egress_info_from(read_yaml_dict(ns_dir / "namespace_info.yaml"), self._egress_firewall_enforced())
 
+    def _egress_info_from(self, ns_info: Dict[str, Any], egress_firewall_enforced: bool) -> Dict[str, Any]:
         egress_nameid = ns_info.get("egress_nameid")
         egress_nameid = None if egress_nameid in (None, "") else str(egress_nameid)
 
@@ -1126,7 +1137,7 @@ class NamespaceDetailsService:
         try:
             existing = {}
             if ns_info_path.exists() and ns_info_path.is_file():
-                parsed = yaml.safe_load(ns_info_path.read_text()) or {}
+                parsed = load_yaml(ns_info_path.read_text()) or {}
                 if isinstance(parsed, dict):
                     existing = parsed
 
@@ -1174,6 +1185,9 @@ class NamespaceDetailsService:
             Dictionary with ArgoCD configuration
         """
         ns_dir = self.repo.get_namespace_dir(env, appname, namespace)
+        return self._nsargocd_in(ns_dir)
+
+    def _nsargocd_in(self, ns_dir: Path) -> Dict[str, Any]:
         cfg_path = ns_dir / "nsargocd.yaml"
 
         data = read_yaml_dict(cfg_path)
@@ -1284,3 +1298,175 @@ class NamespaceDetailsService:
 
         return {"deleted": existed}
 
+
+    # ============================================
+    # Basic Info Operations
+    # ============================================
+
+    def get_basic_info(
+        self,
+        env: str,
+        appname: str,
+        namespace: str
+    ) -> Dict[str, Any]:
+        """Get basic namespace information (clusters and ArgoCD summary).
+
+        Args:
+            env: Environment name
+            appname: Application name
+            namespace: Namespace name
+
+        Returns:
+            Dictionary with clusters, generate_argo_app and ArgoCD summary
+        """
+        ns_dir = self.repo.get_namespace_dir(env, appname, namespace)
+        return self._basic_info_from(
+            env, appname, read_yaml_dict(ns_dir / "namespace_info.yaml"), self._nsargocd_in(ns_dir)
+        )
+
+    def _basic_info_from(
+        self,
+        env: str,
+        appname: str,
+        ns_info: Dict[str, Any],
+        nsargocd: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        from backend.utils.helpers import parse_bool
+
+        clusters = ns_info.get("clusters")
+        if not isinstance(clusters, list):
+            clusters = []
+
+        # Namespace ArgoCD settings only apply when the app has argocd.yaml
+        need_argo = parse_bool(nsargocd.get("need_argo")) and self.repo.argocd_exists(env, appname)
+
+        return {
+            "clusters": [str(c) for c in clusters if c is not None and str(c).strip()],
+            "generate_argo_app": parse_bool(ns_info.get("generate_argo_app")),
+            "need_argo": need_argo,
+            "argocd_sync_strategy": nsargocd.get("argocd_sync_strategy", ""),
+            "gitrepourl": nsargocd.get("gitrepourl", ""),
+            "status": "Argo used" if need_argo else "Argo not used",
+        }
+
+    # ============================================
+    # Aggregated Details
+    # ============================================
+
+    def get_details(
+        self,
+        env: str,
+        appname: str,
+        namespace: str,
+        sections: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Get several namespace detail sections in one call.
+
+        The namespace directory is resolved once and each file is read once,
+        however many sections use it (namespace_info.yaml feeds basic, egress
+        and egress_ip). A failing section does not fail the others: it is
+        left out of ``sections`` and reported under ``errors``.
+
+        Args:
+            env: Environment name
+            appname: Application name
+            namespace: Namespace name
+            sections: Section names to return (default: all of NAMESPACE_DETAIL_SECTIONS)
+
+        Returns:
+            Dictionary with sections (name -> same body as the section's own
+            endpoint) and errors (name -> detail and type)
+
+        Raises:
+            ValidationError: If a section name is unknown
+            NotFoundError: If the namespace does not exist
+        """
+        selected = list(dict.fromkeys(sections or NAMESPACE_DETAIL_SECTIONS))
+        unknown = [s for s in selected if s not in NAMESPACE_DETAIL_SECTIONS]
+        if unknown:
+            raise ValidationError(
+                "fields",
+                f"Unknown section(s) {', '.join(unknown)}; expected any of {', '.join(NAMESPACE_DETAIL_SECTIONS)}",
+            )
+
+        ns_dir = self.repo.get_namespace_dir(env, appname, namespace)
+
+        loaded: Dict[str, Tuple[Any, Optional[Exception]]] = {}
+
+        def load(name: str, fn: Any) -> Any:
+            """Run fn once per call; later uses get its result or exception."""
+            if name not in loaded:
+                try:
+                    loaded[name] = (fn(), None)
+                except Exception as e:
+                    loaded[name] = (None, e)
+            value, error = loaded[name]
+            if error is not None:
+                raise error
+            return value
+
+        def ns_info() -> Dict[str, Any]:
+            return load("namespace_info", lambda: read_yaml_dict(ns_dir / "namespace_info.yaml"))
+
+        def enforced() -> bool:
+            return load("enforcement", self._egress_firewall_enforced)
+
+        def nsargocd() -> Dict[str, Any]:
+            return load("nsargocd", lambda: self._nsargocd_in(ns_dir))
+
+        def egress_ip() -> Dict[str, Any]:
+            return load("egress_ip", lambda: self._egress_info_from(ns_info(), enforced()))
+
+        def egress() -> Dict[str, Any]:
+            base = egress_ip()
+            if not base.get("egress_nameid"):
+                return {**base, "allocated_egress_ips": []}
+            from backend.services.ns_egress_ip_service import NsEgressIpService
+
+            clusters = ns_info().get("clusters")
+            clusters_list = [
+                str(c).strip() for c in clusters if c is not None and str(c).strip()
+            ] if isinstance(clusters, list) else []
+            return {
+                **base,
+                "allocated_egress_ips": NsEgressIpService().get_allocated_egress_ips(
+                    env=env,
+                    appname=appname,
+                    egress_nameid=str(base["egress_nameid"]),
+                    clusters_list=clusters_list,
+                ),
+            }
+
+        def egressfirewall() -> Dict[str, Any]:
+            if not enforced():
+                return {"exists": False, "rules": []}
+            return self._egressfirewall_in(ns_dir)
+
+        builders = {
+            "basic": lambda: self._basic_info_from(env, appname, ns_info(), nsargocd()),
+            "egress": egress,
+            "egress_ip": egress_ip,
+            "resourcequota": lambda: self._resourcequota_in(ns_dir),
+            "limitrange": lambda: self._limitrange_in(ns_dir),
+            "rolebindings": lambda: self._rolebindings_in(ns_dir),
+            "egressfirewall": egressfirewall,
+            "nsargocd": nsargocd,
+        }
+
+        result: Dict[str, Any] = {"sections": {}, "errors": {}}
+        for name in selected:
+            try:
+                result["sections"][name] = builders[name]()
+            except AppError as e:
+                logger.warning("Namespace details section %s failed for %s/%s/%s: %s", name, env, appname, namespace, e)
+                result["errors"][name] = {
+                    "detail": e.message,
+                    "type": "validation_error" if isinstance(e, ValidationError) else "app_error",
+                }
+            except Exception as e:
+                logger.error(
+                    "Namespace details section %s failed for %s/%s/%s: %s", name, env, appname, namespace, e,
+                    exc_info=True,
+                )
+                result["errors"][name] = {"detail": str(e), "type": "internal_error"}
+        return result
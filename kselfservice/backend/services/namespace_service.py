@@ -1,14 +1,18 @@
 """Namespace service for business logic."""
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import contextvars
 import re
 import shutil
+import threading
 import logging
 
 from backend.repositories.namespace_repository import NamespaceRepository
 from backend.utils.helpers import parse_bool, as_trimmed_str
-from backend.utils.yaml_utils import write_yaml_dict
+from backend.config.settings import get_promotion_concurrency
+from backend.utils.yaml_utils import read_yaml_dict, rewrite_namespace_in_yaml_text, write_yaml_dict
 from backend.utils.enforcement import load_enforcement_settings
 from backend.exceptions.custom import (
     ValidationError,
@@ -16,10 +20,101 @@ from backend.exceptions.custom import (
     AlreadyExistsError,
     AppError,
 )
+from backend.utils.tracing import traced_methods
+from backend.services.cluster_service import ClusterService
+from backend.services.ns_egress_ip_service import NsEgressIpService
 
 logger = logging.getLogger("uvicorn.error")
 
-
+_NAMESPACE_NAME = re.compile(r"^[a-z0-9]([-a-z0-9]*[a-z0-9])?$")
+
+
+def _validated_namespace_name(namespace: Any) -> str:
+    """Return the stripped namespace name, or raise ValidationError."""
+    namespace = str(namespace or "").strip()
+    if not namespace:
+        raise ValidationError("namespace", "is required")
+    if not _NAMESPACE_NAME.match(namespace):
+        raise ValidationError(
+            "namespace",
+            "Invalid namespace name. Must be lowercase alphanumeric with hyphens."
+        )
+    return namespace
+
+
+def _flatten_clusters(clusters: Optional[List[Any]]) -> List[str]:
+    """Flatten nested cluster lists into stripped, non-empty names."""
+    flattened_clusters = []
+    for item in clusters or []:
+        if isinstance(item, list):
+            # Handle nested lists by flattening them
+            for sub_item in item:
+                if sub_item is not None and str(sub_item).strip():
+                    flattened_clusters.append(str(sub_item).strip())
+        elif item is not None and str(item).strip():
+            flattened_clusters.append(str(item).strip())
+    return flattened_clusters
+
+
+def _namespace_info(clusters: List[str], egress_nameid: str) -> Dict[str, Any]:
+    """namespace_info.yaml content of a new namespace."""
+    ns_info: Dict[str, Any] = {
+        "clusters": clusters,
+    }
+    if egress_nameid:
+        ns_info["egress_nameid"] = egress_nameid
+    return ns_info
+
+
+def _cluster_names(env: str) -> Set[str]:
+    """Names of the clusters configured for an environment."""
+    repo = ClusterService().repo
+    return {repo.get_clustername_from_item(item) for item in repo.load_clusters(env)}
+
+
+def _copy_namespace_dir(src_dir: Path, dst_dir: Path, namespace: str, ns_info: Dict[str, Any]) -> None:
+    """Copy a namespace folder into an existing empty dst_dir in one pass.
+
+    YAML files get metadata.namespace set as they are copied and
+    namespace_info.yaml is written from ns_info, so no file is read twice.
+    """
+    info_path = src_dir / "namespace_info.yaml"
+
+    def copy_file(src: str, dst: str) -> str:
+        path = Path(src)
+        if path == info_path:
+            write_yaml_dict(Path(dst), ns_info, sort_keys=False)
+            return dst
+        if path.suffix in (".yaml", ".yml"):
+            raw = path.read_text()
+            out = rewrite_namespace_in_yaml_text(raw, namespace) if "namespace" in raw else None
+            if out is not None:
+                Path(dst).write_text(out)
+                return dst
+        return shutil.copy2(src, dst)
+
+    shutil.copytree(src_dir, dst_dir, copy_function=copy_file, dirs_exist_ok=True)
+
+
+def _created_namespace(namespace: str, clusters: List[str], egress_nameid: str) -> Dict[str, Any]:
+    """Response data of a new namespace."""
+    need_argo = False
+    status = "Argo used" if need_argo else "Argo not used"
+
+    return {
+        "name": namespace,
+        "description": "",
+        "clusters": clusters,
+        "egress_nameid": egress_nameid if egress_nameid else None,
+        "enable_pod_based_egress_ip": False,
+        "allow_all_egress": False,
+        "need_argo": need_argo,
+        "generate_argo_app": True,
+        "status": status
+    }
+
+
+@traced_methods
 class NamespaceService:
     """Service for namespace business logic."""
 
@@ -94,15 +189,7 @@ class NamespaceService:
             ValidationError: If validation fails
             AppError: If creation fails
         """
-        # Validate namespace name
-        namespace = str(namespace or "").strip()
-        if not namespace:
-            raise ValidationError("namespace", "is required")
-        if not re.match(r"^[a-z0-9]([-a-z0-9]*[a-z0-9])?$", namespace):
-            raise ValidationError(
-                "namespace",
-                "Invalid namespace name. Must be lowercase alphanumeric with hyphens."
-            )
+        namespace = _validated_namespace_name(namespace)
 
         ns_dir = None
         try:
@@ -110,25 +197,9 @@ class NamespaceService:
             ns_dir = self.repo.create_namespace_dir(env, appname, namespace)
 
             # Prepare namespace info
-            clusters = clusters or []
-            # Flatten any nested lists and convert to strings
-            flattened_clusters = []
-            for item in clusters:
-                if isinstance(item, list):
-                    # Handle nested lists by flattening them
-                    for sub_item in item:
-                        if sub_item is not None and str(sub_item).strip():
-                            flattened_clusters.append(str(sub_item).strip())
-                elif item is not None and str(item).strip():
-                    flattened_clusters.append(str(item).strip())
-
-            ns_info: Dict[str, Any] = {
-                "clusters": flattened_clusters,
-            }
-
+            flattened_clusters = _flatten_clusters(clusters)
             egress_nameid_str = str(egress_nameid or "").strip()
-            if egress_nameid_str:
-                ns_info["egress_nameid"] = egress_nameid_str
+            ns_info = _namespace_info(flattened_clusters, egress_nameid_str)
 
             # Write namespace info
             ns_info_path = ns_dir / "namespace_info.yaml"
@@ -143,19 +214,246 @@ class NamespaceService:
             logger.error("Failed to create namespace: %s", e, exc_info=True)
             raise AppError(f"Failed to create namespace: {e}")
 
-        need_argo = False
-        status = "Argo used" if need_argo else "Argo not used"
+        return _created_namespace(namespace, flattened_clusters, egress_nameid_str)
+
+    def create_namespaces(
+        self,
+        env: str,
+        appname: str,
+        namespaces: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Create several namespaces of an application at once.
+
+        The whole set is validated before anything is written: names, names
+        repeated in the request or already present, clusters unknown in the
+        environment, and whether every cluster can still allocate an egress
+        IP for each new egress_nameid. All problems are reported together.
+        If writing any namespace fails, the ones already created by this call
+        are removed again.
+
+        Args:
+            env: Environment name
+            appname: Application name
+            namespaces: Dicts with namespace, clusters and egress_nameid
+
+        Returns:
+            Created namespace data, in request order
+
+        Raises:
+            ValidationError: If any namespace fails validation
+            NotFoundError: If the application does not exist
+            AppError: If creation fails
+        """
+        if not namespaces:
+            raise ValidationError("namespaces", "is required")
+
+        app_dir = self.repo.get_app_dir(env, appname)
+        known_clusters = _cluster_names(env)
+
+        problems: List[str] = []
+        planned: List[Tuple[str, List[str], str]] = []
+        seen = set()
+        clusters_by_egress_nameid: Dict[str, List[str]] = {}
+        for item in namespaces:
+            raw_name = item.get("namespace")
+            try:
+                namespace = _validated_namespace_name(raw_name)
+            except ValidationError as e:
+                problems.append(f"{str(raw_name or '').strip() or '<empty>'}: {e.details['message']}")
+                continue
+            if namespace in seen:
+                problems.append(f"{namespace}: listed more than once")
+                continue
+            seen.add(namespace)
+            if (app_dir / namespace).exists():
+                problems.append(f"{namespace}: already exists")
+
+            clusters = _flatten_clusters(item.get("clusters"))
+            unknown = sorted(set(clusters) - known_clusters)
+            if unknown:
+                problems.append(f"{namespace}: unknown clusters in {env}: {', '.join(unknown)}")
+
+            egress_nameid = str(item.get("egress_nameid") or "").strip()
+            if egress_nameid:
+                clusters_by_egress_nameid.setdefault(egress_nameid, []).extend(clusters)
+            planned.append((namespace, clusters, egress_nameid))
+
+        try:
+            NsEgressIpService().validate_bulk_egress_ip_allocations(
+                env=env,
+                appname=appname,
+                clusters_by_egress_nameid=clusters_by_egress_nameid,
+            )
+        except ValueError as e:
+            problems.append(str(e))
+
+        if problems:
+            raise ValidationError("namespaces", "; ".join(problems))
 
+        created: List[Path] = []
+        try:
+            for namespace, clusters, egress_nameid in planned:
+                ns_dir = self.repo.create_namespace_dir(env, appname, namespace)
+                created.append(ns_dir)
+                write_yaml_dict(
+                    ns_dir / "namespace_info.yaml",
+                    _namespace_info(clusters, egress_nameid),
+                    sort_keys=False,
+                )
+        except Exception as e:
+            # All or nothing: remove what this call created
+            for ns_dir in created:
+                shutil.rmtree(ns_dir, ignore_errors=True)
+            if isinstance(e, (AlreadyExistsError, NotFoundError)):
+                raise
+            logger.error("Failed to create namespaces: %s", e, exc_info=True)
+            raise AppError(f"Failed to create namespaces: {e}")
+
+        return [
+            _created_namespace(namespace, clusters, egress_nameid)
+            for namespace, clusters, egress_nameid in planned
+        ]
+
+    def promote_namespaces(
+        self,
+        appname: str,
+        from_env: str,
+        to_env: str,
+        namespaces: Optional[List[str]] = None,
+        cluster_map: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Promote namespaces of an application to another environment.
+
+        The selected namespaces (all of the app's by default) are copied under
+        the same names, PROMOTION_CONCURRENCY at a time. Each file is copied
+        once, with metadata.namespace rewritten on the way and the clusters in
+        namespace_info.yaml mapped through cluster_map. Everything is
+        validated first: source namespaces, names free in the target env,
+        mapped clusters known there and egress IP capacity for the set. If
+        any copy fails, every namespace copied by this call is removed.
+
+        Args:
+            appname: Application name
+            from_env: Source environment
+            to_env: Target environment
+            namespaces: Namespace names, or None for all of the app's
+            cluster_map: Source cluster name to target cluster name; clusters
+                not in the map keep their name
+
+        Returns:
+            Dictionary with the promoted namespaces, their target clusters and
+            a one-line summary
+
+        Raises:
+            ValidationError: If validation fails
+            NotFoundError: If the app does not exist in either env
+            AppError: If copying fails
+        """
+        if from_env == to_env:
+            raise ValidationError("to_env", "must differ from the source env")
+
+        src_app_dir = self.repo.get_app_dir(from_env, appname)
+        dst_app_dir = self.repo.get_app_dir(to_env, appname)
+
+        if namespaces is None:
+            selected = sorted(p.name for p in src_app_dir.iterdir() if p.is_dir())
+        else:
+            selected = list(dict.fromkeys(str(ns or "").strip() for ns in namespaces))
+        if not selected:
+            raise ValidationError("namespaces", f"No namespaces to promote in {from_env}/{appname}")
+
+        cluster_map = {str(k).strip(): str(v).strip() for k, v in (cluster_map or {}).items()}
+        known_clusters = _cluster_names(to_env)
+
+        problems: List[str] = []
+        planned: List[Tuple[str, Dict[str, Any]]] = []
+        clusters_by_egress_nameid: Dict[str, List[str]] = {}
+        for raw_name in selected:
+            try:
+                namespace = _validated_namespace_name(raw_name)
+            except ValidationError as e:
+                problems.append(f"{raw_name or '<empty>'}: {e.details['message']}")
+                continue
+            src_dir = src_app_dir / namespace
+            if not src_dir.is_dir():
+                problems.append(f"{namespace}: not found in {from_env}")
+                continue
+            if (dst_app_dir / namespace).exists():
+                problems.append(f"{namespace}: already exists in {to_env}")
+
+            ns_info = read_yaml_dict(src_dir / "namespace_info.yaml")
+            raw_clusters = ns_info.get("clusters")
+            clusters = list(dict.fromkeys(
+                cluster_map.get(c, c)
+                for c in _flatten_clusters(raw_clusters if isinstance(raw_clusters, list) else [])
+            ))
+            unknown = sorted(set(clusters) - known_clusters)
+            if unknown:
+                problems.append(f"{namespace}: clusters not in {to_env}: {', '.join(unknown)}")
+            ns_info["clusters"] = clusters
+
+            egress_nameid = str(ns_info.get("egress_nameid") or "").strip()
+            if egress_nameid:
+                clusters_by_egress_nameid.setdefault(egress_nameid, []).extend(clusters)
+            planned.append((namespace, ns_info))
+
+        try:
+            NsEgressIpService().validate_bulk_egress_ip_allocations(
+                env=to_env,
+                appname=appname,
+                clusters_by_egress_nameid=clusters_by_egress_nameid,
+            )
+        except ValueError as e:
+            problems.append(str(e))
+
+        if problems:
+            raise ValidationError("namespaces", "; ".join(problems))
+
+        created: List[Path] = []
+        lock = threading.Lock()
+
+        def promote(namespace: str, ns_info: Dict[str, Any]) -> None:
+            dst_dir = dst_app_dir / namespace
+            dst_dir.mkdir(exist_ok=False)
+            with lock:
+                created.append(dst_dir)
+            _copy_namespace_dir(src_app_dir / namespace, dst_dir, namespace, ns_info)
+
+        pool = ThreadPoolExecutor(
+            max_workers=min(get_promotion_concurrency(), len(planned)),
+            thread_name_prefix="promote",
+        )
+        try:
+            # Each copy gets its own context copy so request timing follows it
+            futures = [
+                pool.submit(contextvars.copy_context().run, promote, namespace, ns_info)
+                for namespace, ns_info in planned
+            ]
+            for future in futures:
+                future.result()
+        except Exception as e:
+            # All or nothing: wait for running copies, then remove what this call created
+            pool.shutdown(wait=True, cancel_futures=True)
+            for dst_dir in created:
+                shutil.rmtree(dst_dir, ignore_errors=True)
+            logger.error("Failed to promote %s from %s to %s: %s", appname, from_env, to_env, e, exc_info=True)
+            raise AppError(f"Failed to promote namespaces: {e}")
+        finally:
+            pool.shutdown(wait=True)
+
+        names = [namespace for namespace, _ in planned]
         return {
-            "name": namespace,
-            "description": "",
-            "clusters": flattened_clusters,
-            "egress_nameid": egress_nameid_str if egress_nameid_str else None,
-            "enable_pod_based_egress_ip": False,
-            "allow_all_egress": False,
-            "need_argo": need_argo,
-            "generate_argo_app": True,
-            "status": status
+            "appname": appname,
+            "from_env": from_env,
+            "to_env": to_env,
+            "namespaces": [
+                {"namespace": namespace, "clusters": ns_info["clusters"]}
+                for namespace, ns_info in planned
+            ],
+            "summary": (
+                f"Promoted {len(names)} namespace{'s' if len(names) != 1 else ''} of {appname} "
+                f"from {from_env} to {to_env}: {', '.join(names)}"
+            ),
         }
 
     def delete_namespaces(
@@ -10,7 +10,7 @@ from backend.dependencies import get_workspace_path
 from backend.dependencies import get_requests_root
 from backend.services.cluster_service import ClusterService
 from backend.services.namespace_details_service import NamespaceDetailsService
-from backend.utils.yaml_utils import read_yaml_dict
+from backend.utils.yaml_utils import read_yaml_dict, load_yaml
 
 
 class NsEgressIpService:
@@ -164,6 +164,73 @@ class NsEgressIpService:
             if not new_ip:
                 raise ValueError(f"No free egress IPs remaining for cluster {clustername}")
 
+    def validate_bulk_egress_ip_allocations(
+        self,
+        *,
+        env: str,
+        appname: str,
+        clusters_by_egress_nameid: Dict[str, List[str]],
+    ) -> None:
+        """Validate allocations for several egress_nameids of an app at once.
+
+        Like validate_egress_ip_allocations, but the IPs the other
+        egress_nameids would take in a cluster count as taken, so the whole
+        set either fits or is rejected. Each allocation file is read once.
+
+        Does not persist any changes.
+
+        Raises:
+            ValueError: Naming every cluster that cannot provide the IPs needed
+        """
+        workspace_path = get_workspace_path()
+        app = str(appname or "").strip()
+
+        needed: Dict[str, List[str]] = {}
+        for egress_nameid, clusters_list in clusters_by_egress_nameid.items():
+            egress_nameid = str(egress_nameid or "").strip()
+            if not egress_nameid:
+                continue
+            for c in clusters_list:
+                clustername = str(c).strip() if c is not None else ""
+                if clustername and egress_nameid not in needed.setdefault(clustername, []):
+                    needed[clustername].append(egress_nameid)
+
+        problems: List[str] = []
+        for clustername in sorted(needed, key=lambda s: s.lower()):
+            allocated_path = self._egress_allocated_file_for_cluster(
+                workspace_path=workspace_path,
+                env=env,
+                clustername=clustername,
+            )
+            allocated_yaml = read_yaml_dict(allocated_path)
+
+            missing = []
+            for egress_nameid in needed[clustername]:
+                existing_ips_for_key = allocated_yaml.get(f"{app}_{egress_nameid}")
+                if isinstance(existing_ips_for_key, list) and any(str(x).strip() for x in existing_ips_for_key):
+                    continue
+                missing.append(egress_nameid)
+            if not missing:
+                continue
+
+            ranges = self.cluster_service.get_cluster_egress_ranges(env, clustername)
+            if not ranges:
+                problems.append(f"No egress_ip_ranges configured for cluster {clustername}")
+                continue
+
+            allocated_all = self._collect_allocated_ips(allocated_yaml)
+            for _ in missing:
+                new_ip = self._allocate_first_free_ip(ranges=ranges, allocated=allocated_all)
+                if not new_ip:
+                    problems.append(
+                        f"No free egress IPs remaining for cluster {clustername} "
+                        f"({len(missing)} egress_nameids need one)"
+                    )
+                    break
+                allocated_all.add(int(ipaddress.ip_address(new_ip)))
+
+        if problems:
+            raise ValueError("; ".join(problems))
 
     def get_allocated_egress_ips_for_namespace(
         self,
@@ -179,7 +246,7 @@ class NsEgressIpService:
             ns_dir = namespace_details_service.repo.get_namespace_dir(env, appname, namespace)
             ns_info_path = ns_dir / "namespace_info.yaml"
             if ns_info_path.exists() and ns_info_path.is_file():
-                parsed = yaml.safe_load(ns_info_path.read_text()) or {}
+                parsed = load_yaml(ns_info_path.read_text()) or {}
                 if isinstance(parsed, dict):
                     raw_clusters = parsed.get("clusters")
                     if isinstance(raw_clusters, list):
@@ -191,6 +258,21 @@ class NsEgressIpService:
         except Exception:
             clusters_list = []
 
+        return self.get_allocated_egress_ips(
+            env=env,
+            appname=appname,
+            egress_nameid=egress_nameid,
+            clusters_list=clusters_list,
+        )
+
+    def get_allocated_egress_ips(
+        self,
+        *,
+        env: str,
+        appname: str,
+        egress_nameid: str,
+        clusters_list: List[str],
+    ) -> List[Dict[str, str]]:
         workspace_path = get_workspace_path()
         alloc_key = f"{str(appname or '').strip()}_{str(egress_nameid or '').strip()}"
 
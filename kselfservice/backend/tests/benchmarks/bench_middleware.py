@@ -0,0 +1,87 @@
+"""Benchmark: per-request overhead of the request logging and read-only middlewares.
+
+Compares the pure-ASGI middlewares against equivalent BaseHTTPMiddleware
+implementations (the previous design) by driving a trivial ASGI endpoint
+in-process, so only middleware cost is measured.
+
+Usage (from the kselfservice directory):
+    python -m backend.tests.benchmarks.bench_middleware [requests]
+"""
+
+import asyncio
+import logging
+import sys
+import time
+import uuid
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse, PlainTextResponse
+
+from backend.middleware.logging import RequestLoggingMiddleware, logger
+from backend.middleware.readonly import ReadOnlyMiddleware
+
+
+class _BaseHTTPLogging(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        start = time.perf_counter()
+        logger.info("Request started: %s %s", request.method, request.url.path)
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        logger.info("Request completed in %.2fms", (time.perf_counter() - start) * 1000)
+        return response
+
+
+class _BaseHTTPReadOnly(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        if request.method in ("POST", "PUT", "DELETE", "PATCH") and "_yaml" not in request.url.path:
+            return JSONResponse(status_code=403, content={"detail": "read-only"})
+        return await call_next(request)
+
+
+async def _endpoint(scope, receive, send):
+    await PlainTextResponse("ok")(scope, receive, send)
+
+
+def _build(logging_cls, readonly_cls):
+    return readonly_cls(logging_cls(_endpoint))
+
+
+async def _drive(app, n: int) -> float:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/static/js/app.js", "raw_path": b"/static/js/app.js",
+        "root_path": "", "query_string": b"", "headers": [(b"host", b"bench"), (b"user-agent", b"bench")],
+        "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(200):
+        await app(dict(scope), receive, send)
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    logger.setLevel(logging.WARNING)
+    baseline = asyncio.run(_drive(_endpoint, n))
+    old = asyncio.run(_drive(_build(_BaseHTTPLogging, _BaseHTTPReadOnly), n))
+    new = asyncio.run(_drive(_build(RequestLoggingMiddleware, ReadOnlyMiddleware), n))
+    print(f"requests per variant:       {n}")
+    print(f"endpoint only:              {baseline:8.1f} us/request")
+    print(f"BaseHTTPMiddleware stack:   {old:8.1f} us/request (+{old - baseline:.1f})")
+    print(f"pure ASGI stack:            {new:8.1f} us/request (+{new - baseline:.1f})")
+    print(f"middleware overhead saved:  {old - new:8.1f} us/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark: serialization time and bytes on the wire for GET /apps with 5k apps.
+
+Compares the default FastAPI path (response_model validation, jsonable_encoder,
+stdlib JSONResponse) with FastJSONResponse (no validation, orjson when
+installed, gzip for clients that accept it). Both run through FastAPI's own
+request handling on an in-process app, so only the response side differs.
+
+Usage (from the kselfservice directory):
+    python -m backend.tests.benchmarks.bench_responses [apps] [rounds]
+"""
+
+import asyncio
+import sys
+import time
+from typing import Any, Dict
+
+from fastapi import FastAPI
+
+from backend.utils import responses
+from backend.utils.responses import FastJSONResponse
+
+
+def make_env(n_apps: int) -> Dict[str, Dict[str, Any]]:
+    """An environment shaped like ApplicationService.get_apps_for_env plus permissions."""
+    return {
+        f"app-{i:05d}": {
+            "appname": f"app-{i:05d}",
+            "description": f"Application {i} owned by the payments platform team",
+            "managedby": [f"team-{i % 40}", "platform-admins"],
+            "clusters": [f"ocp-{dc}-{i % 12:02d}" for dc in ("east", "west")],
+            "totalns": i % 9,
+            "argocd": bool(i % 3),
+            "permissions": {"canView": True, "canManage": bool(i % 5 == 0)},
+        }
+        for i in range(n_apps)
+    }
+
+
+def _build_app(apps: Dict[str, Dict[str, Any]]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/default", response_model=Dict[str, Dict[str, Any]])
+    def default():
+        return apps
+
+    @app.get("/fast", response_model=Dict[str, Dict[str, Any]], response_class=FastJSONResponse)
+    def fast():
+        return FastJSONResponse(apps)
+
+    return app
+
+
+async def _drive(app: FastAPI, path: str, accept_encoding: bytes, rounds: int):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": path, "raw_path": path.encode(),
+        "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"accept-encoding", accept_encoding)],
+        "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    size = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal size
+        if message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    await app(dict(scope), receive, send)
+    wire_bytes, size = size, 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / rounds * 1000, wire_bytes
+
+
+def main() -> None:
+    n_apps = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    app = _build_app(make_env(n_apps))
+
+    rows = [
+        ("response_model + json", "/default", b"gzip"),
+        ("FastJSONResponse, identity", "/fast", b"identity"),
+        ("FastJSONResponse, gzip", "/fast", b"gzip"),
+    ]
+    print(f"apps: {n_apps}, rounds: {rounds}, serializer: {'orjson' if responses.orjson else 'stdlib json'}")
+    for label, path, accept in rows:
+        ms, wire = asyncio.run(_drive(app, path, accept, rounds))
+        print(f"{label:28s} {ms:8.2f} ms/request {wire / 1024:10.1f} KiB on the wire")
+
+
+if __name__ == "__main__":
+    main()
@@ -54,6 +54,32 @@ class TestNamespacesE2E:
         )
         assert response.status_code in [400, 403, 422]
 
+    async def test_bulk_create_namespaces_rejects_invalid_names(
+        self, async_client: httpx.AsyncClient, test_app_setup: str, test_env: str
+    ):
+        """Test that POST /api/v1/apps/{appname}/namespaces/bulk validates the whole set."""
+        appname = test_app_setup
+
+        response = await async_client.post(
+            f"/api/v1/apps/{appname}/namespaces/bulk",
+            json={"namespaces": [{"namespace": "valid-ns"}, {"namespace": "Invalid_NS"}]},
+            params={"env": test_env}
+        )
+        assert response.status_code in [400, 403, 404]
+
+    async def test_promote_namespaces_rejects_same_env(
+        self, async_client: httpx.AsyncClient, test_app_setup: str, test_env: str
+    ):
+        """Test that POST /api/v1/apps/{appname}/namespaces/promote requires a different target env."""
+        appname = test_app_setup
+
+        response = await async_client.post(
+            f"/api/v1/apps/{appname}/namespaces/promote",
+            json={"to_env": test_env},
+            params={"env": test_env}
+        )
+        assert response.status_code in [400, 403, 404]
+
     async def test_delete_namespaces_requires_namespace_list(
         self, async_client: httpx.AsyncClient, test_app_setup: str, test_env: str
     ):
@@ -162,3 +188,21 @@ class TestNamespaceDetailsE2E:
             data = response.json()
             assert isinstance(data, (dict, list))
 
+
+    async def test_get_namespace_details(
+        self, async_client: httpx.AsyncClient,
+        test_app_setup: str, test_namespace_setup: str, test_env: str
+    ):
+        """Test that GET /api/v1/apps/{appname}/namespaces/{namespace}/details returns the selected sections."""
+        appname = test_app_setup
+        namespace = test_namespace_setup
+
+        response = await async_client.get(
+            f"/api/v1/apps/{appname}/namespaces/{namespace}/details",
+            params={"env": test_env, "fields": "basic,resourcequota"}
+        )
+        assert response.status_code in [200, 400, 403, 404]
+
+        if response.status_code == 200:
+            data = response.json()
+            assert set(data["sections"]) | set(data["errors"]) == {"basic", "resourcequota"}
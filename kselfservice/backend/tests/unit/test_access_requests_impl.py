@@ -0,0 +1,162 @@
+"""
+Unit tests for the append-only access request store.
+
+Tests cover:
+- Create, list ordering and duplicate checks from the in-memory index
+- Import of the legacy accessrequests.yaml
+- Grant updates and visibility across instances sharing the log (multi-worker)
+- Log compaction
+- Filtered, cursor-paginated queries
+"""
+import json
+
+import pytest
+import yaml
+
+from backend.auth import access_requests_impl
+from backend.auth.access_requests_impl import AccessRequestsImpl
+from backend.models.access_request import AccessRequest
+
+
+def make_request(requested_at: str, application: str = "app1", role: str = "viewer", **principal) -> AccessRequest:
+    return AccessRequest(
+        requestor="alice",
+        requested_at=requested_at,
+        type="app_access",
+        payload={"application": application, "role": role, **(principal or {"userid": "bob"})},
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    return AccessRequestsImpl(store_dir=tmp_path)
+
+
+class TestAccessRequestStore:
+    """Tests for create, list and duplicate checks."""
+
+    def test_list_is_newest_first(self, store):
+        """Listing returns requests ordered by requested_at descending."""
+        store.request_access(make_request("2026-01-02T00:00:00+00:00", "app2"))
+        store.request_access(make_request("2026-01-01T00:00:00+00:00", "app1"))
+        store.request_access(make_request("2026-01-03T00:00:00+00:00", "app3"))
+
+        apps = [r["payload"]["application"] for r in store.list_access_requests()]
+        assert apps == ["app3", "app2", "app1"]
+
+    def test_unset_fields_are_omitted(self, store):
+        """Optional fields left unset are not stored as the string 'None'."""
+        store.request_access(make_request("2026-01-01T00:00:00+00:00"))
+        row = store.list_access_requests()[0]
+        assert "status" not in row
+
+    def test_duplicate_check(self, store):
+        """Duplicates match on application, role and the same user or group."""
+        store.request_access(make_request("2026-01-01T00:00:00+00:00", userid="bob"))
+        store.request_access(make_request("2026-01-01T00:00:01+00:00", group="team"))
+
+        assert store.check_duplicate_app_access_request("app1", "viewer", "bob", "") is True
+        assert store.check_duplicate_app_access_request("app1", "viewer", "", "team") is True
+        assert store.check_duplicate_app_access_request("app1", "manager", "bob", "") is False
+        assert store.check_duplicate_app_access_request("app2", "viewer", "bob", "") is False
+
+    def test_imports_legacy_yaml(self, tmp_path):
+        """An existing accessrequests.yaml is imported into the log once."""
+        legacy = {
+            "2026-01-01T00:00:00+00:00:alice:app_access": {
+                "requestor": "alice",
+                "requested_at": "2026-01-01T00:00:00+00:00",
+                "type": "app_access",
+                "payload": {"application": "app1", "role": "viewer", "userid": "bob"},
+                "status": None,
+            }
+        }
+        (tmp_path / "accessrequests.yaml").write_text(yaml.safe_dump(legacy))
+
+        store = AccessRequestsImpl(store_dir=tmp_path)
+
+        assert store.check_duplicate_app_access_request("app1", "viewer", "bob", "") is True
+        assert (tmp_path / "accessrequests.jsonl").exists()
+
+
+class TestAccessRequestGrantsAndWorkers:
+    """Tests for grant updates, cross-instance sync and compaction."""
+
+    def test_mark_granted_updates_latest_match(self, store):
+        """Granting updates the newest request for the app and principal."""
+        store.request_access(make_request("2026-01-01T00:00:00+00:00"))
+        store.request_access(make_request("2026-01-02T00:00:00+00:00", role="manager"))
+
+        count = store.mark_app_access_granted([("app1", "manager", "bob", "")], "admin", "2026-01-05T00:00:00+00:00")
+
+        assert count == 1
+        newest, oldest = store.list_access_requests()
+        assert newest["status"] == "granted"
+        assert newest["granted_by"] == "admin"
+        assert "status" not in oldest
+
+    def test_second_instance_sees_appends(self, tmp_path):
+        """Instances sharing the log (as separate workers do) see each other's writes."""
+        worker_a = AccessRequestsImpl(store_dir=tmp_path)
+        worker_b = AccessRequestsImpl(store_dir=tmp_path)
+        assert worker_b.list_access_requests() == []
+
+        worker_a.request_access(make_request("2026-01-01T00:00:00+00:00"))
+
+        assert worker_b.check_duplicate_app_access_request("app1", "viewer", "bob", "") is True
+        assert len(worker_b.list_access_requests()) == 1
+
+    def test_compaction_drops_superseded_records(self, tmp_path, monkeypatch):
+        """Once enough records accumulate the log is rewritten with live entries only."""
+        monkeypatch.setattr(access_requests_impl, "_COMPACT_MIN_RECORDS", 4)
+        store = AccessRequestsImpl(store_dir=tmp_path)
+        other = AccessRequestsImpl(store_dir=tmp_path)
+        store.request_access(make_request("2026-01-01T00:00:00+00:00"))
+        for i in range(3):
+            store.mark_app_access_granted([("app1", "viewer", "bob", "")], "admin", f"2026-01-0{i + 2}T00:00:00+00:00")
+
+        lines = (tmp_path / "accessrequests.jsonl").read_text().splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["item"]["granted_at"] == "2026-01-04T00:00:00+00:00"
+        assert other.list_access_requests()[0]["granted_at"] == "2026-01-04T00:00:00+00:00"
+
+
+class TestAccessRequestQuery:
+    """Tests for filtered, sorted and cursor-paginated listing."""
+
+    @pytest.fixture
+    def populated(self, store):
+        for day in range(1, 10):
+            store.request_access(make_request(f"2026-01-0{day}T00:00:00+00:00", f"app{day % 3}"))
+        store.mark_app_access_granted([("app1", "viewer", "bob", "")], "admin", "2026-02-01T00:00:00+00:00")
+        return store
+
+    def test_pages_cover_all_matches_once(self, populated):
+        """Following the cursor walks every request exactly once, in order."""
+        seen, cursor = [], None
+        while True:
+            page, cursor = populated.query_access_requests(limit=4, cursor=cursor, descending=False)
+            seen.extend(r["requested_at"] for r in page)
+            if cursor is None:
+                break
+        assert seen == sorted(r["requested_at"] for r in populated.list_access_requests())
+
+    def test_filters_and_date_range(self, populated):
+        """Equality filters combine with an inclusive requested_at range."""
+        page, cursor = populated.query_access_requests(
+            filters={"application": "app2", "status": "pending"},
+            requested_from="2026-01-03",
+            requested_to="2026-01-08",
+        )
+        assert [r["requested_at"][:10] for r in page] == ["2026-01-08", "2026-01-05"]
+        assert cursor is None
+
+        granted, _ = populated.query_access_requests(filters={"status": "granted"})
+        assert [r["payload"]["application"] for r in granted] == ["app1"]
+
+    def test_invalid_cursor_and_filter(self, populated):
+        """Malformed cursors and unknown filter fields are rejected."""
+        with pytest.raises(ValueError):
+            populated.query_access_requests(cursor="not-a-cursor")
+        with pytest.raises(ValueError):
+            populated.query_access_requests(filters={"role": "viewer"})
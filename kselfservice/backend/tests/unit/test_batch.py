@@ -0,0 +1,243 @@
+"""
+Unit tests for POST /batch.
+
+Tests cover:
+- Sub-requests run through the app with the caller's identity; RBAC per sub-request
+- Results in request order, per-sub-request errors, concurrency cap
+- Per-batch caches (user context, @single_flight results), none across batches
+- Path validation, request limit, and that the batch is not a write
+- Each sub-request has its own request state (request id)
+"""
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from backend.auth import rbac
+from backend.auth.rbac import require_rbac
+from backend.exceptions import register_exception_handlers
+from backend.exceptions.custom import ValidationError
+from backend.middleware.bulkhead import route_group
+from backend.middleware.etag import ETagMiddleware, write_change
+from backend.middleware.logging import RequestLoggingMiddleware
+from backend.middleware.readonly import ReadOnlyMiddleware
+from backend.routers import batch
+from backend.utils import workspace_generation
+from backend.utils.batch import BatchCache, batch_cached, subrequest_target
+from backend.utils.single_flight import single_flight
+from backend.utils.workspace_generation import WorkspaceGenerations
+
+
+@pytest.fixture
+def generations(tmp_path, monkeypatch):
+    instance = WorkspaceGenerations(tmp_path / "workspace.generations.json")
+    monkeypatch.setattr(workspace_generation, "_instance", instance)
+    return instance
+
+
+@pytest.fixture
+def user_contexts(monkeypatch):
+    """Fake role lookup: every user may view every app but "secret"."""
+    loaded = []
+
+    def load(user_id):
+        loaded.append(user_id)
+        return {"username": user_id, "roles": ["viewer"]}
+
+    def enforce(usercontext, obj, act, app=None):
+        if app and app.get("id") == "secret":
+            raise HTTPException(status_code=403, detail=f"{usercontext['username']} may not view secret")
+
+    monkeypatch.setattr(rbac, "_load_user_context", load)
+    monkeypatch.setattr(rbac, "enforce_request", enforce)
+    return loaded
+
+
+class Service:
+    calls = []
+
+    @single_flight(scope=lambda env: (env,))
+    def get_pool(self, env):
+        Service.calls.append(env)
+        return {"env": env, "free": 3}
+
+
+@pytest.fixture
+def client(generations, user_contexts):
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.include_router(batch.router, prefix="/api/v1")
+    state = {"running": 0, "peak": 0}
+    app.state.concurrency = state
+
+    @app.get("/api/v1/apps/{appname}/status")
+    def app_status(
+        appname: str,
+        request: Request,
+        env: str,
+        _: None = Depends(require_rbac(obj="/apps", act="GET", app_id=lambda r: r.path_params["appname"])),
+    ):
+        user = rbac.get_current_user_context(request)["username"]
+        return {"app": appname, "env": env, "user": user, "encoding": request.headers.get("accept-encoding")}
+
+    @app.get("/api/v1/clusters/{cluster}/free_pool")
+    def free_pool(cluster: str, env: str):
+        return Service().get_pool(env)
+
+    @app.get("/api/v1/slow")
+    async def slow():
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.05)
+        state["running"] -= 1
+        return {"ok": True}
+
+    @app.get("/api/v1/broken")
+    def broken():
+        raise RuntimeError("boom")
+
+    @app.get("/api/v1/text")
+    def text():
+        return PlainTextResponse("kind: LimitRange\n")
+
+    app.add_middleware(ETagMiddleware)
+    app.add_middleware(ReadOnlyMiddleware)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def _batch(client, *requests, **kwargs):
+    return client.post("/api/v1/batch", json={"requests": list(requests)}, **kwargs)
+
+
+class TestBatch:
+    """Tests for POST /batch."""
+
+    def test_results_in_order_with_rbac_per_subrequest(self, client):
+        response = _batch(
+            client,
+            {"path": "/apps/app1/status", "params": {"env": "dev"}},
+            {"path": "/apps/secret/status?env=dev"},
+            {"path": "/apps/app2/status?env=qa"},
+            {"path": "/nowhere"},
+            headers={"x-user": "alice", "accept-encoding": "gzip"},
+        )
+        assert response.status_code == 200
+        results = response.json()["responses"]
+        assert [(r["path"], r["status"]) for r in results] == [
+            ("/apps/app1/status?env=dev", 200),
+            ("/apps/secret/status?env=dev", 403),
+            ("/apps/app2/status?env=qa", 200),
+            ("/nowhere", 404),
+        ]
+        assert results[0]["body"] == {"app": "app1", "env": "dev", "user": "alice", "encoding": None}
+        assert results[1]["body"]["detail"] == "alice may not view secret"
+
+    def test_failing_subrequest_does_not_fail_the_batch(self, client):
+        results = _batch(client, {"path": "/broken"}, {"path": "/text"}).json()["responses"]
+        assert results[0]["status"] == 500
+        assert results[1] == {"path": "/text", "status": 200, "body": "kind: LimitRange\n"}
+
+    def test_concurrency_cap(self, client, monkeypatch):
+        monkeypatch.setenv("BATCH_CONCURRENCY", "2")
+        results = _batch(client, *[{"path": "/slow"}] * 6).json()["responses"]
+        assert [r["status"] for r in results] == [200] * 6
+        assert client.app.state.concurrency["peak"] == 2
+
+    def test_user_context_is_resolved_once_per_batch(self, client, user_contexts):
+        _batch(client, *[{"path": f"/apps/app{i}/status?env=dev"} for i in range(5)], headers={"x-user": "bob"})
+        assert user_contexts == ["bob"]
+        _batch(client, {"path": "/apps/app1/status?env=dev"}, headers={"x-user": "bob"})
+        assert user_contexts == ["bob", "bob"]
+
+    def test_single_flight_results_are_shared_within_a_batch(self, client, monkeypatch):
+        monkeypatch.setenv("BATCH_CONCURRENCY", "1")
+        Service.calls = []
+        results = _batch(client, *[{"path": f"/clusters/c{i}/free_pool?env=dev"} for i in range(4)]).json()
+        assert [r["body"] for r in results["responses"]] == [{"env": "dev", "free": 3}] * 4
+        assert Service.calls == ["dev"]
+        client.get("/api/v1/clusters/c1/free_pool?env=dev")
+        client.get("/api/v1/clusters/c1/free_pool?env=dev")
+        assert Service.calls == ["dev", "dev", "dev"]
+
+    @pytest.mark.parametrize("path", ["apps", "/api/v1/apps", "/batch", "/changes/stream", "/apps/../config", "//host/x"])
+    def test_invalid_paths_are_rejected(self, client, path):
+        response = _batch(client, {"path": "/apps/app1/status?env=dev"}, {"path": path})
+        assert response.status_code == 400
+        assert response.json()["field"] == "path"
+
+    def test_request_limit(self, client, monkeypatch):
+        monkeypatch.setenv("BATCH_MAX_REQUESTS", "2")
+        response = _batch(client, *[{"path": "/slow"}] * 3)
+        assert response.status_code == 400
+        assert response.json()["field"] == "requests"
+
+    def test_batch_is_not_a_write(self, client, generations, monkeypatch):
+        monkeypatch.setenv("READONLY", "true")
+        response = _batch(client, {"path": "/apps/app1/status?env=dev"})
+        assert response.status_code == 200
+        assert generations.read_journal()[0] == 0
+        assert write_change("POST", "/api/v1/batch", "") is None
+        assert route_group("POST", "/api/v1/batch") is None
+
+
+def test_subrequests_get_their_own_request_state(generations, user_contexts):
+    app = FastAPI()
+    app.include_router(batch.router, prefix="/api/v1")
+
+    @app.get("/api/v1/request_id")
+    def request_id(request: Request):
+        return {"request_id": request.state.request_id}
+
+    app.add_middleware(RequestLoggingMiddleware)
+    batch_states = []
+
+    def capture_state(inner):
+        async def middleware(scope, receive, send):
+            await inner(scope, receive, send)
+            batch_states.append(dict(scope.get("state") or {}))
+        return middleware
+
+    client = TestClient(capture_state(app))
+    response = _batch(client, {"path": "/request_id"}, {"path": "/request_id"})
+
+    ids = [r["body"]["request_id"] for r in response.json()["responses"]]
+    assert len(set(ids)) == 2
+    assert response.headers["x-request-id"] not in ids
+    assert batch_states == [{"request_id": response.headers["x-request-id"]}]
+
+
+class TestBatchHelpers:
+    """Tests for the batch path validation and cache helpers."""
+
+    def test_subrequest_target_merges_query_and_params(self):
+        assert subrequest_target("/apps?env=dev", {"x": 1, "ns": ["a", "b"], "skip": None}) == (
+            "/apps",
+            "env=dev&x=1&ns=a&ns=b",
+        )
+
+    def test_fragment_is_rejected(self):
+        with pytest.raises(ValidationError):
+            subrequest_target("/apps#frag")
+
+    def test_batch_cached_outside_a_batch_always_computes(self):
+        calls = []
+        assert batch_cached("k", lambda: calls.append(1) or len(calls)) == 1
+        assert batch_cached("k", lambda: calls.append(1) or len(calls)) == 2
+
+    def test_exceptions_are_not_cached(self):
+        cache = BatchCache()
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise OSError("transient")
+            return "ok"
+
+        with pytest.raises(OSError):
+            cache.get("k", flaky)
+        assert cache.get("k", flaky) == "ok"
+        assert cache.get("k", flaky) == "ok"
+        assert len(attempts) == 2
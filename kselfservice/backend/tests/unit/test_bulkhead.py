@@ -0,0 +1,132 @@
+"""
+Unit tests for the bulkhead middleware.
+
+Tests cover:
+- Route group classification
+- Slot accounting, FIFO hand-over and queue timeouts
+- 503 + Retry-After when a group is full, without affecting other groups
+"""
+import asyncio
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.middleware.bulkhead import Bulkhead, BulkheadMiddleware, route_group
+from backend.utils.metrics import BULKHEAD_IN_FLIGHT, BULKHEAD_REJECTED
+
+
+class TestRouteGroup:
+    """Tests for route classification."""
+
+    @pytest.mark.parametrize("method,path,group", [
+        ("POST", "/api/v1/apps/app1/pull_request/commit_push", "git"),
+        ("POST", "/api/v1/apps/app1/pull_request/ensure", "git"),
+        ("POST", "/api/v1/config", "git"),
+        ("GET", "/api/v1/requests/changes", "git"),
+        ("GET", "/api/v1/apps/app1/pull_request/status", "external"),
+        ("GET", "/api/v1/apps/app1/pull_requests", "external"),
+        ("GET", "/api/v1/config", "read"),
+        ("GET", "/api/v1/apps", "read"),
+        ("DELETE", "/api/v1/clusters/c1", "write"),
+        ("PUT", "/api/v1/apps/app1/namespaces/ns1/resources/resourcequota", "write"),
+        ("GET", "/api/v1/changes/stream", None),
+        ("GET", "/api/v1/changes", "read"),
+        ("GET", "/metrics", None),
+        ("GET", "/static/app.js", None),
+    ])
+    def test_classification(self, method, path, group):
+        assert route_group(method, path) == group
+
+
+class TestBulkhead:
+    """Tests for slot accounting."""
+
+    async def test_limit_and_timeout(self):
+        bulkhead = Bulkhead("test_a", 2)
+        assert await bulkhead.acquire(0)
+        assert await bulkhead.acquire(0)
+        assert not await bulkhead.acquire(0)
+        assert not await bulkhead.acquire(0.01)
+        assert bulkhead.in_flight == 2
+        bulkhead.release()
+        assert await bulkhead.acquire(0)
+
+    async def test_released_slot_goes_to_oldest_waiter(self):
+        bulkhead = Bulkhead("test_b", 1)
+        assert await bulkhead.acquire(0)
+        order = []
+
+        async def wait(name):
+            if await bulkhead.acquire(5):
+                order.append(name)
+
+        first = asyncio.ensure_future(wait("first"))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(wait("second"))
+        await asyncio.sleep(0)
+        # A newcomer does not jump the queue
+        assert not await bulkhead.acquire(0)
+
+        bulkhead.release()
+        await first
+        bulkhead.release()
+        await second
+        assert order == ["first", "second"]
+        assert bulkhead.in_flight == 1
+        assert BULKHEAD_IN_FLIGHT.value("test_b") == 1
+
+    async def test_cancelled_waiter_does_not_leak_a_slot(self):
+        bulkhead = Bulkhead("test_c", 1)
+        assert await bulkhead.acquire(0)
+        task = asyncio.ensure_future(bulkhead.acquire(5))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        bulkhead.release()
+        assert bulkhead.in_flight == 0
+
+
+class TestBulkheadMiddleware:
+    """Tests for admission through the middleware."""
+
+    def test_full_group_is_rejected_while_others_proceed(self, monkeypatch):
+        monkeypatch.setenv("BULKHEAD_GIT_LIMIT", "1")
+        monkeypatch.setenv("BULKHEAD_QUEUE_TIMEOUT", "0")
+        monkeypatch.setenv("BULKHEAD_RETRY_AFTER", "7")
+        started, finish = threading.Event(), threading.Event()
+
+        app = FastAPI()
+
+        @app.get("/api/v1/requests/changes")
+        def changes():
+            started.set()
+            finish.wait(5)
+            return {"changes": []}
+
+        @app.get("/api/v1/apps")
+        def apps():
+            return {}
+
+        app.add_middleware(BulkheadMiddleware)
+        rejected_before = BULKHEAD_REJECTED.value("git")
+
+        with TestClient(app) as client:
+            results = {}
+            slow = threading.Thread(target=lambda: results.setdefault("slow", client.get("/api/v1/requests/changes")))
+            slow.start()
+            assert started.wait(5)
+
+            busy = client.get("/api/v1/requests/changes")
+            assert busy.status_code == 503
+            assert busy.headers["Retry-After"] == "7"
+            assert client.get("/api/v1/apps").status_code == 200
+
+            finish.set()
+            slow.join(5)
+            assert results["slow"].status_code == 200
+            assert client.get("/api/v1/requests/changes").status_code == 200
+
+        assert BULKHEAD_REJECTED.value("git") == rejected_before + 1
@@ -0,0 +1,145 @@
+"""
+Unit tests for the workspace change journal and GET /changes.
+
+Tests cover:
+- Journal entries, generations and the CHANGE_JOURNAL_SIZE bound
+- Delta vs resync answers (first load, aged out, workspace refresh, reset)
+- Journal kind/op of API writes, end to end through ETagMiddleware
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.exceptions import register_exception_handlers
+from backend.middleware.etag import ETagMiddleware, write_change
+from backend.routers import changes
+from backend.utils import workspace_generation
+from backend.utils.workspace_generation import WorkspaceGenerations
+
+
+@pytest.fixture
+def generations(tmp_path, monkeypatch):
+    instance = WorkspaceGenerations(tmp_path / "workspace.generations.json")
+    monkeypatch.setattr(workspace_generation, "_instance", instance)
+    return instance
+
+
+def _ops(result):
+    return [(c["kind"], c["env"], c["app"], c["namespace"], c["op"]) for c in result["changes"]]
+
+
+class TestChangeJournal:
+    """Tests for WorkspaceGenerations.changes_since."""
+
+    def test_changes_after_since_for_the_env(self, generations):
+        assert generations.bump("dev", "app1", "ns1") == 1
+        assert generations.bump("QA", "app1") == 2
+        assert generations.bump("dev", "app2", kind="namespace", op="create") == 3
+
+        result = generations.changes_since(1, "dev")
+        assert result["generation"] == 3
+        assert result["resync"] is False
+        assert _ops(result) == [("namespace", "dev", "app2", None, "create")]
+        assert [c["generation"] for c in generations.changes_since(0, "qa")["changes"]] == [2]
+
+    def test_up_to_date_client_gets_no_changes(self, generations):
+        generations.bump("dev", "app1")
+        assert generations.changes_since(1, "dev") == {"generation": 1, "resync": False, "changes": []}
+        assert generations.changes_since(0, "dev")["resync"] is False
+
+    @pytest.mark.parametrize("since", [None, 5])
+    def test_unknown_generation_resyncs(self, generations, since):
+        generations.bump("dev", "app1")
+        assert generations.changes_since(since, "dev") == {"generation": 1, "resync": True, "changes": []}
+
+    def test_aged_out_generation_resyncs(self, generations, monkeypatch):
+        monkeypatch.setenv("CHANGE_JOURNAL_SIZE", "3")
+        for i in range(5):
+            generations.bump("dev", f"app{i}")
+        assert generations.changes_since(1, "dev")["resync"] is True
+        assert [c["app"] for c in generations.changes_since(2, "dev")["changes"]] == ["app2", "app3", "app4"]
+
+    def test_workspace_refresh_resyncs(self, generations):
+        generations.bump("dev", "app1")
+        generations.bump(op="refresh")
+        generations.bump("dev", "app2")
+        assert generations.changes_since(1, "dev")["resync"] is True
+        assert _ops(generations.changes_since(2, "dev")) == [("app", "dev", "app2", None, "update")]
+
+    def test_journal_only_change_keeps_etags(self, generations):
+        version = generations.version("dev", "app1")
+        assert generations.bump("dev", "app1", kind="pull_request", bump_counters=False) == 1
+        assert generations.version("dev", "app1") == version
+        assert _ops(generations.changes_since(0, "dev")) == [("pull_request", "dev", "app1", None, "update")]
+
+    def test_journal_is_shared_by_workers(self, generations):
+        other_worker = WorkspaceGenerations(generations.path)
+        generations.bump("dev", "app1")
+        assert other_worker.bump("dev", "app2") == 2
+        assert [c["app"] for c in generations.changes_since(0, "dev")["changes"]] == ["app1", "app2"]
+
+
+class TestWriteChange:
+    """Tests for the journal kind and op of API writes."""
+
+    @pytest.mark.parametrize("method,path,env,expected", [
+        ("POST", "/api/v1/apps", "dev", (("dev",), "app", "create")),
+        ("DELETE", "/api/v1/apps/a1", "dev", (("dev", "a1"), "app", "delete")),
+        ("PUT", "/api/v1/apps/a1", "dev", (("dev", "a1"), "app", "update")),
+        ("POST", "/api/v1/apps/a1/namespaces", "dev", (("dev", "a1"), "namespace", "create")),
+        ("DELETE", "/api/v1/apps/a1/namespaces", "dev", (("dev", "a1"), "namespace", "delete")),
+        ("PUT", "/api/v1/apps/a1/namespaces/n1/nsargocd", "dev", (("dev", "a1", "n1"), "namespace", "update")),
+        ("DELETE", "/api/v1/apps/a1/argocd", "dev", (("dev", "a1"), "app", "update")),
+        ("POST", "/api/v1/apps/a1/l4_ingress/allocate", "dev", (("dev", "a1"), "allocation", "update")),
+        ("DELETE", "/api/v1/apps/a1/egress_ips", "dev", (("dev", "a1"), "allocation", "update")),
+        ("POST", "/api/v1/apps/a1/pull_request/commit_push", "dev", (("dev", "a1"), "pull_request", "update")),
+        ("POST", "/api/v1/apps/a1/pull_request/discard_edits", "dev", (("dev", "a1"), "app", "update")),
+        ("POST", "/api/v1/config", "", ((), "workspace", "refresh")),
+        ("POST", "/api/v1/clusters", "dev", ((), "workspace", "update")),
+        ("POST", "/api/v1/apps/a1/pull_request/merge", "", None),
+        ("POST", "/api/v1/role-management/app/assign", "", None),
+    ])
+    def test_write_change(self, method, path, env, expected):
+        assert write_change(method, path, env) == expected
+
+
+@pytest.fixture
+def client(generations):
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.include_router(changes.router, prefix="/api/v1")
+
+    @app.post("/api/v1/apps")
+    def create_app(env: str):
+        return {"ok": True}
+
+    @app.put("/api/v1/apps/{appname}/namespaces/{namespace}/resources/limitrange")
+    def put_limitrange(appname: str, namespace: str, env: str):
+        return {"ok": True}
+
+    app.add_middleware(ETagMiddleware)
+    return TestClient(app)
+
+
+class TestChangesEndpoint:
+    """Tests for GET /changes."""
+
+    def test_first_load_then_delta(self, client):
+        first = client.get("/api/v1/changes?env=dev").json()
+        assert first == {"generation": 0, "resync": True, "changes": []}
+
+        client.post("/api/v1/apps?env=dev")
+        client.put("/api/v1/apps/app1/namespaces/ns1/resources/limitrange?env=qa")
+        client.put("/api/v1/apps/app1/namespaces/ns1/resources/limitrange?env=dev")
+
+        delta = client.get(f"/api/v1/changes?env=DEV&since={first['generation']}").json()
+        assert delta["generation"] == 3
+        assert delta["resync"] is False
+        assert _ops(delta) == [
+            ("app", "dev", None, None, "create"),
+            ("namespace", "dev", "app1", "ns1", "update"),
+        ]
+        assert client.get("/api/v1/changes?env=dev&since=3").json()["changes"] == []
+
+    def test_env_is_required(self, client):
+        assert client.get("/api/v1/changes?since=0").status_code == 400
@@ -0,0 +1,277 @@
+"""
+Unit tests for workspace generations and ETagMiddleware.
+
+Tests cover:
+- Generation counters (tree/node propagation, epoch, cross-worker visibility)
+- Classification of ETag GETs and writes
+- 304 before routing, ETags that change after writes, roles and per user
+- Role assignments by another user change the ETag of GET /apps
+"""
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from backend.auth.role_mgmt_impl import RoleMgmtImpl
+from backend.middleware import etag as etag_module
+from backend.middleware.etag import CACHE_CONTROL, ETagMiddleware, etag_scope, write_scope
+from backend.middleware.metrics import route_template
+from backend.utils import workspace_generation
+from backend.utils.responses import FastJSONResponse
+from backend.utils.workspace_generation import WorkspaceGenerations
+
+
+@pytest.fixture
+def generations(tmp_path, monkeypatch):
+    instance = WorkspaceGenerations(tmp_path / "workspace.generations.json")
+    monkeypatch.setattr(workspace_generation, "_instance", instance)
+    return instance
+
+
+class TestWorkspaceGenerations:
+    """Tests for the counters behind the ETags."""
+
+    def test_namespace_write_changes_its_lists_but_not_siblings(self, generations):
+        before = {
+            "env": generations.version("dev"),
+            "app": generations.version("dev", "app1"),
+            "ns1": generations.version("dev", "app1", "ns1"),
+            "ns2": generations.version("dev", "app1", "ns2"),
+            "other_app": generations.version("dev", "app2"),
+            "other_env": generations.version("qa"),
+            "root": generations.version(),
+        }
+        generations.bump("dev", "app1", "ns1")
+        after = {
+            "env": generations.version("dev"),
+            "app": generations.version("dev", "app1"),
+            "ns1": generations.version("dev", "app1", "ns1"),
+            "ns2": generations.version("dev", "app1", "ns2"),
+            "other_app": generations.version("dev", "app2"),
+            "other_env": generations.version("qa"),
+            "root": generations.version(),
+        }
+        changed = {k for k in before if before[k] != after[k]}
+        assert changed == {"env", "app", "ns1", "root"}
+
+    def test_app_write_invalidates_its_namespaces(self, generations):
+        ns = generations.version("dev", "app1", "ns1")
+        other = generations.version("dev", "app2", "ns1")
+        generations.bump("dev", "app1")
+        assert generations.version("dev", "app1", "ns1") != ns
+        assert generations.version("dev", "app2", "ns1") == other
+
+    def test_epoch_invalidates_everything(self, generations):
+        versions = [generations.version(), generations.version("dev", "app1", "ns1")]
+        generations.bump()
+        assert generations.version() != versions[0]
+        assert generations.version("dev", "app1", "ns1") != versions[1]
+
+    def test_env_is_case_insensitive(self, generations):
+        generations.bump("DEV", "app1")
+        assert generations.version("dev", "app1") == generations.version("Dev", "app1")
+
+    def test_bump_in_another_worker_is_visible(self, generations):
+        other_worker = WorkspaceGenerations(generations.path)
+        seen = generations.version("dev", "app1")
+        other_worker.bump("dev", "app1")
+        assert generations.version("dev", "app1") == other_worker.version("dev", "app1") != seen
+
+
+class TestClassification:
+    """Tests for the route rules."""
+
+    @pytest.mark.parametrize("path,env,expected", [
+        ("/api/v1/apps", "dev", (("dev", None, None), "/api/v1/apps")),
+        ("/api/v1/apps/a1/namespaces", "dev", (("dev", "a1", None), "/api/v1/apps/{appname}/namespaces")),
+        ("/api/v1/apps/a1/l4_ingress", "dev", (("dev", "a1", None), "/api/v1/apps/{appname}/l4_ingress")),
+        (
+            "/api/v1/apps/a1/namespaces/n1/resources/limitrange", "dev",
+            (("dev", "a1", "n1"), "/api/v1/apps/{appname}/namespaces/{namespace}/resources/limitrange"),
+        ),
+        ("/api/v1/clusters", "", ((None, None, None), "/api/v1/clusters")),
+        ("/api/v1/apps", "", None),
+        ("/api/v1/apps/a1/pull_request/status", "dev", None),
+        ("/api/v1/apps/a1/namespaces/n1/unknown", "dev", None),
+    ])
+    def test_etag_scope(self, path, env, expected):
+        assert etag_scope(path, env) == expected
+
+    @pytest.mark.parametrize("path,env,expected", [
+        ("/api/v1/apps/a1/namespaces/n1/resources/limitrange", "dev", ("dev", "a1", "n1")),
+        ("/api/v1/apps/a1/namespaces", "dev", ("dev", "a1")),
+        ("/api/v1/apps/a1/pull_request/discard_edits", "dev", ("dev", "a1")),
+        ("/api/v1/apps", "dev", ("dev",)),
+        ("/api/v1/apps/a1/namespaces/n1/copy", "dev", ()),
+        ("/api/v1/apps/a1/namespaces/n1/namespace_info/egress", "dev", ("dev", "a1")),
+        ("/api/v1/apps/a1/namespaces/n1/namespace_info/basic", "dev", ("dev", "a1")),
+        ("/api/v1/apps/a1", "", ()),
+        ("/api/v1/config", "", ()),
+        ("/api/v1/clusters", "dev", ()),
+        ("/api/v1/apps/a1/pull_request/commit_push", "dev", None),
+        ("/api/v1/role-management/app/assign", "", None),
+    ])
+    def test_write_scope(self, path, env, expected):
+        assert write_scope(path, env) == expected
+
+
+@pytest.fixture
+def app_client(generations, monkeypatch):
+    roles = {"alice": ["viewall"], "bob": ["viewall"]}
+    monkeypatch.setattr(etag_module, "get_user_context", lambda user: {"username": user, "roles": list(roles.get(user, []))})
+    monkeypatch.setattr(etag_module, "policy_version", lambda: "policy-1")
+    monkeypatch.setattr(etag_module, "role_store_version", lambda: "roles-1")
+    calls = []
+
+    app = FastAPI()
+
+    @app.get("/api/v1/apps/{appname}/namespaces")
+    def list_namespaces(appname: str, env: str, n: int = 3):
+        calls.append(appname)
+        return FastJSONResponse({f"ns{i}": {"name": f"ns{i}", "clusters": ["c1"] * 20} for i in range(n)})
+
+    @app.get("/api/v1/apps/{appname}/namespaces/{namespace}/resources/limitrange")
+    def get_limitrange(appname: str, namespace: str, env: str):
+        calls.append(namespace)
+        return {"limits": []}
+
+    @app.put("/api/v1/apps/{appname}/namespaces/{namespace}/resources/limitrange")
+    def put_limitrange(appname: str, namespace: str, env: str, fail: bool = False):
+        if fail:
+            raise HTTPException(status_code=422, detail="invalid")
+        return {"ok": True}
+
+    @app.put("/api/v1/apps/{appname}/namespaces/{namespace}/namespace_info/egress")
+    def put_egress(appname: str, namespace: str, env: str):
+        return {"ok": True}
+
+    app.add_middleware(ETagMiddleware)
+    return TestClient(app), calls, roles
+
+
+class TestETagMiddleware:
+    """Tests for conditional GETs."""
+
+    NS_URL = "/api/v1/apps/app1/namespaces?env=dev"
+    LR_URL = "/api/v1/apps/app1/namespaces/ns1/resources/limitrange?env=dev"
+
+    def get(self, client, url, etag=None, user="alice", **headers):
+        headers["x-user"] = user
+        if etag:
+            headers["If-None-Match"] = etag
+        return client.get(url, headers=headers)
+
+    def test_matching_etag_gets_304_without_running_the_endpoint(self, app_client):
+        client, calls, _ = app_client
+        first = self.get(client, self.LR_URL)
+        assert first.status_code == 200
+        assert first.headers["cache-control"] == CACHE_CONTROL
+        etag = first.headers["etag"]
+        assert etag.startswith('"') and etag.endswith('"')
+
+        second = self.get(client, self.LR_URL, etag)
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+        assert calls == ["ns1"]
+
+    def test_stale_etag_gets_full_response(self, app_client):
+        client, calls, _ = app_client
+        response = self.get(client, self.LR_URL, '"something-else"')
+        assert response.status_code == 200
+        assert calls == ["ns1"]
+
+    def test_write_invalidates_the_resource_and_its_lists(self, app_client):
+        client, _, _ = app_client
+        lr_etag = self.get(client, self.LR_URL).headers["etag"]
+        ns_etag = self.get(client, self.NS_URL).headers["etag"]
+        other_etag = self.get(client, "/api/v1/apps/app1/namespaces/ns2/resources/limitrange?env=dev").headers["etag"]
+
+        assert client.put(self.LR_URL, headers={"x-user": "alice"}).status_code == 200
+
+        assert self.get(client, self.LR_URL, lr_etag).status_code == 200
+        assert self.get(client, self.NS_URL, ns_etag).status_code == 200
+        assert self.get(client, "/api/v1/apps/app1/namespaces/ns2/resources/limitrange?env=dev", other_etag).status_code == 304
+
+    def test_egress_allocation_write_invalidates_sibling_namespaces(self, app_client, generations):
+        client, _, _ = app_client
+        sibling = generations.version("dev", "a1", "n2")
+
+        client.put("/api/v1/apps/a1/namespaces/n1/namespace_info/egress?env=dev")
+
+        assert generations.version("dev", "a1", "n2") != sibling
+
+    def test_rejected_write_does_not_bump(self, app_client):
+        client, _, _ = app_client
+        etag = self.get(client, self.LR_URL).headers["etag"]
+        assert client.put(self.LR_URL + "&fail=true", headers={"x-user": "alice"}).status_code == 422
+        assert self.get(client, self.LR_URL, etag).status_code == 304
+
+    def test_etag_depends_on_user_and_roles(self, app_client):
+        client, _, roles = app_client
+        alice = self.get(client, self.LR_URL).headers["etag"]
+        assert self.get(client, self.LR_URL, user="bob").headers["etag"] != alice
+
+        roles["alice"].append("platform_admin")
+        assert self.get(client, self.LR_URL, alice).status_code == 200
+
+    def test_gzip_representation_has_its_own_etag(self, app_client, monkeypatch):
+        monkeypatch.setenv("RESPONSE_GZIP_MIN_BYTES", "0")
+        client, calls, _ = app_client
+        gzipped = self.get(client, self.NS_URL, **{"Accept-Encoding": "gzip"})
+        plain = self.get(client, self.NS_URL, **{"Accept-Encoding": "identity"})
+
+        assert gzipped.headers["content-encoding"] == "gzip"
+        assert gzipped.headers["etag"] == plain.headers["etag"][:-1] + '-gzip"'
+        response = self.get(client, self.NS_URL, gzipped.headers["etag"], **{"Accept-Encoding": "gzip"})
+        assert response.status_code == 304
+        assert response.headers["etag"] == gzipped.headers["etag"]
+        assert len(calls) == 2
+
+    def test_304_is_labelled_with_the_route_template(self, app_client):
+        client, _, _ = app_client
+        etag = self.get(client, self.LR_URL).headers["etag"]
+        seen = []
+        inner = client.app.middleware_stack
+
+        async def spy(scope, receive, send):
+            await inner(scope, receive, send)
+            seen.append(route_template(scope))
+
+        client.app.middleware_stack = spy
+        assert self.get(client, self.LR_URL, etag).status_code == 304
+        assert seen == ["/api/v1/apps/{appname}/namespaces/{namespace}/resources/limitrange"]
+
+
+class TestRoleStoreVersion:
+    """Tests for role changes that are not the caller's own."""
+
+    def test_assign_changes_apps_etag_for_other_users(self, generations, tmp_path, monkeypatch):
+        monkeypatch.setenv("WORKSPACE", str(tmp_path))
+        monkeypatch.setenv("DEMO_MODE", "false")
+        impl = RoleMgmtImpl()
+        monkeypatch.setattr(RoleMgmtImpl, "_instance", impl)
+        monkeypatch.setattr(etag_module, "get_user_context", lambda user: {"username": user, "roles": ["viewall"]})
+        monkeypatch.setattr(etag_module, "policy_version", lambda: "policy-1")
+
+        app = FastAPI()
+
+        @app.get("/api/v1/apps")
+        def list_apps(env: str):
+            return {"app1": {"managedby": impl.get_app_managedby("app1")}}
+
+        @app.post("/api/v1/role-management/app/assign")
+        def assign():
+            impl.add_user2apps2roles("admin", "carol", "app1", "manager")
+            return {"ok": True}
+
+        app.add_middleware(ETagMiddleware)
+        client = TestClient(app)
+        url = "/api/v1/apps?env=dev"
+        etag = client.get(url, headers={"x-user": "bob"}).headers["etag"]
+
+        assert client.post("/api/v1/role-management/app/assign", headers={"x-user": "admin"}).status_code == 200
+
+        response = client.get(url, headers={"x-user": "bob", "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json() == {"app1": {"managedby": ["carol"]}}
+        assert response.headers["etag"] != etag
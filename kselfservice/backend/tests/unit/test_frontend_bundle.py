@@ -0,0 +1,195 @@
+"""
+Unit tests for the precompiled frontend bundle.
+
+Tests cover:
+- Bundle build (script order, hashed names, compressed siblings, rewritten index.html)
+- JSX transpilation with the vendored babel-standalone (needs Node.js)
+- PrecompressedStaticFiles (encoding negotiation, immutable caching, strong ETags, 304)
+"""
+import gzip
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.utils import frontend_bundle
+from backend.utils.frontend_bundle import (
+    IMMUTABLE_CACHE_CONTROL,
+    BundleError,
+    PrecompressedStaticFiles,
+    build_bundle,
+    content_hash,
+    load_manifest,
+)
+
+_REAL_BABEL = Path(frontend_bundle.FRONTEND_DIR) / "vendor" / "babel-standalone.min.js"
+
+INDEX_HTML = """<!doctype html>
+<html>
+  <head>
+    <link rel="stylesheet" href="/static/css/styles.css" />
+  </head>
+  <body>
+    <div id="root"></div>
+
+    <script src="/static/vendor/react.js"></script>
+    <script src="/static/vendor/babel-standalone.min.js"></script>
+
+    <!-- 1. Services -->
+    <script type="text/babel" data-presets="react" src="/static/js/one.js"></script>
+    <!-- 2. Views -->
+    <script type="text/babel" data-presets="react" src="/static/js/two.js"></script>
+  </body>
+</html>
+"""
+
+
+@pytest.fixture
+def frontend(tmp_path):
+    root = tmp_path / "frontend"
+    (root / "vendor").mkdir(parents=True)
+    (root / "js").mkdir()
+    (root / "css").mkdir()
+    (root / "index.html").write_text(INDEX_HTML)
+    (root / "vendor" / "react.js").write_text("window.React = {};\n")
+    if _REAL_BABEL.exists():
+        shutil.copy(_REAL_BABEL, root / "vendor" / "babel-standalone.min.js")
+    else:
+        (root / "vendor" / "babel-standalone.min.js").write_text("/* babel */\n")
+    (root / "js" / "one.js").write_text("const greet = (name) => 'hi ' + name;\n")
+    (root / "js" / "two.js").write_text("function View() { return <div className=\"x\">{greet('a')}</div>; }\n")
+    (root / "css" / "styles.css").write_text("body { margin: 0; }\n" * 50)
+    return root
+
+
+def dist_file(frontend, manifest, key):
+    return (frontend / "dist" / manifest["files"][key]).read_text()
+
+
+class TestBuild:
+    """Tests for build_bundle."""
+
+    def test_bundles_are_hashed_and_compressed(self, frontend):
+        manifest = build_bundle(frontend, transpile_jsx=False)
+        dist = frontend / "dist"
+
+        for key, hashed in manifest["files"].items():
+            data = (dist / hashed).read_bytes()
+            assert hashed.split(".")[-2] == content_hash(data)
+            assert gzip.decompress((dist / (hashed + ".gz")).read_bytes()) == data
+        assert manifest["sources"]["app.js"] == ["js/one.js", "js/two.js"]
+        assert json.loads((dist / "manifest.json").read_text()) == manifest
+        assert load_manifest(frontend) == manifest
+
+    def test_without_transpile_ships_one_babel_script(self, frontend):
+        manifest = build_bundle(frontend, transpile_jsx=False)
+
+        assert manifest["transpiled"] is False
+        assert "babel-standalone" in " ".join(manifest["sources"]["vendor.js"])
+        app = dist_file(frontend, manifest, "app.js")
+        assert app.index("const greet") < app.index("function View")
+        html = (frontend / "dist" / "index.html").read_text()
+        assert f'type="text/babel" data-presets="react" src="/static/dist/{manifest["files"]["app.js"]}"' in html
+
+    def test_index_html_references_only_bundles(self, frontend):
+        manifest = build_bundle(frontend, transpile_jsx=False)
+        html = (frontend / "dist" / "index.html").read_text()
+
+        assert html.count("<script") == 2
+        assert "<!--" not in html
+        assert f'href="/static/dist/{manifest["files"]["css/styles.css"]}"' in html
+        assert html.index(manifest["files"]["vendor.js"]) < html.index(manifest["files"]["app.js"])
+
+    def test_rebuild_replaces_previous_output(self, frontend):
+        first = build_bundle(frontend, transpile_jsx=False)
+        (frontend / "js" / "one.js").write_text("const greet = (name) => 'hello ' + name;\n")
+        second = build_bundle(frontend, transpile_jsx=False)
+
+        assert first["files"]["app.js"] != second["files"]["app.js"]
+        assert second["files"]["vendor.js"] == first["files"]["vendor.js"]
+        assert not (frontend / "dist" / first["files"]["app.js"]).exists()
+        assert [p.name for p in frontend.iterdir() if p.name.startswith(".")] == []
+
+    def test_missing_script_fails_without_touching_dist(self, frontend):
+        build_bundle(frontend, transpile_jsx=False)
+        before = sorted(p.name for p in (frontend / "dist").iterdir())
+        (frontend / "js" / "two.js").unlink()
+
+        with pytest.raises(BundleError, match="js/two.js"):
+            build_bundle(frontend, transpile_jsx=False)
+        assert sorted(p.name for p in (frontend / "dist").iterdir()) == before
+
+    @pytest.mark.skipif(shutil.which("node") is None or not _REAL_BABEL.exists(), reason="needs Node.js")
+    def test_transpile_compiles_jsx_once(self, frontend):
+        manifest = build_bundle(frontend)
+
+        assert manifest["transpiled"] is True
+        assert manifest["sources"]["vendor.js"] == ["vendor/react.js"]
+        app = dist_file(frontend, manifest, "app.js")
+        assert "React.createElement(\"div\"" in app and "<div" not in app
+        html = (frontend / "dist" / "index.html").read_text()
+        assert "text/babel" not in html and "babel-standalone" not in html
+
+    @pytest.mark.skipif(shutil.which("node") is None or not _REAL_BABEL.exists(), reason="needs Node.js")
+    def test_transpile_error_names_the_file(self, frontend):
+        (frontend / "js" / "two.js").write_text("function View() { return <div>; }\n")
+        with pytest.raises(BundleError, match="two.js"):
+            build_bundle(frontend)
+
+
+class TestPrecompressedStaticFiles:
+    """Tests for serving the built bundle."""
+
+    @pytest.fixture
+    def client(self, frontend):
+        manifest = build_bundle(frontend, transpile_jsx=False)
+        app = FastAPI()
+        app.mount("/static/dist", PrecompressedStaticFiles(directory=str(frontend / "dist")))
+        return TestClient(app), manifest
+
+    def test_gzip_sibling_is_served_with_immutable_caching(self, client):
+        client, manifest = client
+        css = manifest["files"]["css/styles.css"]
+        response = client.get(f"/static/dist/{css}", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["content-type"].startswith("text/css")
+        assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert response.headers["etag"] == f'"{css.split(".")[-2]}-gzip"'
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) < len(response.content)
+        assert response.text == "body { margin: 0; }\n" * 50
+
+    def test_identity_when_compression_not_accepted(self, client):
+        client, manifest = client
+        css = manifest["files"]["css/styles.css"]
+        response = client.get(f"/static/dist/{css}", headers={"Accept-Encoding": "gzip;q=0, identity"})
+
+        assert "content-encoding" not in response.headers
+        assert response.headers["etag"] == f'"{css.split(".")[-2]}"'
+        assert int(response.headers["content-length"]) == len(response.content)
+
+    def test_if_none_match_returns_304(self, client):
+        client, manifest = client
+        url = f"/static/dist/{manifest['files']['app.js']}"
+        etag = client.get(url, headers={"Accept-Encoding": "gzip"}).headers["etag"]
+
+        response = client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+        assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+        # The gzip validator does not match the identity representation
+        response = client.get(url, headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+        assert response.status_code == 200
+
+    def test_unhashed_files_keep_default_headers(self, client):
+        client, _ = client
+        response = client.get("/static/dist/manifest.json")
+        assert response.status_code == 200
+        assert "cache-control" not in response.headers
@@ -0,0 +1,26 @@
+"""
+Unit tests for the shared HTTP header helpers.
+
+Tests cover:
+- Accept-Encoding parsing (q values, malformed q, wildcard expansion)
+"""
+import pytest
+
+from backend.utils.http import accepted_encodings
+
+
+class TestAcceptedEncodings:
+    """Tests for accepted_encodings."""
+
+    @pytest.mark.parametrize("header,expected", [
+        ("gzip, deflate, br", {"gzip", "deflate", "br"}),
+        ("br;q=0, gzip;q=0.5", {"gzip"}),
+        ("GZIP;q=bad, br", {"br"}),
+        ("*", {"*", "br", "gzip"}),
+        ("", set()),
+    ])
+    def test_accepted_encodings(self, header, expected):
+        assert accepted_encodings(header, ("br", "gzip")) == expected
+
+    def test_wildcard_without_supported_codings(self):
+        assert accepted_encodings("*;q=1") == {"*"}
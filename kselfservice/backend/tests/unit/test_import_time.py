@@ -0,0 +1,88 @@
+"""
+Import-time budget for backend.main.
+
+Runs ``python -X importtime -c "import backend.main"`` in a fresh interpreter
+and fails when startup import cost regresses.
+
+Tests cover:
+- Heavy modules (requests, casbin) are imported on first use, not at startup
+- The Casbin enforcer and role stores are not loaded and logging is not set up at import
+- Time spent in backend.* modules stays under IMPORT_TIME_BUDGET_MS
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Tuple
+
+import pytest
+
+# Directory containing the backend package
+_ROOT = Path(__file__).resolve().parents[3]
+
+# Imported lazily (GitHub calls, enforcer build); must not come back on the import path
+DEFERRED_MODULES = ("requests", "urllib3", "casbin")
+
+# Self time of backend.* modules, in ms: ~1.5x the ~475 ms measured locally, so
+# noise passes but a regression of a few hundred ms does not
+DEFAULT_BUDGET_MS = 750
+
+
+def run_importtime(tmp_path) -> Tuple[Dict[str, Tuple[int, int]], str]:
+    """Import backend.main in a subprocess; return {module: (self_us, cumulative_us)} and stdout."""
+    env = dict(os.environ)
+    env.update({"HOME": str(tmp_path), "TRACE_SAMPLE_RATIO": "0", "PYTHONDONTWRITEBYTECODE": "1"})
+    env.pop("LOG_FILE", None)
+    probe = (
+        "import backend.main\n"
+        "from backend.auth import rbac\n"
+        "from backend.auth.role_mgmt_impl import RoleMgmtImpl\n"
+        "from backend.config import logging_config\n"
+        "print(rbac._ENFORCER is None, RoleMgmtImpl._instance is None, logging_config._queue_listener is None)\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=str(_ROOT), env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    modules: Dict[str, Tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        try:
+            modules[name.strip()] = (int(self_us), int(cumulative_us))
+        except ValueError:
+            continue  # header line
+    return modules, proc.stdout
+
+
+@pytest.fixture(scope="module")
+def runs(tmp_path_factory):
+    # Two runs; the faster one is compared with the budget to dampen noise
+    return [run_importtime(tmp_path_factory.mktemp("home")) for _ in range(2)]
+
+
+class TestImportTime:
+    """Startup import cost of the application module."""
+
+    def test_heavy_modules_are_deferred(self, runs):
+        modules, _ = runs[0]
+        assert "backend.main" in modules
+        eager = [m for m in modules if m.split(".")[0] in DEFERRED_MODULES]
+        assert eager == [], f"imported at startup: {sorted(eager)}"
+
+    def test_enforcer_role_stores_and_logging_set_up_in_lifespan(self, runs):
+        _, stdout = runs[0]
+        assert stdout.strip().splitlines()[-1] == "True True True"
+
+    def test_backend_import_time_within_budget(self, runs):
+        budget_ms = float(os.getenv("IMPORT_TIME_BUDGET_MS", DEFAULT_BUDGET_MS))
+        backend_ms = min(
+            sum(self_us for name, (self_us, _) in modules.items() if name.split(".")[0] == "backend") / 1000
+            for modules, _ in runs
+        )
+        assert backend_ms <= budget_ms, (
+            f"backend.* modules took {backend_ms:.0f} ms to import (budget {budget_ms:.0f} ms); "
+            f"defer heavy imports or raise IMPORT_TIME_BUDGET_MS deliberately"
+        )
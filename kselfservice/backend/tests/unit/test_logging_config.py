@@ -0,0 +1,161 @@
+"""
+Unit tests for the queue-based logging pipeline.
+
+Tests cover:
+- Non-blocking bounded queue with drop policy and drop reporting
+- Sampling of successful request logs under load, decided once per request
+- Listener output and flush on shutdown
+"""
+import json
+import logging
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from backend.config import logging_config
+from backend.config.logging_config import BoundedQueueHandler, SuccessSamplingFilter
+from backend.middleware import logging as logging_middleware
+from backend.middleware.logging import RequestLoggingMiddleware
+
+
+def make_record(msg: str, level: int = logging.INFO, **extra) -> logging.LogRecord:
+    record = logging.LogRecord("test", level, __file__, 1, msg, None, None)
+    for k, v in extra.items():
+        setattr(record, k, v)
+    return record
+
+
+class TestBoundedQueueHandler:
+    """Tests for the drop policy."""
+
+    def test_full_queue_drops_info_and_keeps_warnings(self):
+        handler = BoundedQueueHandler(max_size=2)
+        handler.handle(make_record("a"))
+        handler.handle(make_record("b"))
+        handler.handle(make_record("c"))                       # dropped
+        handler.handle(make_record("w", level=logging.WARNING))  # evicts "a"
+
+        queued = [handler.queue.get_nowait().getMessage() for _ in range(2)]
+        assert queued == ["b", "w"]
+        assert handler.dropped == 2
+
+    def test_drops_are_reported_when_room_returns(self):
+        handler = BoundedQueueHandler(max_size=2)
+        handler.handle(make_record("a"))
+        handler.handle(make_record("b"))
+        handler.handle(make_record("c"))  # dropped
+        handler.queue.get_nowait()
+        handler.queue.get_nowait()
+
+        handler.handle(make_record("d"))
+
+        messages = [handler.queue.get_nowait().getMessage() for _ in range(handler.queue.qsize())]
+        assert messages == ["d", "Log queue full: dropped 1 log record(s)"]
+        assert handler.dropped == 1
+
+    def test_prepare_keeps_exception_info(self):
+        handler = BoundedQueueHandler(max_size=5)
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            record = logging.LogRecord("test", logging.ERROR, __file__, 1, "failed %s", ("x",), sys.exc_info())
+        prepared = handler.prepare(record)
+        assert prepared.msg == "failed x" and prepared.args is None
+        assert prepared.exc_info[0] is RuntimeError
+
+
+class TestSuccessSamplingFilter:
+    """Tests for request log sampling."""
+
+    def test_unsampled_below_threshold_and_for_unkeyed_records(self):
+        flt = SuccessSamplingFilter(rate=0.0, qps_threshold=5)
+        kept = [flt.filter(make_record("ok", sample_key=f"r{i}")) for i in range(5)]
+        assert all(kept)
+        assert flt.filter(make_record("error line"))
+
+    def test_sampling_is_consistent_per_request(self):
+        flt = SuccessSamplingFilter(rate=0.5, qps_threshold=0)
+        decisions = {}
+        for i in range(200):
+            decisions[f"r{i}"] = flt.filter(make_record("started", sample_key=f"r{i}"))
+        assert 40 < sum(decisions.values()) < 160
+        for key, kept in list(decisions.items())[:20]:
+            assert flt.filter(make_record("completed", sample_key=key)) == kept
+
+    def test_threshold_is_exact_across_threads(self, monkeypatch):
+        monkeypatch.setattr(logging_config, "time", SimpleNamespace(monotonic=lambda: 100.0))
+        flt = SuccessSamplingFilter(rate=0.0, qps_threshold=1000)
+        barrier = threading.Barrier(8)
+        kept = []
+
+        def log_many():
+            barrier.wait()
+            kept.append(sum(flt.filter(make_record("completed", sample_key=f"r{i}")) for i in range(500)))
+
+        threads = [threading.Thread(target=log_many) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert sum(kept) == 1000
+
+    def test_middleware_samples_only_successful_completion_lines(self, monkeypatch):
+        records = []
+        monkeypatch.setattr(logging_middleware.logger, "handle", records.append)
+        monkeypatch.setattr(logging_middleware.logger, "isEnabledFor", lambda level: True)
+        app = FastAPI()
+
+        @app.get("/ok")
+        def ok():
+            return {}
+
+        @app.get("/missing")
+        def missing():
+            raise HTTPException(status_code=404)
+
+        app.add_middleware(RequestLoggingMiddleware)
+        client = TestClient(app)
+        client.get("/ok")
+        client.get("/missing")
+
+        started = [r for r in records if r.getMessage().startswith("Request started")]
+        completed = [r for r in records if r.getMessage().startswith("Request completed")]
+        assert [r.levelno for r in started] == [logging.DEBUG, logging.DEBUG]
+        assert not any(hasattr(r, "sample_key") for r in started)
+        assert completed[0].sample_key == completed[0].request_id
+        assert not hasattr(completed[1], "sample_key")
+
+
+class TestSetupAndShutdown:
+    """Tests for the listener pipeline."""
+
+    @pytest.fixture
+    def restore_logging(self):
+        root = logging.getLogger()
+        saved = list(root.handlers), root.level
+        yield
+        logging_config.shutdown_logging()
+        root.handlers[:] = saved[0]
+        root.setLevel(saved[1])
+
+    def test_records_are_written_by_listener_and_flushed(self, tmp_path, restore_logging):
+        log_file = tmp_path / "app.log"
+        logging_config.setup_logging(log_level="INFO", log_file=str(log_file), json_logs=True)
+        log = logging.getLogger("backend.test")
+        for i in range(50):
+            log.info("line %d", i, extra={"request_id": f"r{i}"})
+
+        logging_config.shutdown_logging()
+
+        lines = [json.loads(l) for l in log_file.read_text().splitlines()]
+        messages = [l["message"] for l in lines if l["logger"] == "backend.test"]
+        assert messages == [f"line {i}" for i in range(50)]
+        assert lines[-1]["request_id"] == "r49"
+
+        # After shutdown, loggers write through directly
+        log.warning("late")
+        assert "late" in log_file.read_text()
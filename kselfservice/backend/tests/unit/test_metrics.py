@@ -0,0 +1,132 @@
+"""
+Unit tests for the in-process Prometheus metrics registry and middleware.
+
+Tests cover:
+- Counter, gauge and histogram text rendering
+- git / GitHub call tracking and the YAML parse counter (all backend parses go through yaml_utils)
+- Per-route-template request metrics recorded by MetricsMiddleware
+"""
+import re
+import subprocess
+from pathlib import Path
+
+import pytest
+import yaml
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from backend.middleware.metrics import MetricsMiddleware
+from backend.utils import metrics
+from backend.utils.metrics import Counter, Gauge, Histogram, MetricsRegistry
+from backend.utils.yaml_utils import load_yaml, load_yaml_all
+
+
+class TestMetricsRegistry:
+    """Tests for metric primitives and text exposition."""
+
+    def test_render_counter_gauge_and_histogram(self):
+        registry = MetricsRegistry()
+        counter = registry.register(Counter("jobs_total", "Jobs.", ("kind",)))
+        gauge = registry.register(Gauge("queue_depth", "Depth."))
+        hist = registry.register(Histogram("job_seconds", "Latency.", buckets=(0.1, 1.0)))
+        counter.inc("a")
+        counter.inc("a", amount=2)
+        gauge.set(3)
+        hist.observe(0.05)
+        hist.observe(0.5)
+        hist.observe(5)
+
+        text = registry.render()
+
+        assert "# TYPE jobs_total counter" in text
+        assert 'jobs_total{kind="a"} 3' in text
+        assert "queue_depth 3" in text
+        assert 'job_seconds_bucket{le="0.1"} 1' in text
+        assert 'job_seconds_bucket{le="1"} 2' in text
+        assert 'job_seconds_bucket{le="+Inf"} 3' in text
+        assert "job_seconds_count 3" in text
+        assert "job_seconds_sum 5.55" in text
+
+    def test_label_count_is_enforced(self):
+        counter = Counter("x_total", "X.", ("a", "b"))
+        with pytest.raises(ValueError):
+            counter.inc("only-one")
+
+    def test_duplicate_registration_rejected(self):
+        registry = MetricsRegistry()
+        registry.register(Counter("dup_total", "Dup."))
+        with pytest.raises(ValueError):
+            registry.register(Counter("dup_total", "Dup."))
+
+
+class TestOperationCounters:
+    """Tests for git, GitHub and YAML instrumentation."""
+
+    def test_track_git_labels_subcommand_and_outcome(self):
+        before_ok = metrics.GIT_RUNS.value("fetch", "ok")
+        before_err = metrics.GIT_RUNS.value("push", "error")
+
+        with metrics.track_git(["-C", "/tmp/repo", "fetch", "--all"]):
+            pass
+        with pytest.raises(subprocess.CalledProcessError):
+            with metrics.track_git(["push", "origin", "main"]):
+                raise subprocess.CalledProcessError(1, "git push")
+
+        assert metrics.GIT_RUNS.value("fetch", "ok") == before_ok + 1
+        assert metrics.GIT_RUNS.value("push", "error") == before_err + 1
+
+    def test_track_github_records_status(self):
+        before = metrics.GITHUB_CALLS.value("GET", "200")
+        with metrics.track_github("get") as call:
+            call.status = "200"
+        assert metrics.GITHUB_CALLS.value("GET", "200") == before + 1
+
+    def test_yaml_parses_are_counted(self):
+        before = metrics.YAML_PARSES.value()
+        assert load_yaml("a: 1") == {"a": 1}
+        assert load_yaml_all("a: 1\n---\nb: 2") == [{"a": 1}, {"b": 2}]
+        assert metrics.YAML_PARSES.value() == before + 2
+
+    def test_backend_parses_go_through_yaml_utils(self):
+        backend_dir = Path(metrics.__file__).resolve().parents[1]
+        # settings.py sits below yaml_utils in the import graph and only reads the config at startup
+        exempt = {backend_dir / "utils" / "yaml_utils.py", backend_dir / "config" / "settings.py"}
+        direct = [
+            str(path.relative_to(backend_dir))
+            for path in backend_dir.rglob("*.py")
+            if "tests" not in path.parts and path not in exempt
+            and re.search(r"\byaml\.(safe_|full_|unsafe_)?load(_all)?\(", path.read_text())
+        ]
+        assert direct == []
+
+    def test_yaml_module_is_not_patched(self):
+        assert yaml.load.__module__ == "yaml"
+        assert yaml.load_all.__module__ == "yaml"
+
+
+class TestMetricsMiddleware:
+    """Tests for per-route request metrics."""
+
+    def test_records_route_template_and_status(self):
+        router = APIRouter()
+
+        @router.get("/apps/{appname}")
+        def get_app(appname: str):
+            return {"appname": appname}
+
+        app = FastAPI()
+        app.include_router(router, prefix="/api/v1")
+        app.add_middleware(MetricsMiddleware)
+        client = TestClient(app)
+        template = "/api/v1/apps/{appname}"
+        before = metrics.HTTP_REQUESTS.value("GET", template, "200")
+        before_missing = metrics.HTTP_REQUESTS.value("GET", "<unmatched>", "404")
+
+        client.get("/api/v1/apps/one")
+        client.get("/api/v1/apps/two")
+        client.get("/nope")
+
+        assert metrics.HTTP_REQUESTS.value("GET", template, "200") == before + 2
+        assert metrics.HTTP_REQUEST_DURATION.count("GET", template) >= 2
+        assert metrics.HTTP_REQUESTS.value("GET", "<unmatched>", "404") == before_missing + 1
+        assert metrics.HTTP_REQUESTS_IN_FLIGHT.value("GET") == 0
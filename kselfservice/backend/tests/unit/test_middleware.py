@@ -0,0 +1,89 @@
+"""
+Unit tests for the ASGI request logging and read-only middlewares.
+
+Tests cover:
+- Request ID exposure on request.state and the X-Request-ID header
+- Streaming responses passing through unchanged
+- Read-only blocking of modifying methods and the `_yaml` preview exemption
+"""
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from backend.config.settings import is_readonly
+from backend.middleware.logging import RequestLoggingMiddleware
+from backend.middleware.readonly import ReadOnlyMiddleware
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/echo-id")
+    def echo_id(request: Request):
+        return {"request_id": request.state.request_id}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"a", b"b", b"c"]), media_type="text/plain")
+
+    @app.post("/things")
+    def create_thing():
+        return {"ok": True}
+
+    @app.post("/things/rolebinding_yaml")
+    def preview_thing():
+        return {"yaml": ""}
+
+    app.add_middleware(RequestLoggingMiddleware)
+    app.add_middleware(ReadOnlyMiddleware)
+    return app
+
+
+@pytest.fixture
+def client():
+    return TestClient(build_app())
+
+
+@pytest.fixture(autouse=True)
+def clear_readonly_cache():
+    # is_readonly() is lru_cached; reset it around env changes.
+    is_readonly.cache_clear()
+    yield
+    is_readonly.cache_clear()
+
+
+class TestRequestLoggingMiddleware:
+    """Tests for request id tracking."""
+
+    def test_request_id_on_state_and_header(self, client):
+        """The id seen by the handler is the one returned in X-Request-ID."""
+        resp = client.get("/echo-id")
+        assert resp.status_code == 200
+        assert resp.json()["request_id"] == resp.headers["X-Request-ID"]
+
+    def test_streaming_response_passes_through(self, client):
+        """Streaming bodies are forwarded intact with the request id header."""
+        resp = client.get("/stream")
+        assert resp.text == "abc"
+        assert resp.headers["X-Request-ID"]
+
+
+class TestReadOnlyMiddleware:
+    """Tests for read-only mode blocking."""
+
+    def test_writes_allowed_when_not_readonly(self, client, monkeypatch):
+        monkeypatch.setenv("READONLY", "false")
+        assert client.post("/things").status_code == 200
+
+    def test_writes_blocked_when_readonly(self, client, monkeypatch):
+        """Modifying requests get a 403 while reads still work."""
+        monkeypatch.setenv("READONLY", "true")
+        resp = client.post("/things")
+        assert resp.status_code == 403
+        assert "read-only" in resp.json()["detail"]
+        assert client.get("/echo-id").status_code == 200
+
+    def test_yaml_previews_allowed_when_readonly(self, client, monkeypatch):
+        monkeypatch.setenv("READONLY", "true")
+        assert client.post("/things/rolebinding_yaml").status_code == 200
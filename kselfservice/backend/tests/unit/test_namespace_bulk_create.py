@@ -0,0 +1,171 @@
+"""
+Unit tests for bulk namespace creation.
+
+Tests cover:
+- All namespaces written like single creates; the pull request ensured once
+- Up-front validation of names, duplicates, existing namespaces, clusters and
+  egress IP capacity across the whole set, with nothing written on failure
+- Rollback of already created namespaces when a write fails
+- The bulk create is journalled as a namespace create
+"""
+import pytest
+import yaml
+
+from backend.exceptions.custom import AppError, NotFoundError, ValidationError
+from backend.middleware.etag import write_change
+from backend.models import NamespaceBulkCreate
+from backend.routers import namespaces as namespaces_router
+from backend.services import namespace_service as namespace_service_module
+from backend.services.namespace_service import NamespaceService
+
+
+def _write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(yaml.safe_dump(data))
+
+
+@pytest.fixture
+def app_dir(tmp_path, monkeypatch):
+    """A dev workspace with app1 (namespace "existing") and clusters c1, c2, c3."""
+    workspace = tmp_path / "workspace"
+    repos = workspace / "kselfserv" / "cloned-repositories"
+    monkeypatch.setenv("HOME", str(tmp_path))
+    _write(tmp_path / ".kselfserve" / "kselfserveconfig.yaml", {"workspace": str(workspace)})
+
+    _write(repos / "control" / "clusters" / "dev_clusters.yaml", [
+        {"clustername": "c1", "egress_ip_ranges": [{"start_ip": "10.0.0.1", "end_ip": "10.0.0.3"}]},
+        {"clustername": "c2", "egress_ip_ranges": [{"start_ip": "10.1.0.1", "end_ip": "10.1.0.1"}]},
+        {"clustername": "c3"},
+    ])
+    _write(repos / "rendered_dev" / "ip_provisioning" / "c1" / "egressip-allocated.yaml", {"app2_e9": ["10.0.0.1"]})
+
+    app = repos / "requests" / "apprequests" / "dev" / "app1"
+    _write(app / "existing" / "namespace_info.yaml", {"clusters": ["c1"]})
+    return app
+
+
+@pytest.fixture
+def service():
+    return NamespaceService()
+
+
+def _namespaces(app_dir):
+    return sorted(p.name for p in app_dir.iterdir() if p.is_dir())
+
+
+class TestCreateNamespaces:
+    """Tests for NamespaceService.create_namespaces."""
+
+    def test_creates_all_like_single_creates(self, app_dir, service):
+        result = service.create_namespaces("dev", "app1", [
+            {"namespace": "ns1", "clusters": ["c1", ["c2"]], "egress_nameid": "e1"},
+            {"namespace": " ns2 ", "clusters": None, "egress_nameid": None},
+        ])
+
+        single = service.create_namespace("dev", "app1", "ns3", ["c1", ["c2"]], "e1")
+        assert result[0] == {**single, "name": "ns1"}
+        assert [r["name"] for r in result] == ["ns1", "ns2"]
+        assert yaml.safe_load((app_dir / "ns1" / "namespace_info.yaml").read_text()) == {
+            "clusters": ["c1", "c2"],
+            "egress_nameid": "e1",
+        }
+        assert yaml.safe_load((app_dir / "ns2" / "namespace_info.yaml").read_text()) == {"clusters": []}
+
+    def test_reports_every_problem_and_writes_nothing(self, app_dir, service):
+        with pytest.raises(ValidationError) as exc:
+            service.create_namespaces("dev", "app1", [
+                {"namespace": "ok"},
+                {"namespace": "Bad_Name"},
+                {"namespace": ""},
+                {"namespace": "dup"},
+                {"namespace": "dup"},
+                {"namespace": "existing"},
+                {"namespace": "lost", "clusters": ["c1", "c9"]},
+            ])
+
+        assert exc.value.field == "namespaces"
+        message = exc.value.details["message"]
+        assert "Bad_Name: Invalid namespace name" in message
+        assert "<empty>: is required" in message
+        assert "dup: listed more than once" in message
+        assert "existing: already exists" in message
+        assert "lost: unknown clusters in dev: c9" in message
+        assert "ok" not in message
+        assert _namespaces(app_dir) == ["existing"]
+
+    def test_egress_capacity_counts_the_whole_set(self, app_dir, service):
+        # c1 has two free IPs and c2 one; three new egress_nameids need one each
+        with pytest.raises(ValidationError) as exc:
+            service.create_namespaces("dev", "app1", [
+                {"namespace": "a", "clusters": ["c1", "c2"], "egress_nameid": "e1"},
+                {"namespace": "b", "clusters": ["c1"], "egress_nameid": "e2"},
+                {"namespace": "c", "clusters": ["c1"], "egress_nameid": "e3"},
+                {"namespace": "d", "clusters": ["c2", "c3"], "egress_nameid": "e1"},
+            ])
+
+        message = exc.value.details["message"]
+        assert "No free egress IPs remaining for cluster c1" in message
+        assert "No egress_ip_ranges configured for cluster c3" in message
+        assert "cluster c2" not in message
+        assert _namespaces(app_dir) == ["existing"]
+
+    def test_shared_egress_nameid_needs_one_ip_per_cluster(self, app_dir, service):
+        result = service.create_namespaces("dev", "app1", [
+            {"namespace": f"ns{i}", "clusters": ["c1", "c2"], "egress_nameid": "e1"} for i in range(5)
+        ])
+        assert len(result) == 5
+
+    def test_failed_write_rolls_back(self, app_dir, service, monkeypatch):
+        write_yaml_dict = namespace_service_module.write_yaml_dict
+        written = []
+
+        def failing_write(path, data, **kwargs):
+            if len(written) == 2:
+                raise OSError("disk full")
+            written.append(path)
+            write_yaml_dict(path, data, **kwargs)
+
+        monkeypatch.setattr(namespace_service_module, "write_yaml_dict", failing_write)
+
+        with pytest.raises(AppError) as exc:
+            service.create_namespaces("dev", "app1", [{"namespace": f"ns{i}"} for i in range(4)])
+
+        assert "disk full" in exc.value.message
+        assert _namespaces(app_dir) == ["existing"]
+
+    def test_missing_app_and_empty_request(self, app_dir, service):
+        with pytest.raises(NotFoundError):
+            service.create_namespaces("dev", "missing", [{"namespace": "ns1"}])
+        with pytest.raises(ValidationError):
+            service.create_namespaces("dev", "app1", [])
+
+
+class TestCreateNamespacesEndpoint:
+    """Tests for POST /apps/{appname}/namespaces/bulk."""
+
+    def test_pull_request_is_ensured_once(self, app_dir, service, monkeypatch):
+        ensured = []
+        monkeypatch.setattr(namespaces_router, "_try_ensure_pull_request", lambda env, app: ensured.append((env, app)))
+        payload = NamespaceBulkCreate(namespaces=[{"namespace": f"ns{i}", "clusters": ["c1"]} for i in range(40)])
+
+        result = namespaces_router.create_namespaces_bulk("app1", payload, "dev", None, service)
+
+        assert result["appname"] == "app1" and result["env"] == "dev"
+        assert len(result["namespaces"]) == 40
+        assert ensured == [("dev", "app1")]
+
+    def test_pull_request_is_not_ensured_on_failure(self, app_dir, service, monkeypatch):
+        ensured = []
+        monkeypatch.setattr(namespaces_router, "_try_ensure_pull_request", lambda env, app: ensured.append((env, app)))
+        payload = NamespaceBulkCreate(namespaces=[{"namespace": "existing"}])
+
+        with pytest.raises(ValidationError):
+            namespaces_router.create_namespaces_bulk("app1", payload, "dev", None, service)
+        assert ensured == []
+
+    def test_journalled_as_namespace_create(self):
+        assert write_change("POST", "/api/v1/apps/app1/namespaces/bulk", "dev") == (
+            ("dev", "app1"),
+            "namespace",
+            "create",
+        )
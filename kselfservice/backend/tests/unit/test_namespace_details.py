@@ -0,0 +1,164 @@
+"""
+Unit tests for the aggregated namespace details endpoint.
+
+Tests cover:
+- Every section matches the body of its own namespace endpoint
+- The namespace directory is resolved once and each file read once
+- Field selection, unknown fields, per-section errors, missing namespace
+- The basic info PUT answers with the GET body
+"""
+from pathlib import Path
+
+import pytest
+import yaml
+
+from backend.exceptions.custom import NotFoundError, ValidationError
+from backend.middleware.etag import etag_scope
+from backend.models import NamespaceInfoBasicUpdate
+from backend.repositories.namespace_repository import NamespaceRepository
+from backend.routers import ns_basicInfo, ns_details, ns_egress_ip
+from backend.services.namespace_details_service import NAMESPACE_DETAIL_SECTIONS, NamespaceDetailsService
+from backend.services.ns_egress_ip_service import NsEgressIpService
+
+
+def _write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(data if isinstance(data, str) else yaml.safe_dump(data))
+
+
+@pytest.fixture
+def ns_dir(tmp_path, monkeypatch):
+    """A workspace with app1/ns1 in dev, with every namespace file set."""
+    workspace = tmp_path / "workspace"
+    repos = workspace / "kselfserv" / "cloned-repositories"
+    monkeypatch.setenv("HOME", str(tmp_path))
+    _write(tmp_path / ".kselfserve" / "kselfserveconfig.yaml", {"workspace": str(workspace)})
+
+    app_dir = repos / "requests" / "apprequests" / "dev" / "app1"
+    _write(app_dir / "argocd.yaml", {"argocd": True})
+    ns = app_dir / "ns1"
+    _write(ns / "namespace_info.yaml", {
+        "clusters": ["c1", "c2"],
+        "egress_nameid": "e1",
+        "enable_pod_based_egress_ip": True,
+        "generate_argo_app": "true",
+    })
+    _write(ns / "nsargocd.yaml", {"need_argo": "true", "argocd_sync_strategy": "auto", "gitrepourl": "https://git/x"})
+    _write(ns / "resourcequota.yaml", {"spec": {"hard": {"requests.cpu": "2", "requests.memory": "4Gi"}}})
+    _write(ns / "limitrange.yaml", {"spec": {"limits": [{"type": "Container", "default": {"cpu": "1"}}]}})
+    _write(ns / "rolebinding_requests.yaml", [{"subjects": [{"kind": "Group", "name": "devs"}], "roleRef": {"name": "view"}}])
+    _write(ns / "egress_firewall_requests.yaml", [{"type": "Allow", "to": {"dnsName": "example.com"}}])
+    _write(repos / "rendered_dev" / "ip_provisioning" / "c1" / "egressip-allocated.yaml", {"app1_e1": ["10.0.0.5"]})
+    return ns
+
+
+@pytest.fixture
+def service():
+    return NamespaceDetailsService()
+
+
+class TestNamespaceDetails:
+    """Tests for NamespaceDetailsService.get_details."""
+
+    def test_sections_match_their_endpoints(self, ns_dir, service):
+        result = service.get_details("dev", "app1", "ns1")
+
+        assert result["errors"] == {}
+        assert list(result["sections"]) == list(NAMESPACE_DETAIL_SECTIONS)
+        sections = result["sections"]
+        assert sections["basic"] == service.get_basic_info("dev", "app1", "ns1")
+        assert sections["egress"] == ns_egress_ip.get_namespace_info_egress(
+            "app1", "ns1", "dev", service, NsEgressIpService()
+        )
+        assert sections["egress"]["allocated_egress_ips"] == [{"c1": "10.0.0.5"}, {"c2": ""}]
+        assert sections["egress_ip"] == service.get_egress_info("dev", "app1", "ns1")
+        assert sections["resourcequota"] == service.get_resourcequota("dev", "app1", "ns1")
+        assert sections["limitrange"] == service.get_limitrange("dev", "app1", "ns1")
+        assert sections["rolebindings"] == service.get_rolebindings("dev", "app1", "ns1")
+        assert sections["egressfirewall"] == service.get_egressfirewall("dev", "app1", "ns1")
+        assert sections["nsargocd"] == service.get_nsargocd("dev", "app1", "ns1")
+        assert sections["basic"]["status"] == "Argo used"
+
+    def test_basic_reports_disabled_argo_as_not_used(self, ns_dir, service):
+        _write(ns_dir / "nsargocd.yaml", {"need_argo": "false", "gitrepourl": "https://git/x"})
+
+        basic = service.get_details("dev", "app1", "ns1", ["basic"])["sections"]["basic"]
+
+        assert basic == service.get_basic_info("dev", "app1", "ns1")
+        assert basic["need_argo"] is False
+        assert basic["status"] == "Argo not used"
+        assert service._basic_info_from("dev", "app1", {}, {"need_argo": "false"})["need_argo"] is False
+
+    def test_directory_resolved_and_files_read_once(self, ns_dir, service, monkeypatch):
+        resolved = []
+        get_namespace_dir = service.repo.get_namespace_dir
+        monkeypatch.setattr(
+            service.repo, "get_namespace_dir", lambda *args: resolved.append(args) or get_namespace_dir(*args)
+        )
+        reads = []
+        read_text = Path.read_text
+        monkeypatch.setattr(Path, "read_text", lambda self, *a, **k: reads.append(self) or read_text(self, *a, **k))
+
+        service.get_details("dev", "app1", "ns1")
+
+        assert resolved == [("dev", "app1", "ns1")]
+        ns_reads = sorted(p.name for p in reads if p.parent == ns_dir)
+        assert ns_reads == sorted(p.name for p in ns_dir.iterdir())
+
+    def test_field_selection(self, ns_dir, service):
+        result = service.get_details("dev", "app1", "ns1", ["limitrange", "basic", "limitrange"])
+        assert list(result["sections"]) == ["limitrange", "basic"]
+
+    def test_unknown_field_is_rejected(self, ns_dir, service):
+        with pytest.raises(ValidationError) as exc:
+            service.get_details("dev", "app1", "ns1", ["basic", "pods"])
+        assert exc.value.field == "fields"
+        assert "pods" in exc.value.message
+
+    def test_failing_section_does_not_fail_the_others(self, ns_dir, service):
+        (ns_dir / "rolebinding_requests.yaml").write_text("subjects: [unclosed")
+
+        result = service.get_details("dev", "app1", "ns1")
+
+        assert "rolebindings" not in result["sections"]
+        assert result["errors"]["rolebindings"]["type"] == "app_error"
+        assert "Failed to read RoleBinding" in result["errors"]["rolebindings"]["detail"]
+        assert len(result["sections"]) == len(NAMESPACE_DETAIL_SECTIONS) - 1
+
+    def test_missing_namespace(self, ns_dir, service):
+        with pytest.raises(NotFoundError):
+            service.get_details("dev", "app1", "missing")
+
+
+class TestNamespaceDetailsEndpoint:
+    """Tests for GET /apps/{appname}/namespaces/{namespace}/details."""
+
+    def test_fields_parameter(self, ns_dir, service):
+        result = ns_details.get_namespace_details("app1", "ns1", "dev", " nsargocd, ,egress_ip", service)
+        assert list(result["sections"]) == ["nsargocd", "egress_ip"]
+
+    def test_env_is_required(self, ns_dir, service):
+        with pytest.raises(ValidationError):
+            ns_details.get_namespace_details("app1", "ns1", None, None, service)
+
+    def test_has_etags(self):
+        assert etag_scope("/api/v1/apps/app1/namespaces/ns1/details", "dev") == (
+            ("dev", "app1", "ns1"),
+            "/api/v1/apps/{appname}/namespaces/{namespace}/details",
+        )
+
+
+class TestNamespaceInfoBasicEndpoint:
+    """Tests for PUT /apps/{appname}/namespaces/{namespace}/namespace_info/basic."""
+
+    def test_put_returns_the_get_body(self, ns_dir, service, monkeypatch):
+        monkeypatch.setattr(ns_basicInfo.pull_requests, "ensure_pull_request", lambda **kwargs: None)
+        payload = NamespaceInfoBasicUpdate(namespace_info={"clusters": ["c1"]})
+
+        result = ns_basicInfo.put_namespace_info_basic(
+            "app1", "ns1", payload, "dev", NamespaceRepository(), service, NsEgressIpService()
+        )
+
+        assert result == service.get_basic_info("dev", "app1", "ns1")
+        assert result["clusters"] == ["c1"]
+        assert result["status"] == "Argo used"
@@ -0,0 +1,179 @@
+"""
+Unit tests for whole-app namespace promotion between environments.
+
+Tests cover:
+- All or selected namespaces copied under the same names, files intact
+- metadata.namespace and mapped clusters rewritten during the copy
+- Up-front validation (missing, already promoted, unmapped clusters, egress
+  IP capacity in the target env) with nothing written on failure
+- Parallel copies, rollback when a copy fails
+- One pull request ensure per promotion; journalled as a workspace write
+"""
+import threading
+import time
+
+import pytest
+import yaml
+
+from backend.exceptions.custom import AppError, NotFoundError, ValidationError
+from backend.middleware.etag import write_change
+from backend.models import NamespacePromoteRequest
+from backend.routers import namespaces as namespaces_router
+from backend.services import namespace_service as namespace_service_module
+from backend.services.namespace_service import NamespaceService
+
+
+def _write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(data if isinstance(data, str) else yaml.safe_dump(data))
+
+
+@pytest.fixture
+def apps(tmp_path, monkeypatch):
+    """app1 in dev (web, api, jobs on dev clusters) and qa (empty), with qa clusters q1, q2."""
+    workspace = tmp_path / "workspace"
+    repos = workspace / "kselfserv" / "cloned-repositories"
+    monkeypatch.setenv("HOME", str(tmp_path))
+    _write(tmp_path / ".kselfserve" / "kselfserveconfig.yaml", {"workspace": str(workspace)})
+
+    _write(repos / "control" / "clusters" / "qa_clusters.yaml", [
+        {"clustername": "q1", "egress_ip_ranges": [{"start_ip": "10.2.0.1", "end_ip": "10.2.0.1"}]},
+        {"clustername": "q2", "egress_ip_ranges": [{"start_ip": "10.3.0.1", "end_ip": "10.3.0.9"}]},
+    ])
+
+    root = repos / "requests" / "apprequests"
+    dev = root / "dev" / "app1"
+    _write(dev / "web" / "namespace_info.yaml", {"clusters": ["d1", "d2"], "egress_nameid": "e1"})
+    _write(dev / "web" / "nsargocd.yaml", {"need_argo": "true", "gitrepourl": "https://git/web"})
+    _write(dev / "web" / "extra" / "cm.yaml", "kind: ConfigMap\nmetadata:\n  name: cm\n  namespace: old\n---\nkind: Secret\n")
+    _write(dev / "web" / "notes.txt", "keep me\n")
+    _write(dev / "api" / "namespace_info.yaml", {"clusters": ["d1"]})
+    _write(dev / "jobs" / "namespace_info.yaml", {"clusters": ["q2"]})
+    (root / "qa" / "app1").mkdir(parents=True)
+    return {"dev": dev, "qa": root / "qa" / "app1"}
+
+
+@pytest.fixture
+def service():
+    return NamespaceService()
+
+
+CLUSTER_MAP = {"d1": "q1", "d2": "q2"}
+
+
+def _names(app_dir):
+    return sorted(p.name for p in app_dir.iterdir() if p.is_dir())
+
+
+class TestPromoteNamespaces:
+    """Tests for NamespaceService.promote_namespaces."""
+
+    def test_promotes_all_namespaces(self, apps, service):
+        result = service.promote_namespaces("app1", "dev", "qa", cluster_map=CLUSTER_MAP)
+
+        assert _names(apps["qa"]) == ["api", "jobs", "web"]
+        assert result["namespaces"] == [
+            {"namespace": "api", "clusters": ["q1"]},
+            {"namespace": "jobs", "clusters": ["q2"]},
+            {"namespace": "web", "clusters": ["q1", "q2"]},
+        ]
+        assert result["summary"] == "Promoted 3 namespaces of app1 from dev to qa: api, jobs, web"
+
+        web = apps["qa"] / "web"
+        assert yaml.safe_load((web / "namespace_info.yaml").read_text()) == {
+            "clusters": ["q1", "q2"],
+            "egress_nameid": "e1",
+        }
+        assert (web / "nsargocd.yaml").read_text() == (apps["dev"] / "web" / "nsargocd.yaml").read_text()
+        assert (web / "notes.txt").read_text() == "keep me\n"
+        docs = list(yaml.safe_load_all((web / "extra" / "cm.yaml").read_text()))
+        assert docs[0]["metadata"]["namespace"] == "web"
+        assert docs[1] == {"kind": "Secret"}
+        # The source is untouched
+        assert yaml.safe_load((apps["dev"] / "web" / "namespace_info.yaml").read_text())["clusters"] == ["d1", "d2"]
+
+    def test_promotes_selected_namespaces(self, apps, service):
+        result = service.promote_namespaces("app1", "dev", "qa", ["jobs", "api", "jobs"], CLUSTER_MAP)
+        assert [ns["namespace"] for ns in result["namespaces"]] == ["jobs", "api"]
+        assert result["summary"].startswith("Promoted 2 namespaces")
+        assert _names(apps["qa"]) == ["api", "jobs"]
+
+    def test_reports_every_problem_and_writes_nothing(self, apps, service):
+        (apps["qa"] / "api").mkdir()
+        with pytest.raises(ValidationError) as exc:
+            service.promote_namespaces("app1", "dev", "qa", ["web", "api", "gone", "../dev"], {"d2": "q2"})
+
+        message = exc.value.details["message"]
+        assert "web: clusters not in qa: d1" in message
+        assert "api: already exists in qa" in message
+        assert "gone: not found in dev" in message
+        assert "../dev: Invalid namespace name" in message
+        assert _names(apps["qa"]) == ["api"]
+
+    def test_egress_capacity_in_the_target_env(self, apps, service):
+        _write(apps["dev"] / "api" / "namespace_info.yaml", {"clusters": ["d1"], "egress_nameid": "e2"})
+        with pytest.raises(ValidationError) as exc:
+            service.promote_namespaces("app1", "dev", "qa", cluster_map=CLUSTER_MAP)
+
+        message = exc.value.details["message"]
+        assert "No free egress IPs remaining for cluster q1" in message
+        assert "cluster q2" not in message
+        assert _names(apps["qa"]) == []
+
+    def test_copies_run_in_parallel(self, apps, service, monkeypatch):
+        monkeypatch.setenv("PROMOTION_CONCURRENCY", "3")
+        copy_dir = namespace_service_module._copy_namespace_dir
+        state = {"running": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def slow_copy(*args):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.1)
+            with lock:
+                state["running"] -= 1
+            copy_dir(*args)
+
+        monkeypatch.setattr(namespace_service_module, "_copy_namespace_dir", slow_copy)
+        service.promote_namespaces("app1", "dev", "qa", cluster_map=CLUSTER_MAP)
+        assert state["peak"] == 3
+
+    def test_failed_copy_rolls_back(self, apps, service, monkeypatch):
+        copy_dir = namespace_service_module._copy_namespace_dir
+
+        def failing_copy(src_dir, dst_dir, namespace, ns_info):
+            copy_dir(src_dir, dst_dir, namespace, ns_info)
+            if namespace == "jobs":
+                raise OSError("disk full")
+
+        monkeypatch.setattr(namespace_service_module, "_copy_namespace_dir", failing_copy)
+
+        with pytest.raises(AppError) as exc:
+            service.promote_namespaces("app1", "dev", "qa", cluster_map=CLUSTER_MAP)
+
+        assert "disk full" in exc.value.message
+        assert _names(apps["qa"]) == []
+
+    def test_same_env_and_missing_app(self, apps, service):
+        with pytest.raises(ValidationError):
+            service.promote_namespaces("app1", "dev", "dev")
+        with pytest.raises(NotFoundError):
+            service.promote_namespaces("app1", "dev", "prd")
+
+
+class TestPromoteNamespacesEndpoint:
+    """Tests for POST /apps/{appname}/namespaces/promote."""
+
+    def test_pull_request_is_ensured_once_for_the_target_env(self, apps, service, monkeypatch):
+        ensured = []
+        monkeypatch.setattr(namespaces_router, "_try_ensure_pull_request", lambda env, app: ensured.append((env, app)))
+        payload = NamespacePromoteRequest(to_env="QA", cluster_map=CLUSTER_MAP)
+
+        result = namespaces_router.promote_namespaces("app1", payload, "dev", None, service)
+
+        assert len(result["namespaces"]) == 3
+        assert ensured == [("qa", "app1")]
+
+    def test_journalled_as_a_workspace_write(self):
+        assert write_change("POST", "/api/v1/apps/app1/namespaces/promote", "dev") == ((), "workspace", "update")
@@ -0,0 +1,165 @@
+"""
+Unit tests for on-demand request profiling.
+
+Tests cover:
+- Stack sampling anchored at one endpoint call (not other threads running the
+  same endpoint) and collapsed-stack output
+- Ring buffer eviction of old profiles
+- Profile flag parsing and the Casbin PROFILE permission (platform_admin only)
+- Middleware capture of a profiled request, retrievable by request id, without
+  concurrent requests to the same endpoint
+"""
+import sys
+import threading
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.auth.rbac import check_permission
+from backend.middleware import profiling
+from backend.middleware.profiling import PROFILE_ACT, PROFILE_OBJ, ProfilingMiddleware, profile_requested
+from backend.utils import profiler
+from backend.utils.profiler import ProfileStore, StackSampler, anchor_endpoints
+
+
+def busy_leaf(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def other_leaf(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def busy_endpoint(seconds: float, leaf=busy_leaf) -> None:
+    leaf(seconds)
+
+
+def make_context(roles):
+    return {"username": "u", "roles": roles, "groups": [], "app_roles": {}}
+
+
+class TestStackSampler:
+    """Tests for the sampling profiler core."""
+
+    def test_samples_are_anchored_at_one_call(self):
+        """Only stacks above the anchor frame are kept, not other threads in the same function."""
+        sampler = StackSampler(interval_ms=1)
+
+        def anchored_call():
+            sampler.anchor(threading.get_ident(), sys._getframe())
+            busy_endpoint(0.2)
+
+        worker = threading.Thread(target=anchored_call)
+        other = threading.Thread(target=busy_endpoint, args=(0.2, other_leaf))
+        sampler.start()
+        worker.start()
+        other.start()
+        worker.join()
+        other.join()
+        sampler.stop()
+
+        assert sampler.samples > 0
+        lines = sampler.collapsed().splitlines()
+        assert all(line.startswith("busy_endpoint (") for line in lines)
+        assert any(";busy_leaf (" in line for line in lines)
+        assert not any("other_leaf" in line for line in lines)
+
+    def test_only_the_first_anchor_counts(self):
+        sampler = StackSampler(interval_ms=1)
+        frame = sys._getframe()
+        assert sampler.anchor(1, frame)
+        assert not sampler.anchor(2, frame)
+
+    def test_ring_buffer_evicts_oldest(self):
+        store = ProfileStore(max_profiles=2)
+        for i in range(3):
+            store.add({"request_id": f"r{i}", "collapsed": ""})
+        assert store.get("r0") is None
+        assert [p["request_id"] for p in store.summaries()] == ["r2", "r1"]
+        assert "collapsed" not in store.summaries()[0]
+
+
+class TestProfilingFlagAndPermission:
+    """Tests for how profiling is requested and authorized."""
+
+    def test_profile_requested_by_header_or_query(self):
+        assert profile_requested({"headers": [(b"x-profile", b"1")]})
+        assert profile_requested({"headers": [], "query_string": b"env=dev&_profile=true"})
+        assert not profile_requested({"headers": [], "query_string": b"env=dev"})
+        assert not profile_requested({"headers": [(b"x-profile", b"0")]})
+
+    def test_only_platform_admin_may_profile(self):
+        assert check_permission(make_context(["platform_admin"]), PROFILE_OBJ, PROFILE_ACT)
+        assert not check_permission(make_context(["viewall"]), PROFILE_OBJ, PROFILE_ACT)
+        assert not check_permission(make_context(["role_mgmt_admin"]), PROFILE_OBJ, PROFILE_ACT)
+
+
+class TestProfilingMiddleware:
+    """Tests for capturing profiles through the middleware."""
+
+    def build_client(self, monkeypatch, roles):
+        monkeypatch.setattr(profiling, "get_current_user_context", lambda request: make_context(roles))
+        monkeypatch.setattr(profiler, "_store", ProfileStore(max_profiles=5))
+        app = FastAPI()
+
+        @app.get("/slow")
+        def slow(other: bool = False):
+            busy_endpoint(0.1, other_leaf if other else busy_leaf)
+            return {"ok": True}
+
+        @app.get("/slow_async")
+        async def slow_async():
+            busy_endpoint(0.1)
+            return {"ok": True}
+
+        anchor_endpoints(app)
+        app.add_middleware(ProfilingMiddleware)
+        return TestClient(app)
+
+    def test_admin_request_is_profiled(self, monkeypatch):
+        client = self.build_client(monkeypatch, ["platform_admin"])
+
+        resp = client.get("/slow", headers={"X-Profile": "1"})
+
+        profile_id = resp.headers["X-Profile-Id"]
+        profile = profiler.get_profile_store().get(profile_id)
+        assert profile["path"] == "/slow"
+        assert profile["samples"] > 0
+        assert "busy_leaf (" in profile["collapsed"]
+
+    def test_async_endpoint_is_profiled(self, monkeypatch):
+        client = self.build_client(monkeypatch, ["platform_admin"])
+
+        resp = client.get("/slow_async", headers={"X-Profile": "1"})
+
+        profile = profiler.get_profile_store().get(resp.headers["X-Profile-Id"])
+        assert profile["samples"] > 0
+        assert all(line.startswith("slow_async (") for line in profile["collapsed"].splitlines())
+
+    def test_concurrent_requests_to_the_endpoint_are_not_sampled(self, monkeypatch):
+        client = self.build_client(monkeypatch, ["platform_admin"])
+        others = [threading.Thread(target=client.get, args=("/slow?other=1",)) for _ in range(2)]
+        for t in others:
+            t.start()
+
+        resp = client.get("/slow", headers={"X-Profile": "1"})
+        for t in others:
+            t.join()
+
+        profile = profiler.get_profile_store().get(resp.headers["X-Profile-Id"])
+        assert "busy_leaf (" in profile["collapsed"]
+        assert "other_leaf" not in profile["collapsed"]
+
+    def test_flag_ignored_for_other_roles(self, monkeypatch):
+        client = self.build_client(monkeypatch, ["viewall"])
+
+        resp = client.get("/slow?_profile=1")
+
+        assert resp.status_code == 200
+        assert "X-Profile-Id" not in resp.headers
+        assert profiler.get_profile_store().summaries() == []
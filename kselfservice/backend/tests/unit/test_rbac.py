@@ -9,6 +9,7 @@ Tests cover:
 - Per-app role permissions (manager, viewer)
 - Permission checking helper functions
 - Edge cases and permission boundaries
+- Enforcer reload when the policy file changes
 """
 import pytest
 from pathlib import Path
@@ -494,3 +495,42 @@ class TestCalculateResourcePermissions:
         assert permissions["canView"] is False
         assert permissions["canManage"] is False
 
+
+@pytest.mark.skipif(not RBAC_AVAILABLE, reason="RBAC module not available")
+class TestPolicyReload:
+    """Tests for enforcer reloads, done off the request path."""
+
+    def test_edited_policy_is_picked_up_on_reload_only(self, tmp_path, monkeypatch):
+        """Requests keep the current enforcer; the watcher's reload swaps in the edit."""
+        from backend.auth import rbac
+
+        policy = tmp_path / "casbin_policy.csv"
+        policy.write_text(rbac.POLICY_PATH.read_text())
+        monkeypatch.setattr(rbac, "POLICY_PATH", policy)
+        rbac.reload_enforcer()
+        try:
+            assert check_permission(VIEWALL_USER, "/reports", "GET") is False
+
+            with policy.open("a") as f:
+                f.write("\np, viewall, /reports, GET, True\n")
+            assert check_permission(VIEWALL_USER, "/reports", "GET") is False
+
+            rbac.reload_enforcer()
+            assert check_permission(VIEWALL_USER, "/reports", "GET") is True
+        finally:
+            monkeypatch.undo()
+            rbac.reload_enforcer()
+
+    def test_reload_takes_the_reload_lock(self):
+        """A watcher reload waits for a rebuild already in progress."""
+        import threading
+
+        from backend.auth import rbac
+
+        done = threading.Event()
+        with rbac._reload_lock:
+            worker = threading.Thread(target=lambda: (rbac.reload_enforcer(), done.set()))
+            worker.start()
+            assert not done.wait(0.2)
+        worker.join(5)
+        assert done.is_set()
@@ -0,0 +1,86 @@
+"""
+Unit tests for per-request I/O accounting and the Server-Timing header.
+
+Tests cover:
+- Exclusive timing of nested categories and no-ops outside a request
+- The timed_methods class decorator used by the repositories
+- Server-Timing header with fs/yaml time, files read and bytes parsed from a sync handler
+"""
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.middleware.logging import RequestLoggingMiddleware
+from backend.utils.request_timing import (
+    current_request_timing,
+    reset_request_timing,
+    start_request_timing,
+    timed,
+    timed_methods,
+)
+from backend.utils.yaml_utils import read_yaml_dict
+
+
+class TestRequestTiming:
+    """Tests for the accumulator."""
+
+    def test_nested_categories_are_exclusive(self):
+        timing, token = start_request_timing()
+        try:
+            with timed("fs"):
+                time.sleep(0.02)
+                with timed("yaml"):
+                    time.sleep(0.03)
+        finally:
+            reset_request_timing(token)
+
+        assert 0.025 <= timing.seconds["yaml"] < 0.05
+        assert 0.015 <= timing.seconds["fs"] < 0.03
+        assert timing.calls == {"yaml": 1, "fs": 1, "rbac": 0, "git": 0, "github": 0}
+
+    def test_noop_outside_request(self):
+        assert current_request_timing() is None
+        with timed("fs"):
+            pass
+
+    def test_timed_methods_wraps_staticmethods(self):
+        @timed_methods("fs")
+        class Repo:
+            @staticmethod
+            def load():
+                return 42
+
+            def _private(self):
+                return 1
+
+        timing, token = start_request_timing()
+        try:
+            assert Repo.load() == 42
+            assert Repo()._private() == 1
+        finally:
+            reset_request_timing(token)
+        assert timing.calls["fs"] == 1
+
+
+class TestServerTimingHeader:
+    """Tests for the Server-Timing header set by RequestLoggingMiddleware."""
+
+    def test_sync_handler_io_is_reported(self, tmp_path):
+        data_file = tmp_path / "appinfo.yaml"
+        data_file.write_text("description: demo\n")
+        app = FastAPI()
+
+        @app.get("/info")
+        def info():
+            return read_yaml_dict(data_file)
+
+        app.add_middleware(RequestLoggingMiddleware)
+        resp = TestClient(app).get("/info")
+
+        header = resp.headers["Server-Timing"]
+        assert resp.json() == {"description": "demo"}
+        assert 'fs;dur=' in header
+        assert 'yaml;dur=' in header
+        assert 'files;desc="1 read, 18 bytes parsed"' in header
+        assert "total;dur=" in header
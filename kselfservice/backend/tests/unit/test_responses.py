@@ -0,0 +1,141 @@
+"""
+Unit tests for FastJSONResponse.
+
+Tests cover:
+- Compact serialization (orjson and the stdlib fallback)
+- Negotiated gzip above RESPONSE_GZIP_MIN_BYTES
+- Returning the response bypasses response_model validation
+"""
+import gzip
+import json
+from typing import Any, Dict
+
+import anyio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from backend.utils import responses
+from backend.utils.responses import FastJSONResponse, dumps
+
+
+def make_apps(n):
+    return {
+        f"app{i:05d}": {
+            "appname": f"app{i:05d}",
+            "description": "Payments ✓",
+            "managedby": ["team-a"],
+            "clusters": ["c1", "c2"],
+            "totalns": i % 7,
+            "argocd": bool(i % 2),
+            "permissions": {"canView": True, "canManage": False},
+        }
+        for i in range(n)
+    }
+
+
+class Item(BaseModel):
+    name: str
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.get("/apps", response_model=Dict[str, Dict[str, Any]], response_class=FastJSONResponse)
+    def list_apps(n: int = 3):
+        return FastJSONResponse(make_apps(n))
+
+    return TestClient(app)
+
+
+class TestSerialization:
+    """Tests for dumps / render."""
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_matches_stdlib_json(self, monkeypatch, use_orjson):
+        if not use_orjson:
+            monkeypatch.setattr(responses, "orjson", None)
+        elif responses.orjson is None:
+            pytest.skip("orjson not installed")
+        content = {"apps": make_apps(3), "n": 1.5, "none": None}
+
+        body = dumps(content)
+        assert json.loads(body) == content
+        assert b": " not in body and b", " not in body
+        assert "Payments ✓".encode() in body
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_unsupported_values_go_through_jsonable_encoder(self, monkeypatch, use_orjson):
+        if not use_orjson:
+            monkeypatch.setattr(responses, "orjson", None)
+        elif responses.orjson is None:
+            pytest.skip("orjson not installed")
+        assert json.loads(dumps({"item": Item(name="a"), "tags": {"x"}})) == {"item": {"name": "a"}, "tags": ["x"]}
+
+
+class TestGzip:
+    """Tests for negotiated compression."""
+
+    def test_large_body_is_gzipped_when_accepted(self, client):
+        response = client.get("/apps?n=200", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) < len(response.content) / 4
+        assert response.json() == make_apps(200)
+
+    def test_not_gzipped_without_accept_encoding(self, client):
+        response = client.get("/apps?n=200", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) == len(response.content)
+
+    def test_small_body_is_not_gzipped(self, client):
+        response = client.get("/apps?n=1", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert "vary" not in response.headers
+
+    def test_threshold_is_configurable(self, client, monkeypatch):
+        monkeypatch.setenv("RESPONSE_GZIP_MIN_BYTES", "0")
+        response = client.get("/apps?n=1", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+
+    def test_body_is_valid_gzip(self):
+        response = FastJSONResponse(make_apps(100))
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "method": "GET", "headers": [(b"accept-encoding", b"gzip, br")]}
+        anyio.run(response, scope, receive, send)
+        assert json.loads(gzip.decompress(messages[1]["body"])) == make_apps(100)
+
+
+class TestResponseModelBypass:
+    """Tests for skipping response_model validation."""
+
+    def test_returned_response_is_not_validated(self):
+        app = FastAPI()
+
+        @app.get("/apps", response_model=Dict[str, Dict[str, Any]], response_class=FastJSONResponse)
+        def list_apps():
+            # Would fail response_model validation (value is not a dict)
+            return FastJSONResponse({"app1": ["not", "a", "dict"]})
+
+        response = TestClient(app).get("/apps")
+        assert response.status_code == 200
+        assert response.json() == {"app1": ["not", "a", "dict"]}
+
+    def test_openapi_keeps_the_response_model(self, client):
+        schema = client.get("/openapi.json").json()
+        content = schema["paths"]["/apps"]["get"]["responses"]["200"]["content"]
+        assert content["application/json"]["schema"]["type"] == "object"
@@ -0,0 +1,265 @@
+"""
+Unit tests for RoleMgmtImpl role store persistence.
+
+These tests exercise the YAML-backed role stores against a temporary
+workspace without requiring a running server.
+
+Tests cover:
+- Only modified stores are rewritten on add/del
+- Batched mutations flush once and roll back on failure
+- Reverse indexes (app -> role holders, group -> members)
+- Bulk user role resolution
+- Cross-worker invalidation through the generation file, reloaded by the RBAC watcher
+"""
+import pytest
+import yaml
+
+from backend.auth import rbac_watcher
+from backend.auth.rbac import get_user_context
+from backend.auth.role_mgmt_impl import RoleMgmtImpl
+
+
+@pytest.fixture
+def impl(tmp_path, monkeypatch):
+    """Create a RoleMgmtImpl rooted at a temporary workspace."""
+    monkeypatch.setenv("WORKSPACE", str(tmp_path))
+    monkeypatch.setenv("DEMO_MODE", "false")
+    return RoleMgmtImpl()
+
+
+def _rbac_dir(tmp_path):
+    return tmp_path / "kselfserv" / "cloned-repositories" / "control" / "rbac"
+
+
+class TestDirtyTracking:
+    """Tests for per-store dirty tracking."""
+
+    def test_add_writes_only_changed_store(self, impl, tmp_path):
+        """Adding a user app role writes only userid_app_roles.yaml."""
+        impl.add_user2apps2roles("admin", "alice", "app1", "viewer")
+
+        rbac_dir = _rbac_dir(tmp_path)
+        assert sorted(p.name for p in rbac_dir.iterdir()) == ["userid_app_roles.yaml"]
+        data = yaml.safe_load((rbac_dir / "userid_app_roles.yaml").read_text())
+        assert data == {"alice": {"app1": ["viewer"]}}
+
+    def test_noop_mutation_does_not_write(self, impl, tmp_path):
+        """Re-adding an existing role or deleting a missing one skips the write."""
+        impl.add_grps2globalroles("admin", "ops", "viewall")
+        path = _rbac_dir(tmp_path) / "group_global_roles.yaml"
+        path.write_text("sentinel: true\n")
+
+        impl.add_grps2globalroles("admin", "ops", "viewall")
+        impl.del_grps2globalroles("admin", "ops", "platform_admin")
+
+        assert path.read_text() == "sentinel: true\n"
+
+    def test_no_temp_files_left_behind(self, impl, tmp_path):
+        """Atomic writes do not leave temporary files in the rbac directory."""
+        impl.add_users2globalroles("admin", "bob", "viewall")
+        impl.del_users2globalroles("admin", "bob", "viewall")
+
+        names = [p.name for p in _rbac_dir(tmp_path).iterdir()]
+        assert names == ["user_global_roles.yaml"]
+
+
+class TestBatch:
+    """Tests for batched role mutations."""
+
+    def test_batch_flushes_once(self, impl, monkeypatch):
+        """All mutations in a batch are persisted with a single write per store."""
+        writes = []
+        original = RoleMgmtImpl._atomic_write
+        monkeypatch.setattr(
+            RoleMgmtImpl, "_atomic_write",
+            staticmethod(lambda path, text: (writes.append(path.name), original(path, text))),
+        )
+
+        with impl.batch():
+            for i in range(200):
+                impl.add_user2apps2roles("admin", f"user{i}", "app1", "viewer")
+            impl.add_grp2apps2roles("admin", "team", "app1", "manager")
+
+        assert sorted(writes) == ["group_app_roles.yaml", "userid_app_roles.yaml"]
+        assert len(impl.get_user2apps2roles()) == 200
+
+    def test_batch_rolls_back_on_error(self, impl, tmp_path):
+        """A failing batch leaves memory and disk unchanged."""
+        impl.add_user2apps2roles("admin", "alice", "app1", "viewer")
+
+        with pytest.raises(ValueError):
+            with impl.batch():
+                impl.add_user2apps2roles("admin", "bob", "app1", "viewer")
+                impl.add_user2apps2roles("admin", "", "app1", "viewer")
+
+        assert impl.get_user2apps2roles() == {"alice": {"app1": ["viewer"]}}
+        data = yaml.safe_load((_rbac_dir(tmp_path) / "userid_app_roles.yaml").read_text())
+        assert data == {"alice": {"app1": ["viewer"]}}
+
+
+class TestReverseIndexes:
+    """Tests for app and group reverse indexes."""
+
+    def test_managedby_tracks_mutations(self, impl):
+        """Manager lookups follow adds and deletes, users before groups."""
+        impl.add_grp2apps2roles("admin", "team", "app1", "manager")
+        impl.add_user2apps2roles("admin", "alice", "app1", "manager")
+        impl.add_user2apps2roles("admin", "bob", "app1", "viewer")
+        impl.add_user2apps2roles("admin", "carol", "app2", "manager")
+
+        assert impl.get_managedby_for_apps(["app1", "app2", "app3"]) == {
+            "app1": ["alice", "team"],
+            "app2": ["carol"],
+            "app3": [],
+        }
+
+        impl.del_user2apps2roles("admin", "alice", "app1", "manager")
+        impl.del_grp2apps2roles("admin", "team", "app1", "manager")
+        assert impl.get_app_managedby("app1") == []
+        assert impl.get_app_role_holders("app1", "viewer") == {"users": ["bob"], "groups": []}
+
+    def test_indexes_built_from_files(self, tmp_path, monkeypatch):
+        """Indexes are rebuilt when stores are loaded from disk."""
+        monkeypatch.setenv("WORKSPACE", str(tmp_path))
+        monkeypatch.setenv("DEMO_MODE", "false")
+        rbac_dir = _rbac_dir(tmp_path)
+        rbac_dir.mkdir(parents=True)
+        (rbac_dir / "userid_app_roles.yaml").write_text(yaml.safe_dump({"alice": {"app1": ["manager"]}}))
+        (rbac_dir / "user_groups.yaml").write_text(yaml.safe_dump({"alice": ["team"], "bob": ["team", "ops"]}))
+
+        impl = RoleMgmtImpl()
+
+        assert impl.get_app_managedby("app1") == ["alice"]
+        assert impl.get_group_members("team") == ["alice", "bob"]
+        assert impl.get_group_members("ops") == ["bob"]
+
+    def test_batch_rollback_restores_indexes(self, impl):
+        """A failed batch leaves the indexes matching the restored data."""
+        with pytest.raises(ValueError):
+            with impl.batch():
+                impl.add_user2apps2roles("admin", "alice", "app1", "manager")
+                raise ValueError("boom")
+
+        assert impl.get_app_managedby("app1") == []
+
+
+class TestReloadFromDisk:
+    """Tests for hot reload of externally edited stores."""
+
+    def test_reload_picks_up_external_edit(self, impl, tmp_path):
+        """Stores edited outside the process are swapped in with fresh indexes."""
+        impl.add_user2apps2roles("admin", "alice", "app1", "viewer")
+        path = _rbac_dir(tmp_path) / "userid_app_roles.yaml"
+        path.write_text(yaml.safe_dump({"alice": {"app1": ["viewer", "manager"]}}))
+
+        assert impl.reload_from_disk() is True
+        assert impl.get_app_managedby("app1") == ["alice"]
+
+    def test_reload_skipped_when_mutated_concurrently(self, impl, monkeypatch):
+        """A reload that raced with an in-process mutation is discarded."""
+        original = RoleMgmtImpl._read_stores
+
+        def racing_read(self, *args):
+            result = original(self, *args)
+            self.add_users2globalroles("admin", "bob", "viewall")
+            return result
+
+        monkeypatch.setattr(RoleMgmtImpl, "_read_stores", racing_read)
+        assert impl.reload_from_disk() is False
+        assert impl.get_users2globalroles() == {"bob": ["viewall"]}
+
+    def test_stores_missing_on_disk_are_copied(self, impl, tmp_path):
+        """Stores kept from memory are copied, not shared with the previous state."""
+        impl.add_user2apps2roles("admin", "alice", "app1", "viewer")
+        impl.add_users2globalroles("admin", "bob", "viewall")
+        previous = impl._data["user_global_roles"]
+        (_rbac_dir(tmp_path) / "user_global_roles.yaml").unlink()
+
+        assert impl.reload_from_disk() is True
+        previous["bob"].append("admin")
+        assert impl.get_users2globalroles() == {"bob": ["viewall"]}
+
+
+class TestMultiWorker:
+    """Tests for two instances sharing one workspace (as uvicorn workers do)."""
+
+    @pytest.fixture
+    def workers(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("WORKSPACE", str(tmp_path))
+        monkeypatch.setenv("DEMO_MODE", "false")
+        return RoleMgmtImpl(), RoleMgmtImpl()
+
+    def test_grant_is_visible_to_other_worker(self, workers):
+        """After a grant in one worker the other reloads on its next check, once."""
+        a, b = workers
+        assert b.refresh_if_changed() is False
+
+        a.add_user2apps2roles("admin", "alice", "app1", "manager")
+
+        assert b.refresh_if_changed() is True
+        assert b.get_app_managedby("app1") == ["alice"]
+        assert b.refresh_if_changed() is False
+        assert a.refresh_if_changed() is False
+
+    def test_watcher_reloads_other_workers_grant(self, workers, monkeypatch):
+        """The RBAC watcher, not the request path, brings in another worker's grant."""
+        a, b = workers
+        monkeypatch.setattr(RoleMgmtImpl, "_instance", b)
+        assert (b.generation_path.parent, b.generation_path.name) in rbac_watcher._targets()
+
+        a.add_user2apps2roles("admin", "alice", "app1", "manager")
+        assert get_user_context("alice")["app_roles"] == {}
+
+        rbac_watcher._on_change({b.generation_path})
+        assert b.get_app_managedby("app1") == ["alice"]
+        assert b.refresh_if_changed() is False
+
+    def test_stale_writer_does_not_drop_other_workers_change(self, workers, tmp_path):
+        """A write from a worker with stale stores merges instead of overwriting."""
+        a, b = workers
+        a.add_user2apps2roles("admin", "alice", "app1", "viewer")
+        b.add_user2apps2roles("admin", "bob", "app1", "viewer")
+        with b.batch():
+            b.add_users2globalroles("admin", "carol", "viewall")
+        a.add_users2globalroles("admin", "dave", "viewall")
+
+        data = yaml.safe_load((_rbac_dir(tmp_path) / "userid_app_roles.yaml").read_text())
+        assert data == {"alice": {"app1": ["viewer"]}, "bob": {"app1": ["viewer"]}}
+        assert a.get_users2globalroles() == {"carol": ["viewall"], "dave": ["viewall"]}
+
+    def test_coordination_files_stay_out_of_rbac_dir(self, workers, tmp_path):
+        """The generation and lock files live in the temp dir, not the control repo clone."""
+        a, _ = workers
+        a.add_grps2globalroles("admin", "ops", "viewall")
+        assert sorted(p.name for p in _rbac_dir(tmp_path).iterdir()) == ["group_global_roles.yaml"]
+        assert (tmp_path / "kselfserv" / "temp" / "role_stores.generation").read_text().strip() == "1"
+
+
+class TestUsersRoleDetails:
+    """Tests for bulk user role resolution."""
+
+    def test_resolves_direct_and_group_roles(self, tmp_path, monkeypatch):
+        """Each user gets direct, group and combined roles in one call."""
+        monkeypatch.setenv("WORKSPACE", str(tmp_path))
+        monkeypatch.setenv("DEMO_MODE", "false")
+        rbac_dir = _rbac_dir(tmp_path)
+        rbac_dir.mkdir(parents=True)
+        (rbac_dir / "user_groups.yaml").write_text(yaml.safe_dump({"alice": ["team"]}))
+        impl = RoleMgmtImpl()
+        impl.add_users2globalroles("admin", "alice", "viewall")
+        impl.add_grps2globalroles("admin", "team", "role_mgmt_admin")
+        impl.add_grp2apps2roles("admin", "team", "app1", "manager")
+        impl.add_user2apps2roles("admin", "bob", "app2", "viewer")
+
+        details = impl.get_users_role_details(["alice", "bob", " alice ", ""])
+
+        assert list(details) == ["alice", "bob"]
+        alice = details["alice"]
+        assert alice["groups"] == ["team"]
+        assert alice["user_global_roles"] == ["viewall"]
+        assert alice["group_global_roles"] == {"team": ["role_mgmt_admin"]}
+        assert alice["group_app_roles"] == {"team": {"app1": ["manager"]}}
+        assert alice["combined_global_roles"] == ["viewall", "role_mgmt_admin"]
+        assert alice["combined_app_roles"] == {"app1": ["manager"]}
+        assert details["bob"]["user_app_roles"] == {"app2": ["viewer"]}
+        assert details["bob"]["groups"] == []
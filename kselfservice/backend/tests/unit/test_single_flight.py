@@ -0,0 +1,175 @@
+"""
+Unit tests for single-flight coalescing of service calls.
+
+Tests cover:
+- Concurrent identical calls share one computation (result and exception)
+- No caching once a call has finished
+- Keys include arguments and the workspace generation of the scope
+- Per-user permissions are added to copies of the shared GET /apps result
+"""
+import threading
+import time
+
+import pytest
+
+from backend.routers import apps as apps_router
+from backend.utils import single_flight as single_flight_module
+from backend.utils import workspace_generation
+from backend.utils.metrics import SINGLE_FLIGHT_CALLS
+from backend.utils.single_flight import SingleFlight, single_flight
+from backend.utils.workspace_generation import WorkspaceGenerations
+
+
+@pytest.fixture
+def generations(tmp_path, monkeypatch):
+    instance = WorkspaceGenerations(tmp_path / "workspace.generations.json")
+    monkeypatch.setattr(workspace_generation, "_instance", instance)
+    return instance
+
+
+def _run_concurrently(n, target):
+    results = [None] * n
+    barrier = threading.Barrier(n)
+
+    def run(i):
+        barrier.wait()
+        try:
+            results[i] = target()
+        except Exception as exc:
+            results[i] = exc
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    return results
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight.do."""
+
+    def test_concurrent_calls_share_one_result(self):
+        group = SingleFlight()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"value": 42}
+
+        results = _run_concurrently(8, lambda: group.do("key", compute))
+        assert len(calls) == 1
+        assert all(result is results[0][0] for result, _ in results)
+        assert sorted(shared for _, shared in results) == [False] + [True] * 7
+        assert group.in_flight() == 0
+
+    def test_exception_is_shared(self):
+        group = SingleFlight()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            raise ValueError("boom")
+
+        results = _run_concurrently(4, lambda: group.do("key", compute))
+        assert len(calls) == 1
+        assert all(isinstance(r, ValueError) for r in results)
+
+    def test_finished_calls_are_not_cached(self):
+        group = SingleFlight()
+        assert group.do("key", lambda: 1) == (1, False)
+        assert group.do("key", lambda: 2) == (2, False)
+
+
+class Service:
+    def __init__(self, started=None, release=None):
+        self.calls = []
+        self.started = started
+        self.release = release
+
+    @single_flight(scope=lambda env: (env,))
+    def get_items(self, env):
+        self.calls.append(env)
+        if self.started is not None:
+            self.started.set()
+            self.release.wait(5)
+        return {"env": env, "call": len(self.calls)}
+
+
+class TestSingleFlightDecorator:
+    """Tests for the @single_flight service method decorator."""
+
+    def test_identical_calls_coalesce_and_other_args_do_not(self, generations):
+        before = SINGLE_FLIGHT_CALLS.value("Service.get_items", "shared")
+
+        started, release = threading.Event(), threading.Event()
+        service = Service(started, release)
+        leader = threading.Thread(target=lambda: service.get_items("dev"))
+        leader.start()
+        assert started.wait(5)
+        followers = [threading.Thread(target=lambda: service.get_items("dev")) for _ in range(3)]
+        other_env = threading.Thread(target=lambda: service.get_items("qa"))
+        for t in followers:
+            t.start()
+        time.sleep(0.1)
+        started.clear()
+        other_env.start()
+        assert started.wait(5)  # qa did not wait for dev
+        release.set()
+        for t in [leader, other_env, *followers]:
+            t.join(5)
+
+        assert sorted(service.calls) == ["dev", "qa"]
+        assert SINGLE_FLIGHT_CALLS.value("Service.get_items", "shared") - before == 3
+
+    def test_call_after_a_write_does_not_join_a_stale_computation(self, generations):
+        started, release = threading.Event(), threading.Event()
+        service = Service(started, release)
+        results = {}
+        stale = threading.Thread(target=lambda: results.setdefault("stale", service.get_items("dev")))
+        stale.start()
+        assert started.wait(5)
+
+        generations.bump("dev", "app1")
+        started.clear()
+        fresh = threading.Thread(target=lambda: results.setdefault("fresh", service.get_items("dev")))
+        fresh.start()
+        assert started.wait(5)
+        release.set()
+        stale.join(5)
+        fresh.join(5)
+        assert service.calls == ["dev", "dev"]
+        assert results["stale"] is not results["fresh"]
+
+    def test_unrelated_scope_write_keeps_the_key(self, generations, monkeypatch):
+        keys = []
+        monkeypatch.setattr(single_flight_module._GROUP, "do", lambda key, fn: (keys.append(key), (fn(), False))[1])
+        service = Service()
+        service.get_items("dev")
+        generations.bump("qa", "app1")
+        service.get_items("dev")
+        generations.bump("dev", "app1")
+        service.get_items("dev")
+        assert keys[0] == keys[1] != keys[2]
+
+
+def test_list_apps_adds_permissions_to_copies(monkeypatch):
+    shared = {"app1": {"appname": "app1"}, "app2": {"appname": "app2"}}
+
+    class FakeService:
+        def get_apps_for_env(self, env):
+            return shared
+
+    def add_permissions(items, user_context, template):
+        for item in items.values():
+            item["permissions"] = {"canView": True, "canManage": user_context["username"] == "admin"}
+
+    monkeypatch.setattr(apps_router, "add_permissions_to_items", add_permissions)
+    admin = apps_router.list_apps(None, "dev", FakeService(), {"username": "admin"})
+    viewer = apps_router.list_apps(None, "dev", FakeService(), {"username": "viewer"})
+
+    assert b'"canManage":true' in admin.body
+    assert b'"canManage":true' not in viewer.body
+    assert shared == {"app1": {"appname": "app1"}, "app2": {"appname": "app2"}}
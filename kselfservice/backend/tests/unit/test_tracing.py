@@ -0,0 +1,200 @@
+"""
+Unit tests for in-process tracing.
+
+Tests cover:
+- Span nesting and per-trace OTLP/JSON export
+- Trace-id ratio sampling and W3C traceparent handling
+- Exception recording, traced_methods and git/GitHub spans
+- TracingMiddleware (server span, threadpool propagation, X-Trace-Id)
+"""
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.middleware.tracing import TracingMiddleware
+from backend.utils import tracing
+from backend.utils.metrics import track_git, track_github
+from backend.utils.tracing import (
+    KIND_CLIENT,
+    KIND_SERVER,
+    STATUS_ERROR,
+    parse_traceparent,
+    span,
+    traced,
+    traced_methods,
+)
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    tracing.setup_tracing(sample_ratio=1.0, trace_file=str(path), max_bytes=0, backup_count=0)
+    yield path
+    tracing.shutdown_tracing()
+
+
+def read_traces(path):
+    """Flush the exporter and return the spans of each exported line."""
+    tracing.shutdown_tracing()
+    if not path.exists():
+        return []
+    traces = []
+    for line in path.read_text().splitlines():
+        payload = json.loads(line)
+        resource_spans = payload["resourceSpans"][0]
+        assert resource_spans["resource"]["attributes"][0]["key"] == "service.name"
+        traces.append(resource_spans["scopeSpans"][0]["spans"])
+    return traces
+
+
+def attrs(span_data):
+    return {a["key"]: list(a["value"].values())[0] for a in span_data["attributes"]}
+
+
+class TestSpans:
+    """Tests for span nesting and export."""
+
+    def test_disabled_tracing_records_nothing(self, tmp_path):
+        tracing.setup_tracing(sample_ratio=0.0, trace_file=str(tmp_path / "t.jsonl"))
+        with span("root") as s:
+            assert s.recording is False
+        assert tracing.current_span() is None
+        assert not (tmp_path / "t.jsonl").exists()
+
+    def test_nested_spans_are_exported_as_one_trace(self, trace_file):
+        with span("root", KIND_SERVER) as root:
+            with span("child", attributes={"n": 1}) as child:
+                with span("grandchild"):
+                    pass
+            assert tracing.current_span() is root
+
+        [spans] = read_traces(trace_file)
+        by_name = {s["name"]: s for s in spans}
+        assert [s["name"] for s in spans] == ["grandchild", "child", "root"]
+        assert {s["traceId"] for s in spans} == {root.trace_id}
+        assert "parentSpanId" not in by_name["root"]
+        assert by_name["child"]["parentSpanId"] == root.span_id
+        assert by_name["grandchild"]["parentSpanId"] == child.span_id
+        assert by_name["root"]["kind"] == KIND_SERVER
+        assert attrs(by_name["child"]) == {"n": "1"}
+        assert int(by_name["root"]["endTimeUnixNano"]) >= int(by_name["root"]["startTimeUnixNano"])
+
+    def test_exception_is_recorded_and_reraised(self, trace_file):
+        with pytest.raises(ValueError):
+            with span("root"):
+                raise ValueError("bad input")
+
+        [[root]] = read_traces(trace_file)
+        assert root["status"]["code"] == STATUS_ERROR
+        assert root["events"][0]["name"] == "exception"
+        assert attrs(root["events"][0])["exception.type"] == "ValueError"
+
+
+class TestSampling:
+    """Tests for sampling decisions."""
+
+    def test_ratio_applies_per_trace(self, tmp_path):
+        path = tmp_path / "t.jsonl"
+        tracing.setup_tracing(sample_ratio=0.25, trace_file=str(path))
+        for _ in range(400):
+            with span("root"):
+                with span("child") as child:
+                    # Children follow their trace's decision
+                    assert child.recording == tracing.current_span().recording
+        traces = read_traces(path)
+        assert 40 < len(traces) < 160
+        assert all(len(spans) == 2 for spans in traces)
+
+    def test_traceparent_is_honored(self, trace_file):
+        trace_id, parent_id = "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7"
+        parent = parse_traceparent(f"00-{trace_id}-{parent_id}-01")
+        with span("server", parent=parent):
+            pass
+        unsampled = parse_traceparent(f"00-{'1' * 32}-{parent_id}-00")
+        with span("server", parent=unsampled) as s:
+            assert s.recording is False
+
+        [[server]] = read_traces(trace_file)
+        assert server["traceId"] == trace_id
+        assert server["parentSpanId"] == parent_id
+
+    def test_invalid_traceparent_is_ignored(self):
+        assert parse_traceparent("garbage") is None
+        assert parse_traceparent(f"00-{'0' * 32}-00f067aa0ba902b7-01") is None
+
+
+class TestInstrumentation:
+    """Tests for the decorators and git/GitHub spans."""
+
+    def test_traced_methods_wraps_public_methods(self, trace_file):
+        @traced_methods
+        class Service:
+            def list_items(self):
+                return self._load()
+
+            def _load(self):
+                return [1]
+
+            @staticmethod
+            def helper():
+                return 2
+
+        with span("root"):
+            assert Service().list_items() == [1]
+            assert Service.helper() == 2
+
+        [spans] = read_traces(trace_file)
+        assert [s["name"] for s in spans] == ["Service.list_items", "Service.helper", "root"]
+        assert attrs(spans[0])["code.function"] == "list_items"
+
+    def test_git_and_github_calls_are_client_spans(self, trace_file):
+        with span("root"):
+            with track_git(["-C", "/tmp/repo", "fetch", "origin"]):
+                pass
+            with track_github("get", "https://api.github.com/repos/o/r/pulls") as call:
+                call.status = "200"
+
+        [spans] = read_traces(trace_file)
+        git_span, github_span = spans[0], spans[1]
+        assert git_span["name"] == "git fetch" and git_span["kind"] == KIND_CLIENT
+        assert github_span["name"] == "GitHub GET"
+        assert attrs(github_span)["http.response.status_code"] == "200"
+        assert attrs(github_span)["url.full"].endswith("/pulls")
+
+
+class TestTracingMiddleware:
+    """Tests for the server span."""
+
+    def make_client(self):
+        app = FastAPI()
+
+        @traced()
+        def load(name):
+            return {"name": name}
+
+        @app.get("/api/v1/apps/{appname}")
+        def get_app(appname: str):
+            return load(appname)
+
+        app.add_middleware(TracingMiddleware)
+        return TestClient(app)
+
+    def test_sync_handler_spans_nest_under_server_span(self, trace_file):
+        response = self.make_client().get("/api/v1/apps/app1")
+        assert response.status_code == 200
+
+        [spans] = read_traces(trace_file)
+        server = spans[-1]
+        assert server["name"] == "GET /api/v1/apps/{appname}"
+        assert attrs(server)["http.response.status_code"] == "200"
+        assert spans[0]["name"].endswith("load")
+        assert spans[0]["parentSpanId"] == server["spanId"]
+        assert response.headers["X-Trace-Id"] == server["traceId"]
+
+    def test_no_header_when_tracing_is_off(self, tmp_path):
+        tracing.setup_tracing(sample_ratio=0.0, trace_file=str(tmp_path / "t.jsonl"))
+        response = self.make_client().get("/api/v1/apps/app1")
+        assert response.status_code == 200
+        assert "X-Trace-Id" not in response.headers
@@ -0,0 +1,180 @@
+"""
+Unit tests for the workspace event broker and GET /changes/stream.
+
+Tests cover:
+- Fan-out of new journal entries, filtered per env and app visibility
+- Slow-consumer dropping and resync on journal gaps
+- The SSE stream: replay from Last-Event-ID, live changes, resync, unsubscribe
+"""
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI
+
+from backend.routers import changes
+from backend.utils import workspace_events, workspace_generation
+from backend.utils.workspace_events import WorkspaceEventBroker
+from backend.utils.workspace_generation import WorkspaceGenerations
+
+
+@pytest.fixture
+def generations(tmp_path, monkeypatch):
+    instance = WorkspaceGenerations(tmp_path / "workspace.generations.json")
+    monkeypatch.setattr(workspace_generation, "_instance", instance)
+    return instance
+
+
+@pytest.fixture
+def broker(generations, monkeypatch):
+    hidden_apps = {"secret"}
+    monkeypatch.setattr(workspace_events, "get_user_context", lambda user: {"username": user})
+    monkeypatch.setattr(
+        workspace_events, "check_permission", lambda ctx, obj, act, app: app["id"] not in hidden_apps
+    )
+    instance = WorkspaceEventBroker(generations)
+    monkeypatch.setattr(workspace_events, "_BROKER", instance)
+    instance.poll()  # baseline
+    return instance
+
+
+def _drain(subscriber):
+    items = []
+    while not subscriber.queue.empty():
+        items.append(subscriber.queue.get_nowait())
+    return items
+
+
+class TestWorkspaceEventBroker:
+    """Tests for fan-out from the change journal."""
+
+    async def test_new_changes_reach_matching_subscribers(self, broker, generations):
+        dev = broker.subscribe("DEV", "alice")
+        qa = broker.subscribe("qa", "alice")
+        generations.bump("dev", "app1", "ns1")
+        generations.bump("qa", "app1")
+        generations.bump("dev", "secret")
+        generations.bump(op="refresh")
+
+        assert broker.poll() == 4
+        await asyncio.sleep(0)
+        assert [(c["env"], c["app"], c["kind"]) for c in _drain(dev)] == [
+            ("dev", "app1", "namespace"),
+            (None, None, "workspace"),
+        ]
+        assert [c["generation"] for c in _drain(qa)] == [2, 4]
+        assert broker.poll() == 0
+
+    async def test_slow_subscriber_is_dropped(self, broker, generations, monkeypatch):
+        monkeypatch.setenv("EVENT_STREAM_QUEUE_SIZE", "2")
+        slow = broker.subscribe("dev", "alice")
+        for i in range(3):
+            generations.bump("dev", f"app{i}")
+        broker.poll()
+        await asyncio.sleep(0)
+        assert slow.dropped
+        assert slow.queue.qsize() == 2
+
+    async def test_journal_gap_drops_every_subscriber(self, broker, generations, monkeypatch):
+        monkeypatch.setenv("CHANGE_JOURNAL_SIZE", "2")
+        subscriber = broker.subscribe("dev", "alice")
+        for i in range(4):
+            generations.bump("dev", f"app{i}")
+        assert broker.poll() == 0
+        await asyncio.sleep(0)
+        assert subscriber.dropped
+        # The waiting stream is woken up
+        assert subscriber.queue.qsize() == 1
+
+    async def test_unsubscribe(self, broker):
+        subscriber = broker.subscribe("dev", "alice")
+        assert broker.subscriber_count() == 1
+        broker.unsubscribe(subscriber)
+        assert broker.subscriber_count() == 0
+
+
+def _parse(body):
+    events = []
+    for block in body.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line and not line.startswith(":"))
+        if "event" in fields:
+            events.append((fields["event"], fields.get("id"), json.loads(fields["data"])))
+    return events
+
+
+async def _stream(path, on_body, headers=()):
+    """Drive GET ``path`` until ``on_body(events)`` returns True, then disconnect."""
+    app = FastAPI()
+    app.include_router(changes.router, prefix="/api/v1")
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": query.encode(), "headers": [(b"host", b"test"), *headers],
+        "client": ("127.0.0.1", 1), "server": ("test", 80),
+    }
+    done = asyncio.Event()
+    body = ""
+    start = {}
+
+    async def receive():
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal body
+        if message["type"] == "http.response.start":
+            start.update(message)
+        elif not done.is_set():
+            body += message.get("body", b"").decode()
+            events = _parse(body)
+            if events and on_body(events):
+                done.set()
+
+    await asyncio.wait_for(app(scope, receive, send), 5)
+    return start, _parse(body)
+
+
+class TestChangeStream:
+    """Tests for GET /changes/stream."""
+
+    async def test_replay_then_live_changes(self, broker, generations):
+        generations.bump("dev", "app1")
+        generations.bump("dev", "secret")
+        generations.bump("qa", "app1")
+        broker.poll()
+
+        def on_body(events):
+            if events[-1][0] == "ready" and len(events) == 2:
+                generations.bump("dev", "app2", kind="namespace", op="create")
+                broker.poll()
+            return events[-1][0] == "change" and len(events) == 3
+
+        start, events = await _stream("/api/v1/changes/stream?env=dev", on_body, [(b"last-event-id", b"0")])
+        headers = dict(start["headers"])
+        assert headers[b"content-type"].startswith(b"text/event-stream")
+        assert headers[b"cache-control"] == b"no-cache"
+        assert [(e, i, d.get("app"), d.get("op")) for e, i, d in events] == [
+            ("change", "1", "app1", "update"),
+            ("ready", "3", None, None),
+            ("change", "4", "app2", "create"),
+        ]
+        assert events[1][2] == {"generation": 3, "resync": False}
+        await asyncio.sleep(0)
+        assert broker.subscriber_count() == 0
+
+    async def test_first_connect_and_slow_consumer_resync(self, broker, generations, monkeypatch):
+        monkeypatch.setenv("EVENT_STREAM_QUEUE_SIZE", "1")
+        generations.bump("dev", "app1")
+        broker.poll()
+
+        def on_body(events):
+            if len(events) == 1:
+                generations.bump("dev", "app2")
+                generations.bump("dev", "app3")
+                broker.poll()
+            return events[-1][0] == "resync"
+
+        _, events = await _stream("/api/v1/changes/stream?env=dev", on_body)
+        assert events[0] == ("ready", "1", {"generation": 1, "resync": True})
+        assert events[-1][0] == "resync"
@@ -7,6 +7,19 @@ Available Utilities:
 - workspace: Workspace and configuration path management
 - helpers: Common data transformation and validation helpers
 - yaml_utils: YAML file reading and writing utilities
+- file_watcher: Background file change detection (inotify with stat-poll fallback)
+- generation: Cross-worker invalidation (generation files, stat tokens, file locks)
+- frontend_bundle: Frontend build step (transpiled, hashed, precompressed) and its static handler
+- http: HTTP header parsing shared by responses and frontend_bundle (Accept-Encoding)
+- metrics: In-process Prometheus metrics registry and git/GitHub/YAML counters
+- profiler: On-demand sampling profiler for single requests
+- request_timing: Per-request yaml/fs/rbac/git/github time accounting (Server-Timing)
+- responses: FastJSONResponse for large list endpoints (orjson, negotiated gzip)
+- batch: In-process GET sub-requests of POST /batch and their per-batch cache
+- single_flight: Coalescing of identical concurrent service calls (keyed by workspace generation)
+- tracing: Sampled spans exported to a rotating OTLP/JSON trace file
+- workspace_events: In-process fan-out of change journal entries to event streams
+- workspace_generation: Per env/app/namespace change counters (ETags) and the change journal
 
 Benefits:
 - DRY (Don't Repeat Yourself): Eliminates code duplication
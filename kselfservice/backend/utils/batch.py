@@ -0,0 +1,211 @@
+"""In-process execution of GET sub-requests for POST /batch.
+
+Many screens issue waves of small GETs: pull request status per app, free
+pool per cluster, egress IPs per namespace. POST /batch takes a list of GET
+paths relative to the API prefix and runs them through the whole ASGI app,
+middleware included, without another HTTP round trip. Each sub-request
+carries the caller's headers, so it is authenticated, checked by RBAC,
+classified by the bulkhead and tagged by ETagMiddleware like a request of
+its own. At most BATCH_CONCURRENCY sub-requests of a batch run at a time,
+and results keep the order of the request.
+
+While a batch runs, ``batch_cached`` memoizes values for all of its
+sub-requests: the caller's RBAC context (roles are still checked per
+sub-request), the workspace configuration and the results of
+``@single_flight`` service methods. The cache lives in a context variable,
+is shared across the worker threads of the batch's sub-requests and is
+dropped when the batch ends. Exceptions are never cached.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import threading
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from starlette.types import ASGIApp, Message, Scope
+
+from backend.config.logging_config import get_logger
+from backend.exceptions.custom import ValidationError
+
+logger = get_logger(__name__)
+
+_API_PREFIX = "/api/v1"
+
+# Paths a sub-request may not target: the batch itself and the endless event stream
+_EXCLUDED_PATHS = re.compile(r"^/(batch|changes/stream)/?$")
+
+# Caller headers not forwarded: the sub-request has no body, its response is
+# embedded uncompressed and conditional requests apply to the batch only
+_DROPPED_HEADERS = frozenset({
+    b"content-length",
+    b"content-type",
+    b"transfer-encoding",
+    b"expect",
+    b"accept-encoding",
+    b"if-none-match",
+    b"if-modified-since",
+})
+
+# Connection-level scope keys copied from the batch request; "state" is copied
+# per sub-request instead, as middleware writes request-specific values into it
+_SCOPE_KEYS = ("type", "asgi", "http_version", "scheme", "server", "client", "root_path")
+
+
+class BatchCache:
+    """Values memoized for the sub-requests of one batch (thread-safe)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: Dict[Hashable, Any] = {}
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._values:
+                return self._values[key]
+        value = compute()
+        with self._lock:
+            # Two sub-requests may compute the same key at once; keep the first
+            return self._values.setdefault(key, value)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._values)
+
+
+_current: ContextVar[Optional[BatchCache]] = ContextVar("batch_cache", default=None)
+
+
+def batch_cached(key: Hashable, compute: Callable[[], Any]) -> Any:
+    """Return ``compute()``, memoized under ``key`` while a batch runs.
+
+    Outside a batch this is just ``compute()``. Cached values are shared by
+    the batch's sub-requests and must be treated as read-only.
+    """
+    cache = _current.get()
+    if cache is None:
+        return compute()
+    return cache.get(key, compute)
+
+
+def subrequest_target(path: str, params: Optional[Dict[str, Any]] = None) -> Tuple[str, str]:
+    """Validate a sub-request path relative to the API prefix.
+
+    Args:
+        path: GET path such as ``/apps/app1/pull_request/status``, optionally
+            with a query string
+        params: Query parameters added to the path's own (lists repeat the key)
+
+    Returns:
+        (path relative to the API prefix, query string)
+
+    Raises:
+        ValidationError: If the path is not a relative API path or targets an
+            endpoint that cannot run in a batch
+    """
+    relative, _, query = str(path or "").strip().partition("?")
+    segments = relative.split("/")
+    if not relative.startswith("/") or relative.startswith("//") or "#" in relative or ".." in segments:
+        raise ValidationError("path", f"Expected a path relative to {_API_PREFIX}, such as /apps: {path!r}")
+    if relative.startswith(_API_PREFIX + "/"):
+        raise ValidationError("path", f"Give paths relative to {_API_PREFIX}: {path!r}")
+    if _EXCLUDED_PATHS.match(relative):
+        raise ValidationError("path", f"{relative} cannot run in a batch")
+    extra = urlencode(
+        {k: v if isinstance(v, list) else str(v) for k, v in (params or {}).items() if v is not None},
+        doseq=True,
+    )
+    return relative, "&".join(q for q in (query, extra) if q)
+
+
+def _decode_body(headers: List[Tuple[bytes, bytes]], body: bytes) -> Any:
+    if not body:
+        return None
+    content_type = dict(headers).get(b"content-type", b"").decode("latin-1")
+    text = body.decode("utf-8", errors="replace")
+    if "json" in content_type:
+        try:
+            return json.loads(text)
+        except ValueError:
+            pass
+    return text
+
+
+async def run_subrequest(app: ASGIApp, parent: Scope, relative: str, query: str) -> Dict[str, Any]:
+    """Run one GET through ``app`` with the headers of the ``parent`` request.
+
+    Returns:
+        Dict with path, status and body (decoded JSON, or text)
+    """
+    path = (parent.get("root_path") or "") + _API_PREFIX + relative
+    scope: Dict[str, Any] = {key: parent[key] for key in _SCOPE_KEYS if key in parent}
+    scope.update(
+        state=dict(parent.get("state") or {}),
+        method="GET",
+        path=path,
+        raw_path=path.encode("utf-8"),
+        query_string=query.encode("latin-1"),
+        headers=[(k, v) for k, v in parent.get("headers", []) if k.lower() not in _DROPPED_HEADERS],
+    )
+
+    status: Optional[int] = None
+    headers: List[Tuple[bytes, bytes]] = []
+    chunks: List[bytes] = []
+    finished = asyncio.Event()
+    request_sent = False
+
+    async def receive() -> Message:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Nothing more to read: report a disconnect only once the response is complete
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        nonlocal status, headers
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            headers = list(message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await app(scope, receive, send)
+    except Exception as exc:
+        # The error middleware has already sent a 500 when it re-raises
+        logger.error(f"Batch sub-request GET {relative} failed: {exc}", exc_info=True)
+        if status is None:
+            status = 500
+    finally:
+        finished.set()
+
+    query_suffix = f"?{query}" if query else ""
+    return {
+        "path": relative + query_suffix,
+        "status": status if status is not None else 500,
+        "body": _decode_body(headers, b"".join(chunks)),
+    }
+
+
+async def run_batch(
+    app: ASGIApp, parent: Scope, targets: List[Tuple[str, str]], concurrency: int
+) -> List[Dict[str, Any]]:
+    """Run GET sub-requests with a shared cache, ``concurrency`` at a time; results in order."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(target: Tuple[str, str]) -> Dict[str, Any]:
+        async with semaphore:
+            return await run_subrequest(app, parent, *target)
+
+    token = _current.set(BatchCache())
+    try:
+        # Tasks copy the context, so every sub-request sees this batch's cache
+        return list(await asyncio.gather(*(run(target) for target in targets)))
+    finally:
+        _current.reset(token)
@@ -0,0 +1,178 @@
+"""Background file watcher with inotify wake-ups and a stat-poll fallback.
+
+Changes are always detected by comparing stat snapshots (mtime, size, inode)
+of the watched files. On Linux, inotify is used only to wake the watcher up
+early; when it is unavailable (other platforms, missing directories, watch
+limits) the watcher simply polls at the configured interval.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger("uvicorn.error")
+
+# (directory, glob pattern) pairs; resolved on every cycle so targets may move.
+WatchTargets = Callable[[], List[Tuple[Path, str]]]
+
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_MASK = _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+
+# Let a burst of writes (e.g. several store files) settle into one reload.
+_DEBOUNCE_SECONDS = 0.2
+
+
+class _Inotify:
+    """Minimal ctypes wrapper around the Linux inotify API."""
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._add_watch.restype = ctypes.c_int
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.fd = fd
+
+    def watch(self, directory: Path) -> bool:
+        # Adding an existing watch again is a cheap no-op, so this is safe per cycle.
+        return self._add_watch(self.fd, os.fsencode(str(directory)), _IN_MASK) >= 0
+
+    def wait(self, timeout: float) -> bool:
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self) -> None:
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class FileWatcher:
+    """Daemon thread that reports changed files to a callback."""
+
+    def __init__(
+        self,
+        name: str,
+        targets: WatchTargets,
+        on_change: Callable[[Set[Path]], None],
+        interval: float = 2.0,
+        use_inotify: bool = True,
+    ) -> None:
+        """Initialize the watcher.
+
+        Args:
+            name: Thread name, used in logs
+            targets: Callable returning (directory, glob pattern) pairs to watch
+            on_change: Called off-thread with the set of added/changed/removed paths
+            interval: Maximum seconds between stat polls
+            use_inotify: Use inotify wake-ups when available (Linux only)
+        """
+        self.name = name
+        self._targets = targets
+        self._on_change = on_change
+        self._interval = max(0.1, float(interval))
+        self._use_inotify = use_inotify
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._inotify: Optional[_Inotify] = None
+        self._previous: Dict[Path, Tuple[int, int, int]] = {}
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        if self._use_inotify and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+            except Exception as e:
+                logger.info("File watcher %s: inotify unavailable (%s); using stat polling", self.name, e)
+                self._inotify = None
+        self._stop.clear()
+        # Baseline is taken here so changes made right after start() are not missed.
+        self._previous = self._snapshot()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _snapshot(self) -> Dict[Path, Tuple[int, int, int]]:
+        snap: Dict[Path, Tuple[int, int, int]] = {}
+        for directory, pattern in self._targets():
+            try:
+                if not directory.is_dir():
+                    continue
+                if self._inotify is not None:
+                    self._inotify.watch(directory)
+                for p in directory.glob(pattern):
+                    try:
+                        st = p.stat()
+                    except OSError:
+                        continue
+                    snap[p] = (st.st_mtime_ns, st.st_size, st.st_ino)
+            except OSError:
+                continue
+        return snap
+
+    def _wait(self) -> None:
+        if self._inotify is not None:
+            try:
+                if self._inotify.wait(self._interval):
+                    self._stop.wait(_DEBOUNCE_SECONDS)
+                return
+            except OSError:
+                self._inotify.close()
+                self._inotify = None
+        self._stop.wait(self._interval)
+
+    def _run(self) -> None:
+        previous = self._previous
+        while not self._stop.is_set():
+            self._wait()
+            if self._stop.is_set():
+                break
+            current = self._snapshot()
+            if current == previous:
+                continue
+            changed = {p for p in set(previous) | set(current) if previous.get(p) != current.get(p)}
+            started = time.perf_counter()
+            try:
+                self._on_change(changed)
+            except Exception as e:
+                # Keep the old snapshot so the same changes are retried next round
+                logger.error("File watcher %s: reload failed: %s", self.name, str(e), exc_info=True)
+                continue
+            previous = current
+            logger.info(
+                "File watcher %s: reloaded after %d change(s) in %.1fms",
+                self.name, len(changed), (time.perf_counter() - started) * 1000,
+            )
@@ -0,0 +1,360 @@
+"""Precompiled, content-hashed frontend bundle.
+
+In development ``frontend/index.html`` loads React plus babel-standalone and
+about forty ``text/babel`` scripts that every browser transpiles on every page
+load. The build step below does that work once:
+
+- the ``text/babel`` scripts are transpiled with the vendored babel-standalone
+  (run under Node.js) and concatenated, in index.html order, into one app bundle
+- the remaining vendor scripts are concatenated into one vendor bundle; the
+  in-browser compiler is no longer needed and is left out
+- every bundle and stylesheet is written as ``name.<hash>.ext`` together with
+  ``.gz`` and (when the ``brotli`` module is installed) ``.br`` siblings
+- a rewritten ``index.html`` and a ``manifest.json`` are written next to them
+
+Everything lands in ``frontend/dist``. When that directory exists, main.py
+serves it through ``PrecompressedStaticFiles``: hashed files are immutable,
+carry a strong ETag and are sent precompressed when the client accepts it.
+
+Without Node.js (or with ``--no-transpile``) the app bundle stays a single
+``text/babel`` script and babel-standalone is kept in the vendor bundle, so
+the page still works and still benefits from hashing and compression.
+
+Usage:
+    python -m backend.utils.frontend_bundle [--frontend-dir DIR] [--no-transpile]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from mimetypes import guess_type
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from backend.utils.http import accepted_encodings
+
+try:
+    import brotli
+except ImportError:  # optional: gzip siblings only
+    brotli = None
+
+FRONTEND_DIR = Path(__file__).resolve().parents[2] / "frontend"
+DIST_DIRNAME = "dist"
+MANIFEST_NAME = "manifest.json"
+
+# URL prefix the frontend directory is mounted under
+STATIC_PREFIX = "/static/"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Encodings served from precompressed siblings, in order of preference
+ENCODINGS: Tuple[Tuple[str, str], ...] = (("br", ".br"), ("gzip", ".gz"))
+
+_HASH_LENGTH = 12
+_HASHED_NAME_RE = re.compile(r"^[^/]+\.([0-9a-f]{%d})\.[A-Za-z0-9]+$" % _HASH_LENGTH)
+_SCRIPT_RE = re.compile(r'[ \t]*<script\b([^>]*?)\bsrc="/static/([^"]+)"([^>]*)>\s*</script>[ \t]*\n?')
+_STYLESHEET_RE = re.compile(r'(<link\b[^>]*\bhref=")/static/([^"]+\.css)(")')
+_COMMENT_RE = re.compile(r"[ \t]*<!--.*?-->[ \t]*\n?", re.S)
+_BODY_END_RE = re.compile(r"[ \t]*</body>")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n(\s*\n)+")
+
+# Transpiles a JSON list of {name, code} read from stdin with the babel-standalone
+# given as argv[1]; writes the JSON list of results to stdout.
+_TRANSPILE_JS = r"""
+const Babel = require(process.argv[1]);
+let input = "";
+process.stdin.setEncoding("utf8");
+process.stdin.on("data", (chunk) => { input += chunk; });
+process.stdin.on("end", () => {
+  const out = JSON.parse(input).map((f) => {
+    try {
+      return Babel.transform(f.code, { presets: ["react"], filename: f.name, compact: false }).code;
+    } catch (err) {
+      process.stderr.write(err.message + "\n");
+      process.exit(1);
+    }
+  });
+  process.stdout.write(JSON.stringify(out));
+});
+"""
+
+
+class BundleError(Exception):
+    """Raised when the frontend bundle cannot be built."""
+
+
+def content_hash(data: bytes) -> str:
+    """Return the short content hash embedded in bundle file names."""
+    return hashlib.sha256(data).hexdigest()[:_HASH_LENGTH]
+
+
+def compress(data: bytes) -> Dict[str, bytes]:
+    """Return the precompressed variants of ``data`` keyed by file suffix."""
+    # mtime=0 keeps the gzip output reproducible for identical input
+    variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(data, quality=11)
+    return variants
+
+
+def transpile(sources: List[Tuple[str, str]], babel_path: Path) -> List[str]:
+    """Transpile JSX sources with the vendored babel-standalone under Node.js.
+
+    Args:
+        sources: (name, code) pairs; the name only appears in error messages.
+        babel_path: Path to babel-standalone(.min).js.
+
+    Returns:
+        The transpiled code of each source, in order.
+
+    Raises:
+        BundleError: If Node.js is not available or a source fails to compile.
+    """
+    node = shutil.which("node")
+    if node is None:
+        raise BundleError("Node.js is required to transpile JSX (or pass --no-transpile)")
+    payload = json.dumps([{"name": name, "code": code} for name, code in sources])
+    proc = subprocess.run(
+        [node, "-e", _TRANSPILE_JS, str(babel_path.resolve())],
+        input=payload, capture_output=True, text=True, encoding="utf-8",
+    )
+    if proc.returncode != 0:
+        raise BundleError(f"JSX transpilation failed:\n{proc.stderr.strip()}")
+    return json.loads(proc.stdout)
+
+
+def _write_asset(out_dir: Path, name: str, data: bytes) -> str:
+    """Write ``data`` as ``stem.<hash>.ext`` plus compressed siblings; return the file name."""
+    stem, ext = os.path.splitext(name)
+    hashed = f"{stem}.{content_hash(data)}{ext}"
+    (out_dir / hashed).write_bytes(data)
+    for suffix, variant in compress(data).items():
+        (out_dir / (hashed + suffix)).write_bytes(variant)
+    return hashed
+
+
+def _parse_scripts(index_html: str) -> List[Tuple[str, bool]]:
+    """Return (path relative to the frontend dir, is_babel) for each static script, in order."""
+    scripts = []
+    for match in _SCRIPT_RE.finditer(index_html):
+        attrs = match.group(1) + match.group(3)
+        scripts.append((match.group(2), 'type="text/babel"' in attrs))
+    return scripts
+
+
+def _read_sources(frontend_dir: Path, paths: List[str]) -> List[Tuple[str, str]]:
+    sources = []
+    for path in paths:
+        try:
+            sources.append((path, (frontend_dir / path).read_text(encoding="utf-8")))
+        except OSError as exc:
+            raise BundleError(f"Cannot read {path} referenced by index.html: {exc}") from exc
+    return sources
+
+
+def _concat(parts: List[str]) -> bytes:
+    # Each part ran as its own classic script; the separator stops ASI surprises
+    return "\n;\n".join(part.rstrip() for part in parts).encode("utf-8") + b"\n"
+
+
+def build_bundle(frontend_dir: Path = FRONTEND_DIR, transpile_jsx: bool = True) -> dict:
+    """Build ``frontend_dir/dist`` from ``frontend_dir/index.html``.
+
+    Args:
+        frontend_dir: Directory holding index.html and the files it references.
+        transpile_jsx: Transpile JSX at build time; otherwise ship a single
+            ``text/babel`` bundle and keep babel-standalone.
+
+    Returns:
+        The manifest written to ``dist/manifest.json``.
+
+    Raises:
+        BundleError: If index.html or a referenced file is missing, or
+            transpilation fails.
+    """
+    index_path = frontend_dir / "index.html"
+    try:
+        index_html = index_path.read_text(encoding="utf-8")
+    except OSError as exc:
+        raise BundleError(f"Cannot read {index_path}: {exc}") from exc
+
+    scripts = _parse_scripts(index_html)
+    vendor_paths = [path for path, is_babel in scripts if not is_babel]
+    app_paths = [path for path, is_babel in scripts if is_babel]
+    babel_paths = [path for path in vendor_paths if "babel" in Path(path).name]
+    if transpile_jsx and app_paths:
+        if not babel_paths:
+            raise BundleError("index.html does not load babel-standalone; nothing to transpile with")
+        vendor_paths = [path for path in vendor_paths if path not in babel_paths]
+
+    app_sources = _read_sources(frontend_dir, app_paths)
+    if transpile_jsx and app_sources:
+        app_code = transpile(app_sources, frontend_dir / babel_paths[0])
+    else:
+        app_code = [code for _, code in app_sources]
+
+    dist_dir = frontend_dir / DIST_DIRNAME
+    # Build next to the old output and swap, so a running server never sees half a bundle
+    tmp_dir = Path(tempfile.mkdtemp(prefix=f".{DIST_DIRNAME}.", dir=str(frontend_dir)))
+    os.chmod(tmp_dir, 0o755)
+    try:
+        files: Dict[str, str] = {}
+        script_tags = []
+        if vendor_paths:
+            vendor_code = [code for _, code in _read_sources(frontend_dir, vendor_paths)]
+            files["vendor.js"] = _write_asset(tmp_dir, "vendor.js", _concat(vendor_code))
+            script_tags.append(f'<script src="{STATIC_PREFIX}{DIST_DIRNAME}/{files["vendor.js"]}"></script>')
+        if app_code:
+            files["app.js"] = _write_asset(tmp_dir, "app.js", _concat(app_code))
+            babel_attrs = "" if transpile_jsx else ' type="text/babel" data-presets="react"'
+            script_tags.append(f'<script{babel_attrs} src="{STATIC_PREFIX}{DIST_DIRNAME}/{files["app.js"]}"></script>')
+
+        def hash_stylesheet(match: "re.Match[str]") -> str:
+            path = match.group(2)
+            data = (frontend_dir / path).read_bytes()
+            files[path] = _write_asset(tmp_dir, Path(path).name, data)
+            return f"{match.group(1)}{STATIC_PREFIX}{DIST_DIRNAME}/{files[path]}{match.group(3)}"
+
+        try:
+            html = _STYLESHEET_RE.sub(hash_stylesheet, index_html)
+        except OSError as exc:
+            raise BundleError(f"Cannot read stylesheet referenced by index.html: {exc}") from exc
+        html = _COMMENT_RE.sub("", _SCRIPT_RE.sub("", html))
+        html = _BODY_END_RE.sub(lambda m: "".join(f"    {tag}\n" for tag in script_tags) + "  </body>", html, count=1)
+        html = _BLANK_LINES_RE.sub("\n\n", html)
+        (tmp_dir / "index.html").write_text(html, encoding="utf-8")
+
+        manifest = {
+            "transpiled": bool(transpile_jsx and app_paths),
+            "files": files,
+            "sources": {"vendor.js": vendor_paths, "app.js": app_paths},
+        }
+        (tmp_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+
+        old_dir = None
+        if dist_dir.exists():
+            old_dir = dist_dir.with_name(tmp_dir.name + ".old")
+            dist_dir.rename(old_dir)
+        tmp_dir.rename(dist_dir)
+        if old_dir is not None:
+            shutil.rmtree(old_dir, ignore_errors=True)
+    finally:
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    return manifest
+
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles serving the hashed bundle with immutable caching.
+
+    Content-hashed files (``name.<hash>.ext``) never change under the same
+    URL, so they are sent with a one-year immutable Cache-Control and a
+    strong ETag derived from the hash. When the client accepts br or gzip and
+    a precompressed sibling exists, that sibling is sent instead. Other files
+    fall back to plain StaticFiles behaviour.
+    """
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        full_path = str(full_path)
+        match = _HASHED_NAME_RE.match(os.path.basename(full_path))
+        if match is None:
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        request_headers = Headers(scope=scope)
+        accepted = accepted_encodings(
+            request_headers.get("accept-encoding", ""), (coding for coding, _ in ENCODINGS)
+        )
+        path, encoding = full_path, None
+        for coding, suffix in ENCODINGS:
+            if coding in accepted:
+                try:
+                    sibling_stat = os.stat(full_path + suffix)
+                except OSError:
+                    continue
+                path, encoding, stat_result = full_path + suffix, coding, sibling_stat
+                break
+
+        # Each representation gets its own strong validator
+        etag = f'"{match.group(1)}-{encoding}"' if encoding else f'"{match.group(1)}"'
+        headers = {
+            "cache-control": IMMUTABLE_CACHE_CONTROL,
+            "etag": etag,
+            "vary": "Accept-Encoding",
+        }
+        if _etag_matches(etag, request_headers.get("if-none-match", "")):
+            return NotModifiedResponse(Headers(headers))
+        if encoding:
+            headers["content-encoding"] = encoding
+        media_type = guess_type(full_path)[0] or "application/octet-stream"
+        return FileResponse(path, status_code=status_code, headers=headers, media_type=media_type, stat_result=stat_result)
+
+
+def load_manifest(frontend_dir: Path = FRONTEND_DIR) -> Optional[dict]:
+    """Return the manifest of a built bundle, or None when no complete build exists."""
+    dist_dir = frontend_dir / DIST_DIRNAME
+    if not (dist_dir / "index.html").is_file():
+        return None
+    try:
+        return json.loads((dist_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _human(size: int) -> str:
+    return f"{size / 1024:.1f} KiB"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build the precompiled, hashed frontend bundle.")
+    parser.add_argument("--frontend-dir", type=Path, default=FRONTEND_DIR, help="frontend directory (default: %(default)s)")
+    parser.add_argument("--no-transpile", action="store_true", help="ship JSX to the browser with babel-standalone")
+    args = parser.parse_args(argv)
+
+    transpile_jsx = not args.no_transpile
+    if transpile_jsx and shutil.which("node") is None:
+        print("warning: Node.js not found; JSX will be transpiled in the browser", file=sys.stderr)
+        transpile_jsx = False
+    try:
+        manifest = build_bundle(args.frontend_dir, transpile_jsx=transpile_jsx)
+    except BundleError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+
+    dist_dir = args.frontend_dir / DIST_DIRNAME
+    print(f"Wrote {dist_dir} (JSX {'transpiled' if manifest['transpiled'] else 'left to the browser'})")
+    for hashed in manifest["files"].values():
+        sizes = [_human((dist_dir / hashed).stat().st_size)]
+        for coding, suffix in ENCODINGS:
+            sibling = dist_dir / (hashed + suffix)
+            if sibling.exists():
+                sizes.append(f"{coding} {_human(sibling.stat().st_size)}")
+        print(f"  {hashed}: {', '.join(sizes)}")
+    if brotli is None:
+        print("  (install 'brotli' to also write .br files)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
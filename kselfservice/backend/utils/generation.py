@@ -0,0 +1,80 @@
+"""Cross-process change detection for state cached by every uvicorn worker.
+
+Each worker keeps its own in-memory copy of shared stores (role assignments,
+the Casbin policy). A writer persists its change and then bumps a small
+generation file. Readers compare the file's stat signature (inode, mtime,
+size) with the one they last loaded, which costs a single ``os.stat``, and
+reload only when it differs. Bumps replace the file atomically, so every bump
+changes the inode even on filesystems with coarse mtimes.
+
+Writers serialize through ``interprocess_lock`` so that read-modify-write
+cycles of different workers cannot overwrite each other.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+StatToken = Tuple[Optional[Tuple[int, int, int]], ...]
+
+
+def stat_token(*paths: Path) -> StatToken:
+    """Return the (inode, mtime_ns, size) signature of each path (None if missing)."""
+    token = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            token.append(None)
+            continue
+        token.append((st.st_ino, st.st_mtime_ns, st.st_size))
+    return tuple(token)
+
+
+@contextmanager
+def interprocess_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive fcntl lock on ``path`` (created if missing)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as lf:
+        fcntl.flock(lf.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lf.fileno(), fcntl.LOCK_UN)
+
+
+class GenerationFile:
+    """Counter file bumped by writers and stat-checked by readers."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def token(self) -> StatToken:
+        return stat_token(self.path)
+
+    def read(self) -> int:
+        try:
+            return int(self.path.read_text().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def bump(self) -> StatToken:
+        """Increment the counter (caller holds the writers' lock) and return the new token."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{self.path.name}.", suffix=".tmp", dir=str(self.path.parent))
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(f"{self.read() + 1}\n")
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        return self.token()
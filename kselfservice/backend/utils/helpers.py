@@ -1,6 +1,6 @@
 """Common helper utilities."""
 
-from typing import Any, List, Optional
+from typing import Any, Callable, List, Optional
 
 
 def parse_bool(v: Any) -> bool:
@@ -96,3 +96,28 @@ def is_set(v: Optional[str]) -> bool:
     """
     s = str(v or "").strip()
     return bool(s) and s != "0"
+
+
+def wrap_public_methods(
+    cls: type, wrapper_factory: Callable[[str, Callable[..., Any]], Callable[..., Any]]
+) -> type:
+    """Replace every public method of a class (incl. static/class methods) with a wrapper.
+
+    Args:
+        cls: Class to modify in place
+        wrapper_factory: Called with the method name and the plain function;
+            returns the function to install in its place
+
+    Returns:
+        The same class, so this can back a class decorator
+    """
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_"):
+            continue
+        if isinstance(attr, staticmethod):
+            setattr(cls, name, staticmethod(wrapper_factory(name, attr.__func__)))
+        elif isinstance(attr, classmethod):
+            setattr(cls, name, classmethod(wrapper_factory(name, attr.__func__)))
+        elif callable(attr):
+            setattr(cls, name, wrapper_factory(name, attr))
+    return cls
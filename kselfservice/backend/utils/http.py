@@ -0,0 +1,34 @@
+"""HTTP header helpers shared by the response and static file handlers."""
+
+from typing import Iterable, Set
+
+
+def accepted_encodings(accept_encoding: str, supported: Iterable[str] = ()) -> Set[str]:
+    """Return the content codings a client accepts (q > 0) from its Accept-Encoding header.
+
+    Args:
+        accept_encoding: Accept-Encoding header value
+        supported: Codings a ``*`` entry stands for
+
+    Returns:
+        Lowercased codings; ``*`` is kept and expanded to ``supported``
+    """
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(coding)
+    if "*" in accepted:
+        accepted.update(supported)
+    return accepted
@@ -0,0 +1,372 @@
+"""In-process metrics registry rendered in the Prometheus text format.
+
+Counters, gauges and histograms live in process memory and are exposed on
+/metrics; no client library or external service is needed. Besides the HTTP
+metrics recorded by MetricsMiddleware, this module counts the expensive
+operations behind them: YAML parses, git subprocess runs and GitHub API calls.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from backend.utils.request_timing import record_bytes_parsed, timed
+from backend.utils.tracing import KIND_CLIENT, span
+
+LabelValues = Tuple[str, ...]
+
+# Prometheus client defaults, extended for slow git/GitHub round trips.
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0, 30.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{_escape(extra[1])}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """Base class for a named metric family with a fixed set of label names."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Sequence[str]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(v) for v in labels)
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+            *self._samples(),
+        ]
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        # Unlabelled counters are exported from the start, even at zero.
+        self._values: Dict[LabelValues, float] = {} if self.labelnames else {(): 0.0}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, optionally computed at scrape time."""
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        collect: Optional[Callable[[], float]] = None,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._collect = collect
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> List[str]:
+        if self._collect is not None:
+            try:
+                self.set(self._collect())
+            except Exception:
+                pass
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed upper bounds, plus _sum and _count."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        # label values -> (per-bucket counts incl. +Inf, sum)
+        self._values: Dict[LabelValues, Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        key = self._key(labels)
+        idx = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                idx = i
+                break
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[idx] += 1
+            self._values[key] = (counts, total + value)
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return sum(entry[0]) if entry else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, (list(c), s)) for k, (c, s) in self._values.items())
+        lines: List[str] = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, n in zip((*self.buckets, math.inf), counts):
+                cumulative += n
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Ordered collection of metric families."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# Content type of the Prometheus text exposition format.
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _threadpool_limiter():
+    # Sync endpoints run on AnyIO's default thread limiter; only reachable from the event loop.
+    from anyio.to_thread import current_default_thread_limiter
+
+    return current_default_thread_limiter()
+
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP requests by method, route template and status code.",
+    ("method", "route", "status"),
+))
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by method and route template.",
+    ("method", "route"),
+))
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served, by method.", ("method",),
+))
+THREADPOOL_BUSY = REGISTRY.register(Gauge(
+    "threadpool_busy_threads", "Worker threads currently running sync endpoints.",
+    collect=lambda: _threadpool_limiter().borrowed_tokens,
+))
+THREADPOOL_MAX = REGISTRY.register(Gauge(
+    "threadpool_max_threads", "Size of the worker thread pool for sync endpoints.",
+    collect=lambda: _threadpool_limiter().total_tokens,
+))
+THREADPOOL_WAITING = REGISTRY.register(Gauge(
+    "threadpool_waiting_tasks", "Sync endpoint calls queued for a free worker thread.",
+    collect=lambda: _threadpool_limiter().statistics().tasks_waiting,
+))
+BULKHEAD_IN_FLIGHT = REGISTRY.register(Gauge(
+    "bulkhead_in_flight_requests", "Requests holding a slot, by route group.", ("group",),
+))
+BULKHEAD_WAITING = REGISTRY.register(Gauge(
+    "bulkhead_waiting_requests", "Requests queued for a slot, by route group.", ("group",),
+))
+BULKHEAD_LIMIT = REGISTRY.register(Gauge(
+    "bulkhead_limit", "Concurrent request limit, by route group.", ("group",),
+))
+BULKHEAD_SATURATION = REGISTRY.register(Gauge(
+    "bulkhead_saturation_ratio", "In-flight requests divided by the limit, by route group.", ("group",),
+))
+BULKHEAD_REJECTED = REGISTRY.register(Counter(
+    "bulkhead_rejected_total", "Requests rejected with 503 because their route group was full.", ("group",),
+))
+YAML_PARSES = REGISTRY.register(Counter(
+    "yaml_parses_total", "YAML texts parsed through backend.utils.yaml_utils.",
+))
+GIT_RUNS = REGISTRY.register(Counter(
+    "git_subprocess_runs_total", "git subprocess invocations by git command and outcome.",
+    ("command", "outcome"),
+))
+GIT_DURATION = REGISTRY.register(Histogram(
+    "git_subprocess_duration_seconds", "git subprocess wall time by git command.", ("command",),
+))
+GITHUB_CALLS = REGISTRY.register(Counter(
+    "github_api_calls_total", "GitHub API calls by HTTP method and response status.",
+    ("method", "status"),
+))
+GITHUB_DURATION = REGISTRY.register(Histogram(
+    "github_api_call_duration_seconds", "GitHub API call latency by HTTP method.", ("method",),
+))
+SINGLE_FLIGHT_CALLS = REGISTRY.register(Counter(
+    "single_flight_calls_total",
+    "Single-flight service calls by method and role (leader ran it, shared waited for its result).",
+    ("method", "role"),
+))
+
+
+def render_latest() -> str:
+    """Render every registered metric in the Prometheus text format."""
+    return REGISTRY.render()
+
+
+def _git_command(args: Sequence[str]) -> str:
+    # Skip "-C <dir>" style options so the label is the git subcommand (clone, fetch, push, ...).
+    it = iter(args)
+    for arg in it:
+        if arg == "git":
+            continue
+        if arg in ("-C", "-c"):
+            next(it, None)
+            continue
+        if arg.startswith("-"):
+            continue
+        return arg
+    return "unknown"
+
+
+@contextmanager
+def track_git(args: Sequence[str]) -> Iterator[None]:
+    """Count and time one git subprocess run (also reported as request git time and a span).
+
+    Args:
+        args: The git argument list (with or without a leading "git" / "-C <dir>")
+    """
+    command = _git_command(args)
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        with span(f"git {command}", KIND_CLIENT, {"git.command": command}), timed("git"):
+            yield
+        outcome = "ok"
+    finally:
+        GIT_DURATION.observe(time.perf_counter() - started, command)
+        GIT_RUNS.inc(command, outcome)
+
+
+class _CallOutcome:
+    status: str = "error"
+
+
+@contextmanager
+def track_github(method: str, url: str = "") -> Iterator[_CallOutcome]:
+    """Count and time one GitHub API call; set ``status`` on the yielded object.
+
+    Also reported as request github time and a span.
+
+    Args:
+        method: HTTP method of the call
+        url: Request URL, recorded on the span
+    """
+    outcome = _CallOutcome()
+    started = time.perf_counter()
+    attributes = {"http.request.method": method.upper()}
+    if url:
+        attributes["url.full"] = url
+    try:
+        with span(f"GitHub {method.upper()}", KIND_CLIENT, attributes) as call_span, timed("github"):
+            try:
+                yield outcome
+            finally:
+                if str(outcome.status).isdigit():
+                    call_span.set_attribute("http.response.status_code", int(outcome.status))
+    finally:
+        GITHUB_DURATION.observe(time.perf_counter() - started, method.upper())
+        GITHUB_CALLS.inc(method.upper(), str(outcome.status))
+
+
+@contextmanager
+def track_yaml_parse(nbytes: int = 0) -> Iterator[None]:
+    """Count and time one YAML parse.
+
+    Also reported as request yaml time and bytes parsed.
+
+    Args:
+        nbytes: Size of the parsed text
+    """
+    YAML_PARSES.inc()
+    record_bytes_parsed(nbytes)
+    with timed("yaml"):
+        yield
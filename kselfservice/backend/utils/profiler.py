@@ -0,0 +1,226 @@
+"""On-demand sampling profiler for single requests.
+
+While a profiled request runs, a background thread samples the stack of the
+thread running that request's endpoint every few milliseconds. Endpoints are
+wrapped once at startup (``anchor_endpoints``): when one starts, the wrapper
+records its thread and its own frame with the request's profile, so only
+stacks through that very call are kept, not those of other requests to the
+same endpoint. That covers sync handlers in the threadpool and async handlers
+on the event loop alike. The result is stored as collapsed stacks
+("frame;frame;frame count" lines, the input format of flamegraph.pl and
+speedscope) in a bounded ring buffer keyed by request id.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from types import FrameType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from backend.config.settings import get_profile_ring_size, get_profile_sample_interval_ms
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__") or code.co_filename
+    return f"{code.co_name} ({module}:{frame.f_lineno})"
+
+
+class StackSampler:
+    """Samples the stack above an anchor frame until stopped."""
+
+    def __init__(self, interval_ms: float) -> None:
+        """Initialize the sampler.
+
+        Args:
+            interval_ms: Milliseconds between samples
+        """
+        self.interval = max(0.0005, float(interval_ms) / 1000.0)
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._anchor: Optional[Tuple[int, FrameType]] = None
+        self._anchored = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        self._anchor = None
+
+    def anchor(self, ident: int, frame: FrameType) -> bool:
+        """Sample stacks of thread ``ident`` above ``frame``; only the first call anchors.
+
+        Returns:
+            True if this call set the anchor
+        """
+        with self._lock:
+            if self._anchored:
+                return False
+            self._anchored = True
+            self._anchor = (ident, frame)
+            return True
+
+    def release(self) -> None:
+        self._anchor = None
+
+    def _sample_once(self) -> None:
+        anchor = self._anchor
+        if anchor is None:
+            return
+        ident, anchor_frame = anchor
+        frame = sys._current_frames().get(ident)
+        stack: List[FrameType] = []
+        f: Optional[FrameType] = frame
+        while f is not None:
+            if f is anchor_frame:
+                if stack:
+                    self.stacks[";".join(_frame_label(x) for x in reversed(stack))] += 1
+                    self.samples += 1
+                return
+            stack.append(f)
+            f = f.f_back
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self._sample_once()
+            except Exception:
+                continue
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """Ring buffer of recent request profiles, keyed by request id."""
+
+    def __init__(self, max_profiles: int) -> None:
+        self._max = max(1, int(max_profiles))
+        self._profiles: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile: Dict[str, Any]) -> None:
+        with self._lock:
+            self._profiles[profile["request_id"]] = profile
+            self._profiles.move_to_end(profile["request_id"])
+            while len(self._profiles) > self._max:
+                self._profiles.popitem(last=False)
+
+    def get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._profiles.get(request_id)
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        """Return recent profiles without their stacks, newest first."""
+        with self._lock:
+            profiles = list(self._profiles.values())
+        return [{k: v for k, v in p.items() if k != "collapsed"} for p in reversed(profiles)]
+
+
+_store: Optional[ProfileStore] = None
+_store_lock = threading.Lock()
+
+
+def get_profile_store() -> ProfileStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ProfileStore(get_profile_ring_size())
+        return _store
+
+
+# Profile of the request being handled; context variables reach threadpool workers
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+
+
+class RequestProfile:
+    """Profiles the endpoint call of one request."""
+
+    def __init__(self, scope: Dict[str, Any], request_id: str) -> None:
+        self._scope = scope
+        self.request_id = request_id
+        self._started_at = datetime.now(timezone.utc).isoformat()
+        self._started = time.perf_counter()
+        self._sampler = StackSampler(get_profile_sample_interval_ms())
+        self._token = None
+
+    def __enter__(self) -> "RequestProfile":
+        self._token = _current.set(self)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._sampler.stop()
+        _current.reset(self._token)
+        get_profile_store().add({
+            "request_id": self.request_id,
+            "method": self._scope.get("method"),
+            "path": self._scope.get("path"),
+            "started_at": self._started_at,
+            "duration_ms": round((time.perf_counter() - self._started) * 1000, 2),
+            "interval_ms": round(self._sampler.interval * 1000, 3),
+            "samples": self._sampler.samples,
+            "collapsed": self._sampler.collapsed(),
+        })
+
+
+@contextmanager
+def _handler_call(frame: FrameType) -> Iterator[None]:
+    # Anchors the current profile, if any, at the endpoint wrapper's frame. Only
+    # the first endpoint of a profiled request anchors, so the sub-requests of a
+    # profiled POST /batch (which inherit its context) do not take over.
+    profile = _current.get()
+    if profile is None or not profile._sampler.anchor(threading.get_ident(), frame):
+        yield
+        return
+    try:
+        yield
+    finally:
+        profile._sampler.release()
+
+
+def _anchored(call: Callable[..., Any]) -> Callable[..., Any]:
+    if inspect.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def async_endpoint(*args: Any, **kwargs: Any) -> Any:
+            with _handler_call(sys._getframe()):
+                return await call(*args, **kwargs)
+
+        async_endpoint.__profile_anchored__ = True
+        return async_endpoint
+
+    @functools.wraps(call)
+    def endpoint(*args: Any, **kwargs: Any) -> Any:
+        with _handler_call(sys._getframe()):
+            return call(*args, **kwargs)
+
+    endpoint.__profile_anchored__ = True
+    return endpoint
+
+
+def anchor_endpoints(app: Any) -> None:
+    """Wrap the endpoint of every route of ``app`` so profiles can find its call.
+
+    Call once after all routers are included. The wrapper is what FastAPI
+    invokes per request (same sync/async kind as the endpoint), so it runs
+    in the thread that runs the endpoint.
+    """
+    for route in getattr(app, "routes", []):
+        dependant = getattr(route, "dependant", None)
+        call = getattr(dependant, "call", None)
+        if call is None or getattr(call, "__profile_anchored__", False):
+            continue
+        dependant.call = _anchored(call)
@@ -0,0 +1,169 @@
+"""Per-request I/O time accounting, reported as Server-Timing.
+
+RequestLoggingMiddleware starts a RequestTiming for each request and binds it
+to a context variable. Context variables are copied into threadpool workers,
+so sync handlers report into the same accumulator. Instrumented code wraps its
+work in ``timed(category)``:
+
+- yaml: YAML parsing (backend.utils.yaml_utils.load_yaml, see backend.utils.metrics)
+- fs: filesystem stat/read/write in yaml_utils and the repositories
+- rbac: Casbin enforcement
+- git: git subprocess runs
+- github: GitHub API calls
+
+Nested blocks are timed exclusively: a YAML parse inside a repository call
+counts as yaml time, not fs time, so the categories add up.
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from backend.utils.helpers import wrap_public_methods
+
+CATEGORIES = ("yaml", "fs", "rbac", "git", "github")
+
+T = TypeVar("T")
+
+
+class RequestTiming:
+    """Accumulates per-category durations and I/O counters for one request."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.seconds: Dict[str, float] = {c: 0.0 for c in CATEGORIES}
+        self.calls: Dict[str, int] = {c: 0 for c in CATEGORIES}
+        self.files_read = 0
+        self.bytes_read = 0
+        self.bytes_parsed = 0
+        self._lock = threading.Lock()
+        # Per-thread stack of [category, segment start] for exclusive timing.
+        self._stacks: Dict[int, List[List[Any]]] = {}
+
+    def enter(self, category: str) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            stack = self._stacks.setdefault(threading.get_ident(), [])
+            if stack:
+                parent = stack[-1]
+                self.seconds[parent[0]] = self.seconds.get(parent[0], 0.0) + (now - parent[1])
+            stack.append([category, now])
+            self.calls[category] = self.calls.get(category, 0) + 1
+
+    def exit(self) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            ident = threading.get_ident()
+            stack = self._stacks.get(ident)
+            if not stack:
+                return
+            category, start = stack.pop()
+            self.seconds[category] = self.seconds.get(category, 0.0) + (now - start)
+            if stack:
+                stack[-1][1] = now
+            else:
+                self._stacks.pop(ident, None)
+
+    def add_file_read(self, nbytes: int) -> None:
+        with self._lock:
+            self.files_read += 1
+            self.bytes_read += max(0, int(nbytes))
+
+    def add_bytes_parsed(self, nbytes: int) -> None:
+        with self._lock:
+            self.bytes_parsed += max(0, int(nbytes))
+
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def summary(self) -> Dict[str, Any]:
+        """Return durations (ms) and counters as plain data for structured logs."""
+        with self._lock:
+            return {
+                **{f"{c}_ms": round(s * 1000, 2) for c, s in self.seconds.items()},
+                **{f"{c}_calls": n for c, n in self.calls.items()},
+                "files_read": self.files_read,
+                "bytes_read": self.bytes_read,
+                "bytes_parsed": self.bytes_parsed,
+            }
+
+    def server_timing(self) -> str:
+        """Render the Server-Timing header value."""
+        with self._lock:
+            parts = [
+                f'{c};dur={s * 1000:.2f};desc="{self.calls[c]} call(s)"'
+                for c, s in self.seconds.items()
+                if self.calls.get(c)
+            ]
+            parts.append(f'files;desc="{self.files_read} read, {self.bytes_parsed} bytes parsed"')
+        parts.append(f"total;dur={self.total_ms():.2f}")
+        return ", ".join(parts)
+
+
+_current: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+def start_request_timing() -> Tuple[RequestTiming, Token]:
+    """Bind a fresh accumulator to the current context.
+
+    Returns:
+        (the accumulator, token to pass to reset_request_timing)
+    """
+    timing = RequestTiming()
+    return timing, _current.set(timing)
+
+
+def reset_request_timing(token: Token) -> None:
+    _current.reset(token)
+
+
+def current_request_timing() -> Optional[RequestTiming]:
+    return _current.get()
+
+
+@contextmanager
+def timed(category: str) -> Iterator[None]:
+    """Attribute the wall time of the block to a category of the current request."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    timing.enter(category)
+    try:
+        yield
+    finally:
+        timing.exit()
+
+
+def timed_methods(category: str) -> Callable[[type], type]:
+    """Class decorator timing every public method (incl. staticmethods) under a category."""
+
+    def wrap(name: str, func: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            with timed(category):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def decorate(cls: type) -> type:
+        return wrap_public_methods(cls, wrap)
+
+    return decorate
+
+
+def record_file_read(nbytes: int) -> None:
+    timing = _current.get()
+    if timing is not None:
+        timing.add_file_read(nbytes)
+
+
+def record_bytes_parsed(nbytes: int) -> None:
+    timing = _current.get()
+    if timing is not None:
+        timing.add_bytes_parsed(nbytes)
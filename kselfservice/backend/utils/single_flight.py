@@ -0,0 +1,113 @@
+"""Single-flight coalescing of identical concurrent service calls.
+
+When many users open the portal at once, each request runs the same
+directory scans and YAML parses for GET /apps, /clusters and
+/clusters/datacenters. A service method decorated with ``@single_flight``
+lets concurrent calls with the same arguments share one computation: the
+first caller runs it, later callers wait for that result (or exception)
+instead of starting their own.
+
+The key is (method, arguments, workspace generation of the method's scope;
+see backend.utils.workspace_generation). A call that starts after a write
+to that scope therefore never joins a computation that began before it.
+Nothing is cached: once the computation finishes, the next call runs again.
+
+Results are shared between callers and must be treated as read-only;
+per-user work (RBAC permissions) is applied to copies afterwards. Within a
+POST /batch the results are also kept until the batch ends
+(backend.utils.batch), so sub-requests run one after another share them too.
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from backend.utils.batch import batch_cached
+from backend.utils.metrics import SINGLE_FLIGHT_CALLS
+from backend.utils.workspace_generation import workspace_generations
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Returns the (env, app, namespace) scope whose generation keys a call
+ScopeFn = Callable[..., Tuple[Optional[str], ...]]
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; concurrent callers share its outcome."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run ``fn`` unless a call with ``key`` is in flight; return (result, shared)."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+_GROUP = SingleFlight()
+
+
+def single_flight(scope: ScopeFn = lambda *args, **kwargs: ()) -> Callable[[F], F]:
+    """Decorate a service method so identical concurrent calls share one result.
+
+    Args:
+        scope: Called with the method's arguments (without self); returns the
+            (env, app, namespace) scope whose generation is part of the key.
+            The default, the whole workspace, changes on every write.
+
+    Arguments must be hashable. The instance is not part of the key: services
+    are stateless and built per request.
+    """
+
+    def decorator(fn: F) -> F:
+        name = fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            generation = workspace_generations().version(*scope(*args, **kwargs))
+            key = (name, args, tuple(sorted(kwargs.items())), generation)
+
+            def call() -> Any:
+                result, shared = _GROUP.do(key, lambda: fn(self, *args, **kwargs))
+                SINGLE_FLIGHT_CALLS.inc(name, "shared" if shared else "leader")
+                return result
+
+            return batch_cached(("single_flight", key), call)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
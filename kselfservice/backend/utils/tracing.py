@@ -0,0 +1,397 @@
+"""Lightweight in-process tracing, exported to a rotating local JSON file.
+
+Spans cover the HTTP request (TracingMiddleware), service and repository
+methods (``traced_methods``), git subprocess runs and GitHub API calls
+(``backend.utils.metrics.track_git`` / ``track_github``). The current span
+lives in a context variable, which is copied into threadpool workers, so
+spans opened by sync handlers nest under the request span.
+
+Sampling is decided once per trace from its trace id (the OpenTelemetry
+TraceIdRatioBased rule), so a trace is either recorded completely or not at
+all; an incoming W3C ``traceparent`` header carries its own decision. When a
+recorded trace's root span ends, all of its spans are written as one line of
+OTLP/JSON (an ExportTraceServiceRequest, the format of the OpenTelemetry
+collector's file exporter), which OTLP-aware tools can load offline.
+
+Export goes through a bounded queue and a writer thread (see
+backend.config.logging_config), so request threads never wait on disk.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar, Union
+
+from backend.config.logging_config import BoundedQueueHandler
+from backend.config.settings import (
+    get_trace_backup_count,
+    get_trace_file,
+    get_trace_max_bytes,
+    get_trace_sample_ratio,
+)
+from backend.utils.helpers import wrap_public_methods
+
+T = TypeVar("T")
+
+# OTLP span kinds
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+
+# OTLP status codes
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+SERVICE_NAME = "kselfservice-backend"
+SPAN_LOGGER = "backend.tracing.spans"
+
+AttributeValue = Union[str, bool, int, float]
+
+
+def _attribute(key: str, value: AttributeValue) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed: Dict[str, Any] = {"boolValue": value}
+    elif isinstance(value, int):
+        # OTLP/JSON encodes 64-bit integers as strings
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+class _Trace:
+    """Finished spans of one recorded trace, flushed when its local root ends."""
+
+    def __init__(self, trace_id: str) -> None:
+        self.trace_id = trace_id
+        self.finished: List[Dict[str, Any]] = []
+        self.root_done = False
+        self.lock = threading.Lock()
+
+
+class Span:
+    """A recorded span. Use ``span()`` or the decorators rather than creating one directly."""
+
+    recording = True
+
+    def __init__(
+        self,
+        trace: _Trace,
+        name: str,
+        kind: int,
+        parent_span_id: str = "",
+        attributes: Optional[Dict[str, AttributeValue]] = None,
+        is_root: bool = False,
+    ) -> None:
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.kind = kind
+        self.attributes: Dict[str, AttributeValue] = dict(attributes or {})
+        self.events: List[Dict[str, Any]] = []
+        self.status_code = STATUS_UNSET
+        self.status_message = ""
+        self.is_root = is_root
+        self.start_ns = time.time_ns()
+        self._start_perf_ns = time.perf_counter_ns()
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        self.attributes[key] = value
+
+    def set_name(self, name: str) -> None:
+        self.name = name
+
+    def set_status(self, code: int, message: str = "") -> None:
+        self.status_code = code
+        self.status_message = message
+
+    def record_exception(self, exc: BaseException) -> None:
+        """Add an OpenTelemetry ``exception`` event and mark the span as failed."""
+        self.events.append({
+            "timeUnixNano": str(time.time_ns()),
+            "name": "exception",
+            "attributes": [
+                _attribute("exception.type", type(exc).__name__),
+                _attribute("exception.message", str(exc)),
+            ],
+        })
+        self.set_status(STATUS_ERROR, f"{type(exc).__name__}: {exc}")
+
+    def end(self) -> None:
+        end_ns = self.start_ns + (time.perf_counter_ns() - self._start_perf_ns)
+        data: Dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(end_ns),
+            "attributes": [_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": self.status_code},
+        }
+        if self.parent_span_id:
+            data["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            data["status"]["message"] = self.status_message
+        if self.events:
+            data["events"] = self.events
+
+        trace = self.trace
+        with trace.lock:
+            if trace.root_done:
+                # Outlived the root span (e.g. leaked background work): export on its own
+                batch = [data]
+            else:
+                trace.finished.append(data)
+                if not self.is_root:
+                    return
+                trace.root_done = True
+                batch, trace.finished = trace.finished, []
+        _export(batch)
+
+
+class _NonRecordingSpan:
+    """Stands in for spans of an unsampled trace so nested spans stay unsampled."""
+
+    recording = False
+    trace_id = ""
+    span_id = ""
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        pass
+
+    def set_name(self, name: str) -> None:
+        pass
+
+    def set_status(self, code: int, message: str = "") -> None:
+        pass
+
+    def record_exception(self, exc: BaseException) -> None:
+        pass
+
+
+_NON_RECORDING = _NonRecordingSpan()
+
+AnySpan = Union[Span, _NonRecordingSpan]
+
+_current: ContextVar[Optional[AnySpan]] = ContextVar("current_span", default=None)
+
+
+class _Config:
+    def __init__(self) -> None:
+        self.enabled = False
+        self.ratio = 0.0
+        self.handler: Optional[BoundedQueueHandler] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+
+
+_config = _Config()
+_setup_lock = threading.Lock()
+
+
+def _sampled(trace_id: str) -> bool:
+    # TraceIdRatioBased: compare the low 64 bits of the trace id with ratio * 2^64
+    if _config.ratio >= 1.0:
+        return True
+    return int(trace_id[16:], 16) < int(_config.ratio * (1 << 64))
+
+
+def _export(batch: List[Dict[str, Any]]) -> None:
+    handler = _config.handler
+    if handler is None:
+        return
+    payload = {
+        "resourceSpans": [{
+            "resource": {"attributes": [_attribute("service.name", SERVICE_NAME)]},
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": batch}],
+        }]
+    }
+    record = logging.LogRecord(SPAN_LOGGER, logging.INFO, __file__, 0, json.dumps(payload), None, None)
+    handler.handle(record)
+
+
+def setup_tracing(
+    sample_ratio: Optional[float] = None,
+    trace_file: Optional[str] = None,
+    max_bytes: Optional[int] = None,
+    backup_count: Optional[int] = None,
+    queue_size: int = 10000,
+) -> None:
+    """Configure span sampling and the rotating file exporter.
+
+    Tracing is off (spans are no-ops) while the sample ratio is 0.
+
+    Args:
+        sample_ratio: Fraction of new traces recorded (default: TRACE_SAMPLE_RATIO or 0)
+        trace_file: Output file, one OTLP/JSON line per trace (default: TRACE_FILE)
+        max_bytes: Maximum bytes per file before rotation (default: TRACE_MAX_BYTES)
+        backup_count: Rotated files to keep (default: TRACE_BACKUP_COUNT)
+        queue_size: Maximum traces waiting for the writer thread before dropping
+    """
+    if sample_ratio is None:
+        sample_ratio = get_trace_sample_ratio()
+    if trace_file is None:
+        trace_file = get_trace_file()
+    if max_bytes is None:
+        max_bytes = get_trace_max_bytes()
+    if backup_count is None:
+        backup_count = get_trace_backup_count()
+
+    shutdown_tracing()
+    with _setup_lock:
+        ratio = min(1.0, max(0.0, float(sample_ratio)))
+        if ratio <= 0.0:
+            return
+
+        path = Path(trace_file)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            filename=str(path), maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8",
+        )
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+        # Only span batches; the queue handler's own drop notices are not JSON
+        file_handler.addFilter(logging.Filter(SPAN_LOGGER))
+
+        handler = BoundedQueueHandler(max_size=queue_size)
+        listener = logging.handlers.QueueListener(handler.queue, file_handler)
+        listener.start()
+
+        _config.handler = handler
+        _config.listener = listener
+        _config.ratio = ratio
+        _config.enabled = True
+
+
+def shutdown_tracing() -> None:
+    """Stop recording and flush queued spans to the file."""
+    with _setup_lock:
+        _config.enabled = False
+        listener, _config.listener = _config.listener, None
+        _config.handler = None
+        if listener is not None:
+            listener.stop()
+            for h in listener.handlers:
+                h.close()
+
+
+def tracing_enabled() -> bool:
+    return _config.enabled
+
+
+def current_span() -> Optional[AnySpan]:
+    return _current.get()
+
+
+def _new_trace_id() -> str:
+    return os.urandom(16).hex()
+
+
+def parse_traceparent(value: str) -> Optional[Tuple[str, str, bool]]:
+    """Parse a W3C ``traceparent`` header into (trace id, parent span id, sampled)."""
+    parts = value.strip().split("-")
+    if len(parts) < 4 or len(parts[0]) != 2 or parts[0] == "ff":
+        return None
+    _, trace_id, span_id, flags = parts[:4]
+    if len(trace_id) != 32 or len(span_id) != 16 or len(flags) != 2:
+        return None
+    try:
+        int(trace_id, 16), int(span_id, 16)
+        sampled = bool(int(flags, 16) & 0x01)
+    except ValueError:
+        return None
+    if trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return trace_id, span_id, sampled
+
+
+@contextmanager
+def span(
+    name: str,
+    kind: int = KIND_INTERNAL,
+    attributes: Optional[Dict[str, AttributeValue]] = None,
+    parent: Optional[Tuple[str, str, bool]] = None,
+) -> Iterator[AnySpan]:
+    """Run the block inside a child of the current span (or a new trace).
+
+    Exceptions are recorded on the span and re-raised.
+
+    Args:
+        name: Span name
+        kind: KIND_INTERNAL, KIND_SERVER or KIND_CLIENT
+        attributes: Initial span attributes
+        parent: Remote parent (trace id, span id, sampled) from parse_traceparent;
+            only used when there is no current span
+    """
+    current = _current.get()
+    if not _config.enabled or (current is not None and not current.recording):
+        # Tracing off, or inside an unsampled trace
+        yield _NON_RECORDING
+        return
+
+    if isinstance(current, Span):
+        new = Span(current.trace, name, kind, current.span_id, attributes)
+    else:
+        if parent is not None:
+            trace_id, parent_span_id, sampled = parent
+        else:
+            trace_id, parent_span_id = _new_trace_id(), ""
+            sampled = _sampled(trace_id)
+        if not sampled:
+            token = _current.set(_NON_RECORDING)
+            try:
+                yield _NON_RECORDING
+            finally:
+                _current.reset(token)
+            return
+        new = Span(_Trace(trace_id), name, kind, parent_span_id, attributes, is_root=True)
+
+    token = _current.set(new)
+    try:
+        yield new
+    except BaseException as exc:
+        new.record_exception(exc)
+        raise
+    finally:
+        _current.reset(token)
+        new.end()
+
+
+def traced(name: Optional[str] = None) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Function decorator running each call inside a span (default name: the qualified name)."""
+
+    def decorate(func: Callable[..., T]) -> Callable[..., T]:
+        span_name = name or func.__qualname__
+        attributes = {"code.namespace": func.__module__, "code.function": func.__name__}
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            if not _config.enabled:
+                return func(*args, **kwargs)
+            with span(span_name, attributes=attributes):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def traced_methods(cls: type) -> type:
+    """Class decorator tracing every public method (incl. static/class methods) as ``Class.method``."""
+    return wrap_public_methods(cls, lambda name, func: traced(f"{cls.__name__}.{name}")(func))
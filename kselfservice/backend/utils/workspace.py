@@ -2,10 +2,11 @@
 
 from pathlib import Path
 from typing import Optional
-import yaml
 import logging
 
 from backend.exceptions.custom import NotInitializedError, ConfigurationError
+from backend.utils.batch import batch_cached
+from backend.utils.yaml_utils import load_yaml
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -18,17 +19,23 @@ def get_config_path() -> Path:
 def load_config() -> dict:
     """Load and return the configuration as a dictionary.
 
+    Read once per POST /batch (backend.utils.batch).
+
     Raises:
         NotInitializedError: If config doesn't exist
         ConfigurationError: If config is invalid
     """
+    return batch_cached(("config",), _read_config)
+
+
+def _read_config() -> dict:
     cfg_path = get_config_path()
     if not cfg_path.exists():
         logger.warning("Configuration file not found: %s", cfg_path)
         raise NotInitializedError("configuration")
 
     try:
-        raw_cfg = yaml.safe_load(cfg_path.read_text()) or {}
+        raw_cfg = load_yaml(cfg_path.read_text()) or {}
     except Exception as e:
         logger.error("Failed to read config file: %s", e, exc_info=True)
         raise ConfigurationError("config_file", f"Failed to read config: {e}")
@@ -0,0 +1,177 @@
+"""In-process pub/sub of workspace changes for the /changes/stream event stream.
+
+Every write through the API, in any worker, is appended to the change journal
+of backend.utils.workspace_generation. One FileWatcher per worker notices the
+journal file changing (inotify wake-ups, stat polling as the fallback), reads
+the new entries and hands them to the worker's subscribers, one per open
+event stream.
+
+Entries are filtered per subscriber on the watcher thread: the subscriber's
+env and the user's visibility of the app (GET /apps/{app} in the Casbin
+policy, with the user's current roles). Each subscriber has a bounded
+asyncio queue. A subscriber that falls behind until its queue is full is
+dropped: its stream sends a "resync" event and ends, and the browser
+reconnects with Last-Event-ID. Missed journal entries (trimmed between two
+polls) or a reset journal drop every subscriber the same way.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from backend.auth.rbac import check_permission, get_user_context
+from backend.config.settings import get_event_stream_queue_size, get_event_stream_watch_interval
+from backend.utils.file_watcher import FileWatcher
+from backend.utils.workspace_generation import WorkspaceGenerations, workspace_generations
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class EventSubscriber:
+    """One open event stream: its filter and bounded queue."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, env: str, user_id: str, queue_size: int) -> None:
+        self.loop = loop
+        self.env = env.strip().lower()
+        self.user_id = user_id
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+    def visible(self, changes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return the changes in this subscriber's env that the user may see (blocking)."""
+        user_context: Optional[Dict[str, Any]] = None
+        result = []
+        for change in changes:
+            if change.get("env") not in (None, self.env):
+                continue
+            app = change.get("app")
+            if app:
+                # Roles are re-read per batch, so revoked access applies to the next event
+                if user_context is None:
+                    user_context = get_user_context(self.user_id)
+                if not check_permission(user_context, f"/apps/{app}", "GET", {"id": app}):
+                    continue
+            result.append(change)
+        return result
+
+    def offer(self, change: Dict[str, Any]) -> None:
+        """Queue a change; runs on the subscriber's event loop."""
+        if self.dropped:
+            return
+        try:
+            self.queue.put_nowait(change)
+        except asyncio.QueueFull:
+            self.drop()
+
+    def drop(self) -> None:
+        """Mark the subscriber for a resync; runs on the subscriber's event loop."""
+        self.dropped = True
+        # Wake a stream waiting on an empty queue
+        if self.queue.empty():
+            self.queue.put_nowait({})
+
+
+class WorkspaceEventBroker:
+    """Fans change journal entries out to the subscribers of this worker."""
+
+    def __init__(self, generations: Optional[WorkspaceGenerations] = None) -> None:
+        self._generations = generations
+        self._lock = threading.Lock()
+        self._subscribers: Set[EventSubscriber] = set()
+        self._last_generation: Optional[int] = None
+        self._watcher: Optional[FileWatcher] = None
+
+    @property
+    def generations(self) -> WorkspaceGenerations:
+        return self._generations or workspace_generations()
+
+    def subscribe(self, env: str, user_id: str) -> EventSubscriber:
+        """Register a subscriber on the running event loop."""
+        subscriber = EventSubscriber(asyncio.get_running_loop(), env, user_id, get_event_stream_queue_size())
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: EventSubscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def poll(self) -> int:
+        """Publish the journal entries added since the last poll; return how many (blocking)."""
+        generation, changes = self.generations.read_journal()
+        with self._lock:
+            last, self._last_generation = self._last_generation, generation
+            subscribers = list(self._subscribers)
+        if last is None or generation == last:
+            return 0
+        new = [c for c in changes if c["generation"] > last]
+        if generation < last or not new or new[0]["generation"] > last + 1:
+            # Journal reset or entries trimmed before this worker saw them
+            logger.warning("Event stream: change journal skipped from %s to %s; resyncing subscribers", last, generation)
+            for subscriber in subscribers:
+                self._call(subscriber, subscriber.drop)
+            return 0
+        for subscriber in subscribers:
+            for change in subscriber.visible(new):
+                self._call(subscriber, subscriber.offer, change)
+        return len(new)
+
+    def _call(self, subscriber: EventSubscriber, callback: Any, *args: Any) -> None:
+        try:
+            subscriber.loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # Event loop closed under an abandoned stream
+            self.unsubscribe(subscriber)
+
+    def _targets(self) -> List[Tuple[Path, str]]:
+        journal = self.generations.journal_path
+        return [(journal.parent, journal.name)]
+
+    def start(self) -> None:
+        """Start watching the change journal (no-op if already running)."""
+        if self._watcher is not None:
+            return
+        with self._lock:
+            self._last_generation = self.generations.read_journal()[0]
+        self._watcher = FileWatcher(
+            "event-watcher", self._targets, lambda _changed: self.poll(), interval=get_event_stream_watch_interval()
+        )
+        self._watcher.start()
+
+    def stop(self) -> None:
+        if self._watcher is None:
+            return
+        self._watcher.stop()
+        self._watcher = None
+
+
+_BROKER: Optional[WorkspaceEventBroker] = None
+_BROKER_LOCK = threading.Lock()
+
+
+def workspace_event_broker() -> WorkspaceEventBroker:
+    """Return the process-wide broker."""
+    global _BROKER
+    if _BROKER is None:
+        with _BROKER_LOCK:
+            if _BROKER is None:
+                _BROKER = WorkspaceEventBroker()
+    return _BROKER
+
+
+def start_event_watcher() -> None:
+    """Start feeding event streams from the change journal."""
+    workspace_event_broker().start()
+
+
+def stop_event_watcher() -> None:
+    """Stop the change journal watcher."""
+    workspace_event_broker().stop()
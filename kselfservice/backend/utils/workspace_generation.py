@@ -0,0 +1,233 @@
+"""Workspace generation counters and change journal.
+
+Every write through the API bumps the counters of the env, app or namespace
+it touched, and a git refresh (saving the workspace config, server start)
+bumps a global epoch. ``version()`` turns the counters relevant to one
+resource into a short string that changes whenever that resource may have
+changed; backend.middleware.etag hashes it into strong ETags.
+
+Two counters are kept per scope ("dev", "dev/app1", "dev/app1/ns1", and ""
+for the whole workspace):
+
+- tree: bumped by a write to the scope or anything below it, so list
+  endpoints (the apps of an env, the namespaces of an app) change when one
+  of their items does
+- node: bumped by a write to the scope itself, so resources below it change
+  too (deleting or restoring an app invalidates its namespaces)
+
+The version of a scope is (epoch, its tree counter, the node counters of its
+ancestors): a write to one namespace leaves its sibling namespaces' ETags
+alone. The counters live in one JSON file that every worker stat-checks, so
+a write in one worker is visible to the next request in any other.
+
+Every bump also gets the next global generation and is appended to a change
+journal of (generation, kind, env, app, namespace, op) entries, capped at
+CHANGE_JOURNAL_SIZE. Changes that leave the workspace files alone (pull
+request status) are journalled without bumping counters. ``changes_since()`` serves GET /changes: the UI asks
+what changed in an env since the generation it last saw and refetches only
+those scopes, or resyncs fully when that generation has aged out of the
+journal or a workspace-wide change (git refresh) happened since.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.config.settings import get_change_journal_size
+from backend.utils.generation import StatToken, interprocess_lock, stat_token
+
+_EPOCH = "epoch"
+
+# Journal entry kind by scope depth
+_KINDS = ("workspace", "env", "app", "namespace")
+
+
+def default_path() -> Path:
+    """Counter file next to the other cross-worker state (see RoleMgmtImpl)."""
+    workspace_raw = str(os.getenv("WORKSPACE", "")).strip()
+    workspace = Path(workspace_raw).expanduser() if workspace_raw else Path.home() / "workspace"
+    return workspace / "kselfserv" / "temp" / "workspace.generations.json"
+
+
+def _scope_parts(env: Optional[str], app: Optional[str], namespace: Optional[str]) -> Tuple[str, ...]:
+    parts = []
+    for part in (env, app, namespace):
+        part = str(part or "").strip()
+        if not part:
+            break
+        parts.append(part.lower() if not parts else part)
+    return tuple(parts)
+
+
+class WorkspaceGenerations:
+    """Per env/app/namespace change counters shared by all workers through one file."""
+
+    def __init__(self, path: Path, journal_path: Optional[Path] = None) -> None:
+        self.path = path
+        self.journal_path = journal_path or path.with_suffix(".journal.json")
+        self._lock_path = path.with_name(path.name + ".lock")
+        self._lock = threading.Lock()
+        self._token: Optional[StatToken] = None
+        self._counters: Dict[str, int] = {}
+
+    def _read(self) -> Dict[str, int]:
+        try:
+            raw = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return {str(k): int(v) for k, v in raw.items() if isinstance(v, int)} if isinstance(raw, dict) else {}
+
+    def _snapshot(self) -> Dict[str, int]:
+        """Return the counters, re-reading the file only when its stat signature changed."""
+        token = stat_token(self.path)
+        with self._lock:
+            if token == self._token:
+                return self._counters
+        # Token taken before reading: a concurrent bump is picked up next time
+        counters = self._read()
+        with self._lock:
+            self._token, self._counters = token, counters
+        return counters
+
+    def read_journal(self) -> Tuple[int, List[Dict[str, Any]]]:
+        """Return (current generation, retained changes oldest first)."""
+        try:
+            raw = json.loads(self.journal_path.read_text())
+        except (OSError, ValueError):
+            return 0, []
+        if not isinstance(raw, dict) or not isinstance(raw.get("generation"), int):
+            return 0, []
+        changes = [c for c in raw.get("changes") or [] if isinstance(c, dict) and isinstance(c.get("generation"), int)]
+        return raw["generation"], changes
+
+    @staticmethod
+    def _write(path: Path, data: Any) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, sort_keys=True)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def bump(
+        self,
+        env: Optional[str] = None,
+        app: Optional[str] = None,
+        namespace: Optional[str] = None,
+        *,
+        kind: Optional[str] = None,
+        op: str = "update",
+        bump_counters: bool = True,
+    ) -> int:
+        """Record a write to a scope; with no env, everything changes (git refresh).
+
+        Args:
+            env: Environment written to (None for the whole workspace)
+            app: Application written to, if any
+            namespace: Namespace written to, if any
+            kind: Journal kind; defaults to the scope's level. Creates pass the
+                level of the item created under the scope (e.g. "app" for POST /apps)
+            op: Journal operation: create, update, delete or refresh
+            bump_counters: False to only journal the change; ETags stay valid
+
+        Returns:
+            The generation of the change
+        """
+        parts = _scope_parts(env, app, namespace)
+        with interprocess_lock(self._lock_path):
+            generation, changes = self.read_journal()
+            generation += 1
+            change = dict(zip(("env", "app", "namespace"), parts + (None,) * (3 - len(parts))))
+            change.update(generation=generation, kind=kind or _KINDS[len(parts)], op=op)
+            changes.append(change)
+            self._write(self.journal_path, {"generation": generation, "changes": changes[-get_change_journal_size():]})
+            if not bump_counters:
+                return generation
+
+            counters = self._read()
+            if not parts:
+                counters[_EPOCH] = counters.get(_EPOCH, 0) + 1
+            else:
+                key = "/".join(parts)
+                counters[f"node:{key}"] = counters.get(f"node:{key}", 0) + 1
+                for i in range(len(parts) + 1):
+                    tree_key = "tree:" + "/".join(parts[:i])
+                    counters[tree_key] = counters.get(tree_key, 0) + 1
+            self._write(self.path, counters)
+            token = stat_token(self.path)
+        with self._lock:
+            self._token, self._counters = token, counters
+        return generation
+
+    def version(self, env: Optional[str] = None, app: Optional[str] = None, namespace: Optional[str] = None) -> str:
+        """Return a string that changes whenever data in the scope may have changed."""
+        parts = _scope_parts(env, app, namespace)
+        counters = self._snapshot()
+        values = [counters.get(_EPOCH, 0), counters.get("tree:" + "/".join(parts), 0)]
+        values += [counters.get("node:" + "/".join(parts[:i]), 0) for i in range(1, len(parts))]
+        return ".".join(str(v) for v in values)
+
+    def changes_since(self, since: Optional[int], env: Optional[str] = None) -> Dict[str, Any]:
+        """Return the changes to an env after generation ``since``.
+
+        Args:
+            since: Last generation the client has seen (None on first load)
+            env: Environment to report; None reports every environment
+
+        Returns:
+            Dict with the current ``generation``, the matching ``changes`` and
+            ``resync``: True when the client must refetch everything because
+            ``since`` is unknown, has aged out of the journal, or a
+            workspace-wide change happened after it
+        """
+        generation, changes = self.read_journal()
+        result: Dict[str, Any] = {"generation": generation, "resync": True, "changes": []}
+        oldest = changes[0]["generation"] if changes else generation + 1
+        if since is None or since > generation or since < oldest - 1:
+            return result
+
+        env_key = str(env or "").strip().lower()
+        newer = [c for c in changes if c["generation"] > since]
+        if any(c.get("kind") == "workspace" for c in newer):
+            return result
+        result["resync"] = False
+        result["changes"] = [c for c in newer if not env_key or c.get("env") == env_key]
+        return result
+
+
+_instance: Optional[WorkspaceGenerations] = None
+_instance_lock = threading.Lock()
+
+
+def workspace_generations() -> WorkspaceGenerations:
+    """Return the process-wide counters (file resolved on first use)."""
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = WorkspaceGenerations(default_path())
+    return _instance
+
+
+def bump_generation(
+    env: Optional[str] = None,
+    app: Optional[str] = None,
+    namespace: Optional[str] = None,
+    *,
+    kind: Optional[str] = None,
+    op: str = "update",
+    bump_counters: bool = True,
+) -> int:
+    """Bump the counters of a scope and journal the change (see WorkspaceGenerations.bump)."""
+    return workspace_generations().bump(env, app, namespace, kind=kind, op=op, bump_counters=bump_counters)
@@ -1,13 +1,56 @@
 """YAML file utilities."""
 
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 import yaml
 import logging
 
+from backend.utils.metrics import track_yaml_parse
+from backend.utils.request_timing import record_file_read, timed
+
 logger = logging.getLogger("uvicorn.error")
 
 
+def _read_text(path: Path) -> Optional[str]:
+    """Read a text file, reporting fs time and the read to the request timing.
+
+    Returns:
+        File content, or None if the path is not an existing file
+    """
+    with timed("fs"):
+        if not path.exists() or not path.is_file():
+            return None
+        text = path.read_text()
+    record_file_read(len(text))
+    return text
+
+
+def _write_text(path: Path, text: str) -> None:
+    with timed("fs"):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+
+def load_yaml(text: str) -> Any:
+    """Parse a YAML text with yaml.safe_load, counted and timed in /metrics and Server-Timing.
+
+    Raises:
+        yaml.YAMLError: If the text is not valid YAML
+    """
+    with track_yaml_parse(len(text)):
+        return yaml.safe_load(text)
+
+
+def load_yaml_all(text: str) -> List[Any]:
+    """Parse every document of a YAML text, like load_yaml.
+
+    Raises:
+        yaml.YAMLError: If the text is not valid YAML
+    """
+    with track_yaml_parse(len(text)):
+        return list(yaml.safe_load_all(text))
+
+
 def read_yaml_dict(path: Path) -> Dict[str, Any]:
     """Read a YAML file and return as dictionary.
 
@@ -17,10 +60,11 @@ def read_yaml_dict(path: Path) -> Dict[str, Any]:
     Returns:
         Dictionary from YAML file, or empty dict if file doesn't exist or has issues
     """
-    if not path.exists() or not path.is_file():
-        return {}
     try:
-        raw = yaml.safe_load(path.read_text()) or {}
+        text = _read_text(path)
+        if text is None:
+            return {}
+        raw = load_yaml(text) or {}
         return raw if isinstance(raw, dict) else {}
     except Exception:
         return {}
@@ -35,10 +79,11 @@ def read_yaml_list(path: Path) -> List[Any]:
     Returns:
         List from YAML file, or empty list if file doesn't exist or has issues
     """
-    if not path.exists() or not path.is_file():
-        return []
     try:
-        raw = yaml.safe_load(path.read_text())
+        text = _read_text(path)
+        if text is None:
+            return []
+        raw = load_yaml(text)
         return raw if isinstance(raw, list) else []
     except Exception:
         return []
@@ -55,8 +100,7 @@ def write_yaml_dict(path: Path, data: Dict[str, Any], sort_keys: bool = False) -
     Raises:
         Exception: If write fails
     """
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(yaml.safe_dump(data, sort_keys=sort_keys))
+    _write_text(path, yaml.safe_dump(data, sort_keys=sort_keys))
 
 
 def write_yaml_list(path: Path, data: List[Any], sort_keys: bool = False) -> None:
@@ -70,8 +114,40 @@ def write_yaml_list(path: Path, data: List[Any], sort_keys: bool = False) -> Non
     Raises:
         Exception: If write fails
     """
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(yaml.safe_dump(data, sort_keys=sort_keys))
+    _write_text(path, yaml.safe_dump(data, sort_keys=sort_keys))
+
+
+def rewrite_namespace_in_yaml_text(raw: str, namespace: str) -> Optional[str]:
+    """Set metadata.namespace in every document of a YAML text that has one.
+
+    Args:
+        raw: YAML text, possibly with several documents
+        namespace: New namespace value to set
+
+    Returns:
+        The rewritten text, or None if nothing changed or the text is not YAML
+    """
+    to_ns = str(namespace or "").strip()
+    if not to_ns:
+        return None
+
+    try:
+        docs = load_yaml_all(raw)
+    except Exception:
+        return None
+
+    changed = False
+    for doc in docs:
+        if isinstance(doc, dict):
+            md = doc.get("metadata")
+            if isinstance(md, dict) and "namespace" in md:
+                if md.get("namespace") != to_ns:
+                    md["namespace"] = to_ns
+                    changed = True
+
+    if not changed:
+        return None
+    return yaml.safe_dump_all(docs, sort_keys=False)
 
 
 def rewrite_namespace_in_yaml_files(root: Path, namespace: str) -> None:
@@ -88,35 +164,19 @@ def rewrite_namespace_in_yaml_files(root: Path, namespace: str) -> None:
     patterns = ("*.yaml", "*.yml")
     for pattern in patterns:
         for path in root.rglob(pattern):
-            if not path.is_file():
-                continue
             try:
-                raw = path.read_text()
+                raw = _read_text(path)
             except Exception:
                 continue
-
-            try:
-                docs = list(yaml.safe_load_all(raw))
-            except Exception:
+            if raw is None:
                 continue
 
-            changed = False
-            next_docs = []
-            for doc in docs:
-                if isinstance(doc, dict):
-                    md = doc.get("metadata")
-                    if isinstance(md, dict) and "namespace" in md:
-                        if md.get("namespace") != to_ns:
-                            md["namespace"] = to_ns
-                            changed = True
-                next_docs.append(doc)
-
-            if not changed:
+            out = rewrite_namespace_in_yaml_text(raw, to_ns)
+            if out is None:
                 continue
 
             try:
-                out = yaml.safe_dump_all(next_docs, sort_keys=False)
-                path.write_text(out)
+                _write_text(path, out)
             except Exception as e:
                 logger.error("Failed to rewrite metadata.namespace in %s: %s", str(path), str(e))
 
@@ -130,10 +190,11 @@ def load_clusters_from_file(path: Path) -> List[Dict[str, Any]]:
     Returns:
         List of cluster dictionaries
     """
-    if not path.exists() or not path.is_file():
-        return []
     try:
-        raw = yaml.safe_load(path.read_text())
+        text = _read_text(path)
+        if text is None:
+            return []
+        raw = load_yaml(text)
     except Exception:
         return []
     if raw is None:
@@ -382,6 +382,12 @@ function App() {
     refreshRequestsChangesData();
   }, [activeEnv, refreshRequestsChangesData]);
 
+  // Refresh requests/changes when the server reports workspace changes (no polling)
+  React.useEffect(() => {
+    if (!activeEnv) return undefined;
+    return subscribeWorkspaceEvents(activeEnv, refreshRequestsChangesData);
+  }, [activeEnv, refreshRequestsChangesData]);
+
   // Load clusters when on Clusters tab
   React.useEffect(() => {
     if (!configComplete) return;
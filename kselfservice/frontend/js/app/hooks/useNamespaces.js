@@ -195,6 +195,11 @@ function useNamespaces({ activeEnv, setLoading, setError, setShowErrorModal }) {
       setDetailNamespace(details);
       setDetailNamespaceName(namespaceName);
 
+      const failed = Object.entries(details.section_errors || {});
+      if (failed.length > 0) {
+        setError(`Some namespace details could not be loaded: ${failed.map(([name, err]) => `${name} (${err?.detail || "error"})`).join(", ")}`);
+      }
+
       return details;
     } catch (e) {
       setError(e?.message || String(e));
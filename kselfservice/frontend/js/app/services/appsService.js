@@ -129,6 +129,18 @@ async function lookupUserRoles(userid) {
   return await fetchJson(`/api/v1/role-management/user/roles?userid=${encodeURIComponent(userId)}`);
 }
 
+/**
+ * Resolve roles for many users in one request.
+ * @param {string[]} userids - User ids to look up
+ * @returns {Promise<Object>} - Role details keyed by user id
+ */
+async function lookupUsersRoles(userids) {
+  const ids = (Array.isArray(userids) ? userids : []).map(safeTrim).filter(Boolean);
+  if (ids.length === 0) return {};
+  const data = await postJson("/api/v1/role-management/user/roles/batch", { userids: ids });
+  return data?.users || {};
+}
+
 async function grantAppAccessRequest(payload) {
   const userid = safeTrim(payload?.userid);
   const group = safeTrim(payload?.group);
@@ -168,6 +180,47 @@ async function loadRequestsChanges(env) {
   }
 }
 
+/**
+ * Subscribe to workspace change events for an environment (server-sent events).
+ * Bursts of events are coalesced into one callback.
+ * @param {string} env - Environment name
+ * @param {Function} onChange - Called after changes, or when the client must resync
+ * @returns {Function} - Closes the subscription
+ */
+function subscribeWorkspaceEvents(env, onChange) {
+  if (!env || typeof EventSource === "undefined") return () => {};
+
+  const source = new EventSource(`/api/v1/changes/stream?env=${encodeURIComponent(env)}`);
+  let connected = false;
+  let timer = null;
+  const notify = () => {
+    if (timer) return;
+    timer = setTimeout(() => {
+      timer = null;
+      onChange();
+    }, 300);
+  };
+
+  source.addEventListener("change", notify);
+  source.addEventListener("resync", notify);
+  source.addEventListener("ready", (e) => {
+    // The first connect follows a full load; after a reconnect, catch up if replay was impossible
+    let data = {};
+    try {
+      data = JSON.parse(e.data);
+    } catch {
+      data = {};
+    }
+    if (connected && data.resync) notify();
+    connected = true;
+  });
+
+  return () => {
+    if (timer) clearTimeout(timer);
+    source.close();
+  };
+}
+
 /**
  * Extract clusters by app from apps response.
  * @param {Object} appsResponse - Apps response object
@@ -106,7 +106,9 @@ async function copyNamespaceApi(env, appname, fromNamespace, payload) {
 }
 
 /**
- * Load namespace details (basic info, egress, rolebindings, egressfirewall, resourcequota, limitrange).
+ * Load namespace details (basic info, egress, rolebindings, egressfirewall, resourcequota, limitrange)
+ * in one round trip. Sections that failed on the server are listed in section_errors and
+ * fall back to empty values.
  * @param {string} env - Environment name
  * @param {string} appname - Application name
  * @param {string} namespaceName - Namespace name
@@ -117,17 +119,12 @@ async function loadNamespaceDetails(env, appname, namespaceName) {
   if (!appname) throw new Error("Application name is required.");
   if (!namespaceName) throw new Error("Namespace name is required.");
 
-  const envParam = `env=${encodeURIComponent(env)}`;
-  const base = `/api/v1/apps/${encodeURIComponent(appname)}/namespaces/${encodeURIComponent(namespaceName)}`;
-
-  const [basic, egress, rolebindings, egressFirewall, resourcequota, limitrange] = await Promise.all([
-    fetchJson(`${base}/namespace_info/basic?${envParam}`),
-    fetchJson(`${base}/namespace_info/egress?${envParam}`),
-    fetchJson(`${base}/rolebinding_requests?${envParam}`),
-    fetchJson(`${base}/egressfirewall?${envParam}`),
-    fetchJson(`${base}/resources/resourcequota?${envParam}`),
-    fetchJson(`${base}/resources/limitrange?${envParam}`),
-  ]);
+  const fields = "basic,egress,rolebindings,egressfirewall,resourcequota,limitrange";
+  const data = await fetchJson(
+    `/api/v1/apps/${encodeURIComponent(appname)}/namespaces/${encodeURIComponent(namespaceName)}/details?env=${encodeURIComponent(env)}&fields=${fields}`
+  );
+  const sections = data?.sections || {};
+  const { basic, egress, rolebindings, egressfirewall: egressFirewall, resourcequota, limitrange } = sections;
 
   return {
     name: namespaceName,
@@ -148,6 +145,7 @@ async function loadNamespaceDetails(env, appname, namespaceName) {
     },
     rolebindings: Array.isArray(rolebindings?.bindings) ? rolebindings.bindings : [],
     egress_firewall_rules: Array.isArray(egressFirewall?.rules) ? egressFirewall.rules : [],
+    section_errors: data?.errors || {},
   };
 }
 